@@ -0,0 +1,30 @@
+"""Add gallery_version to albums
+
+Revision ID: 0c5e8b2f4a17
+Revises: a3d9f6b2c8e4
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0c5e8b2f4a17'
+down_revision: Union[str, None] = 'a3d9f6b2c8e4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Gallery snapshots and ETags are keyed by this counter
+    op.add_column(
+        'albums',
+        sa.Column('gallery_version', sa.Integer(), nullable=False, server_default='0'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('albums', 'gallery_version')
@@ -0,0 +1,51 @@
+"""Add album_purge_jobs table
+
+Revision ID: a3d9f6b2c8e4
+Revises: f4c7a9e1b3d5
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3d9f6b2c8e4'
+down_revision: Union[str, None] = 'f4c7a9e1b3d5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Storage cleanup of deleted albums, processed by the in-app worker pool.
+    # No foreign key to albums: the album row is deleted when the job is queued
+    op.create_table(
+        'album_purge_jobs',
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('album_id', sa.String(length=36), nullable=False),
+        sa.Column('folder', sa.String(length=255), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('resource_type', sa.String(length=10), nullable=True),
+        sa.Column('next_cursor', sa.String(length=255), nullable=True),
+        sa.Column('deleted', sa.Integer(), nullable=False),
+        sa.Column('failed', sa.Integer(), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('locked_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.Column('error_message', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        'ix_album_purge_jobs_status_created',
+        'album_purge_jobs',
+        ['status', 'created_at'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_album_purge_jobs_status_created', table_name='album_purge_jobs')
+    op.drop_table('album_purge_jobs')
@@ -0,0 +1,31 @@
+"""Add composite (album_id, created_at, id) index to photos
+
+Revision ID: b7d4e1f2a3c6
+Revises: 8f3a9c2d1e5b
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d4e1f2a3c6'
+down_revision: Union[str, None] = '8f3a9c2d1e5b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Index used by keyset (cursor) pagination of album galleries
+    op.create_index(
+        'ix_photos_album_created_id',
+        'photos',
+        ['album_id', 'created_at', 'id'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_photos_album_created_id', table_name='photos')
@@ -0,0 +1,47 @@
+"""Add upload_jobs table
+
+Revision ID: c9e2a7b4d8f1
+Revises: b7d4e1f2a3c6
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c9e2a7b4d8f1'
+down_revision: Union[str, None] = 'b7d4e1f2a3c6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Bulk uploads processed in the background by the in-app worker pool
+    op.create_table(
+        'upload_jobs',
+        sa.Column('id', sa.String(length=36), nullable=False),
+        sa.Column('album_id', sa.String(length=36), nullable=False),
+        sa.Column('uploader_name', sa.String(length=255), nullable=True),
+        sa.Column('status', sa.String(length=20), nullable=False),
+        sa.Column('items', sa.JSON(), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('locked_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['album_id'], ['albums.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        'ix_upload_jobs_status_created',
+        'upload_jobs',
+        ['status', 'created_at'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_upload_jobs_status_created', table_name='upload_jobs')
+    op.drop_table('upload_jobs')
@@ -0,0 +1,35 @@
+"""Add content_hash to photos
+
+Revision ID: d5a1f3c7e9b2
+Revises: c9e2a7b4d8f1
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5a1f3c7e9b2'
+down_revision: Union[str, None] = 'c9e2a7b4d8f1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # SHA-256 of the uploaded file, NULL for photos uploaded before this
+    op.add_column('photos', sa.Column('content_hash', sa.String(length=64), nullable=True))
+
+    # Duplicate lookups on upload
+    op.create_index(
+        'ix_photos_album_content_hash',
+        'photos',
+        ['album_id', 'content_hash'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_photos_album_content_hash', table_name='photos')
+    op.drop_column('photos', 'content_hash')
@@ -0,0 +1,28 @@
+"""Add perceptual_hash to photos
+
+Revision ID: e2b8c4d6f0a3
+Revises: d5a1f3c7e9b2
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b8c4d6f0a3'
+down_revision: Union[str, None] = 'd5a1f3c7e9b2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 64-bit pHash computed by Cloudinary; fill older photos with
+    # scripts/backfill_perceptual_hashes.py
+    op.add_column('photos', sa.Column('perceptual_hash', sa.String(length=16), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('photos', 'perceptual_hash')
@@ -0,0 +1,40 @@
+"""Add orientation and captured_at to photos
+
+Revision ID: f4c7a9e1b3d5
+Revises: e2b8c4d6f0a3
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4c7a9e1b3d5'
+down_revision: Union[str, None] = 'e2b8c4d6f0a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('photos', sa.Column('orientation', sa.Integer(), nullable=True))
+    op.add_column('photos', sa.Column('captured_at', sa.DateTime(), nullable=True))
+
+    # Photos uploaded before this have no capture time: use the upload time
+    op.execute('UPDATE photos SET captured_at = created_at WHERE captured_at IS NULL')
+    op.alter_column('photos', 'captured_at', existing_type=sa.DateTime(), nullable=False)
+
+    # Index used by the capture-order gallery (?order=captured)
+    op.create_index(
+        'ix_photos_album_captured_id',
+        'photos',
+        ['album_id', 'captured_at', 'id'],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_photos_album_captured_id', table_name='photos')
+    op.drop_column('photos', 'captured_at')
+    op.drop_column('photos', 'orientation')
@@ -0,0 +1,91 @@
+from fastapi import status
+from fastapi.responses import JSONResponse
+from starlette.datastructures import Headers
+
+from app.api.v1.dependencies.uploads import max_request_bytes, upload_too_large
+from app.application.services.upload_admission import UploadAdmission
+from app.infrastructure.config.settings import settings
+from app.infrastructure.repositories.singletons import upload_admission
+
+# Request bodies that carry files: multipart forms and tus PATCH chunks
+UPLOAD_CONTENT_TYPES = ("multipart/form-data", "application/offset+octet-stream")
+
+
+class UploadAdmissionMiddleware:
+    """
+    Admit or turn away uploads from their headers, before the body is read
+
+    Plain ASGI middleware: the body is only received once the request is
+    admitted, so a refused client (with Expect: 100-continue, not even that)
+    does not send it. Requests declaring more than max_request_bytes get
+    413; requests over the worker's UploadAdmission budget get 503 with
+    Retry-After. A body without Content-Length reserves max_request_bytes
+    and is cut off with 413 if it goes beyond. This is the only place the
+    whole-request limit is enforced; routes only apply smaller ones.
+    """
+
+    def __init__(self, app, admission: UploadAdmission, max_request_bytes: int, retry_after: int):
+        self.app = app
+        self.admission = admission
+        self.max_request_bytes = max_request_bytes
+        self.retry_after = retry_after
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in ("POST", "PUT", "PATCH"):
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        content_type = headers.get("content-type", "").split(";")[0].strip().lower()
+        if content_type not in UPLOAD_CONTENT_TYPES:
+            await self.app(scope, receive, send)
+            return
+
+        length = headers.get("content-length", "")
+        if length.isdigit() and int(length) > self.max_request_bytes:
+            self.admission.too_large += 1
+            error = upload_too_large(self.max_request_bytes)
+            response = JSONResponse(status_code=error.status_code, content={"detail": error.detail})
+            await response(scope, receive, send)
+            return
+
+        size = int(length) if length.isdigit() else self.max_request_bytes
+        if not self.admission.acquire(size):
+            response = JSONResponse(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                content={"detail": "Too many uploads in progress, retry later"},
+                headers={"Retry-After": str(self.retry_after)},
+            )
+            await response(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, self._limit(receive) if not length.isdigit() else receive, send)
+        finally:
+            self.admission.release(size)
+
+    def _limit(self, receive):
+        """Wrap receive() to refuse a body without Content-Length once it is too large"""
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_request_bytes:
+                    self.admission.too_large += 1
+                    raise upload_too_large(self.max_request_bytes)
+            return message
+
+        return limited_receive
+
+
+def setup_upload_admission(app):
+    """Configure upload admission control (MAX_TOTAL_REQUEST_SIZE_MB and per-worker budgets)"""
+    app.add_middleware(
+        UploadAdmissionMiddleware,
+        admission=upload_admission,
+        max_request_bytes=max_request_bytes(),
+        retry_after=settings.UPLOAD_RETRY_AFTER_SECONDS,
+    )
@@ -0,0 +1,112 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+from fastapi import HTTPException, Request, Response, status
+
+from app.infrastructure.config.settings import settings
+
+
+def build_etag(*parts, weak: bool = True) -> str:
+    """
+    Build an ETag from the values that identify a representation
+
+    Strong ETags (weak=False) are for byte-identical representations, the
+    only ones If-Range can match.
+    """
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()
+    return f'W/"{digest[:32]}"' if weak else f'"{digest[:32]}"'
+
+
+def _http_date(value: datetime) -> str:
+    """Format a naive UTC datetime as an HTTP date"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return format_datetime(value.replace(microsecond=0), usegmt=True)
+
+
+def cache_headers(
+    etag: str, last_modified: Optional[datetime], max_age: Optional[int] = None
+) -> Dict[str, str]:
+    """Validator and Cache-Control headers for a cacheable GET response"""
+    if max_age is None:
+        max_age = settings.HTTP_CACHE_MAX_AGE_SECONDS
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={max_age}, must-revalidate",
+    }
+    if last_modified:
+        headers["Last-Modified"] = _http_date(last_modified)
+    return headers
+
+
+def is_not_modified(
+    request: Request, etag: str, last_modified: Optional[datetime]
+) -> bool:
+    """Evaluate If-None-Match / If-Modified-Since against the current validators"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        # If-None-Match takes precedence over If-Modified-Since (RFC 9110)
+        candidates = [tag.strip() for tag in if_none_match.split(",")]
+        weak_etag = etag.removeprefix("W/")
+        return "*" in candidates or any(
+            tag.removeprefix("W/") == weak_etag for tag in candidates
+        )
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        modified = last_modified.replace(microsecond=0)
+        if modified.tzinfo is None:
+            modified = modified.replace(tzinfo=timezone.utc)
+        return modified <= since
+
+    return False
+
+
+def not_modified_response(headers: Dict[str, str]) -> Response:
+    """Empty 304 response carrying the validators"""
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+
+def byte_range(request: Request, size: int, etag: str) -> Optional[Tuple[int, int]]:
+    """
+    (start, end) of a single-range Range request, end exclusive
+
+    Returns None when the whole representation should be sent: no Range
+    header, an unsupported or malformed one, or an If-Range that does not
+    match the current ETag. Raises 416 when the range starts past the end.
+    """
+    header = request.headers.get("range")
+    if not header:
+        return None
+    if_range = request.headers.get("if-range")
+    if if_range and if_range.strip() != etag:
+        return None
+
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, _, last = spec.strip().partition("-")
+    try:
+        if not first:
+            start, end = max(size - int(last), 0), size
+        else:
+            start = int(first)
+            if last and int(last) < start:
+                return None
+            end = min(int(last) + 1, size) if last else size
+    except ValueError:
+        return None
+
+    if start >= size or end <= start:
+        raise HTTPException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            headers={"Content-Range": f"bytes */{size}"},
+        )
+    return start, end
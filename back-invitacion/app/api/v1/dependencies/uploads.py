@@ -0,0 +1,246 @@
+import asyncio
+import base64
+import hashlib
+import os
+from datetime import timezone
+from email.utils import format_datetime
+from typing import BinaryIO, Callable, Dict, List, Optional, Tuple
+from fastapi import HTTPException, Request, Response, UploadFile, status
+from fastapi.routing import APIRoute
+
+from app.infrastructure.config.settings import settings
+
+# Version of the tus resumable upload protocol spoken by /photos/resumable
+TUS_VERSION = "1.0.0"
+
+# Room per file for multipart boundaries, part headers and the form's text fields
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+def get_upload_size(file: UploadFile) -> int:
+    """Size of an uploaded file without reading it into memory"""
+    if file.size is not None:
+        return file.size
+
+    position = file.file.tell()
+    file.file.seek(0, os.SEEK_END)
+    size = file.file.tell()
+    file.file.seek(position)
+    return size
+
+
+def validate_upload_size(file: UploadFile, max_bytes: int = None) -> int:
+    """Reject a file larger than MAX_FILE_SIZE_MB, returning its size otherwise"""
+    if max_bytes is None:
+        max_bytes = settings.MAX_FILE_SIZE_MB * 1024 * 1024
+
+    size = get_upload_size(file)
+    if size > max_bytes:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"File '{file.filename}' exceeds maximum size of {settings.MAX_FILE_SIZE_MB} MB",
+        )
+    return size
+
+
+def max_upload_bytes(files: int) -> int:
+    """Largest multipart body accepted for a form with up to `files` files"""
+    max_mb = min(files * settings.MAX_FILE_SIZE_MB, settings.MAX_TOTAL_REQUEST_SIZE_MB)
+    return max_mb * 1024 * 1024 + files * MULTIPART_OVERHEAD_BYTES
+
+
+def max_request_bytes() -> int:
+    """
+    Largest upload request body accepted by any route
+
+    MAX_TOTAL_REQUEST_SIZE_MB (or MAX_FILES_PER_REQUEST full-size files,
+    if less) plus multipart overhead. Enforced for every upload by
+    UploadAdmissionMiddleware, before a route is even picked.
+    """
+    return max_upload_bytes(settings.MAX_FILES_PER_REQUEST)
+
+
+def limit_upload_body(bulk: bool = False) -> Callable:
+    """
+    Cap the body of an upload route while it streams in (see LimitedUploadRoute)
+
+    Single-file routes accept MAX_FILE_SIZE_MB; bulk routes
+    MAX_FILES_PER_REQUEST times that, never above MAX_TOTAL_REQUEST_SIZE_MB.
+    """
+
+    def decorator(endpoint: Callable) -> Callable:
+        endpoint.bulk_upload = bulk
+        return endpoint
+
+    return decorator
+
+
+def upload_too_large(max_bytes: int) -> HTTPException:
+    """413 for an upload body over max_bytes (the same message wherever it is enforced)"""
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"Upload exceeds maximum size of {max_bytes // (1024 * 1024)} MB",
+    )
+
+
+class LimitedUploadRoute(APIRoute):
+    """
+    Route class enforcing the size limit of upload routes on the receive stream
+
+    Starlette spools the whole multipart body before the endpoint can look
+    at the files, so checking sizes in the endpoint only happens after a
+    too-large request has been read to disk. Routes marked with
+    limit_upload_body() instead get 413 before anything is read when
+    Content-Length is over the limit, and as soon as the limit is crossed
+    for a body streamed without one (or lying about it).
+
+    Only limits below max_request_bytes() are enforced here: the
+    whole-request limit is the admission middleware's.
+    """
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+        bulk = getattr(self.endpoint, "bulk_upload", None)
+        if bulk is None:
+            return handler
+
+        async def limited_handler(request: Request) -> Response:
+            max_bytes = max_upload_bytes(settings.MAX_FILES_PER_REQUEST if bulk else 1)
+            if max_bytes >= max_request_bytes():
+                return await handler(request)
+
+            length = request.headers.get("content-length", "")
+            if length.isdigit() and int(length) > max_bytes:
+                raise upload_too_large(max_bytes)
+
+            receive = request.receive
+            received = 0
+
+            async def limited_receive():
+                nonlocal received
+                message = await receive()
+                if message["type"] == "http.request":
+                    received += len(message.get("body", b""))
+                    if received > max_bytes:
+                        raise upload_too_large(max_bytes)
+                return message
+
+            return await handler(Request(request.scope, limited_receive))
+
+        return limited_handler
+
+
+def open_upload(file: UploadFile) -> BinaryIO:
+    """
+    File object of an upload, rewound for streaming to storage
+
+    Starlette spools uploads to a temporary file on disk (anything above
+    1 MB), so handing the file object on keeps memory per request bounded
+    instead of holding every file as bytes.
+    """
+    file.file.seek(0)
+    return file.file
+
+
+def _sha256(file: BinaryIO) -> str:
+    digest = hashlib.sha256()
+    file.seek(0)
+    for chunk in iter(lambda: file.read(1024 * 1024), b""):
+        digest.update(chunk)
+    file.seek(0)
+    return digest.hexdigest()
+
+
+async def hash_upload(file: UploadFile) -> str:
+    """
+    SHA-256 hex digest of an uploaded file, used to detect duplicates
+
+    The file is read in 1 MB chunks from Starlette's spool in a thread, so
+    hashing costs a local disk read, not memory or event loop time.
+    """
+    return await asyncio.to_thread(_sha256, file.file)
+
+
+def validate_media_files(files: List[UploadFile]) -> List[Tuple[UploadFile, str, str]]:
+    """
+    Validate the files of a bulk upload without reading them
+
+    Returns:
+        List of tuples (file, filename, media_type)
+    """
+    if len(files) == 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="At least one file must be provided",
+        )
+
+    if len(files) > settings.MAX_FILES_PER_REQUEST:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Maximum {settings.MAX_FILES_PER_REQUEST} files allowed per request",
+        )
+
+    allowed_types = settings.ALLOWED_IMAGE_TYPES + settings.ALLOWED_VIDEO_TYPES
+
+    files_data = []
+    for file in files:
+        if file.content_type not in allowed_types:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"File '{file.filename}' has unsupported type '{file.content_type}'. "
+                       f"Allowed types: {', '.join(allowed_types)}",
+            )
+
+        validate_upload_size(file)
+
+        media_type = "video" if file.content_type.startswith("video/") else "image"
+        files_data.append((file, file.filename, media_type))
+
+    return files_data
+
+
+def int_header(request: Request, name: str) -> int:
+    """Value of a required non-negative integer header (Upload-Length, Upload-Offset)"""
+    value = request.headers.get(name)
+    if value is None or not value.isdigit():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Header {name} must be a non-negative integer",
+        )
+    return int(value)
+
+
+def parse_upload_metadata(header: Optional[str]) -> Dict[str, str]:
+    """
+    Decode a tus Upload-Metadata header
+
+    The header is a comma-separated list of "key base64(value)" pairs,
+    e.g. "filename cGFydHkubXA0,album_id MTIz".
+    """
+    metadata = {}
+    for pair in (header or "").split(","):
+        parts = pair.strip().split(" ")
+        if not parts[0]:
+            continue
+        try:
+            metadata[parts[0]] = base64.b64decode(parts[1], validate=True).decode() if len(parts) > 1 else ""
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid Upload-Metadata value for '{parts[0]}'",
+            )
+    return metadata
+
+
+def tus_headers(upload) -> Dict[str, str]:
+    """Protocol headers describing the state of a resumable upload"""
+    return {
+        "Tus-Resumable": TUS_VERSION,
+        "Upload-Offset": str(upload.offset),
+        "Upload-Length": str(upload.length),
+        "Upload-Expires": format_datetime(
+            upload.expires_at.replace(microsecond=0, tzinfo=timezone.utc), usegmt=True
+        ),
+        # The offset changes with every chunk
+        "Cache-Control": "no-store",
+    }
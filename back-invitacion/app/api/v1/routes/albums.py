@@ -1,9 +1,23 @@
+import re
 from typing import List
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, status, Depends, Request, Response, BackgroundTasks
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.infrastructure.database.connection import get_db
+from app.infrastructure.config.settings import settings
+from app.infrastructure.database.connection import get_db, AsyncSessionLocal
 from app.infrastructure.repositories.album_repository_impl import AlbumRepositoryImpl
+from app.infrastructure.repositories.singletons import (
+    gallery_snapshot_store,
+    near_duplicate_indexes,
+    album_purge_worker,
+    export_checksums,
+    export_sizes,
+    media_downloader,
+    create_album_repository,
+    create_album_purge_job_repository,
+    create_photo_repository,
+)
 from app.application.use_cases.album_use_cases import (
     CreateAlbumUseCase,
     GetAlbumUseCase,
@@ -11,17 +25,38 @@ from app.application.use_cases.album_use_cases import (
     GetAllAlbumsUseCase,
     UpdateAlbumUseCase,
     DeleteAlbumUseCase,
+    GetAlbumPurgeJobUseCase,
 )
+from app.application.use_cases.photo_use_cases import FreezeGalleryUseCase
+from app.application.use_cases.album_export_use_cases import ExportAlbumUseCase
 from app.application.dtos.album_dto import (
     AlbumCreateDTO,
     AlbumUpdateDTO,
     AlbumResponseDTO,
+    AlbumPurgeJobResponseDTO,
 )
+from app.domain.entities.album import Album
 from app.domain.exceptions.base import EntityNotFoundException, EntityAlreadyExistsException
+from app.api.v1.dependencies.http_cache import (
+    build_etag,
+    byte_range,
+    cache_headers,
+    is_not_modified,
+    not_modified_response,
+)
 
 router = APIRouter()
 
 
+async def freeze_album_gallery(album: Album):
+    """Write the gallery of a closed album as static files (background task)"""
+    async with AsyncSessionLocal() as session:
+        use_case = FreezeGalleryUseCase(
+            create_photo_repository(session), gallery_snapshot_store
+        )
+        await use_case.execute(album, settings.GALLERY_SNAPSHOT_PAGE_SIZE)
+
+
 @router.post("/", response_model=AlbumResponseDTO, status_code=status.HTTP_201_CREATED)
 async def create_album(
     album_data: AlbumCreateDTO,
@@ -37,7 +72,7 @@ async def create_album(
     - **max_photos_per_user**: Maximum photos per guest (optional)
     """
     try:
-        album_repository = AlbumRepositoryImpl(db)
+        album_repository = create_album_repository(db)
         use_case = CreateAlbumUseCase(album_repository)
         album = await use_case.execute(album_data)
         return AlbumResponseDTO.model_validate(album)
@@ -60,7 +95,7 @@ async def get_album_by_code(
     - **event_code**: Event code
     """
     try:
-        album_repository = AlbumRepositoryImpl(db)
+        album_repository = create_album_repository(db)
         use_case = GetAlbumByCodeUseCase(album_repository)
         album = await use_case.execute(event_code)
         return AlbumResponseDTO.model_validate(album)
@@ -75,17 +110,30 @@ async def get_album_by_code(
 @router.get("/{album_id}", response_model=AlbumResponseDTO)
 async def get_album(
     album_id: str,
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db),
 ):
     """
     Get an album by ID
 
     - **album_id**: Album ID
+
+    Supports conditional requests (If-None-Match / If-Modified-Since).
     """
     try:
-        album_repository = AlbumRepositoryImpl(db)
-        use_case = GetAlbumUseCase(album_repository)
+        # Read straight from the DB (not the per-worker cache) so a stale
+        # cache entry can never produce a wrong 304 or a body older than its ETag
+        use_case = GetAlbumUseCase(AlbumRepositoryImpl(db))
         album = await use_case.execute(album_id)
+
+        # gallery_version changes with every write; updated_at has one-second precision
+        etag = build_etag(album.id, album.gallery_version)
+        headers = cache_headers(etag, album.updated_at)
+        if is_not_modified(request, etag, album.updated_at):
+            return not_modified_response(headers)
+        response.headers.update(headers)
+
         return AlbumResponseDTO.model_validate(album)
     except EntityNotFoundException as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
@@ -95,6 +143,69 @@ async def get_album(
         )
 
 
+@router.get("/{album_id}/export.zip", response_class=StreamingResponse)
+async def export_album(
+    album_id: str,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Download every photo and video of an album as a ZIP
+
+    - **album_id**: Album ID
+
+    The archive is streamed as the originals are fetched from Cloudinary
+    (stored, not recompressed), in capture order. Its length is known up
+    front, so interrupted downloads resume with a Range request
+    (If-Range with the ETag guards against a changed album).
+    """
+    try:
+        use_case = ExportAlbumUseCase(
+            create_album_repository(db),
+            create_photo_repository(db),
+            media_downloader,
+            export_checksums,
+            settings.EXPORT_CONCURRENCY,
+            export_sizes,
+        )
+        album, export = await use_case.execute(album_id)
+    except EntityNotFoundException as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
+        )
+
+    etag = build_etag(
+        album.id,
+        *[(item.key, item.entry.name, item.entry.size) for item in export.items],
+        weak=False,
+    )
+    filename = re.sub(r"[^A-Za-z0-9_.-]", "_", album.event_code)
+    headers = {
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+        "Content-Disposition": f'attachment; filename="{filename}.zip"',
+    }
+
+    requested = byte_range(request, export.size, etag)
+    if requested:
+        start, end = requested
+        status_code = status.HTTP_206_PARTIAL_CONTENT
+        headers["Content-Range"] = f"bytes {start}-{end - 1}/{export.size}"
+    else:
+        start, end = 0, export.size
+        status_code = status.HTTP_200_OK
+    headers["Content-Length"] = str(end - start)
+
+    return StreamingResponse(
+        export.iter_bytes(start, end),
+        status_code=status_code,
+        media_type="application/zip",
+        headers=headers,
+    )
+
+
 @router.get("/", response_model=List[AlbumResponseDTO])
 async def get_all_albums(
     skip: int = 0,
@@ -108,7 +219,7 @@ async def get_all_albums(
     - **limit**: Maximum number of albums to return
     """
     try:
-        album_repository = AlbumRepositoryImpl(db)
+        album_repository = create_album_repository(db)
         use_case = GetAllAlbumsUseCase(album_repository)
         albums = await use_case.execute(skip=skip, limit=limit)
         return [AlbumResponseDTO.model_validate(album) for album in albums]
@@ -122,17 +233,29 @@ async def get_all_albums(
 async def update_album(
     album_id: str,
     album_data: AlbumUpdateDTO,
+    background_tasks: BackgroundTasks,
     db: AsyncSession = Depends(get_db),
 ):
     """
     Update an album
 
     - **album_id**: Album ID
+
+    Deactivating an album freezes its gallery into static files that nginx
+    serves from `/static/galleries/{album_id}/page-{n}.json`.
     """
     try:
-        album_repository = AlbumRepositoryImpl(db)
+        album_repository = create_album_repository(db)
         use_case = UpdateAlbumUseCase(album_repository)
         album = await use_case.execute(album_id, album_data)
+
+        if settings.GALLERY_SNAPSHOT_ENABLED and album_data.is_active is not None:
+            # Both run after the response, once the update is committed
+            if album.is_active:
+                background_tasks.add_task(gallery_snapshot_store.unfreeze, album.id)
+            else:
+                background_tasks.add_task(freeze_album_gallery, album)
+
         return AlbumResponseDTO.model_validate(album)
     except EntityNotFoundException as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
@@ -142,20 +265,55 @@ async def update_album(
         )
 
 
-@router.delete("/{album_id}", status_code=status.HTTP_204_NO_CONTENT)
+@router.delete("/{album_id}", response_model=AlbumPurgeJobResponseDTO, status_code=status.HTTP_202_ACCEPTED)
 async def delete_album(
     album_id: str,
+    response: Response,
     db: AsyncSession = Depends(get_db),
 ):
     """
     Delete an album
 
+    The album and its photos are removed right away. Their Cloudinary
+    assets are deleted by a background purge job; poll the URL in the
+    Location header (/albums/purge-jobs/{job_id}) for its progress.
+
     - **album_id**: Album ID
     """
     try:
-        album_repository = AlbumRepositoryImpl(db)
-        use_case = DeleteAlbumUseCase(album_repository)
-        await use_case.execute(album_id)
+        album_repository = create_album_repository(db)
+        use_case = DeleteAlbumUseCase(album_repository, create_album_purge_job_repository(db))
+        job = await use_case.execute(album_id)
+        await db.commit()
+        album_purge_worker.notify()
+
+        gallery_snapshot_store.remove(album_id)
+        near_duplicate_indexes.invalidate(album_id)
+
+        response.headers["Location"] = f"{settings.API_V1_PREFIX}/albums/purge-jobs/{job.id}"
+        return AlbumPurgeJobResponseDTO.model_validate(job)
+    except EntityNotFoundException as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
+        )
+
+
+@router.get("/purge-jobs/{job_id}", response_model=AlbumPurgeJobResponseDTO)
+async def get_album_purge_job(
+    job_id: str,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Get the progress of the storage cleanup of a deleted album
+
+    - **job_id**: ID returned by DELETE /albums/{album_id}
+    """
+    try:
+        use_case = GetAlbumPurgeJobUseCase(create_album_purge_job_repository(db))
+        job = await use_case.execute(job_id)
+        return AlbumPurgeJobResponseDTO.model_validate(job)
     except EntityNotFoundException as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
     except Exception as e:
@@ -1,6 +1,22 @@
+import os
 from fastapi import APIRouter
 from datetime import datetime
 
+from app.infrastructure.database.connection import get_db_pool_status
+from app.infrastructure.repositories.singletons import (
+    album_cache,
+    gallery_snapshot_store,
+    image_variants,
+    near_duplicate_indexes,
+    cloudinary_service,
+    media_downloader,
+    export_checksums,
+    export_sizes,
+    upload_job_worker,
+    album_purge_worker,
+    upload_admission,
+)
+
 router = APIRouter()
 
 
@@ -21,3 +37,62 @@ async def root():
         "docs": "/docs",
         "health": "/api/v1/health",
     }
+
+
+@router.get("/health/db-pool", tags=["health"])
+async def db_pool_status():
+    """Database connection pool usage for this worker"""
+    return {
+        "pid": os.getpid(),
+        "pool": get_db_pool_status(),
+        "timestamp": datetime.utcnow().isoformat(),
+    }
+
+
+@router.get("/health/cache", tags=["health"])
+async def cache_status():
+    """Album cache, gallery snapshot, image variant and near-duplicate index counters for this worker"""
+    return {
+        "pid": os.getpid(),
+        "album_cache": album_cache.stats(),
+        "gallery_snapshots": gallery_snapshot_store.stats(),
+        "image_variants": image_variants.stats(),
+        "near_duplicate_indexes": near_duplicate_indexes.stats(),
+        "timestamp": datetime.utcnow().isoformat(),
+    }
+
+
+@router.get("/health/storage", tags=["health"])
+async def storage_status():
+    """Cloudinary thread pool usage (running calls and queue depth) and export downloads for this worker"""
+    return {
+        "pid": os.getpid(),
+        "cloudinary": cloudinary_service.stats(),
+        "exports": {
+            **media_downloader.stats(),
+            "checksum_cache": export_checksums.stats(),
+            "size_cache": export_sizes.stats(),
+        },
+        "timestamp": datetime.utcnow().isoformat(),
+    }
+
+
+@router.get("/health/jobs", tags=["health"])
+async def jobs_status():
+    """Background upload and album purge worker counters for this worker"""
+    return {
+        "pid": os.getpid(),
+        "upload_jobs": upload_job_worker.stats(),
+        "album_purges": album_purge_worker.stats(),
+        "timestamp": datetime.utcnow().isoformat(),
+    }
+
+
+@router.get("/health/uploads", tags=["health"])
+async def uploads_status():
+    """Uploads admitted and in flight against the per-worker budget, and uploads turned away"""
+    return {
+        "pid": os.getpid(),
+        "admission": upload_admission.stats(),
+        "timestamp": datetime.utcnow().isoformat(),
+    }
@@ -1,28 +1,93 @@
+import asyncio
+import json
+import uuid
 from typing import Optional, List
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException, status, Depends
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, status, Depends, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.infrastructure.database.connection import get_db
-from app.infrastructure.repositories.photo_repository_impl import PhotoRepositoryImpl
 from app.infrastructure.repositories.album_repository_impl import AlbumRepositoryImpl
-from app.infrastructure.repositories.singletons import cloudinary_service
+from app.infrastructure.repositories.singletons import (
+    cloudinary_service,
+    direct_upload_signer,
+    gallery_snapshot_store,
+    image_variants,
+    near_duplicate_indexes,
+    resumable_upload_spool,
+    create_album_repository,
+    create_photo_repository,
+    create_upload_job_repository,
+    upload_spool,
+    upload_job_worker,
+)
 from app.infrastructure.config.settings import settings
 from app.application.use_cases.photo_use_cases import (
     UploadPhotoUseCase,
     GetPhotosUseCase,
+    GetPhotosByCursorUseCase,
+    GetGalleryPageUseCase,
+    GetNearDuplicatesUseCase,
     GetPhotoUseCase,
     DeletePhotoUseCase,
+    BatchDeletePhotosUseCase,
     BulkUploadMediaUseCase,
+    CreateDirectUploadUseCase,
+    ConfirmDirectUploadUseCase,
+    CompleteThumbnailUseCase,
+    photo_response,
+)
+from app.application.use_cases.upload_job_use_cases import (
+    CreateUploadJobUseCase,
+    GetUploadJobUseCase,
+    upload_job_response,
+)
+from app.application.use_cases.resumable_upload_use_cases import (
+    CreateResumableUploadUseCase,
+    CompleteResumableUploadUseCase,
+    GetResumableUploadUseCase,
+    resumable_upload_response,
 )
 from app.application.dtos.photo_dto import (
     PhotoUploadDTO,
     PhotoResponseDTO,
+    UploadedPhotoResponseDTO,
     PhotoListResponseDTO,
+    NearDuplicateClustersResponseDTO,
     BulkUploadResponseDTO,
+    BatchDeleteRequestDTO,
+    BatchDeleteResponseDTO,
+    DirectUploadRequestDTO,
+    DirectUploadSignatureDTO,
+    DirectUploadConfirmDTO,
+    UploadJobResponseDTO,
+    ResumableUploadResponseDTO,
+)
+from app.infrastructure.jobs.resumable_spool import (
+    UploadLengthExceededError,
+    UploadLockedError,
+    UploadOffsetError,
 )
 from app.domain.exceptions.base import EntityNotFoundException, ValidationException
+from app.api.v1.dependencies.uploads import (
+    validate_upload_size,
+    validate_media_files,
+    hash_upload,
+    open_upload,
+    int_header,
+    limit_upload_body,
+    LimitedUploadRoute,
+    parse_upload_metadata,
+    tus_headers,
+    TUS_VERSION,
+)
+from app.api.v1.dependencies.http_cache import (
+    build_etag,
+    cache_headers,
+    is_not_modified,
+    not_modified_response,
+)
 
-router = APIRouter()
+router = APIRouter(route_class=LimitedUploadRoute)
 
 
 @router.get("/test-db")
@@ -39,8 +104,10 @@ async def test_database_connection():
         return {"status": "error", "message": str(e), "type": type(e).__name__}
 
 
-@router.post("/upload", response_model=PhotoResponseDTO, status_code=status.HTTP_201_CREATED)
+@router.post("/upload", response_model=UploadedPhotoResponseDTO, status_code=status.HTTP_201_CREATED)
+@limit_upload_body()
 async def upload_photo(
+    response: Response,
     file: UploadFile = File(...),
     album_id: str = Form(...),
     uploader_name: Optional[str] = Form("Anonymous"),
@@ -52,6 +119,9 @@ async def upload_photo(
     - **file**: Image file (jpg, png, etc.)
     - **album_id**: Album/Event ID
     - **uploader_name**: Name of the person uploading (optional)
+
+    If the album already has the same file, nothing is uploaded and the
+    existing photo is returned with 200 and "duplicate": true.
     """
     try:
         # Validate file type
@@ -61,8 +131,8 @@ async def upload_photo(
                 detail="File must be an image",
             )
 
-        # Read file
-        file_content = await file.read()
+        # Validate file size without loading the file into memory
+        validate_upload_size(file)
 
         # Create upload DTO
         upload_data = PhotoUploadDTO(
@@ -70,14 +140,21 @@ async def upload_photo(
         )
 
         # Execute use case
-        photo_repository = PhotoRepositoryImpl(db)
-        album_repository = AlbumRepositoryImpl(db)
+        photo_repository = create_photo_repository(db)
+        album_repository = create_album_repository(db)
         use_case = UploadPhotoUseCase(
             photo_repository, album_repository, cloudinary_service
         )
-        photo = await use_case.execute(file_content, file.filename, upload_data)
+        content_hash = await hash_upload(file)
+        photo, duplicate = await use_case.execute(
+            open_upload(file), file.filename, upload_data, content_hash
+        )
 
-        return PhotoResponseDTO.model_validate(photo)
+        if duplicate:
+            response.status_code = status.HTTP_200_OK
+        return UploadedPhotoResponseDTO(
+            **PhotoResponseDTO.model_validate(photo).model_dump(), duplicate=duplicate
+        )
 
     except EntityNotFoundException as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
@@ -90,6 +167,7 @@ async def upload_photo(
 
 
 @router.post("/bulk-upload", response_model=BulkUploadResponseDTO, status_code=status.HTTP_207_MULTI_STATUS)
+@limit_upload_body(bulk=True)
 async def bulk_upload_media(
     files: List[UploadFile] = File(...),
     album_id: str = Form(...),
@@ -98,8 +176,9 @@ async def bulk_upload_media(
     """
     Bulk upload multiple photos and/or videos to an album
 
-    Sequential processing: Each file is uploaded to Cloudinary and saved to DB
-    immediately with its own short-lived database session.
+    Files are uploaded to Cloudinary concurrently (up to BULK_UPLOAD_CONCURRENCY
+    at once) and saved in batches by a single writer, each batch with its own
+    short-lived database session. Each file succeeds or fails on its own.
 
     - **files**: List of files (images and/or videos)
     - **album_id**: Album/Event ID
@@ -112,171 +191,37 @@ async def bulk_upload_media(
     Maximum file size: 50 MB per file
     """
     from app.infrastructure.database.connection import AsyncSessionLocal
-    from app.application.dtos.photo_dto import PhotoResponseDTO, BulkUploadItemResponseDTO
-    from app.domain.entities.photo import Photo
 
     try:
-        # Validate number of files
-        if len(files) == 0:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="At least one file must be provided",
-            )
-
-        if len(files) > settings.MAX_FILES_PER_REQUEST:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Maximum {settings.MAX_FILES_PER_REQUEST} files allowed per request",
-            )
-
-        # Allowed file types
-        allowed_types = settings.ALLOWED_IMAGE_TYPES + settings.ALLOWED_VIDEO_TYPES
-        max_file_size = settings.MAX_FILE_SIZE_MB * 1024 * 1024  # Convert to bytes
-
-        # Validate and read all files first
-        files_data = []
-        for file in files:
-            # Validate content type
-            if file.content_type not in allowed_types:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"File '{file.filename}' has unsupported type '{file.content_type}'. "
-                           f"Allowed types: {', '.join(allowed_types)}",
-                )
-
-            # Read file content
-            file_content = await file.read()
-
-            # Validate file size
-            if len(file_content) > max_file_size:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"File '{file.filename}' exceeds maximum size of {settings.MAX_FILE_SIZE_MB} MB",
-                )
-
-            # Determine media type
-            media_type = "video" if file.content_type.startswith("video/") else "image"
-
-            files_data.append((file_content, file.filename, media_type))
-
-        # Step 1: Validate album exists with a short-lived session
-        async with AsyncSessionLocal() as session:
-            album_repository = AlbumRepositoryImpl(session)
-            album = await album_repository.get_by_id(album_id)
-            if not album:
-                raise EntityNotFoundException(f"Album with id {album_id} not found")
-            if not album.is_active:
-                raise ValidationException("This album is no longer accepting photos")
-        # Session is now closed
-
-        # Step 2: Process each file SEQUENTIALLY
-        results = []
-        successful_count = 0
-
-        for file_content, filename, media_type in files_data:
-            try:
-                # Upload to Cloudinary (no DB session active)
-                if media_type == "video":
-                    cloudinary_response = await cloudinary_service.upload_video(
-                        file=file_content,
-                        filename=filename,
-                        folder=f"albums/{album_id}",
-                    )
-                else:
-                    cloudinary_response = await cloudinary_service.upload_image(
-                        file=file_content,
-                        filename=filename,
-                        folder=f"albums/{album_id}",
-                    )
-
-                # Convert duration from float to int for videos
-                duration = cloudinary_response.get("duration")
-                if duration is not None:
-                    duration = int(round(duration))
-
-                # Create photo entity
-                photo = Photo(
-                    url=cloudinary_response["url"],
-                    public_id=cloudinary_response["public_id"],
-                    album_id=album_id,
-                    media_type=media_type,
-                    thumbnail_url=cloudinary_response.get("thumbnail_url"),
-                    original_filename=filename,
-                    uploader_name=uploader_name,
-                    file_size=cloudinary_response.get("bytes"),
-                    width=cloudinary_response.get("width"),
-                    height=cloudinary_response.get("height"),
-                    format=cloudinary_response.get("format"),
-                    duration=duration,
-                )
-
-                # Save to database with NEW short-lived session
-                async with AsyncSessionLocal() as session:
-                    photo_repository = PhotoRepositoryImpl(session)
-                    saved_photo = await photo_repository.create(photo)
-                    await session.commit()
-                    # Session closes automatically here
-
-                # Increment successful counter
-                successful_count += 1
-
-                # Create success response
-                photo_dto = PhotoResponseDTO(
-                    id=saved_photo.id,
-                    url=saved_photo.url,
-                    public_id=saved_photo.public_id,
-                    album_id=saved_photo.album_id,
-                    media_type=saved_photo.media_type,
-                    thumbnail_url=saved_photo.thumbnail_url,
-                    original_filename=saved_photo.original_filename,
-                    uploader_name=saved_photo.uploader_name,
-                    file_size=saved_photo.file_size,
-                    width=saved_photo.width,
-                    height=saved_photo.height,
-                    format=saved_photo.format,
-                    duration=saved_photo.duration,
-                    created_at=saved_photo.created_at,
-                )
-
-                results.append(
-                    BulkUploadItemResponseDTO(
-                        original_filename=filename,
-                        success=True,
-                        data=photo_dto,
-                    )
-                )
-
-            except Exception as e:
-                # If this specific file fails, continue with the next one
-                results.append(
-                    BulkUploadItemResponseDTO(
-                        original_filename=filename,
-                        success=False,
-                        error_message=str(e),
-                    )
-                )
-
-        # Step 3: Update album photo count with a separate session
-        if successful_count > 0:
-            async with AsyncSessionLocal() as session:
-                try:
-                    album_repository = AlbumRepositoryImpl(session)
-                    for _ in range(successful_count):
-                        await album_repository.increment_photo_count(album_id)
-                    await session.commit()
-                except Exception:
-                    # If counter update fails, don't fail the whole operation
-                    # Photos are already saved successfully
-                    await session.rollback()
+        # Validate all files first (they stay spooled, nothing is read into memory)
+        files_data = validate_media_files(files)
+        content_hashes = await asyncio.gather(*[hash_upload(file) for file, _, _ in files_data])
+
+        use_case = BulkUploadMediaUseCase(
+            AsyncSessionLocal,
+            create_photo_repository,
+            create_album_repository,
+            cloudinary_service,
+            concurrency=settings.BULK_UPLOAD_CONCURRENCY,
+        )
+        results = await use_case.execute(
+            [(open_upload(file), filename, media_type) for file, filename, media_type in files_data],
+            list(content_hashes),
+            PhotoUploadDTO(album_id=album_id, uploader_name=uploader_name),
+        )
 
         # Count totals
         successful = sum(1 for r in results if r.success)
         failed = len(results) - successful
+        duplicates = sum(1 for r in results if r.duplicate)
+        bytes_saved = sum(r.bytes_saved or 0 for r in results)
 
         return BulkUploadResponseDTO(
             total=len(results),
             successful=successful,
             failed=failed,
+            duplicates=duplicates,
+            bytes_saved=bytes_saved,
             album_id=album_id,
             results=results,
         )
@@ -293,30 +238,608 @@ async def bulk_upload_media(
         )
 
 
+@router.post("/jobs", response_model=UploadJobResponseDTO, status_code=status.HTTP_202_ACCEPTED)
+@limit_upload_body(bulk=True)
+async def create_upload_job(
+    response: Response,
+    files: List[UploadFile] = File(...),
+    album_id: str = Form(...),
+    uploader_name: Optional[str] = Form("Anonymous"),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Queue a bulk upload and return right away
+
+    Same input and limits as /photos/bulk-upload, but the files are stored
+    locally and uploaded by a background worker, so the request does not
+    wait for Cloudinary. Poll the URL in the Location header
+    (/photos/jobs/{job_id}) for per-file progress.
+
+    - **files**: List of files (images and/or videos)
+    - **album_id**: Album/Event ID
+    - **uploader_name**: Name of the person uploading (optional)
+    """
+    if not settings.UPLOAD_JOBS_ENABLED:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Background uploads are disabled",
+        )
+
+    job_id = str(uuid.uuid4())
+    job = None
+    try:
+        files_data = validate_media_files(files)
+
+        # Copy the files into the job spool before the job becomes visible,
+        # hashing them on the way for duplicate detection
+        content_hashes = [
+            await upload_spool.save(job_id, index, open_upload(file))
+            for index, (file, filename, media_type) in enumerate(files_data)
+        ]
+
+        upload_job_repository = create_upload_job_repository(db)
+        album_repository = create_album_repository(db)
+        use_case = CreateUploadJobUseCase(upload_job_repository, album_repository)
+        job = await use_case.execute(
+            job_id,
+            [
+                (filename, media_type, content_hash)
+                for (file, filename, media_type), content_hash in zip(files_data, content_hashes)
+            ],
+            PhotoUploadDTO(album_id=album_id, uploader_name=uploader_name),
+        )
+        await db.commit()
+        upload_job_worker.notify()
+
+        response.headers["Location"] = f"{settings.API_V1_PREFIX}/photos/jobs/{job.id}"
+        return upload_job_response(job)
+
+    except EntityNotFoundException as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except ValidationException as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
+        )
+    finally:
+        # Nothing will ever process the files of a job that was not created
+        if job is None:
+            upload_spool.remove(job_id)
+
+
+@router.get("/jobs/{job_id}", response_model=UploadJobResponseDTO)
+async def get_upload_job(
+    job_id: str,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Get the status and per-file progress of a queued bulk upload
+
+    - **job_id**: ID returned by POST /photos/jobs
+    """
+    try:
+        use_case = GetUploadJobUseCase(create_upload_job_repository(db))
+        job = await use_case.execute(job_id)
+        return upload_job_response(job)
+    except EntityNotFoundException as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
+        )
+
+
+async def _get_resumable_upload(upload_id: str):
+    """Load a resumable upload, 404 if unknown and 410 once expired"""
+    upload = await resumable_upload_spool.get(upload_id)
+    if upload is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Upload with id {upload_id} not found",
+        )
+    if upload.expired:
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail=f"Upload with id {upload_id} has expired",
+        )
+    return upload
+
+
+@router.options("/resumable", status_code=status.HTTP_204_NO_CONTENT)
+async def resumable_upload_options():
+    """Capabilities of the resumable upload endpoint (tus discovery)"""
+    return Response(
+        status_code=status.HTTP_204_NO_CONTENT,
+        headers={
+            "Tus-Resumable": TUS_VERSION,
+            "Tus-Version": TUS_VERSION,
+            "Tus-Extension": "creation,expiration,termination",
+            "Tus-Max-Size": str(settings.MAX_FILE_SIZE_MB * 1024 * 1024),
+        },
+    )
+
+
+@router.post("/resumable", status_code=status.HTTP_201_CREATED)
+async def create_resumable_upload(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Start a resumable upload of one file (tus creation)
+
+    Meant for large videos over unreliable connections: the file is sent in
+    chunks with PATCH and a dropped connection only costs the bytes that
+    never arrived.
+
+    Headers:
+    - **Upload-Length**: File size in bytes
+    - **Upload-Metadata**: Comma-separated "key base64(value)" pairs with
+      **filename**, **filetype** (MIME type), **album_id** and optionally
+      **uploader_name**
+
+    Returns 201 with the upload URL in the Location header.
+    """
+    length = int_header(request, "Upload-Length")
+    metadata = parse_upload_metadata(request.headers.get("Upload-Metadata"))
+
+    for key in ("filename", "filetype", "album_id"):
+        if not metadata.get(key):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Upload-Metadata must include '{key}'",
+            )
+
+    allowed_types = settings.ALLOWED_IMAGE_TYPES + settings.ALLOWED_VIDEO_TYPES
+    if metadata["filetype"] not in allowed_types:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"File '{metadata['filename']}' has unsupported type '{metadata['filetype']}'. "
+                   f"Allowed types: {', '.join(allowed_types)}",
+        )
+
+    if length == 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"File '{metadata['filename']}' is empty",
+        )
+    if length > settings.MAX_FILE_SIZE_MB * 1024 * 1024:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"File '{metadata['filename']}' exceeds maximum size of {settings.MAX_FILE_SIZE_MB} MB",
+        )
+
+    media_type = "video" if metadata["filetype"].startswith("video/") else "image"
+
+    try:
+        album_repository = create_album_repository(db)
+        use_case = CreateResumableUploadUseCase(album_repository, resumable_upload_spool)
+        upload = await use_case.execute(
+            metadata["filename"],
+            media_type,
+            length,
+            PhotoUploadDTO(
+                album_id=metadata["album_id"],
+                uploader_name=metadata.get("uploader_name") or "Anonymous",
+            ),
+        )
+
+        headers = tus_headers(upload)
+        headers["Location"] = f"{settings.API_V1_PREFIX}/photos/resumable/{upload.id}"
+        return Response(status_code=status.HTTP_201_CREATED, headers=headers)
+
+    except EntityNotFoundException as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except ValidationException as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
+        )
+
+
+@router.head("/resumable/{upload_id}")
+async def get_resumable_upload_offset(upload_id: str):
+    """
+    Bytes of a resumable upload received so far (tus HEAD)
+
+    Ask before resuming after a dropped connection and continue the PATCH
+    from the returned Upload-Offset.
+    """
+    upload = await _get_resumable_upload(upload_id)
+    return Response(status_code=status.HTTP_200_OK, headers=tus_headers(upload))
+
+
+@router.patch("/resumable/{upload_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def append_resumable_upload(
+    upload_id: str,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Send the next chunk of a resumable upload (tus PATCH)
+
+    Headers: **Upload-Offset** (bytes already received, from HEAD) and
+    Content-Type: application/offset+octet-stream; the body is the chunk,
+    which may be the rest of the file. Everything that arrives is kept even
+    if the connection drops. Responds 204 with the new Upload-Offset.
+
+    The chunk that completes the file stores it like /photos/upload (videos
+    included). If that fails, retry with an empty PATCH at the final offset.
+    """
+    if request.headers.get("content-type") != "application/offset+octet-stream":
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Content-Type must be application/offset+octet-stream",
+        )
+    offset = int_header(request, "Upload-Offset")
+    upload = await _get_resumable_upload(upload_id)
+
+    try:
+        async with resumable_upload_spool.lock(upload) as upload:
+            if upload.completed:
+                # Retry of the last chunk after its response was lost
+                if offset != upload.length:
+                    raise UploadOffsetError(upload.length)
+            else:
+                await resumable_upload_spool.append(upload, offset, request.stream())
+
+                if upload.offset == upload.length:
+                    photo_repository = create_photo_repository(db)
+                    album_repository = create_album_repository(db)
+                    use_case = CompleteResumableUploadUseCase(
+                        photo_repository, album_repository, cloudinary_service, resumable_upload_spool
+                    )
+                    photo, duplicate = await use_case.execute(upload)
+                    await db.commit()
+                    await resumable_upload_spool.complete(upload, photo.id, duplicate)
+
+        return Response(status_code=status.HTTP_204_NO_CONTENT, headers=tus_headers(upload))
+
+    except UploadOffsetError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e),
+            headers={"Tus-Resumable": TUS_VERSION, "Upload-Offset": str(e.offset)},
+        )
+    except UploadLockedError as e:
+        raise HTTPException(status_code=status.HTTP_423_LOCKED, detail=str(e))
+    except UploadLengthExceededError as e:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e))
+    except EntityNotFoundException as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except ValidationException as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except HTTPException:
+        # Raised while reading the body (request size limit)
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
+        )
+
+
+@router.get("/resumable/{upload_id}", response_model=ResumableUploadResponseDTO)
+async def get_resumable_upload(
+    upload_id: str,
+    response: Response,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Get the status of a resumable upload, with the photo once completed
+
+    - **upload_id**: ID at the end of the Location returned by POST /photos/resumable
+    """
+    try:
+        use_case = GetResumableUploadUseCase(create_photo_repository(db), resumable_upload_spool)
+        upload, photo = await use_case.execute(upload_id)
+        response.headers["Cache-Control"] = "no-store"
+        return resumable_upload_response(upload, photo)
+    except EntityNotFoundException as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
+        )
+
+
+@router.delete("/resumable/{upload_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_resumable_upload(upload_id: str):
+    """
+    Cancel a resumable upload and delete the data received (tus termination)
+
+    A completed upload only loses its status; the photo is kept.
+    """
+    upload = await _get_resumable_upload(upload_id)
+    try:
+        async with resumable_upload_spool.lock(upload):
+            resumable_upload_spool.remove(upload.id)
+    except UploadLockedError as e:
+        raise HTTPException(status_code=status.HTTP_423_LOCKED, detail=str(e))
+    return Response(status_code=status.HTTP_204_NO_CONTENT, headers={"Tus-Resumable": TUS_VERSION})
+
+
+@router.post("/direct-upload/sign", response_model=DirectUploadSignatureDTO)
+async def sign_direct_upload(
+    request_data: DirectUploadRequestDTO,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Get short-lived signed parameters to upload a file straight to Cloudinary
+
+    The browser posts the file together with **params** to **upload_url**,
+    then sends Cloudinary's response to /photos/direct-upload/confirm.
+    The upload never passes through this API.
+
+    - **album_id**: Album/Event ID
+    - **media_type**: "image" or "video"
+    """
+    try:
+        album_repository = create_album_repository(db)
+        use_case = CreateDirectUploadUseCase(album_repository, direct_upload_signer)
+        return await use_case.execute(request_data)
+
+    except EntityNotFoundException as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except ValidationException as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
+        )
+
+
+@router.post("/direct-upload/confirm", response_model=PhotoResponseDTO, status_code=status.HTTP_201_CREATED)
+async def confirm_direct_upload(
+    confirmation: DirectUploadConfirmDTO,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Register a file uploaded directly to Cloudinary
+
+    Send the fields of Cloudinary's upload response (public_id, version,
+    signature, resource_type, format, width, height, bytes, duration).
+    The signature is verified before the photo is saved, and the file's
+    details are read back from Cloudinary: fields that do not match them
+    are rejected. Confirming the same upload twice returns the existing photo.
+    """
+    try:
+        photo_repository = create_photo_repository(db)
+        album_repository = create_album_repository(db)
+        use_case = ConfirmDirectUploadUseCase(
+            photo_repository, album_repository, direct_upload_signer, cloudinary_service
+        )
+        photo = await use_case.execute(confirmation)
+        return PhotoResponseDTO.model_validate(photo)
+
+    except EntityNotFoundException as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except ValidationException as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
+        )
+
+
+@router.post("/notifications/cloudinary", status_code=status.HTTP_204_NO_CONTENT)
+async def cloudinary_notification(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Receive Cloudinary notifications (set CLOUDINARY_NOTIFICATION_URL to this URL)
+
+    Eager notifications store the URL of the thumbnail rendered in the
+    background; other notification types are acknowledged and ignored.
+    """
+    body = await request.body()
+    if not direct_upload_signer.verify_notification(
+        body,
+        request.headers.get("X-Cld-Timestamp"),
+        request.headers.get("X-Cld-Signature"),
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid notification signature",
+        )
+
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid notification body"
+        )
+
+    if payload.get("notification_type") != "eager":
+        return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+    eager = [derived for derived in payload.get("eager") or [] if derived.get("secure_url")]
+    if not payload.get("public_id") or not eager:
+        return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+    try:
+        photo_repository = create_photo_repository(db)
+        album_repository = create_album_repository(db)
+        use_case = CompleteThumbnailUseCase(photo_repository, album_repository)
+        await use_case.execute(payload["public_id"], eager[0]["secure_url"])
+        return Response(status_code=status.HTTP_204_NO_CONTENT)
+    except Exception as e:
+        # Cloudinary retries notifications that do not get a 2xx response
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
+        )
+
+
 @router.get("/album/{album_id}", response_model=PhotoListResponseDTO)
 async def get_photos_by_album(
     album_id: str,
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    pagination: str = Query("offset", pattern="^(offset|cursor)$"),
+    cursor: Optional[str] = None,
+    exact_count: bool = False,
+    order: str = Query("uploaded", pattern="^(uploaded|captured)$"),
+    variants: bool = False,
     db: AsyncSession = Depends(get_db),
 ):
     """
     Get all photos in an album
 
     - **album_id**: Album/Event ID
-    - **skip**: Number of photos to skip (pagination)
+    - **skip**: Number of photos to skip (offset pagination)
     - **limit**: Maximum number of photos to return
+    - **pagination**: "offset" (default) or "cursor"
+    - **cursor**: `next_cursor` from the previous page (implies cursor pagination)
+    - **exact_count**: Compute `total` with COUNT(*) instead of the album counter
+    - **order**: "uploaded" (default, newest upload first) or "captured"
+      (chronological by capture time; upload time for files without one).
+      Keep the same order when following a cursor.
+    - **variants**: Add `variants` and `srcset` (resized f_auto URLs) to images
+
+    Supports conditional requests: the ETag is derived from the album's
+    gallery version, so unchanged galleries return 304 without loading
+    any photo.
     """
     try:
-        photo_repository = PhotoRepositoryImpl(db)
-        use_case = GetPhotosUseCase(photo_repository)
-        photos, total = await use_case.execute(album_id, skip, limit)
+        # Read the validator straight from the DB (not the per-worker cache)
+        # so a stale cache entry can never produce a wrong 304
+        album = await AlbumRepositoryImpl(db).get_by_id(album_id)
+        if album:
+            etag = build_etag(
+                album_id, album.gallery_version,
+                skip, limit, pagination, cursor, exact_count, order, variants,
+            )
+            headers = cache_headers(etag, album.updated_at)
+            if is_not_modified(request, etag, album.updated_at):
+                return not_modified_response(headers)
+            response.headers.update(headers)
+
+        photo_repository = create_photo_repository(db)
+
+        # Default-shaped pages are served as pre-serialized snapshot bytes
+        page_size = settings.GALLERY_SNAPSHOT_PAGE_SIZE
+        if (
+            album
+            and settings.GALLERY_SNAPSHOT_ENABLED
+            and pagination == "offset"
+            and not cursor
+            and not exact_count
+            and order == "uploaded"
+            and not variants
+            and limit == page_size
+            and skip % page_size == 0
+        ):
+            use_case = GetGalleryPageUseCase(photo_repository, gallery_snapshot_store)
+            body = await use_case.execute(album, skip // page_size, page_size)
+            return Response(content=body, media_type="application/json", headers=headers)
+
+        if pagination == "cursor" or cursor:
+            use_case = GetPhotosByCursorUseCase(photo_repository)
+            photos, total, next_cursor = await use_case.execute(
+                album_id, cursor, limit, exact_count, order
+            )
+        else:
+            use_case = GetPhotosUseCase(photo_repository)
+            photos, total = await use_case.execute(album_id, skip, limit, exact_count, order)
+            next_cursor = None
 
         return PhotoListResponseDTO(
             total=total,
-            photos=[PhotoResponseDTO.model_validate(photo) for photo in photos],
+            photos=[
+                photo_response(photo, image_variants if variants else None)
+                for photo in photos
+            ],
+            album_id=album_id,
+            next_cursor=next_cursor,
+        )
+    except ValidationException as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
+        )
+
+
+@router.get("/album/{album_id}/near-duplicates", response_model=NearDuplicateClustersResponseDTO)
+async def get_near_duplicates(
+    album_id: str,
+    max_distance: int = Query(None, ge=0, le=10),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    List clusters of near-identical photos (burst shots, re-edited copies)
+
+    Photos are compared by the Hamming distance between their 64-bit
+    perceptual hashes; a cluster links photos within **max_distance** bits
+    of each other (default NEAR_DUPLICATE_MAX_DISTANCE). Photos without a
+    perceptual hash (videos, or images not backfilled yet) are ignored.
+
+    - **album_id**: Album ID
+    - **max_distance**: Maximum differing bits (0-10)
+    """
+    if max_distance is None:
+        max_distance = settings.NEAR_DUPLICATE_MAX_DISTANCE
+
+    try:
+        album_repository = create_album_repository(db)
+        album = await album_repository.get_by_id(album_id)
+        if not album:
+            raise EntityNotFoundException(f"Album with id {album_id} not found")
+
+        photo_repository = create_photo_repository(db)
+        use_case = GetNearDuplicatesUseCase(photo_repository, near_duplicate_indexes)
+        clusters, indexed = await use_case.execute(album_id, max_distance)
+
+        return NearDuplicateClustersResponseDTO(
             album_id=album_id,
+            max_distance=max_distance,
+            indexed=indexed,
+            total_clusters=len(clusters),
+            clusters=[
+                [PhotoResponseDTO.model_validate(photo) for photo in cluster]
+                for cluster in clusters
+            ],
         )
+
+    except EntityNotFoundException as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
+        )
+
+
+@router.post("/batch-delete", response_model=BatchDeleteResponseDTO)
+async def batch_delete_photos(
+    request: BatchDeleteRequestDTO,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Delete several photos and/or videos at once
+
+    - **photo_ids**: IDs of the photos to delete (up to MAX_PHOTOS_PER_BATCH_DELETE)
+
+    Unknown IDs are reported in `not_found`. Photos whose asset Cloudinary
+    could not delete are kept and reported in `failed`; sending the same
+    request again retries them.
+    """
+    try:
+        photo_repository = create_photo_repository(db)
+        album_repository = create_album_repository(db)
+        use_case = BatchDeletePhotosUseCase(
+            photo_repository,
+            album_repository,
+            cloudinary_service,
+            max_photos=settings.MAX_PHOTOS_PER_BATCH_DELETE,
+        )
+        return await use_case.execute(request.photo_ids)
+    except ValidationException as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
@@ -326,18 +849,20 @@ async def get_photos_by_album(
 @router.get("/{photo_id}", response_model=PhotoResponseDTO)
 async def get_photo(
     photo_id: str,
+    variants: bool = False,
     db: AsyncSession = Depends(get_db),
 ):
     """
     Get a single photo by ID
 
     - **photo_id**: Photo ID
+    - **variants**: Add `variants` and `srcset` (resized f_auto URLs) to images
     """
     try:
-        photo_repository = PhotoRepositoryImpl(db)
+        photo_repository = create_photo_repository(db)
         use_case = GetPhotoUseCase(photo_repository)
         photo = await use_case.execute(photo_id)
-        return PhotoResponseDTO.model_validate(photo)
+        return photo_response(photo, image_variants if variants else None)
     except EntityNotFoundException as e:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
     except Exception as e:
@@ -357,8 +882,8 @@ async def delete_photo(
     - **photo_id**: Photo ID
     """
     try:
-        photo_repository = PhotoRepositoryImpl(db)
-        album_repository = AlbumRepositoryImpl(db)
+        photo_repository = create_photo_repository(db)
+        album_repository = create_album_repository(db)
         use_case = DeletePhotoUseCase(
             photo_repository, album_repository, cloudinary_service
         )
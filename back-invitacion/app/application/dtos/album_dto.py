@@ -1,3 +1,4 @@
+from datetime import datetime
 from typing import Optional
 from pydantic import BaseModel
 
@@ -36,3 +37,20 @@ class AlbumResponseDTO(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class AlbumPurgeJobResponseDTO(BaseModel):
+    """DTO for the storage cleanup of a deleted album"""
+
+    id: str
+    album_id: str
+    status: str  # "queued", "processing", "completed" or "failed"
+    resource_type: Optional[str] = None  # Type being purged, None once all are done
+    deleted: int  # Assets deleted so far
+    failed: int
+    error_message: Optional[str] = None
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
@@ -10,6 +10,13 @@ class PhotoUploadDTO(BaseModel):
     uploader_name: Optional[str] = "Anonymous"
 
 
+class ImageVariantDTO(BaseModel):
+    """DTO for a resized delivery URL of an image"""
+
+    width: int
+    url: str
+
+
 class PhotoResponseDTO(BaseModel):
     """DTO for photo response"""
 
@@ -26,7 +33,11 @@ class PhotoResponseDTO(BaseModel):
     height: Optional[int] = None
     format: Optional[str] = None
     duration: Optional[int] = None
+    orientation: Optional[int] = None  # EXIF orientation of the original file
+    captured_at: Optional[datetime] = None  # When it was taken (upload time if unknown)
     created_at: datetime
+    variants: Optional[list[ImageVariantDTO]] = None  # Images only, when requested with ?variants=true
+    srcset: Optional[str] = None  # The same variants as an <img srcset> value
 
     class Config:
         from_attributes = True
@@ -38,6 +49,45 @@ class PhotoListResponseDTO(BaseModel):
     total: int
     photos: list[PhotoResponseDTO]
     album_id: str
+    next_cursor: Optional[str] = None  # Only set in cursor pagination mode
+
+
+class NearDuplicateClustersResponseDTO(BaseModel):
+    """DTO for the near-duplicate photo clusters of an album"""
+
+    album_id: str
+    max_distance: int  # Maximum Hamming distance between pHashes of a cluster
+    indexed: int  # Photos with a perceptual hash
+    total_clusters: int
+    clusters: list[list[PhotoResponseDTO]]
+
+
+class BatchDeleteRequestDTO(BaseModel):
+    """DTO for deleting several photos/videos at once"""
+
+    photo_ids: list[str]
+
+
+class BatchDeleteFailureDTO(BaseModel):
+    """DTO for a photo a batch delete could not remove"""
+
+    photo_id: str
+    error_message: str
+
+
+class BatchDeleteResponseDTO(BaseModel):
+    """DTO for batch delete response"""
+
+    requested: int
+    deleted: list[str]  # Photo IDs removed from storage and the database
+    not_found: list[str]  # Unknown photo IDs
+    failed: list[BatchDeleteFailureDTO]  # Kept because storage refused to delete them
+
+
+class UploadedPhotoResponseDTO(PhotoResponseDTO):
+    """DTO for an upload response, flagging files the album already had"""
+
+    duplicate: bool = False  # True when the existing photo was returned instead
 
 
 class BulkUploadItemResponseDTO(BaseModel):
@@ -45,6 +95,8 @@ class BulkUploadItemResponseDTO(BaseModel):
 
     original_filename: str
     success: bool
+    duplicate: bool = False  # Same content already in the album, nothing uploaded
+    bytes_saved: Optional[int] = None  # Bytes local preprocessing removed before upload
     data: Optional[PhotoResponseDTO] = None
     error_message: Optional[str] = None
 
@@ -55,5 +107,88 @@ class BulkUploadResponseDTO(BaseModel):
     total: int
     successful: int
     failed: int
+    duplicates: int = 0  # Successful files that matched an existing photo
+    bytes_saved: int = 0  # Total removed by local preprocessing
     album_id: str
     results: list[BulkUploadItemResponseDTO]
+
+
+class DirectUploadRequestDTO(BaseModel):
+    """DTO for requesting signed parameters for a browser upload"""
+
+    album_id: str
+    media_type: str = "image"  # "image" or "video"
+
+
+class DirectUploadSignatureDTO(BaseModel):
+    """DTO with the signed parameters the browser posts to Cloudinary"""
+
+    album_id: str
+    cloud_name: str
+    upload_url: str
+    params: dict
+    expires_at: datetime
+
+
+class DirectUploadConfirmDTO(BaseModel):
+    """DTO for confirming a browser upload with Cloudinary's response"""
+
+    album_id: str
+    public_id: str
+    version: int
+    signature: str  # Signature returned by Cloudinary in the upload response
+    resource_type: str = "image"
+    format: Optional[str] = None
+    width: Optional[int] = None
+    height: Optional[int] = None
+    bytes: Optional[int] = None
+    duration: Optional[float] = None
+    phash: Optional[str] = None
+    original_filename: Optional[str] = None
+    uploader_name: Optional[str] = "Anonymous"
+
+
+class UploadJobItemResponseDTO(BaseModel):
+    """DTO for the progress of one file of an upload job"""
+
+    original_filename: str
+    media_type: str
+    status: str  # "pending", "completed" or "failed"
+    duplicate: bool = False
+    bytes_saved: Optional[int] = None
+    photo_id: Optional[str] = None
+    error_message: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
+class UploadJobResponseDTO(BaseModel):
+    """DTO for upload job status"""
+
+    id: str
+    album_id: str
+    status: str  # "queued", "processing", "completed" or "failed"
+    total: int
+    processed: int
+    successful: int
+    failed: int
+    duplicates: int = 0
+    items: list[UploadJobItemResponseDTO]
+    created_at: datetime
+    finished_at: Optional[datetime] = None
+
+
+class ResumableUploadResponseDTO(BaseModel):
+    """DTO for the status of a resumable upload"""
+
+    id: str
+    album_id: str
+    filename: str
+    media_type: str
+    status: str  # "uploading" or "completed"
+    length: int  # Declared size in bytes
+    offset: int  # Bytes received so far
+    expires_at: datetime  # Deleted if no data arrives before then
+    duplicate: bool = False  # The album already had the file, nothing was uploaded
+    photo: Optional[PhotoResponseDTO] = None  # Once completed
@@ -0,0 +1,252 @@
+import asyncio
+import posixpath
+import re
+import zlib
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, List, Optional
+
+from app.application.services.zip_stream import ZipEntry, ZipLayout
+from app.domain.entities.photo import Photo
+
+# Chunks buffered per file being fetched; bounds memory to about
+# concurrency * QUEUE_CHUNKS * 64 KB per export, whatever the album size
+QUEUE_CHUNKS = 4
+
+_UNSAFE_NAME = re.compile(r'[\x00-\x1f/\\:*?"<>|]+')
+
+
+class ExportNames:
+    """
+    Unique archive paths for the photos of an export, handed out in order
+
+    The original filename is kept with the stored format's extension;
+    repeated names (several phones numbering IMG_0001.jpg) get a suffix.
+    Only the names already used are kept, so photos can be named page by page.
+    """
+
+    def __init__(self, folder: str):
+        self.folder = folder
+        self._used = set()
+
+    def name(self, photo: Photo) -> str:
+        stem, extension = posixpath.splitext(
+            _UNSAFE_NAME.sub("_", (photo.original_filename or "").replace("\\", "/").rsplit("/", 1)[-1])
+        )
+        stem = stem.strip(" .") or photo.id
+        extension = f".{photo.format}" if photo.format else extension
+        name = f"{stem}{extension}"
+        counter = 1
+        while name.lower() in self._used:
+            counter += 1
+            name = f"{stem} ({counter}){extension}"
+        self._used.add(name.lower())
+        return f"{self.folder}/{name}"
+
+
+class ChecksumCache:
+    """
+    LRU of the CRC-32 of exported files, keyed by storage public_id
+
+    A resumed download (Range request) needs the CRCs of the files it skips
+    for the central directory; with them cached those files are not fetched
+    again.
+    """
+
+    def __init__(self, max_size: int = 100_000):
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[int]:
+        crc = self._entries.get(key)
+        if crc is not None:
+            self._entries.move_to_end(key)
+        return crc
+
+    def set(self, key: str, crc: int) -> None:
+        self._entries[key] = crc
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, int]:
+        return {"size": len(self._entries), "max_size": self.max_size}
+
+
+class SizeCache(ChecksumCache):
+    """
+    LRU of file lengths checked against the CDN, keyed by delivery URL
+
+    Delivery URLs carry the asset version, so a checked length stays valid;
+    resumed downloads and repeated exports skip the HEAD requests.
+    """
+
+
+@dataclass
+class ExportItem:
+    """A file of the export and where its bytes come from"""
+
+    entry: ZipEntry
+    url: str
+    key: str
+
+
+@dataclass
+class _Part:
+    item: ExportItem
+    fetch_from: int
+    fetch_to: int
+    needs_crc: bool
+
+
+class AlbumExport:
+    """
+    Stored ZIP of an album streamed straight from the media URLs
+
+    The next files are fetched `concurrency` at a time while the current one
+    is written out, each into a small bounded queue, so slow CDN responses
+    overlap without holding more than a few chunks per file in memory.
+    Every byte position is fixed by ZipLayout, so any range of the archive
+    can be produced: files before the range are skipped, and only fetched
+    if the central directory needs a CRC that is not cached.
+    """
+
+    def __init__(
+        self,
+        items: List[ExportItem],
+        downloader,
+        checksums: ChecksumCache,
+        concurrency: int = 8,
+    ):
+        self.items = items
+        self.downloader = downloader
+        self.checksums = checksums
+        self.concurrency = max(1, concurrency)
+        for item in items:
+            item.entry.crc = checksums.get(item.key)
+        self.layout = ZipLayout([item.entry for item in items])
+
+    @property
+    def size(self) -> int:
+        return self.layout.size
+
+    async def iter_bytes(self, start: int = 0, end: Optional[int] = None) -> AsyncIterator[bytes]:
+        """Yield the archive bytes [start, end)"""
+        layout = self.layout
+        end = layout.size if end is None else min(end, layout.size)
+        directory_needed = end > layout.central_directory_offset
+
+        def clip(data: bytes, offset: int) -> bytes:
+            low = max(start - offset, 0)
+            high = min(end - offset, len(data))
+            return data[low:high] if low < high else b""
+
+        parts = []
+        background = []
+        for item in self.items:
+            entry = item.entry
+            data_start = layout.data_offset(entry)
+            data_end = data_start + entry.size
+            item_end = data_end + layout.descriptor_size(entry)
+            if item_end <= start or entry.offset >= end:
+                if directory_needed and entry.crc is None:
+                    background.append(item)
+                continue
+
+            descriptor_needed = data_end < end
+            needs_crc = entry.crc is None and (descriptor_needed or directory_needed)
+            if needs_crc:
+                # The CRC covers the whole file, even the bytes before the range
+                fetch_from, fetch_to = 0, entry.size
+            else:
+                fetch_from = min(max(start - data_start, 0), entry.size)
+                fetch_to = max(min(end - data_start, entry.size), fetch_from)
+            parts.append(_Part(item, fetch_from, fetch_to, needs_crc))
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        checksum_tasks = [
+            asyncio.create_task(self._checksum(item, semaphore)) for item in background
+        ]
+        window = deque()
+        pending = iter(parts)
+
+        def fetch_next() -> None:
+            part = next(pending, None)
+            if part is not None:
+                queue = asyncio.Queue(QUEUE_CHUNKS)
+                window.append((part, queue, asyncio.create_task(self._fetch(part, queue))))
+
+        for _ in range(self.concurrency):
+            fetch_next()
+
+        try:
+            while window:
+                part, queue, _task = window.popleft()
+                fetch_next()
+                entry = part.item.entry
+                data_start = layout.data_offset(entry)
+
+                header = clip(layout.local_header(entry), entry.offset)
+                if header:
+                    yield header
+
+                crc = 0
+                position = part.fetch_from
+                while True:
+                    chunk = await queue.get()
+                    if chunk is None:
+                        break
+                    if isinstance(chunk, Exception):
+                        raise chunk
+                    if part.needs_crc:
+                        crc = zlib.crc32(chunk, crc)
+                    piece = clip(chunk, data_start + position)
+                    position += len(chunk)
+                    if piece:
+                        yield piece
+                if position != part.fetch_to:
+                    raise Exception(
+                        f"{part.item.url} ended at byte {position}, {part.fetch_to} expected"
+                    )
+                if part.needs_crc:
+                    entry.crc = crc
+                    self.checksums.set(part.item.key, crc)
+
+                descriptor = b""
+                if data_start + entry.size < end:
+                    descriptor = clip(layout.data_descriptor(entry), data_start + entry.size)
+                if descriptor:
+                    yield descriptor
+
+            if directory_needed:
+                await asyncio.gather(*checksum_tasks)
+                yield clip(layout.central_directory(), layout.central_directory_offset)
+        finally:
+            for _part, _queue, task in window:
+                task.cancel()
+            for task in checksum_tasks:
+                task.cancel()
+
+    async def _fetch(self, part: _Part, queue: asyncio.Queue) -> None:
+        """Feed the chunks of a file into its queue, then None (or the error)"""
+        try:
+            if part.fetch_to > part.fetch_from:
+                async for chunk in self.downloader.stream(
+                    part.item.url, part.fetch_from, part.fetch_to, part.item.entry.size
+                ):
+                    await queue.put(chunk)
+            await queue.put(None)
+        except Exception as e:
+            await queue.put(e)
+
+    async def _checksum(self, item: ExportItem, semaphore: asyncio.Semaphore) -> None:
+        """Fetch a file only to learn the CRC the central directory needs"""
+        async with semaphore:
+            crc = 0
+            if item.entry.size:
+                async for chunk in self.downloader.stream(
+                    item.url, 0, item.entry.size, item.entry.size
+                ):
+                    crc = zlib.crc32(chunk, crc)
+            item.entry.crc = crc
+            self.checksums.set(item.key, crc)
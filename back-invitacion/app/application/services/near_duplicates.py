@@ -0,0 +1,183 @@
+from typing import Dict, List, Optional, Tuple
+
+
+def parse_hash(perceptual_hash: str) -> int:
+    """64-bit integer of a hex perceptual hash"""
+    return int(perceptual_hash, 16)
+
+
+def hamming(a: int, b: int) -> int:
+    """Number of differing bits between two hashes"""
+    return (a ^ b).bit_count()
+
+
+def _blocks(max_distance: int, bits: int = 64) -> List[Tuple[int, int]]:
+    """(shift, mask) of max_distance + 1 contiguous bit blocks covering the hash"""
+    count = max_distance + 1
+    blocks = []
+    start = 0
+    for i in range(count):
+        width = bits // count + (1 if i < bits % count else 0)
+        blocks.append((start, (1 << width) - 1))
+        start += width
+    return blocks
+
+
+def near_pairs(values: List[int], max_distance: int) -> List[Tuple[int, int]]:
+    """
+    Index pairs (i, j) of values within max_distance bits of each other
+
+    Pigeonhole join: split the hash into max_distance + 1 blocks; two hashes
+    differing in at most max_distance bits agree exactly on at least one
+    block, so only hashes sharing a block value are compared.
+    """
+    pairs = set()
+    for shift, mask in _blocks(max_distance):
+        buckets: Dict[int, List[int]] = {}
+        for i, value in enumerate(values):
+            buckets.setdefault((value >> shift) & mask, []).append(i)
+
+        for members in buckets.values():
+            for position, i in enumerate(members):
+                for j in members[position + 1 :]:
+                    if (i, j) not in pairs and hamming(values[i], values[j]) <= max_distance:
+                        pairs.add((i, j))
+    return list(pairs)
+
+
+class BKTree:
+    """
+    Burkhard-Keller tree over perceptual hashes
+
+    Children are keyed by their Hamming distance to the parent. By the
+    triangle inequality a search within max_distance only has to descend
+    into children whose key is within max_distance of the query's distance
+    to the node, which skips most of the tree for small radii.
+    """
+
+    def __init__(self):
+        # Node: [hash, keys with that exact hash, {distance: child node}]
+        self._root: Optional[list] = None
+        self.size = 0
+
+    def add(self, value: int, key: str) -> None:
+        self.size += 1
+        if self._root is None:
+            self._root = [value, [key], {}]
+            return
+
+        node = self._root
+        while True:
+            distance = hamming(value, node[0])
+            if distance == 0:
+                node[1].append(key)
+                return
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = [value, [key], {}]
+                return
+            node = child
+
+    def search(self, value: int, max_distance: int) -> List[Tuple[int, str]]:
+        """(distance, key) of every entry within max_distance of value"""
+        if self._root is None:
+            return []
+
+        found = []
+        stack = [self._root]
+        while stack:
+            node_value, keys, children = stack.pop()
+            distance = hamming(value, node_value)
+            if distance <= max_distance:
+                found.extend((distance, key) for key in keys)
+
+            low, high = distance - max_distance, distance + max_distance
+            for child_distance, child in children.items():
+                if low <= child_distance <= high:
+                    stack.append(child)
+        return found
+
+
+class NearDuplicateIndex:
+    """
+    Near-duplicate clusters of one album, maintained incrementally
+
+    The first build links all near pairs at once with a pigeonhole join
+    (a BK-tree search per photo degrades towards a full scan at this radius
+    on 64-bit hashes). Photos added later are searched in the BK-tree once
+    and linked (union-find) with their neighbours, so clusters stay up to
+    date and reading them never rescans the album.
+    """
+
+    def __init__(self, max_distance: int):
+        self.max_distance = max_distance
+        self.tree = BKTree()
+        self.hashes: Dict[str, str] = {}  # photo_id -> perceptual hash
+        self._parent: Dict[str, str] = {}
+
+    def _find(self, key: str) -> str:
+        root = key
+        while self._parent[root] != root:
+            root = self._parent[root]
+        # Path compression
+        while self._parent[key] != root:
+            self._parent[key], key = root, self._parent[key]
+        return root
+
+    def _union(self, a: str, b: str) -> None:
+        root_a, root_b = self._find(a), self._find(b)
+        if root_a != root_b:
+            self._parent[root_b] = root_a
+
+    @classmethod
+    def build(cls, max_distance: int, entries: List[Tuple[str, str]]) -> "NearDuplicateIndex":
+        """Index of a whole album from (photo_id, perceptual_hash) entries"""
+        index = cls(max_distance)
+        entries = list(dict(entries).items())  # One entry per photo
+        values = [parse_hash(perceptual_hash) for _, perceptual_hash in entries]
+
+        for (photo_id, perceptual_hash), value in zip(entries, values):
+            index._parent[photo_id] = photo_id
+            index.tree.add(value, photo_id)
+            index.hashes[photo_id] = perceptual_hash
+
+        for i, j in near_pairs(values, max_distance):
+            index._union(entries[i][0], entries[j][0])
+        return index
+
+    def add(self, photo_id: str, perceptual_hash: str) -> None:
+        if photo_id in self.hashes:
+            return
+
+        value = parse_hash(perceptual_hash)
+        self._parent[photo_id] = photo_id
+        for _, neighbour in self.tree.search(value, self.max_distance):
+            self._union(photo_id, neighbour)
+
+        self.tree.add(value, photo_id)
+        self.hashes[photo_id] = perceptual_hash
+
+    def sync(self, entries: List[Tuple[str, str]]) -> bool:
+        """
+        Add the photos the index does not have yet
+
+        Returns False when photos were removed from the album; clusters
+        cannot be split, so the caller must build a new index instead.
+        """
+        current = {photo_id for photo_id, _ in entries}
+        if any(photo_id not in current for photo_id in self.hashes):
+            return False
+
+        for photo_id, perceptual_hash in entries:
+            self.add(photo_id, perceptual_hash)
+        return True
+
+    def clusters(self) -> List[List[str]]:
+        """Groups of two or more near-identical photos, largest first"""
+        groups: Dict[str, List[str]] = {}
+        for photo_id in self.hashes:
+            groups.setdefault(self._find(photo_id), []).append(photo_id)
+
+        clusters = [group for group in groups.values() if len(group) > 1]
+        clusters.sort(key=len, reverse=True)
+        return clusters
@@ -0,0 +1,71 @@
+from typing import Any, Dict
+
+
+class UploadAdmission:
+    """
+    Per-worker budget of upload requests being received or processed
+
+    An upload is admitted only while both the number of uploads in flight
+    and the sum of their declared body sizes stay within budget; otherwise
+    it should be turned away before its body is read, so a crowd uploading
+    at once gets told to retry instead of exhausting the worker's memory,
+    disk spool and Cloudinary connections. A limit of 0 disables it.
+
+    Single event loop, so no locking: acquire() and release() never await.
+    """
+
+    def __init__(self, max_uploads: int = 0, max_bytes: int = 0):
+        self.max_uploads = max_uploads
+        self.max_bytes = max_bytes
+        self.uploads = 0
+        self.bytes = 0
+        self.peak_uploads = 0
+        self.peak_bytes = 0
+        self.admitted = 0
+        self.rejected_uploads = 0  # Turned away because of max_uploads
+        self.rejected_bytes = 0  # Turned away because of max_bytes
+        self.too_large = 0  # Refused outright for exceeding the request size limit
+
+    def acquire(self, size: int) -> bool:
+        """
+        Reserve room for an upload of `size` bytes
+
+        An upload larger than the whole byte budget is still admitted when
+        nothing else is in flight, so it is never refused forever.
+
+        Returns:
+            False if the worker is over budget; nothing is reserved then
+        """
+        if self.max_uploads and self.uploads >= self.max_uploads:
+            self.rejected_uploads += 1
+            return False
+        if self.max_bytes and self.uploads and self.bytes + size > self.max_bytes:
+            self.rejected_bytes += 1
+            return False
+
+        self.uploads += 1
+        self.bytes += size
+        self.admitted += 1
+        self.peak_uploads = max(self.peak_uploads, self.uploads)
+        self.peak_bytes = max(self.peak_bytes, self.bytes)
+        return True
+
+    def release(self, size: int) -> None:
+        """Give back what acquire() reserved once the upload has been handled"""
+        self.uploads -= 1
+        self.bytes -= size
+
+    def stats(self) -> Dict[str, Any]:
+        """Current load and counters for monitoring"""
+        return {
+            "uploads": self.uploads,
+            "max_uploads": self.max_uploads,
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "peak_uploads": self.peak_uploads,
+            "peak_bytes": self.peak_bytes,
+            "admitted": self.admitted,
+            "rejected_uploads": self.rejected_uploads,
+            "rejected_bytes": self.rejected_bytes,
+            "too_large": self.too_large,
+        }
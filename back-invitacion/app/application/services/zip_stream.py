@@ -0,0 +1,183 @@
+import struct
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional
+
+# Entries are stored (no compression): photos and videos are already compressed
+METHOD_STORED = 0
+# Bit 3: CRC in a data descriptor after the data. Bit 11: UTF-8 names
+FLAGS = 0x0808
+VERSION = 20
+VERSION_ZIP64 = 45
+# Made by Unix, so external attributes carry permissions
+VERSION_MADE_BY = (3 << 8) | VERSION_ZIP64
+FILE_ATTRIBUTES = 0o100644 << 16
+
+MAX_32 = 0xFFFFFFFF
+MAX_16 = 0xFFFF
+
+
+def dos_datetime(value: Optional[datetime]) -> tuple:
+    """(time, date) in MS-DOS format; the format cannot go below 1980"""
+    if value is None or value.year < 1980:
+        return 0, (1 << 5) | 1
+    return (
+        (value.hour << 11) | (value.minute << 5) | (value.second // 2),
+        ((value.year - 1980) << 9) | (value.month << 5) | value.day,
+    )
+
+
+@dataclass
+class ZipEntry:
+    """A stored file of a ZIP archive whose size is known before its data is read"""
+
+    name: str
+    size: int
+    modified: Optional[datetime] = None
+    crc: Optional[int] = None
+    offset: int = 0  # Of the local header, assigned by ZipLayout
+
+    @property
+    def zip64(self) -> bool:
+        return self.size >= MAX_32
+
+
+class ZipLayout:
+    """
+    Byte layout of a stored ZIP archive built before any data is read
+
+    With every size known up front, the offset of each local header, the
+    central directory and the total length are fixed, so the archive can be
+    streamed from any byte position (HTTP Range). Only the CRCs are learned
+    while streaming; they go in the data descriptors and the central
+    directory, both fixed-width. ZIP64 records are used for files or
+    archives over 4 GB and for more than 65535 entries.
+    """
+
+    def __init__(self, entries: List[ZipEntry]):
+        self.entries = entries
+        offset = 0
+        for entry in entries:
+            entry.offset = offset
+            offset += len(self.local_header(entry)) + entry.size + self.descriptor_size(entry)
+        self.central_directory_offset = offset
+        self.size = offset + len(self._central_directory(placeholder=True))
+
+    def local_header(self, entry: ZipEntry) -> bytes:
+        name = entry.name.encode()
+        mtime, mdate = dos_datetime(entry.modified)
+        extra = b""
+        size = entry.size
+        if entry.zip64:
+            extra = struct.pack("<HHQQ", 0x0001, 16, entry.size, entry.size)
+            size = MAX_32
+        return (
+            struct.pack(
+                "<IHHHHHIIIHH",
+                0x04034B50,
+                VERSION_ZIP64 if entry.zip64 else VERSION,
+                FLAGS,
+                METHOD_STORED,
+                mtime,
+                mdate,
+                0,  # CRC follows the data
+                size,
+                size,
+                len(name),
+                len(extra),
+            )
+            + name
+            + extra
+        )
+
+    def data_offset(self, entry: ZipEntry) -> int:
+        return entry.offset + len(self.local_header(entry))
+
+    def descriptor_size(self, entry: ZipEntry) -> int:
+        return 24 if entry.zip64 else 16
+
+    def data_descriptor(self, entry: ZipEntry) -> bytes:
+        if entry.zip64:
+            return struct.pack("<IIQQ", 0x08074B50, entry.crc, entry.size, entry.size)
+        return struct.pack("<IIII", 0x08074B50, entry.crc, entry.size, entry.size)
+
+    def central_directory(self) -> bytes:
+        """Central directory and end records; every entry's CRC must be known"""
+        return self._central_directory(placeholder=False)
+
+    def _central_directory(self, placeholder: bool) -> bytes:
+        records = []
+        for entry in self.entries:
+            name = entry.name.encode()
+            mtime, mdate = dos_datetime(entry.modified)
+            zip64_fields = []
+            size = entry.size
+            if entry.zip64:
+                zip64_fields += [entry.size, entry.size]
+                size = MAX_32
+            offset = entry.offset
+            if offset >= MAX_32:
+                zip64_fields.append(offset)
+                offset = MAX_32
+            extra = b""
+            if zip64_fields:
+                extra = struct.pack(
+                    f"<HH{len(zip64_fields)}Q", 0x0001, 8 * len(zip64_fields), *zip64_fields
+                )
+            records.append(
+                struct.pack(
+                    "<IHHHHHHIIIHHHHHII",
+                    0x02014B50,
+                    VERSION_MADE_BY,
+                    VERSION_ZIP64 if zip64_fields else VERSION,
+                    FLAGS,
+                    METHOD_STORED,
+                    mtime,
+                    mdate,
+                    0 if placeholder else entry.crc,
+                    size,
+                    size,
+                    len(name),
+                    len(extra),
+                    0,
+                    0,
+                    0,
+                    FILE_ATTRIBUTES,
+                    offset,
+                )
+                + name
+                + extra
+            )
+
+        directory = b"".join(records)
+        count = len(self.entries)
+        start = self.central_directory_offset
+        end = b""
+        if count >= MAX_16 or start >= MAX_32 or len(directory) >= MAX_32:
+            zip64_end_offset = start + len(directory)
+            end += struct.pack(
+                "<IQHHIIQQQQ",
+                0x06064B50,
+                44,
+                VERSION_MADE_BY,
+                VERSION_ZIP64,
+                0,
+                0,
+                count,
+                count,
+                len(directory),
+                start,
+            )
+            end += struct.pack("<IIQI", 0x07064B50, 0, zip64_end_offset, 1)
+        end += struct.pack(
+            "<IHHHHIIH",
+            0x06054B50,
+            0,
+            0,
+            min(count, MAX_16),
+            min(count, MAX_16),
+            min(len(directory), MAX_32),
+            min(start, MAX_32),
+            0,
+        )
+        return directory + end
@@ -0,0 +1,104 @@
+import asyncio
+import logging
+from typing import Optional, Tuple
+from app.domain.entities.album import Album
+from app.domain.repositories.album_repository import AlbumRepository
+from app.domain.repositories.photo_repository import PhotoRepository
+from app.domain.exceptions.base import EntityNotFoundException
+from app.application.services.album_export import (
+    AlbumExport,
+    ChecksumCache,
+    ExportItem,
+    ExportNames,
+    SizeCache,
+)
+from app.application.services.zip_stream import ZipEntry
+
+logger = logging.getLogger(__name__)
+
+# Photos loaded per keyset query while building the export
+EXPORT_PAGE_SIZE = 1000
+
+
+class ExportAlbumUseCase:
+    """Use case for building the ZIP export of every photo and video of an album"""
+
+    def __init__(
+        self,
+        album_repository: AlbumRepository,
+        photo_repository: PhotoRepository,
+        downloader,
+        checksums: ChecksumCache,
+        concurrency: int = 8,
+        sizes: Optional[SizeCache] = None,
+    ):
+        self.album_repository = album_repository
+        self.photo_repository = photo_repository
+        self.downloader = downloader
+        self.checksums = checksums
+        self.concurrency = concurrency
+        self.sizes = sizes if sizes is not None else SizeCache()
+
+    async def execute(self, album_id: str) -> Tuple[Album, AlbumExport]:
+        album = await self.album_repository.get_by_id(album_id)
+        if not album:
+            raise EntityNotFoundException(f"Album with ID {album_id} not found")
+
+        # Capture order, so the archive lists the event chronologically. Each
+        # page is reduced to its archive entries (name, size, time, URL, key)
+        # before the next one is loaded; the layout itself needs every entry.
+        names = ExportNames(album.event_code)
+        items = []
+        after = None
+        while True:
+            page = await self.photo_repository.get_by_album_id_after(
+                album_id, after, EXPORT_PAGE_SIZE, "captured"
+            )
+            items.extend(
+                ExportItem(
+                    entry=ZipEntry(
+                        name=names.name(photo), size=photo.file_size, modified=photo.captured_at
+                    ),
+                    url=photo.url,
+                    key=photo.public_id,
+                )
+                for photo in page
+            )
+            if len(page) < EXPORT_PAGE_SIZE:
+                break
+            after = (page[-1].captured_at, page[-1].id)
+
+        await self._check_sizes(items)
+        return album, AlbumExport(items, self.downloader, self.checksums, self.concurrency)
+
+    async def _check_sizes(self, items) -> None:
+        """
+        Set every entry's size to the CDN's Content-Length (HEAD)
+
+        The archive's layout and length are fixed before the first byte is
+        sent, so a stored size that is wrong would only show up as a file
+        ending early or late halfway through the download. Checked lengths
+        are cached; the stored size is only used when the HEAD fails.
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def check(item: ExportItem) -> None:
+            size = self.sizes.get(item.url)
+            if size is None:
+                try:
+                    async with semaphore:
+                        size = await self.downloader.size(item.url)
+                except Exception:
+                    if item.entry.size is None:
+                        raise
+                    logger.warning("Could not check the size of %s", item.url, exc_info=True)
+                    return
+                self.sizes.set(item.url, size)
+            if item.entry.size is not None and item.entry.size != size:
+                logger.warning(
+                    "%s is %s bytes, %s stored; exporting the delivered file",
+                    item.key, size, item.entry.size,
+                )
+            item.entry.size = size
+
+        await asyncio.gather(*[check(item) for item in items])
@@ -1,6 +1,8 @@
 from typing import List
 from app.domain.entities.album import Album
+from app.domain.entities.album_purge_job import AlbumPurgeJob
 from app.domain.repositories.album_repository import AlbumRepository
+from app.domain.repositories.album_purge_job_repository import AlbumPurgeJobRepository
 from app.domain.exceptions.base import EntityNotFoundException, EntityAlreadyExistsException
 from app.application.dtos.album_dto import AlbumCreateDTO, AlbumUpdateDTO
 
@@ -95,11 +97,37 @@ class UpdateAlbumUseCase:
 class DeleteAlbumUseCase:
     """Use case for deleting an album"""
 
-    def __init__(self, album_repository: AlbumRepository):
+    def __init__(
+        self,
+        album_repository: AlbumRepository,
+        album_purge_job_repository: AlbumPurgeJobRepository,
+    ):
         self.album_repository = album_repository
+        self.album_purge_job_repository = album_purge_job_repository
+
+    async def execute(self, album_id: str) -> AlbumPurgeJob:
+        """
+        Delete the album (its photos go with it) and queue the removal of its assets
 
-    async def execute(self, album_id: str) -> bool:
+        Both happen in the caller's transaction, so an album is never
+        deleted without its purge job.
+        """
         result = await self.album_repository.delete(album_id)
         if not result:
             raise EntityNotFoundException(f"Album with id {album_id} not found")
-        return result
+
+        job = AlbumPurgeJob(album_id=album_id, folder=f"albums/{album_id}")
+        return await self.album_purge_job_repository.create(job)
+
+
+class GetAlbumPurgeJobUseCase:
+    """Use case for getting the progress of an album purge job"""
+
+    def __init__(self, album_purge_job_repository: AlbumPurgeJobRepository):
+        self.album_purge_job_repository = album_purge_job_repository
+
+    async def execute(self, job_id: str) -> AlbumPurgeJob:
+        job = await self.album_purge_job_repository.get_by_id(job_id)
+        if not job:
+            raise EntityNotFoundException(f"Album purge job with id {job_id} not found")
+        return job
@@ -1,9 +1,57 @@
-from typing import BinaryIO, List, Tuple, Dict, Any
+import asyncio
+from typing import BinaryIO, Callable, List, Tuple, Dict, Any, Optional
 from app.domain.entities.photo import Photo
+from app.domain.entities.album import Album
 from app.domain.repositories.photo_repository import PhotoRepository
 from app.domain.repositories.album_repository import AlbumRepository
 from app.domain.exceptions.base import EntityNotFoundException, ValidationException
-from app.application.dtos.photo_dto import PhotoUploadDTO, BulkUploadItemResponseDTO
+from app.application.dtos.photo_dto import (
+    PhotoUploadDTO,
+    ImageVariantDTO,
+    PhotoResponseDTO,
+    PhotoListResponseDTO,
+    BulkUploadItemResponseDTO,
+    BatchDeleteFailureDTO,
+    BatchDeleteResponseDTO,
+    DirectUploadRequestDTO,
+    DirectUploadSignatureDTO,
+    DirectUploadConfirmDTO,
+)
+from app.application.services.pagination import encode_cursor, decode_cursor
+
+
+def photo_from_upload(
+    cloudinary_response: Dict[str, Any],
+    album_id: str,
+    media_type: str,
+    filename: str,
+    uploader_name: Optional[str],
+    content_hash: Optional[str] = None,
+) -> Photo:
+    """Build the Photo entity for a file stored in Cloudinary"""
+    # Convert duration from float to int (round seconds)
+    duration = cloudinary_response.get("duration")
+    if duration is not None:
+        duration = int(round(duration))
+
+    return Photo(
+        url=cloudinary_response["url"],
+        public_id=cloudinary_response["public_id"],
+        album_id=album_id,
+        media_type=media_type,
+        thumbnail_url=cloudinary_response.get("thumbnail_url"),
+        original_filename=filename,
+        uploader_name=uploader_name,
+        file_size=cloudinary_response.get("bytes"),
+        width=cloudinary_response.get("width"),
+        height=cloudinary_response.get("height"),
+        format=cloudinary_response.get("format"),
+        duration=duration,
+        orientation=cloudinary_response.get("orientation"),
+        captured_at=cloudinary_response.get("captured_at"),
+        content_hash=content_hash,
+        perceptual_hash=cloudinary_response.get("phash"),
+    )
 
 
 class UploadPhotoUseCase:
@@ -20,8 +68,20 @@ class UploadPhotoUseCase:
         self.cloudinary_service = cloudinary_service
 
     async def execute(
-        self, file: BinaryIO, filename: str, upload_data: PhotoUploadDTO
-    ) -> Photo:
+        self,
+        file: BinaryIO,
+        filename: str,
+        upload_data: PhotoUploadDTO,
+        content_hash: Optional[str] = None,
+        media_type: str = "image",
+    ) -> Tuple[Photo, bool]:
+        """
+        Upload an image (or a video) unless the album already has the same file
+
+        Returns:
+            Tuple (photo, duplicate); duplicate is True when the existing
+            photo with the same content_hash was returned instead
+        """
         # Verify album exists and is active
         album = await self.album_repository.get_by_id(upload_data.album_id)
         if not album:
@@ -30,27 +90,34 @@ class UploadPhotoUseCase:
         if not album.is_active:
             raise ValidationException("This album is no longer accepting photos")
 
+        # Skip the Cloudinary upload for a file the album already has
+        if content_hash:
+            existing = await self.photo_repository.get_by_content_hashes(
+                upload_data.album_id, [content_hash]
+            )
+            if existing:
+                return existing[0], True
+
         # Upload to Cloudinary
-        cloudinary_response = await self.cloudinary_service.upload_image(
+        upload = (
+            self.cloudinary_service.upload_video
+            if media_type == "video"
+            else self.cloudinary_service.upload_image
+        )
+        cloudinary_response = await upload(
             file=file,
             filename=filename,
             folder=f"albums/{upload_data.album_id}",
         )
 
         # Create photo entity
-        photo = Photo(
-            url=cloudinary_response["url"],
-            public_id=cloudinary_response["public_id"],
-            album_id=upload_data.album_id,
-            media_type="image",  # Single upload is for images only
-            thumbnail_url=cloudinary_response.get("thumbnail_url"),
-            original_filename=filename,
-            uploader_name=upload_data.uploader_name,
-            file_size=cloudinary_response.get("bytes"),
-            width=cloudinary_response.get("width"),
-            height=cloudinary_response.get("height"),
-            format=cloudinary_response.get("format"),
-            duration=None,  # Images don't have duration
+        photo = photo_from_upload(
+            cloudinary_response,
+            upload_data.album_id,
+            media_type,
+            filename,
+            upload_data.uploader_name,
+            content_hash,
         )
 
         # Save to repository
@@ -59,7 +126,7 @@ class UploadPhotoUseCase:
         # Increment album photo count
         await self.album_repository.increment_photo_count(upload_data.album_id)
 
-        return saved_photo
+        return saved_photo, False
 
 
 class GetPhotosUseCase:
@@ -69,13 +136,159 @@ class GetPhotosUseCase:
         self.photo_repository = photo_repository
 
     async def execute(
-        self, album_id: str, skip: int = 0, limit: int = 100
+        self,
+        album_id: str,
+        skip: int = 0,
+        limit: int = 100,
+        exact_count: bool = False,
+        order: str = "uploaded",
     ) -> tuple[List[Photo], int]:
-        photos = await self.photo_repository.get_by_album_id(album_id, skip, limit)
+        if not exact_count:
+            # Total comes from albums.photo_count in the same query
+            return await self.photo_repository.get_page_with_total(
+                album_id, skip, limit, order=order
+            )
+
+        photos = await self.photo_repository.get_by_album_id(album_id, skip, limit, order)
         total = await self.photo_repository.count_by_album_id(album_id)
         return photos, total
 
 
+class GetPhotosByCursorUseCase:
+    """Use case for getting photos from an album with keyset (cursor) pagination"""
+
+    def __init__(self, photo_repository: PhotoRepository):
+        self.photo_repository = photo_repository
+
+    async def execute(
+        self,
+        album_id: str,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        exact_count: bool = False,
+        order: str = "uploaded",
+    ) -> tuple[List[Photo], int, Optional[str]]:
+        after = decode_cursor(cursor) if cursor else None
+        limit = max(1, limit)
+
+        # Fetch one extra row to know whether another page exists
+        if exact_count:
+            photos = await self.photo_repository.get_by_album_id_after(
+                album_id, after, limit + 1, order
+            )
+            total = await self.photo_repository.count_by_album_id(album_id)
+        else:
+            photos, total = await self.photo_repository.get_page_with_total(
+                album_id, limit=limit + 1, after=after, order=order
+            )
+
+        next_cursor = None
+        if len(photos) > limit:
+            photos = photos[:limit]
+            last = photos[-1]
+            position = last.captured_at if order == "captured" else last.created_at
+            next_cursor = encode_cursor(position, last.id)
+
+        return photos, total, next_cursor
+
+
+def photo_response(photo: Photo, image_variants=None) -> PhotoResponseDTO:
+    """Build the response of a photo, with its srcset variants when a URL builder is given"""
+    response = PhotoResponseDTO.model_validate(photo)
+    if image_variants is not None and photo.media_type == "image":
+        variants = image_variants.get(photo.public_id, photo.format, photo.width)
+        response.variants = [
+            ImageVariantDTO(width=width, url=url) for width, url in variants.urls
+        ]
+        response.srcset = variants.srcset
+    return response
+
+
+def serialize_gallery_page(album_id: str, photos: List[Photo], total: int) -> bytes:
+    """Serialize a gallery page exactly as GET /photos/album/{album_id} returns it"""
+    return PhotoListResponseDTO(
+        total=total,
+        photos=[PhotoResponseDTO.model_validate(photo) for photo in photos],
+        album_id=album_id,
+    ).model_dump_json().encode()
+
+
+class GetGalleryPageUseCase:
+    """Use case for serving a pre-serialized gallery page from the snapshot store"""
+
+    def __init__(self, photo_repository: PhotoRepository, snapshot_store):
+        self.photo_repository = photo_repository
+        self.snapshot_store = snapshot_store
+
+    async def execute(self, album: Album, page: int, page_size: int) -> bytes:
+        version = self.snapshot_store.version_of(album)
+        body = self.snapshot_store.get_page(album.id, version, page)
+        if body is not None:
+            return body
+
+        # Only the requested page is rebuilt; other pages are rebuilt when asked for
+        photos, total = await self.photo_repository.get_page_with_total(
+            album.id, page * page_size, page_size
+        )
+        body = serialize_gallery_page(album.id, photos, total)
+        self.snapshot_store.put_page(album.id, version, page, body)
+        return body
+
+
+class FreezeGalleryUseCase:
+    """Use case for writing every gallery page of a closed album as static files"""
+
+    def __init__(self, photo_repository: PhotoRepository, snapshot_store):
+        self.photo_repository = photo_repository
+        self.snapshot_store = snapshot_store
+
+    async def execute(self, album: Album, page_size: int) -> Optional[str]:
+        pages = []
+        after = None
+        while True:
+            photos = await self.photo_repository.get_by_album_id_after(
+                album.id, after, page_size
+            )
+            if photos or not pages:
+                pages.append(serialize_gallery_page(album.id, photos, album.photo_count))
+            if len(photos) < page_size:
+                break
+            after = (photos[-1].created_at, photos[-1].id)
+
+        return self.snapshot_store.freeze(album.id, pages)
+
+
+class GetNearDuplicatesUseCase:
+    """Use case for listing clusters of near-identical photos in an album"""
+
+    def __init__(self, photo_repository: PhotoRepository, index_cache):
+        self.photo_repository = photo_repository
+        self.index_cache = index_cache
+
+    async def execute(self, album_id: str, max_distance: int) -> Tuple[List[List[Photo]], int]:
+        """
+        Returns:
+            Tuple (clusters of photos, largest first; photos with a perceptual hash)
+        """
+        entries = await self.photo_repository.get_perceptual_hashes(album_id)
+        index = self.index_cache.get_index(album_id, max_distance, entries)
+        clusters = index.clusters()
+
+        photos = {
+            photo.id: photo
+            for photo in await self.photo_repository.get_by_ids(
+                [photo_id for cluster in clusters for photo_id in cluster]
+            )
+        }
+        return [
+            sorted(
+                (photos[photo_id] for photo_id in cluster if photo_id in photos),
+                key=lambda photo: photo.created_at,
+            )
+            for cluster in clusters
+        ], len(entries)
+
+
 class GetPhotoUseCase:
     """Use case for getting a single photo by ID"""
 
@@ -108,8 +321,8 @@ class DeletePhotoUseCase:
         if not photo:
             raise EntityNotFoundException(f"Photo with id {photo_id} not found")
 
-        # Delete from Cloudinary
-        await self.cloudinary_service.delete_image(photo.public_id)
+        # Delete from Cloudinary (media_type is also the Cloudinary resource type)
+        await self.cloudinary_service.delete_image(photo.public_id, photo.media_type)
 
         # Delete from repository
         result = await self.photo_repository.delete(photo_id)
@@ -121,22 +334,138 @@ class DeletePhotoUseCase:
         return result
 
 
-class BulkUploadMediaUseCase:
-    """Use case for bulk uploading multiple photos/videos to Cloudinary"""
+class BatchDeletePhotosUseCase:
+    """Use case for deleting many photos/videos at once"""
 
     def __init__(
         self,
         photo_repository: PhotoRepository,
         album_repository: AlbumRepository,
         cloudinary_service,
+        max_photos: int = 500,
     ):
         self.photo_repository = photo_repository
         self.album_repository = album_repository
         self.cloudinary_service = cloudinary_service
+        self.max_photos = max_photos
+
+    async def execute(self, photo_ids: List[str]) -> BatchDeleteResponseDTO:
+        """
+        Delete photos from Cloudinary and the database
+
+        Photos are resolved in one query and their assets deleted per
+        resource type, 100 public IDs per Cloudinary call. Rows are then
+        removed with one DELETE and one counter update per album. A photo
+        whose asset Cloudinary could not delete is kept and reported as
+        failed, so it can be retried.
+        """
+        photo_ids = list(dict.fromkeys(photo_ids))
+        if len(photo_ids) > self.max_photos:
+            raise ValidationException(
+                f"Maximum {self.max_photos} photos can be deleted per request"
+            )
+
+        photos = await self.photo_repository.get_by_ids(photo_ids)
+        found = {photo.id for photo in photos}
+
+        # media_type ("image" / "video") is also the Cloudinary resource type
+        by_resource_type: Dict[str, List[Photo]] = {}
+        for photo in photos:
+            by_resource_type.setdefault(photo.media_type, []).append(photo)
+
+        statuses: Dict[str, str] = {}
+        for resource_type, group in by_resource_type.items():
+            statuses.update(
+                await self.cloudinary_service.delete_resources(
+                    [photo.public_id for photo in group], resource_type
+                )
+            )
+
+        # "not_found" means the asset is already gone; the row can go too
+        removed_by_album: Dict[str, List[str]] = {}
+        failed = []
+        for photo in photos:
+            outcome = statuses.get(photo.public_id, "error: no response from storage")
+            if outcome in ("deleted", "not_found"):
+                removed_by_album.setdefault(photo.album_id, []).append(photo.id)
+            else:
+                failed.append(BatchDeleteFailureDTO(photo_id=photo.id, error_message=outcome))
+
+        deleted = []
+        for album_id, ids in removed_by_album.items():
+            count = await self.photo_repository.delete_by_ids(album_id, ids)
+            if count:
+                await self.album_repository.adjust_photo_count(album_id, -count)
+            deleted.extend(ids)
+
+        return BatchDeleteResponseDTO(
+            requested=len(photo_ids),
+            deleted=deleted,
+            not_found=[photo_id for photo_id in photo_ids if photo_id not in found],
+            failed=failed,
+        )
+
+
+class CompleteThumbnailUseCase:
+    """Use case for storing a thumbnail rendered in the background by Cloudinary"""
+
+    def __init__(self, photo_repository: PhotoRepository, album_repository: AlbumRepository):
+        self.photo_repository = photo_repository
+        self.album_repository = album_repository
+
+    async def execute(self, public_id: str, thumbnail_url: str) -> Optional[Photo]:
+        """
+        Replace the computed fallback thumbnail URL with Cloudinary's
+
+        Returns None when the photo is unknown (e.g. deleted meanwhile).
+        """
+        photo = await self.photo_repository.get_by_public_id(public_id)
+        if not photo:
+            return None
+
+        if photo.thumbnail_url == thumbnail_url:
+            return photo
+
+        updated = await self.photo_repository.update(
+            photo.id, photo.model_copy(update={"thumbnail_url": thumbnail_url})
+        )
+
+        # Bump the album version so every worker drops its cached gallery pages
+        await self.album_repository.touch(photo.album_id)
+
+        return updated
+
+
+class BulkUploadMediaUseCase:
+    """
+    Use case for bulk uploading multiple photos/videos to Cloudinary
+
+    Pipeline: files are uploaded to storage concurrently (at most
+    `concurrency` at once) while a single writer task saves the finished
+    ones. The writer takes every upload completed since its last write and
+    stores them in one short-lived transaction (a multi-row INSERT plus one
+    album counter UPDATE), so no DB session is held during uploads and the
+    request takes about as long as its slowest file.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable,
+        photo_repository_factory: Callable,
+        album_repository_factory: Callable,
+        cloudinary_service,
+        concurrency: int = 10,
+    ):
+        self.session_factory = session_factory
+        self.photo_repository_factory = photo_repository_factory
+        self.album_repository_factory = album_repository_factory
+        self.cloudinary_service = cloudinary_service
+        self.concurrency = max(1, concurrency)
 
     async def execute(
         self,
         files_data: List[Tuple[BinaryIO, str, str]],  # (file, filename, media_type)
+        content_hashes: List[str],
         upload_data: PhotoUploadDTO,
     ) -> List[BulkUploadItemResponseDTO]:
         """
@@ -144,141 +473,272 @@ class BulkUploadMediaUseCase:
 
         Args:
             files_data: List of tuples (file, filename, media_type)
+            content_hashes: SHA-256 of each file, to skip files the album has
             upload_data: Upload metadata (album_id, uploader_name)
 
         Returns:
-            List of BulkUploadItemResponseDTO with results for each file
+            List of BulkUploadItemResponseDTO with results for each file, in order
         """
-        # Verify album exists and is active (only once)
-        album = await self.album_repository.get_by_id(upload_data.album_id)
+        album_id = upload_data.album_id
+
+        # Validate the album and find files it already has (short-lived session)
+        async with self.session_factory() as session:
+            album = await self.album_repository_factory(session).get_by_id(album_id)
+            if not album:
+                raise EntityNotFoundException(f"Album with id {album_id} not found")
+            if not album.is_active:
+                raise ValidationException("This album is no longer accepting photos")
+
+            existing_photos = {
+                photo.content_hash: photo
+                for photo in await self.photo_repository_factory(
+                    session
+                ).get_by_content_hashes(album_id, content_hashes)
+            }
+
+        results: List[Optional[BulkUploadItemResponseDTO]] = [None] * len(files_data)
+
+        # Files with the same content form a group; only one of them is stored
+        groups: Dict[str, List[int]] = {}
+        for index, content_hash in enumerate(content_hashes):
+            existing_photo = existing_photos.get(content_hash)
+            if existing_photo:
+                results[index] = self._duplicate(files_data[index][1], existing_photo)
+            else:
+                groups.setdefault(content_hash, []).append(index)
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        queue: asyncio.Queue = asyncio.Queue()
+
+        async def upload_group(content_hash: str, indexes: List[int]) -> None:
+            # A later copy is only uploaded if the earlier ones failed
+            for position, index in enumerate(indexes):
+                file, filename, media_type = files_data[index]
+                try:
+                    async with semaphore:
+                        if media_type == "video":
+                            cloudinary_response = await self.cloudinary_service.upload_video(
+                                file=file, filename=filename, folder=f"albums/{album_id}"
+                            )
+                        else:
+                            cloudinary_response = await self.cloudinary_service.upload_image(
+                                file=file, filename=filename, folder=f"albums/{album_id}"
+                            )
+
+                    photo = photo_from_upload(
+                        cloudinary_response,
+                        album_id,
+                        media_type,
+                        filename,
+                        upload_data.uploader_name,
+                        content_hash,
+                    )
+                    saved = asyncio.get_running_loop().create_future()
+                    await queue.put((photo, saved))
+                    try:
+                        saved_photo = await saved
+                    except Exception as e:
+                        raise RuntimeError(f"Failed to save to database: {str(e)}") from e
+
+                    results[index] = BulkUploadItemResponseDTO(
+                        original_filename=filename,
+                        success=True,
+                        bytes_saved=cloudinary_response.get("bytes_saved"),
+                        data=PhotoResponseDTO.model_validate(saved_photo),
+                    )
+                except Exception as e:
+                    results[index] = BulkUploadItemResponseDTO(
+                        original_filename=filename, success=False, error_message=str(e)
+                    )
+                    continue
+
+                for other in indexes[position + 1 :]:
+                    results[other] = self._duplicate(files_data[other][1], saved_photo)
+                return
+
+        writer = asyncio.create_task(self._write_batches(album_id, queue))
+        uploads = [
+            asyncio.create_task(upload_group(content_hash, indexes))
+            for content_hash, indexes in groups.items()
+        ]
+        try:
+            # The writer only stops early if it crashed; uploads waiting on it would hang
+            uploaded = asyncio.gather(*uploads)
+            await asyncio.wait({uploaded, writer}, return_when=asyncio.FIRST_COMPLETED)
+            if writer.done():
+                writer.result()
+                raise RuntimeError("Bulk upload writer stopped unexpectedly")
+            await uploaded
+            await queue.put(None)
+            await writer
+        finally:
+            # Never leave storage uploads or the writer running behind the request
+            for task in (*uploads, writer):
+                task.cancel()
+            await asyncio.gather(*uploads, writer, return_exceptions=True)
+
+        return results
+
+    @staticmethod
+    def _duplicate(filename: str, photo: Photo) -> BulkUploadItemResponseDTO:
+        return BulkUploadItemResponseDTO(
+            original_filename=filename,
+            success=True,
+            duplicate=True,
+            data=PhotoResponseDTO.model_validate(photo),
+        )
+
+    async def _write_batches(self, album_id: str, queue: asyncio.Queue) -> None:
+        """Single writer: save everything queued since the last write, until None"""
+        done = False
+        while not done:
+            batch = [await queue.get()]
+            while not queue.empty():
+                batch.append(queue.get_nowait())
+            if batch[-1] is None:
+                batch.pop()
+                done = True
+            if batch:
+                await self._write(album_id, batch)
+
+    async def _write(self, album_id: str, batch: List[Tuple[Photo, asyncio.Future]]) -> None:
+        """Insert a batch of photos and bump the album counter in one transaction"""
+        try:
+            async with self.session_factory() as session:
+                saved_photos = await self.photo_repository_factory(session).bulk_create(
+                    [photo for photo, _ in batch]
+                )
+                await self.album_repository_factory(session).adjust_photo_count(
+                    album_id, len(saved_photos)
+                )
+                await session.commit()
+        except Exception as e:
+            if len(batch) > 1:
+                # Retry row by row so one bad row only fails its own file
+                for item in batch:
+                    await self._write(album_id, [item])
+            elif not batch[0][1].done():
+                batch[0][1].set_exception(e)
+            return
+
+        for (_, saved), saved_photo in zip(batch, saved_photos):
+            if not saved.done():
+                saved.set_result(saved_photo)
+
+
+class CreateDirectUploadUseCase:
+    """Use case for issuing signed parameters for a browser-to-Cloudinary upload"""
+
+    def __init__(self, album_repository: AlbumRepository, upload_signer):
+        self.album_repository = album_repository
+        self.upload_signer = upload_signer
+
+    async def execute(self, request: DirectUploadRequestDTO) -> DirectUploadSignatureDTO:
+        if request.media_type not in ("image", "video"):
+            raise ValidationException("media_type must be 'image' or 'video'")
+
+        album = await self.album_repository.get_by_id(request.album_id)
         if not album:
-            raise EntityNotFoundException(f"Album with id {upload_data.album_id} not found")
+            raise EntityNotFoundException(f"Album with id {request.album_id} not found")
 
         if not album.is_active:
             raise ValidationException("This album is no longer accepting photos")
 
-        # Upload all files to Cloudinary in parallel
-        cloudinary_results = await self.cloudinary_service.bulk_upload(
-            files_data=files_data,
-            folder=f"albums/{upload_data.album_id}",
+        # The folder is part of the signed parameters, so the browser can
+        # only upload into this album
+        signed = self.upload_signer.sign_upload(
+            folder=f"albums/{request.album_id}", resource_type=request.media_type
         )
+        return DirectUploadSignatureDTO(album_id=request.album_id, **signed)
 
-        # Process results and create entities
-        results = []
-        photos_to_save = []
-        failed_uploads = []
 
-        from app.application.dtos.photo_dto import PhotoResponseDTO
+class ConfirmDirectUploadUseCase:
+    """Use case for registering a photo uploaded directly to Cloudinary"""
 
-        for (file, filename, media_type), cloudinary_response in zip(
-            files_data, cloudinary_results
+    def __init__(
+        self,
+        photo_repository: PhotoRepository,
+        album_repository: AlbumRepository,
+        upload_signer,
+        storage_service,
+    ):
+        self.photo_repository = photo_repository
+        self.album_repository = album_repository
+        self.upload_signer = upload_signer
+        self.storage_service = storage_service
+
+    async def execute(self, confirmation: DirectUploadConfirmDTO) -> Photo:
+        # Only Cloudinary (or whoever holds the API secret) can produce this
+        # signature, so a verified public_id really was uploaded
+        if not self.upload_signer.verify_upload(
+            confirmation.public_id, confirmation.version, confirmation.signature
         ):
-            # Check if upload to Cloudinary failed
-            if "error" in cloudinary_response:
-                failed_uploads.append(
-                    BulkUploadItemResponseDTO(
-                        original_filename=filename,
-                        success=False,
-                        error_message=cloudinary_response.get("error"),
-                    )
-                )
-                continue
-
-            # Create photo entity
-            # Convert duration from float to int (round seconds)
-            duration = cloudinary_response.get("duration")
-            if duration is not None:
-                duration = int(round(duration))
-
-            photo = Photo(
-                url=cloudinary_response["url"],
-                public_id=cloudinary_response["public_id"],
-                album_id=upload_data.album_id,
-                media_type=media_type,
-                thumbnail_url=cloudinary_response.get("thumbnail_url"),
-                original_filename=filename,
-                uploader_name=upload_data.uploader_name,
-                file_size=cloudinary_response.get("bytes"),
-                width=cloudinary_response.get("width"),
-                height=cloudinary_response.get("height"),
-                format=cloudinary_response.get("format"),
-                duration=duration,  # For videos (converted to int)
-            )
+            raise ValidationException("Invalid upload signature")
 
-            photos_to_save.append((photo, filename))
-
-        # Save all photos to database in bulk
-        successful_uploads = 0
-        if photos_to_save:
-            try:
-                photos_entities = [photo for photo, _ in photos_to_save]
-                saved_photos = await self.photo_repository.bulk_create(photos_entities)
-
-                # Commit immediately after bulk insert to avoid connection timeout
-                await self.photo_repository.session.commit()
-
-                successful_uploads = len(saved_photos)
-
-                # Create success responses
-                for saved_photo, (_, filename) in zip(saved_photos, photos_to_save):
-                    photo_dto = PhotoResponseDTO(
-                        id=saved_photo.id,
-                        url=saved_photo.url,
-                        public_id=saved_photo.public_id,
-                        album_id=saved_photo.album_id,
-                        media_type=saved_photo.media_type,
-                        thumbnail_url=saved_photo.thumbnail_url,
-                        original_filename=saved_photo.original_filename,
-                        uploader_name=saved_photo.uploader_name,
-                        file_size=saved_photo.file_size,
-                        width=saved_photo.width,
-                        height=saved_photo.height,
-                        format=saved_photo.format,
-                        duration=saved_photo.duration,
-                        created_at=saved_photo.created_at,
-                    )
+        if not confirmation.public_id.startswith(f"albums/{confirmation.album_id}/"):
+            raise ValidationException("Upload does not belong to this album")
 
-                    results.append(
-                        BulkUploadItemResponseDTO(
-                            original_filename=filename,
-                            success=True,
-                            data=photo_dto,
-                        )
-                    )
+        if confirmation.resource_type not in ("image", "video"):
+            raise ValidationException("resource_type must be 'image' or 'video'")
 
-            except Exception as e:
-                # Rollback on error
-                try:
-                    await self.photo_repository.session.rollback()
-                except:
-                    pass
-
-                # If bulk save fails, mark all as failed
-                for _, filename in photos_to_save:
-                    results.append(
-                        BulkUploadItemResponseDTO(
-                            original_filename=filename,
-                            success=False,
-                            error_message=f"Failed to save to database: {str(e)}",
-                        )
-                    )
+        # Confirming twice (e.g. a client retry) returns the same photo
+        existing = await self.photo_repository.get_by_public_id(confirmation.public_id)
+        if existing:
+            return existing
 
-        # Add failed uploads to results
-        results.extend(failed_uploads)
-
-        # Increment album photo count only once for all successful uploads
-        if successful_uploads > 0:
-            try:
-                for _ in range(successful_uploads):
-                    await self.album_repository.increment_photo_count(upload_data.album_id)
-                # Commit the counter updates
-                await self.album_repository.session.commit()
-            except Exception as e:
-                # If counter update fails, log but don't fail the whole operation
-                # The photos are already saved successfully
-                try:
-                    await self.album_repository.session.rollback()
-                except:
-                    pass
+        album = await self.album_repository.get_by_id(confirmation.album_id)
+        if not album:
+            raise EntityNotFoundException(f"Album with id {confirmation.album_id} not found")
 
-        return results
+        if not album.is_active:
+            raise ValidationException("This album is no longer accepting photos")
+
+        # The signature covers only public_id and version: the rest of the
+        # file's details are read back from Cloudinary, never from the client
+        is_image = confirmation.resource_type == "image"
+        resource = await self.storage_service.get_image_details(
+            confirmation.public_id, phash=is_image, resource_type=confirmation.resource_type
+        )
+        for field in ("bytes", "width", "height", "format", "duration", "phash"):
+            sent = getattr(confirmation, field)
+            if sent is not None and sent != resource.get(field):
+                raise ValidationException(f"{field} does not match the uploaded file")
+
+        # URLs are built from the signed fields instead of trusting the client
+        format = resource.get("format")
+        url = self.upload_signer.delivery_url(
+            confirmation.public_id,
+            confirmation.resource_type,
+            confirmation.version,
+            format,
+        )
+        thumbnail_url = None
+        if is_image:
+            thumbnail_url = self.upload_signer.thumbnail_url(
+                confirmation.public_id, confirmation.version, format
+            )
+
+        duration = resource.get("duration")
+        if duration is not None:
+            duration = int(round(duration))
+
+        photo = Photo(
+            url=url,
+            public_id=confirmation.public_id,
+            album_id=confirmation.album_id,
+            media_type=confirmation.resource_type,
+            thumbnail_url=thumbnail_url,
+            original_filename=confirmation.original_filename,
+            uploader_name=confirmation.uploader_name,
+            file_size=resource.get("bytes"),
+            width=resource.get("width"),
+            height=resource.get("height"),
+            format=format,
+            duration=duration,
+            perceptual_hash=resource.get("phash") if is_image else None,
+        )
+
+        saved_photo = await self.photo_repository.create(photo)
+        await self.album_repository.adjust_photo_count(confirmation.album_id, 1)
+
+        return saved_photo
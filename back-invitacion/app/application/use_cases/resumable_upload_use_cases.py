@@ -0,0 +1,124 @@
+from typing import Optional, Tuple
+from app.domain.entities.photo import Photo
+from app.domain.repositories.album_repository import AlbumRepository
+from app.domain.repositories.photo_repository import PhotoRepository
+from app.domain.exceptions.base import EntityNotFoundException, ValidationException
+from app.application.dtos.photo_dto import (
+    PhotoUploadDTO,
+    PhotoResponseDTO,
+    ResumableUploadResponseDTO,
+)
+from app.application.use_cases.photo_use_cases import UploadPhotoUseCase
+
+
+def resumable_upload_response(upload, photo: Optional[Photo] = None) -> ResumableUploadResponseDTO:
+    """Build the status response of a resumable upload"""
+    return ResumableUploadResponseDTO(
+        id=upload.id,
+        album_id=upload.album_id,
+        filename=upload.filename,
+        media_type=upload.media_type,
+        status="completed" if upload.completed else "uploading",
+        length=upload.length,
+        offset=upload.offset,
+        expires_at=upload.expires_at,
+        duplicate=upload.duplicate,
+        photo=PhotoResponseDTO.model_validate(photo) if photo else None,
+    )
+
+
+class CreateResumableUploadUseCase:
+    """Use case for starting an upload that is sent in resumable chunks"""
+
+    def __init__(self, album_repository: AlbumRepository, spool):
+        self.album_repository = album_repository
+        self.spool = spool
+
+    async def execute(
+        self,
+        filename: str,
+        media_type: str,
+        length: int,
+        upload_data: PhotoUploadDTO,
+    ):
+        """
+        Reserve a spool entry for a file of `length` bytes
+
+        The album is checked now, so a guest does not send 50 MB to find
+        out at the end that the album is closed.
+        """
+        album = await self.album_repository.get_by_id(upload_data.album_id)
+        if not album:
+            raise EntityNotFoundException(f"Album with id {upload_data.album_id} not found")
+
+        if not album.is_active:
+            raise ValidationException("This album is no longer accepting photos")
+
+        return await self.spool.create(
+            album_id=upload_data.album_id,
+            filename=filename,
+            media_type=media_type,
+            length=length,
+            uploader_name=upload_data.uploader_name,
+        )
+
+
+class CompleteResumableUploadUseCase:
+    """Use case for storing a fully received resumable upload"""
+
+    def __init__(
+        self,
+        photo_repository: PhotoRepository,
+        album_repository: AlbumRepository,
+        cloudinary_service,
+        spool,
+    ):
+        self.photo_repository = photo_repository
+        self.album_repository = album_repository
+        self.cloudinary_service = cloudinary_service
+        self.spool = spool
+
+    async def execute(self, upload) -> Tuple[Photo, bool]:
+        """
+        Send the spooled file to storage and save it like a regular upload
+
+        The spool entry is left untouched; mark it complete once the photo
+        is committed.
+
+        Returns:
+            Tuple (photo, duplicate), as UploadPhotoUseCase
+        """
+        content_hash = await self.spool.checksum(upload)
+        use_case = UploadPhotoUseCase(
+            self.photo_repository, self.album_repository, self.cloudinary_service
+        )
+        with self.spool.open(upload) as file:
+            return await use_case.execute(
+                file,
+                upload.filename,
+                PhotoUploadDTO(album_id=upload.album_id, uploader_name=upload.uploader_name),
+                content_hash,
+                upload.media_type,
+            )
+
+
+class GetResumableUploadUseCase:
+    """Use case for getting the status of a resumable upload"""
+
+    def __init__(self, photo_repository: PhotoRepository, spool):
+        self.photo_repository = photo_repository
+        self.spool = spool
+
+    async def execute(self, upload_id: str):
+        """
+        Returns:
+            Tuple (upload, photo); photo is None until the upload completes
+        """
+        upload = await self.spool.get(upload_id)
+        if not upload:
+            raise EntityNotFoundException(f"Upload with id {upload_id} not found")
+
+        photo = None
+        if upload.completed:
+            photo = await self.photo_repository.get_by_id(upload.photo_id)
+        return upload, photo
@@ -0,0 +1,91 @@
+from typing import List, Tuple
+from app.domain.entities.upload_job import UploadJob, UploadJobItem
+from app.domain.repositories.album_repository import AlbumRepository
+from app.domain.repositories.upload_job_repository import UploadJobRepository
+from app.domain.exceptions.base import EntityNotFoundException, ValidationException
+from app.application.dtos.photo_dto import (
+    PhotoUploadDTO,
+    UploadJobResponseDTO,
+    UploadJobItemResponseDTO,
+)
+
+
+def upload_job_response(job: UploadJob) -> UploadJobResponseDTO:
+    """Build the status response of an upload job"""
+    return UploadJobResponseDTO(
+        id=job.id,
+        album_id=job.album_id,
+        status=job.status,
+        total=len(job.items),
+        processed=job.processed,
+        successful=job.successful,
+        failed=job.failed,
+        duplicates=job.duplicates,
+        items=[UploadJobItemResponseDTO.model_validate(item) for item in job.items],
+        created_at=job.created_at,
+        finished_at=job.finished_at,
+    )
+
+
+class CreateUploadJobUseCase:
+    """Use case for queueing a bulk upload to be processed in the background"""
+
+    def __init__(
+        self,
+        upload_job_repository: UploadJobRepository,
+        album_repository: AlbumRepository,
+    ):
+        self.upload_job_repository = upload_job_repository
+        self.album_repository = album_repository
+
+    async def execute(
+        self,
+        job_id: str,
+        files: List[Tuple[str, str, str]],  # (filename, media_type, content_hash)
+        upload_data: PhotoUploadDTO,
+    ) -> UploadJob:
+        """
+        Create a queued job for files already stored in the upload spool
+
+        Args:
+            job_id: ID the files were spooled under
+            files: List of tuples (filename, media_type, content_hash), in spool order
+            upload_data: Upload metadata (album_id, uploader_name)
+
+        Returns:
+            The queued UploadJob
+        """
+        album = await self.album_repository.get_by_id(upload_data.album_id)
+        if not album:
+            raise EntityNotFoundException(f"Album with id {upload_data.album_id} not found")
+
+        if not album.is_active:
+            raise ValidationException("This album is no longer accepting photos")
+
+        job = UploadJob(
+            id=job_id,
+            album_id=upload_data.album_id,
+            uploader_name=upload_data.uploader_name,
+            items=[
+                UploadJobItem(
+                    original_filename=filename,
+                    media_type=media_type,
+                    content_hash=content_hash,
+                )
+                for filename, media_type, content_hash in files
+            ],
+        )
+        return await self.upload_job_repository.create(job)
+
+
+class GetUploadJobUseCase:
+    """Use case for getting the progress of an upload job"""
+
+    def __init__(self, upload_job_repository: UploadJobRepository):
+        self.upload_job_repository = upload_job_repository
+
+    async def execute(self, job_id: str) -> UploadJob:
+        job = await self.upload_job_repository.get_by_id(job_id)
+        if not job:
+            raise EntityNotFoundException(f"Upload job with id {job_id} not found")
+        return job
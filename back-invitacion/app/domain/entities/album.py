@@ -12,3 +12,4 @@ class Album(BaseEntity):
     is_active: bool = True  # Can disable after event
     max_photos_per_user: Optional[int] = None  # Limit photos per guest
     photo_count: int = 0  # Total photos in album
+    gallery_version: int = 0  # Bumped by every change to the album or its photos
@@ -0,0 +1,22 @@
+from datetime import datetime
+from typing import Optional
+from app.domain.entities.base import BaseEntity
+
+# Cloudinary resource types purged, in order
+PURGE_RESOURCE_TYPES = ["image", "video"]
+
+
+class AlbumPurgeJob(BaseEntity):
+    """Removal of a deleted album's assets from storage, processed in the background"""
+
+    album_id: str  # The album row is already gone
+    folder: str  # Storage folder of the album's assets
+    status: str = "queued"  # "queued", "processing", "completed" or "failed"
+    resource_type: Optional[str] = "image"  # Type being purged, None once all are done
+    next_cursor: Optional[str] = None  # Listing position within resource_type
+    deleted: int = 0  # Assets deleted (or already gone)
+    failed: int = 0  # Assets storage refused to delete
+    attempts: int = 0  # Times a worker has claimed the job
+    locked_at: Optional[datetime] = None  # Last progress of the worker holding it
+    finished_at: Optional[datetime] = None
+    error_message: Optional[str] = None
@@ -1,3 +1,4 @@
+from datetime import datetime
 from typing import Optional
 from app.domain.entities.base import BaseEntity
 
@@ -17,3 +18,7 @@ class Photo(BaseEntity):
     height: Optional[int] = None
     format: Optional[str] = None  # jpg, png, mp4, mov, etc.
     duration: Optional[int] = None  # Duration in seconds (for videos only)
+    orientation: Optional[int] = None  # EXIF orientation (1-8) of the original file
+    captured_at: Optional[datetime] = None  # When it was taken (upload time if the file does not say)
+    content_hash: Optional[str] = None  # SHA-256 of the uploaded file, for deduplication
+    perceptual_hash: Optional[str] = None  # 64-bit pHash (hex), for near-duplicate detection
@@ -0,0 +1,45 @@
+from datetime import datetime
+from typing import List, Optional
+from pydantic import BaseModel
+from app.domain.entities.base import BaseEntity
+
+
+class UploadJobItem(BaseModel):
+    """One file of an upload job"""
+
+    original_filename: str
+    media_type: str = "image"  # "image" or "video"
+    status: str = "pending"  # "pending", "completed" or "failed"
+    content_hash: Optional[str] = None  # SHA-256 of the spooled file
+    duplicate: bool = False  # Matched an existing photo, nothing was uploaded
+    bytes_saved: Optional[int] = None  # Removed by local preprocessing
+    photo_id: Optional[str] = None  # Set once the photo is saved
+    error_message: Optional[str] = None
+
+
+class UploadJob(BaseEntity):
+    """Bulk upload processed in the background"""
+
+    album_id: str
+    uploader_name: Optional[str] = None
+    status: str = "queued"  # "queued", "processing", "completed" or "failed"
+    items: List[UploadJobItem] = []
+    attempts: int = 0  # Times a worker has claimed the job
+    locked_at: Optional[datetime] = None  # Last progress of the worker holding it
+    finished_at: Optional[datetime] = None
+
+    @property
+    def successful(self) -> int:
+        return sum(1 for item in self.items if item.status == "completed")
+
+    @property
+    def failed(self) -> int:
+        return sum(1 for item in self.items if item.status == "failed")
+
+    @property
+    def duplicates(self) -> int:
+        return sum(1 for item in self.items if item.duplicate)
+
+    @property
+    def processed(self) -> int:
+        return self.successful + self.failed
@@ -0,0 +1,41 @@
+from abc import abstractmethod
+from datetime import datetime
+from typing import Optional
+from app.domain.repositories.base_repository import BaseRepository
+from app.domain.entities.album_purge_job import AlbumPurgeJob
+
+
+class AlbumPurgeJobRepository(BaseRepository[AlbumPurgeJob]):
+    """Album purge job repository interface"""
+
+    @abstractmethod
+    async def claim_next(self, stale_before: datetime) -> Optional[AlbumPurgeJob]:
+        """
+        Mark the oldest runnable job as processing and return it
+
+        Runnable means queued, or processing with no progress since
+        stale_before (its worker died). Concurrent workers never claim the
+        same job.
+        """
+        pass
+
+    @abstractmethod
+    async def heartbeat(self, job_id: str, attempt: int) -> bool:
+        """
+        Refresh locked_at of a job still held by the given claim
+
+        False once another worker took the job over (its attempt count
+        moved on) or the job is no longer processing.
+        """
+        pass
+
+    @abstractmethod
+    async def save_progress(self, entity: AlbumPurgeJob) -> bool:
+        """
+        Store the progress of a job, only while its claim is still current
+
+        The row must still be processing under the same attempt count;
+        attempts itself is never written (only claim_next changes it).
+        False when the job was taken over or deleted.
+        """
+        pass
@@ -12,6 +12,16 @@ class AlbumRepository(BaseRepository[Album]):
         """Get album by event code"""
         pass
 
+    @abstractmethod
+    async def adjust_photo_count(self, album_id: str, delta: int) -> bool:
+        """Atomically add delta (may be negative) to the photo count, never below zero"""
+        pass
+
+    @abstractmethod
+    async def touch(self, album_id: str) -> bool:
+        """Mark the album as changed (bump its gallery version) when only its photos changed"""
+        pass
+
     @abstractmethod
     async def increment_photo_count(self, album_id: str) -> bool:
         """Increment the photo count for an album"""
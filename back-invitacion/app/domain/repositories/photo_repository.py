@@ -1,5 +1,6 @@
 from abc import abstractmethod
-from typing import List, Optional
+from datetime import datetime
+from typing import List, Optional, Tuple
 from app.domain.repositories.base_repository import BaseRepository
 from app.domain.entities.photo import Photo
 
@@ -8,8 +9,47 @@ class PhotoRepository(BaseRepository[Photo]):
     """Photo repository interface"""
 
     @abstractmethod
-    async def get_by_album_id(self, album_id: str, skip: int = 0, limit: int = 100) -> List[Photo]:
-        """Get all photos in an album"""
+    async def bulk_create(self, entities: List[Photo]) -> List[Photo]:
+        """Create multiple photos in a single operation (one multi-row INSERT)"""
+        pass
+
+    @abstractmethod
+    async def get_by_album_id(
+        self, album_id: str, skip: int = 0, limit: int = 100, order: str = "uploaded"
+    ) -> List[Photo]:
+        """Get all photos in an album ("uploaded": newest first, "captured": chronological)"""
+        pass
+
+    @abstractmethod
+    async def get_by_album_id_after(
+        self,
+        album_id: str,
+        after: Optional[Tuple[datetime, str]] = None,
+        limit: int = 100,
+        order: str = "uploaded",
+    ) -> List[Photo]:
+        """
+        Get photos in an album that come after a keyset position
+
+        The key is (created_at, id) for the "uploaded" order and
+        (captured_at, id) for the "captured" order.
+        """
+        pass
+
+    @abstractmethod
+    async def get_page_with_total(
+        self,
+        album_id: str,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[Tuple[datetime, str]] = None,
+        order: str = "uploaded",
+    ) -> Tuple[List[Photo], int]:
+        """
+        Get a page of photos together with the album's denormalized photo count
+
+        Uses keyset pagination when after is given, offset pagination otherwise.
+        """
         pass
 
     @abstractmethod
@@ -17,6 +57,21 @@ class PhotoRepository(BaseRepository[Photo]):
         """Get photo by Cloudinary public ID"""
         pass
 
+    @abstractmethod
+    async def get_by_content_hashes(self, album_id: str, content_hashes: List[str]) -> List[Photo]:
+        """Get the photos of an album whose file has one of the given SHA-256 digests"""
+        pass
+
+    @abstractmethod
+    async def get_by_ids(self, photo_ids: List[str]) -> List[Photo]:
+        """Get several photos by ID (unknown IDs are skipped)"""
+        pass
+
+    @abstractmethod
+    async def get_perceptual_hashes(self, album_id: str) -> List[Tuple[str, str]]:
+        """Get (photo_id, perceptual_hash) of every photo of an album that has one"""
+        pass
+
     @abstractmethod
     async def count_by_album_id(self, album_id: str) -> int:
         """Count photos in an album"""
@@ -26,3 +81,8 @@ class PhotoRepository(BaseRepository[Photo]):
     async def delete_by_public_id(self, public_id: str) -> bool:
         """Delete photo by Cloudinary public ID"""
         pass
+
+    @abstractmethod
+    async def delete_by_ids(self, album_id: str, photo_ids: List[str]) -> int:
+        """Delete several photos of an album at once, returning how many were deleted"""
+        pass
@@ -0,0 +1,153 @@
+import os
+import shutil
+import tempfile
+from collections import OrderedDict
+from typing import Optional, List, Dict, Any, Tuple
+
+from app.domain.entities.album import Album
+
+
+def _write_atomic(path: str, body: bytes) -> None:
+    """Write a file so concurrent readers (other workers, nginx) never see it half written"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as tmp:
+            tmp.write(body)
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class GallerySnapshotStore:
+    """
+    Pre-serialized gallery pages per album
+
+    Pages are keyed by the album's gallery version, a counter bumped in the
+    same UPDATE as every upload, delete and thumbnail change, so a page can never be served for
+    a different album state. Pages live in a bounded in-memory LRU and,
+    optionally, on local disk where every worker on the host can reuse them.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        static_directory: Optional[str] = None,
+        max_pages: int = 512,
+    ):
+        self.directory = directory
+        self.static_directory = static_directory
+        self.max_pages = max_pages
+        self._pages: "OrderedDict[Tuple[str, int], Tuple[str, bytes]]" = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def version_of(album: Album) -> str:
+        """Version token that changes whenever the album's photos change"""
+        return str(album.gallery_version)
+
+    def _page_path(self, album_id: str, version: str, page: int) -> str:
+        return os.path.join(self.directory, album_id, version, f"page-{page}.json")
+
+    def _static_path(self, album_id: str, page: int) -> str:
+        return os.path.join(self.static_directory, album_id, f"page-{page}.json")
+
+    def get_page(self, album_id: str, version: str, page: int) -> Optional[bytes]:
+        """Get a page for this album version, or None if it must be rebuilt"""
+        entry = self._pages.get((album_id, page))
+        if entry and entry[0] == version:
+            self._pages.move_to_end((album_id, page))
+            self.hits += 1
+            return entry[1]
+
+        if self.directory:
+            try:
+                with open(self._page_path(album_id, version, page), "rb") as snapshot:
+                    body = snapshot.read()
+            except OSError:
+                body = None
+            if body is not None:
+                self._remember(album_id, version, page, body)
+                self.disk_hits += 1
+                return body
+
+        self.misses += 1
+        return None
+
+    def put_page(self, album_id: str, version: str, page: int, body: bytes) -> None:
+        """Store a freshly built page"""
+        self._remember(album_id, version, page, body)
+        if not self.directory:
+            return
+
+        try:
+            _write_atomic(self._page_path(album_id, version, page), body)
+            self._remove_old_versions(album_id, version)
+        except OSError:
+            # The disk copy is an optimization, memory still has the page
+            pass
+
+    def _remember(self, album_id: str, version: str, page: int, body: bytes) -> None:
+        self._pages[(album_id, page)] = (version, body)
+        self._pages.move_to_end((album_id, page))
+        while len(self._pages) > self.max_pages:
+            self._pages.popitem(last=False)
+
+    def _remove_old_versions(self, album_id: str, current_version: str) -> None:
+        album_dir = os.path.join(self.directory, album_id)
+        for version in os.listdir(album_dir):
+            if version != current_version:
+                shutil.rmtree(os.path.join(album_dir, version), ignore_errors=True)
+
+    def invalidate(self, album_id: str) -> None:
+        """
+        Drop this worker's pages for an album (they are rebuilt lazily on demand)
+
+        Call it once the change is committed, or a request in between could
+        rebuild the page, or the frozen gallery, from the old rows.
+        """
+        for key in [key for key in self._pages if key[0] == album_id]:
+            del self._pages[key]
+        # A frozen gallery no longer matches the album (e.g. a moderator deleted a photo)
+        self.unfreeze(album_id)
+
+    def remove(self, album_id: str) -> None:
+        """Remove every snapshot of an album, including frozen static files"""
+        self.invalidate(album_id)
+        if self.directory:
+            shutil.rmtree(os.path.join(self.directory, album_id), ignore_errors=True)
+
+    def freeze(self, album_id: str, pages: List[bytes]) -> Optional[str]:
+        """Write all pages of an inactive album as static files for nginx"""
+        if not self.static_directory:
+            return None
+
+        album_dir = os.path.join(self.static_directory, album_id)
+        for page, body in enumerate(pages):
+            _write_atomic(self._static_path(album_id, page), body)
+
+        # Drop pages left over from a previous, larger freeze
+        page = len(pages)
+        while os.path.exists(self._static_path(album_id, page)):
+            os.remove(self._static_path(album_id, page))
+            page += 1
+        return album_dir
+
+    def unfreeze(self, album_id: str) -> None:
+        """Remove the static files of a changed, re-activated or deleted album"""
+        if self.static_directory:
+            shutil.rmtree(os.path.join(self.static_directory, album_id), ignore_errors=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for monitoring"""
+        return {
+            "pages_in_memory": len(self._pages),
+            "max_pages": self.max_pages,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+        }
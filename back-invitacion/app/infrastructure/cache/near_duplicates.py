@@ -0,0 +1,52 @@
+from collections import OrderedDict
+from typing import Any, Dict, List, Tuple
+
+from app.application.services.near_duplicates import NearDuplicateIndex
+
+
+class NearDuplicateIndexCache:
+    """
+    Per-worker LRU of near-duplicate indexes, one per (album, max_distance)
+
+    An index is kept across requests and only fed the photos uploaded since
+    the previous request; it is rebuilt when photos were deleted.
+    """
+
+    def __init__(self, max_size: int = 32):
+        self.max_size = max_size
+        self._indexes: "OrderedDict[Tuple[str, int], NearDuplicateIndex]" = OrderedDict()
+        self.builds = 0
+        self.updates = 0
+
+    def get_index(
+        self, album_id: str, max_distance: int, entries: List[Tuple[str, str]]
+    ) -> NearDuplicateIndex:
+        """Index of an album brought up to date with entries (photo_id, perceptual_hash)"""
+        key = (album_id, max_distance)
+        index = self._indexes.get(key)
+
+        if index is not None and index.sync(entries):
+            self._indexes.move_to_end(key)
+            self.updates += 1
+            return index
+
+        index = NearDuplicateIndex.build(max_distance, entries)
+        self.builds += 1
+
+        self._indexes[key] = index
+        self._indexes.move_to_end(key)
+        while len(self._indexes) > self.max_size:
+            self._indexes.popitem(last=False)
+        return index
+
+    def invalidate(self, album_id: str) -> None:
+        for key in [key for key in self._indexes if key[0] == album_id]:
+            del self._indexes[key]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "indexes": len(self._indexes),
+            "max_size": self.max_size,
+            "builds": self.builds,
+            "updates": self.updates,
+        }
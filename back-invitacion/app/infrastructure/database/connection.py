@@ -3,15 +3,38 @@ from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sess
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.pool import NullPool
 from app.infrastructure.config.settings import settings
+from app.infrastructure.database.pool import (
+    InstrumentedQueuePool,
+    get_pool_limits,
+    get_pool_status,
+)
 
 Base = declarative_base()
 
-# Use NullPool for remote database connections (Hostinger)
-# Each session creates and closes its own connection
+
+def _engine_options() -> dict:
+    """Build the pool options for the configured DB_POOL_MODE"""
+    if settings.DB_POOL_MODE == "null":
+        # Each session creates and closes its own connection
+        return {"poolclass": NullPool}
+
+    pool_size, max_overflow = get_pool_limits()
+    return {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        # Remote MySQL (Hostinger) drops idle connections, so recycle them
+        # before the server does and validate them on checkout
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
 engine = create_async_engine(
     settings.DATABASE_URL,
     echo=settings.DATABASE_ECHO,
-    poolclass=NullPool,  # No connection pooling - create fresh connection each time
+    **_engine_options(),
 )
 
 AsyncSessionLocal = async_sessionmaker(
@@ -47,3 +70,8 @@ async def init_db():
 async def close_db():
     """Close database connection"""
     await engine.dispose()
+
+
+def get_db_pool_status() -> dict:
+    """Get connection pool usage for the current worker"""
+    return get_pool_status(engine.pool)
@@ -1,5 +1,5 @@
 from datetime import datetime
-from sqlalchemy import Column, String, Boolean, DateTime, Integer, Text, ForeignKey
+from sqlalchemy import Column, String, Boolean, DateTime, Integer, Text, ForeignKey, Index, JSON
 from sqlalchemy.orm import relationship
 import uuid
 from app.infrastructure.database.connection import Base
@@ -23,6 +23,9 @@ class AlbumModel(Base):
     is_active = Column(Boolean, default=True)
     max_photos_per_user = Column(Integer, nullable=True, default=50)
     photo_count = Column(Integer, default=0)
+    # Counter behind gallery snapshots and ETags; updated_at has one-second
+    # precision on MySQL, so two changes in the same second would collide
+    gallery_version = Column(Integer, nullable=False, default=0, server_default="0")
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -34,6 +37,14 @@ class PhotoModel(Base):
     """SQLAlchemy model for Photo"""
 
     __tablename__ = "photos"
+    __table_args__ = (
+        # Keyset pagination of album galleries (newest first)
+        Index("ix_photos_album_created_id", "album_id", "created_at", "id"),
+        # Duplicate lookups on upload
+        Index("ix_photos_album_content_hash", "album_id", "content_hash"),
+        # Keyset pagination of album galleries in capture order
+        Index("ix_photos_album_captured_id", "album_id", "captured_at", "id"),
+    )
 
     id = Column(String(36), primary_key=True, default=generate_uuid)
     url = Column(String(500), nullable=False)
@@ -48,8 +59,58 @@ class PhotoModel(Base):
     height = Column(Integer, nullable=True)
     format = Column(String(10), nullable=True)
     duration = Column(Integer, nullable=True)  # Duration in seconds (for videos)
+    orientation = Column(Integer, nullable=True)  # EXIF orientation (1-8)
+    captured_at = Column(DateTime, nullable=False, default=datetime.utcnow)  # Upload time if unknown
+    content_hash = Column(String(64), nullable=True)  # SHA-256 hex digest of the file
+    perceptual_hash = Column(String(16), nullable=True)  # 64-bit pHash (hex) from Cloudinary
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Relationship
     album = relationship("AlbumModel", back_populates="photos")
+
+
+class UploadJobModel(Base):
+    """SQLAlchemy model for UploadJob"""
+
+    __tablename__ = "upload_jobs"
+    __table_args__ = (
+        # Workers look for the oldest runnable job
+        Index("ix_upload_jobs_status_created", "status", "created_at"),
+    )
+
+    id = Column(String(36), primary_key=True, default=generate_uuid)
+    album_id = Column(String(36), ForeignKey("albums.id", ondelete="CASCADE"), nullable=False)
+    uploader_name = Column(String(255), nullable=True)
+    status = Column(String(20), nullable=False, default="queued")
+    items = Column(JSON, nullable=False)  # Per-file progress
+    attempts = Column(Integer, nullable=False, default=0)
+    locked_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class AlbumPurgeJobModel(Base):
+    """SQLAlchemy model for AlbumPurgeJob"""
+
+    __tablename__ = "album_purge_jobs"
+    __table_args__ = (
+        # Workers look for the oldest runnable job
+        Index("ix_album_purge_jobs_status_created", "status", "created_at"),
+    )
+
+    id = Column(String(36), primary_key=True, default=generate_uuid)
+    album_id = Column(String(36), nullable=False)  # No foreign key: the album is deleted
+    folder = Column(String(255), nullable=False)
+    status = Column(String(20), nullable=False, default="queued")
+    resource_type = Column(String(10), nullable=True)
+    next_cursor = Column(String(255), nullable=True)
+    deleted = Column(Integer, nullable=False, default=0)
+    failed = Column(Integer, nullable=False, default=0)
+    attempts = Column(Integer, nullable=False, default=0)
+    locked_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    error_message = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
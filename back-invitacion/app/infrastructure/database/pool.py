@@ -0,0 +1,93 @@
+import time
+import threading
+from typing import Any, Dict, Tuple
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool
+from app.infrastructure.config.settings import settings
+
+
+class PoolStats:
+    """Counters describing how long requests wait for a pooled connection"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record_wait(self, seconds: float, timed_out: bool = False) -> None:
+        """Record the time spent acquiring a connection"""
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.total_wait += seconds
+            self.max_wait = max(self.max_wait, seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return a copy of the counters"""
+        with self._lock:
+            attempts = self.checkouts + self.timeouts
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": round(self.total_wait / attempts * 1000, 3) if attempts else 0.0,
+                "max_wait_ms": round(self.max_wait * 1000, 3),
+            }
+
+
+# Shared by every pool instance so counters survive engine.dispose()
+pool_stats = PoolStats()
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that measures the wait time of every checkout"""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except Exception:
+            pool_stats.record_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        pool_stats.record_wait(time.perf_counter() - start)
+        return connection
+
+
+def get_pool_limits() -> Tuple[int, int]:
+    """
+    Compute pool_size and max_overflow for this worker
+
+    When DB_MAX_CONNECTIONS is set, the budget is split evenly between
+    DB_WORKERS processes so the server limit is never exceeded.
+    """
+    pool_size = settings.DB_POOL_SIZE
+    max_overflow = settings.DB_MAX_OVERFLOW
+
+    if settings.DB_MAX_CONNECTIONS > 0:
+        per_worker = max(1, settings.DB_MAX_CONNECTIONS // max(1, settings.DB_WORKERS))
+        pool_size = min(pool_size, per_worker)
+        max_overflow = min(max_overflow, per_worker - pool_size)
+
+    return max(1, pool_size), max(0, max_overflow)
+
+
+def get_pool_status(pool: Pool) -> Dict[str, Any]:
+    """Describe the current state of an engine pool"""
+    if not isinstance(pool, InstrumentedQueuePool):
+        return {"mode": "null", "pooled": False}
+
+    status = {
+        "mode": "queue",
+        "pooled": True,
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(0, pool.overflow()),
+        "max_overflow": pool._max_overflow,
+        "timeout": pool.timeout(),
+        "recycle": pool._recycle,
+    }
+    status.update(pool_stats.snapshot())
+    return status
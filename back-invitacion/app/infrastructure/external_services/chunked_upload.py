@@ -0,0 +1,79 @@
+import asyncio
+import io
+import os
+import uuid
+from typing import Any, Awaitable, BinaryIO, Callable, Dict, Union
+
+from app.infrastructure.config.settings import settings
+
+# Cloudinary rejects chunks smaller than 5 MB (except the last one)
+MIN_CHUNK_SIZE = 5 * 1024 * 1024
+
+
+def as_file(file: Union[bytes, BinaryIO]) -> BinaryIO:
+    """Wrap raw bytes so every upload path can read in chunks"""
+    return io.BytesIO(file) if isinstance(file, (bytes, bytearray)) else file
+
+
+def get_file_size(file: BinaryIO) -> int:
+    """Remaining size of a seekable file object from its current position"""
+    position = file.tell()
+    file.seek(0, os.SEEK_END)
+    size = file.tell() - position
+    file.seek(position)
+    return size
+
+
+def should_upload_in_chunks(size: int) -> bool:
+    """Whether a file is large enough for the chunked upload protocol"""
+    threshold = settings.CLOUDINARY_CHUNKED_THRESHOLD_MB * 1024 * 1024
+    return settings.CLOUDINARY_CHUNKED_UPLOADS and size >= threshold
+
+
+async def upload_in_chunks(
+    file: BinaryIO,
+    size: int,
+    read_chunk: Callable[[BinaryIO, int], Awaitable[bytes]],
+    send_chunk: Callable[[bytes, Dict[str, str]], Awaitable[Dict[str, Any]]],
+    chunk_size: int = None,
+    retries: int = None,
+) -> Dict[str, Any]:
+    """
+    Upload a file with Cloudinary's chunked protocol
+
+    Chunks share an X-Unique-Upload-Id and carry their Content-Range, so a
+    failed chunk is retried on its own instead of restarting the whole
+    transfer. Only one chunk is held in memory at a time. The response of
+    the last chunk describes the complete asset.
+    """
+    if chunk_size is None:
+        chunk_size = settings.CLOUDINARY_CHUNK_SIZE_MB * 1024 * 1024
+    if retries is None:
+        retries = settings.CLOUDINARY_CHUNK_RETRIES
+    chunk_size = max(chunk_size, MIN_CHUNK_SIZE)
+
+    upload_id = uuid.uuid4().hex
+    offset = 0
+    response: Dict[str, Any] = {}
+
+    while offset < size:
+        chunk = await read_chunk(file, chunk_size)
+        if not chunk:
+            break
+
+        headers = {
+            "X-Unique-Upload-Id": upload_id,
+            "Content-Range": f"bytes {offset}-{offset + len(chunk) - 1}/{size}",
+        }
+        for attempt in range(retries + 1):
+            try:
+                response = await send_chunk(chunk, headers)
+                break
+            except Exception:
+                if attempt == retries:
+                    raise
+                await asyncio.sleep(settings.CLOUDINARY_CHUNK_RETRY_BACKOFF_SECONDS * 2 ** attempt)
+
+        offset += len(chunk)
+
+    return response
@@ -0,0 +1,396 @@
+import asyncio
+import time
+from typing import BinaryIO, Dict, Any, List, Optional, Tuple, Union
+
+import cloudinary
+import httpx
+
+from app.infrastructure.config.settings import settings
+from app.infrastructure.external_services.chunked_upload import (
+    as_file,
+    get_file_size,
+    should_upload_in_chunks,
+    upload_in_chunks,
+)
+from app.infrastructure.external_services.cloudinary_signing import (
+    sign_params,
+    transformation_string,
+)
+from app.infrastructure.external_services.cloudinary_service import (
+    DELIVERY_TRANSFORMATION,
+    THUMBNAIL_EAGER,
+    delete_in_batches,
+    eager_upload_options,
+    image_upload_result,
+    video_upload_result,
+)
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class CloudinaryHttpService:
+    """
+    Cloudinary backend built on a pooled async HTTP client
+
+    Drop-in replacement for CloudinaryService: same method signatures, but
+    requests are signed locally and sent over keep-alive (HTTP/2 when the
+    h2 package is installed) connections without blocking any thread.
+    """
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.cloud_name = settings.CLOUDINARY_CLOUD_NAME
+        self.api_key = settings.CLOUDINARY_API_KEY
+        self.api_secret = settings.CLOUDINARY_API_SECRET
+        self.base_url = (base_url or settings.CLOUDINARY_API_BASE_URL).rstrip("/")
+
+        # Only used to build delivery URLs locally
+        cloudinary.config(
+            cloud_name=self.cloud_name,
+            api_key=self.api_key,
+            api_secret=self.api_secret,
+            secure=True,
+        )
+
+        self.http2 = transport is None and _http2_available()
+        self._client = httpx.AsyncClient(
+            base_url=f"{self.base_url}/v1_1/{self.cloud_name}",
+            http2=self.http2,
+            transport=transport,
+            timeout=httpx.Timeout(settings.CLOUDINARY_HTTP_TIMEOUT_SECONDS, connect=10.0),
+            limits=httpx.Limits(
+                max_connections=settings.CLOUDINARY_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.CLOUDINARY_HTTP_MAX_CONNECTIONS,
+                keepalive_expiry=60.0,
+            ),
+        )
+        self.requests = 0
+        self.in_flight = 0
+        self.failed = 0
+
+    def _signed(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Add timestamp, api_key and signature to upload API parameters"""
+        params = {
+            # The API expects booleans as "true"/"false"
+            key: str(value).lower() if isinstance(value, bool) else value
+            for key, value in params.items()
+            if value is not None
+        }
+        params["timestamp"] = str(int(time.time()))
+        params["signature"] = sign_params(params, self.api_secret)
+        params["api_key"] = self.api_key
+        return params
+
+    async def _request(self, method: str, path: str, **kwargs) -> Dict[str, Any]:
+        """Send a request and decode the JSON response, raising on API errors"""
+        self.requests += 1
+        self.in_flight += 1
+        try:
+            response = await self._client.request(method, path, **kwargs)
+            payload = response.json()
+            if response.is_error or "error" in payload:
+                message = payload.get("error", {}).get("message") or response.text
+                raise Exception(f"HTTP {response.status_code}: {message}")
+            return payload
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.in_flight -= 1
+
+    async def _upload(
+        self,
+        file: Union[bytes, BinaryIO],
+        filename: str,
+        resource_type: str,
+        params: Dict[str, Any],
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Dict[str, Any]:
+        # httpx streams file objects chunk by chunk instead of buffering them
+        return await self._request(
+            "POST",
+            f"/{resource_type}/upload",
+            data=self._signed(params),
+            files={"file": (filename or "upload", file)},
+            headers=headers,
+        )
+
+    async def _upload_chunked(
+        self,
+        file: BinaryIO,
+        filename: str,
+        size: int,
+        resource_type: str,
+        params: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """Upload a large file chunk by chunk over the pooled client"""
+
+        async def read_chunk(source: BinaryIO, chunk_size: int) -> bytes:
+            return await asyncio.to_thread(source.read, chunk_size)
+
+        async def send_chunk(chunk: bytes, headers: Dict[str, str]) -> Dict[str, Any]:
+            return await self._upload(chunk, filename, resource_type, params, headers)
+
+        return await upload_in_chunks(file, size, read_chunk, send_chunk)
+
+    @property
+    def _admin_auth(self) -> Tuple[str, str]:
+        return (self.api_key, self.api_secret)
+
+    def stats(self) -> Dict[str, Any]:
+        """Connection and request counters for monitoring"""
+        return {
+            "backend": "http",
+            "http2": self.http2,
+            "requests": self.requests,
+            "in_flight": self.in_flight,
+            "failed": self.failed,
+        }
+
+    async def close(self) -> None:
+        """Close pooled connections (called on application shutdown)"""
+        await self._client.aclose()
+
+    async def upload_image(
+        self, file: BinaryIO, filename: str, folder: str = "photos"
+    ) -> Dict[str, Any]:
+        """
+        Upload an image to Cloudinary
+
+        Args:
+            file: Binary file object
+            filename: Original filename
+            folder: Cloudinary folder path
+
+        Returns:
+            Dict with upload response including url, public_id, etc.
+        """
+        try:
+            response = await self._upload(
+                file,
+                filename,
+                "image",
+                {
+                    "folder": folder,
+                    "transformation": transformation_string(DELIVERY_TRANSFORMATION),
+                    # Generate thumbnail
+                    "eager": transformation_string(THUMBNAIL_EAGER),
+                    **eager_upload_options(),
+                    "phash": True,
+                },
+            )
+            return image_upload_result(response)
+
+        except Exception as e:
+            raise Exception(f"Failed to upload image to Cloudinary: {str(e)}")
+
+    async def upload_video(
+        self, file: BinaryIO, filename: str, folder: str = "videos"
+    ) -> Dict[str, Any]:
+        """
+        Upload a video to Cloudinary
+
+        Args:
+            file: Binary file object
+            filename: Original filename
+            folder: Cloudinary folder path
+
+        Returns:
+            Dict with upload response including url, public_id, duration, etc.
+        """
+        try:
+            file = as_file(file)
+            size = get_file_size(file)
+            params = {
+                "folder": folder,
+                "transformation": transformation_string(DELIVERY_TRANSFORMATION),
+            }
+
+            # Large videos go in retryable chunks instead of one long request
+            if should_upload_in_chunks(size):
+                response = await self._upload_chunked(file, filename, size, "video", params)
+            else:
+                response = await self._upload(file, filename, "video", params)
+            return video_upload_result(response)
+
+        except Exception as e:
+            raise Exception(f"Failed to upload video to Cloudinary: {str(e)}")
+
+    async def bulk_upload(
+        self, files_data: List[Tuple[BinaryIO, str, str]], folder: str = "photos"
+    ) -> List[Dict[str, Any]]:
+        """
+        Upload multiple files (images and/or videos) in parallel to Cloudinary
+
+        Args:
+            files_data: List of tuples (file, filename, media_type)
+            folder: Cloudinary folder path
+
+        Returns:
+            List of upload results (same order as input)
+        """
+        async def upload_single(file_data: Tuple[BinaryIO, str, str]) -> Dict[str, Any]:
+            file, filename, media_type = file_data
+            try:
+                if media_type == "video":
+                    return await self.upload_video(file, filename, folder)
+                else:
+                    return await self.upload_image(file, filename, folder)
+            except Exception as e:
+                return {
+                    "error": str(e),
+                    "filename": filename,
+                    "success": False
+                }
+
+        return await asyncio.gather(*[upload_single(data) for data in files_data])
+
+    async def delete_image(self, public_id: str, resource_type: str = "image") -> Dict[str, Any]:
+        """
+        Delete an image (or, with resource_type="video", a video) from Cloudinary
+
+        Args:
+            public_id: Cloudinary public ID of the asset
+            resource_type: "image" or "video"
+
+        Returns:
+            Dict with deletion response
+        """
+        try:
+            return await self._request(
+                "POST",
+                f"/{resource_type}/destroy",
+                data=self._signed({"public_id": public_id}),
+            )
+        except Exception as e:
+            raise Exception(f"Failed to delete {resource_type} from Cloudinary: {str(e)}")
+
+    async def delete_resources(
+        self, public_ids: List[str], resource_type: str = "image"
+    ) -> Dict[str, str]:
+        """
+        Delete many assets of one resource type with the Admin API
+
+        Returns:
+            Dict public_id -> "deleted", "not_found" or an error message
+        """
+
+        async def delete_batch(batch: List[str]) -> Dict[str, Any]:
+            return await self._request(
+                "DELETE",
+                f"/resources/{resource_type}/upload",
+                params=[("public_ids[]", public_id) for public_id in batch],
+                auth=self._admin_auth,
+            )
+
+        return await delete_in_batches(public_ids, delete_batch)
+
+    async def get_image_details(
+        self, public_id: str, phash: bool = False, resource_type: str = "image"
+    ) -> Dict[str, Any]:
+        """
+        Get details of an image (or video) from Cloudinary
+
+        Args:
+            public_id: Cloudinary public ID of the image
+            phash: Include the perceptual hash
+            resource_type: "image" or "video"
+
+        Returns:
+            Dict with image details
+        """
+        try:
+            return await self._request(
+                "GET",
+                f"/resources/{resource_type}/upload/{public_id}",
+                params={"phash": "true"} if phash else None,
+                auth=self._admin_auth,
+            )
+        except Exception as e:
+            raise Exception(f"Failed to get image details from Cloudinary: {str(e)}")
+
+    async def delete_folder(self, folder_path: str) -> Dict[str, Any]:
+        """
+        Delete a folder from Cloudinary (useful when deleting an album)
+
+        Args:
+            folder_path: Path to the folder
+
+        Returns:
+            Dict with deletion response
+        """
+        try:
+            # Delete all resources in the folder (up to 1000 per type)
+            deleted: Dict[str, str] = {}
+            for resource_type in ("image", "video"):
+                response = await self._request(
+                    "DELETE",
+                    f"/resources/{resource_type}/upload",
+                    params={"prefix": folder_path},
+                    auth=self._admin_auth,
+                )
+                deleted.update(response.get("deleted", {}))
+            await self._request("DELETE", f"/folders/{folder_path}", auth=self._admin_auth)
+            return {"deleted": deleted}
+        except Exception as e:
+            raise Exception(f"Failed to delete folder from Cloudinary: {str(e)}")
+
+    async def list_resources(
+        self,
+        prefix: str,
+        resource_type: str = "image",
+        max_results: int = 500,
+        next_cursor: Optional[str] = None,
+    ) -> Tuple[List[str], Optional[str]]:
+        """
+        List one page of the public IDs under a prefix
+
+        Returns:
+            Tuple (public_ids, next_cursor); next_cursor is None on the last page
+        """
+        params = {"prefix": prefix, "max_results": max_results}
+        if next_cursor:
+            params["next_cursor"] = next_cursor
+        response = await self._request(
+            "GET", f"/resources/{resource_type}/upload", params=params, auth=self._admin_auth
+        )
+        public_ids = [resource["public_id"] for resource in response.get("resources", [])]
+        return public_ids, response.get("next_cursor")
+
+    async def delete_empty_folder(self, folder_path: str) -> Dict[str, Any]:
+        """Delete a folder whose assets have already been deleted"""
+        return await self._request("DELETE", f"/folders/{folder_path}", auth=self._admin_auth)
+
+    def generate_transformation_url(
+        self, public_id: str, width: int = None, height: int = None, crop: str = "fill"
+    ) -> str:
+        """
+        Generate a transformed image URL (built locally, no request is made)
+
+        Args:
+            public_id: Cloudinary public ID
+            width: Desired width
+            height: Desired height
+            crop: Crop mode
+
+        Returns:
+            Transformed image URL
+        """
+        transformation = {}
+        if width:
+            transformation["width"] = width
+        if height:
+            transformation["height"] = height
+        if crop:
+            transformation["crop"] = crop
+
+        return cloudinary.CloudinaryImage(public_id).build_url(**transformation)
@@ -2,14 +2,180 @@ import cloudinary
 import cloudinary.uploader
 import cloudinary.api
 import asyncio
-from typing import BinaryIO, Dict, Any, List, Tuple
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Awaitable, BinaryIO, Callable, Dict, Any, List, Optional, Tuple
 from app.infrastructure.config.settings import settings
+from app.infrastructure.external_services.chunked_upload import (
+    as_file,
+    get_file_size,
+    should_upload_in_chunks,
+    upload_in_chunks,
+)
+
+
+# Upload options shared by every storage backend
+DELIVERY_TRANSFORMATION = [
+    {"quality": "auto:good"},
+    {"fetch_format": "auto"},
+]
+THUMBNAIL_EAGER = [
+    {
+        "width": 400,
+        "height": 400,
+        "crop": "fill",
+        "gravity": "auto",
+        "quality": "auto:good",
+    }
+]
+
+# Admin API limit of public IDs per delete_resources call
+DELETE_BATCH_SIZE = 100
+# delete_resources calls in flight at once per delete_in_batches
+DELETE_CONCURRENCY = 4
+
+
+async def delete_in_batches(
+    public_ids: List[str],
+    delete_batch: Callable[[List[str]], Awaitable[Dict[str, Any]]],
+) -> Dict[str, str]:
+    """
+    Delete assets DELETE_BATCH_SIZE at a time, up to DELETE_CONCURRENCY batches at once
+
+    Returns:
+        Dict public_id -> "deleted", "not_found" or the error of its batch;
+        a failed batch does not stop the others
+    """
+    semaphore = asyncio.Semaphore(DELETE_CONCURRENCY)
+
+    async def run(batch: List[str]) -> Dict[str, str]:
+        try:
+            async with semaphore:
+                response = await delete_batch(batch)
+            return response.get("deleted", {})
+        except Exception as e:
+            return {public_id: f"error: {e}" for public_id in batch}
+
+    batches = [
+        public_ids[start : start + DELETE_BATCH_SIZE]
+        for start in range(0, len(public_ids), DELETE_BATCH_SIZE)
+    ]
+    statuses: Dict[str, str] = {}
+    for result in await asyncio.gather(*[run(batch) for batch in batches]):
+        statuses.update(result)
+    return statuses
+
+
+def thumbnail_url(
+    public_id: str, version: Optional[int] = None, format: Optional[str] = None
+) -> str:
+    """
+    URL of the 400x400 thumbnail of an image, built locally
+
+    It is the URL of the eager derived asset, so it works before the eager
+    thumbnail is ready too (Cloudinary then renders it on first request).
+    """
+    return cloudinary.CloudinaryImage(public_id, version=version, format=format).build_url(
+        secure=True, transformation=THUMBNAIL_EAGER
+    )
+
+
+def eager_upload_options() -> Dict[str, Any]:
+    """Eager thumbnail options, rendered in the background when configured"""
+    options: Dict[str, Any] = {"eager_async": settings.CLOUDINARY_EAGER_ASYNC}
+    if settings.CLOUDINARY_EAGER_ASYNC and settings.CLOUDINARY_NOTIFICATION_URL:
+        options["eager_notification_url"] = settings.CLOUDINARY_NOTIFICATION_URL
+    return options
+
+
+def image_upload_result(response: Dict[str, Any]) -> Dict[str, Any]:
+    """Extract the fields we store from an image upload response"""
+    eager_url = (
+        response.get("eager", [{}])[0].get("secure_url")
+        if response.get("eager")
+        else None
+    )
+    return {
+        "url": response.get("secure_url"),
+        "public_id": response.get("public_id"),
+        # With async eager the thumbnail is not ready yet, the notification
+        # receiver stores Cloudinary's URL once it is
+        "thumbnail_url": eager_url or thumbnail_url(
+            response.get("public_id"), response.get("version"), response.get("format")
+        ),
+        "width": response.get("width"),
+        "height": response.get("height"),
+        "format": response.get("format"),
+        "bytes": response.get("bytes"),
+        "resource_type": response.get("resource_type"),
+        "phash": response.get("phash"),  # Perceptual hash, for near-duplicate detection
+    }
+
+
+def video_upload_result(response: Dict[str, Any]) -> Dict[str, Any]:
+    """Extract the fields we store from a video upload response"""
+    return {
+        "url": response.get("secure_url"),
+        "public_id": response.get("public_id"),
+        "thumbnail_url": None,  # No thumbnail generation for videos as per requirements
+        "width": response.get("width"),
+        "height": response.get("height"),
+        "format": response.get("format"),
+        "bytes": response.get("bytes"),
+        "duration": response.get("duration"),  # Duration in seconds
+        "resource_type": response.get("resource_type"),
+    }
+
+
+class ExecutorStats:
+    """Queue depth and latency counters for the SDK thread pool"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.max_queued = 0
+        self.total_wait = 0.0
+
+    def submitted(self) -> None:
+        with self._lock:
+            self.queued += 1
+            self.max_queued = max(self.max_queued, self.queued)
+
+    def started(self, waited: float) -> None:
+        with self._lock:
+            self.queued -= 1
+            self.running += 1
+            self.total_wait += waited
+
+    def finished(self, ok: bool) -> None:
+        with self._lock:
+            self.running -= 1
+            if ok:
+                self.completed += 1
+            else:
+                self.failed += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            done = self.completed + self.failed
+            return {
+                "queued": self.queued,
+                "running": self.running,
+                "completed": self.completed,
+                "failed": self.failed,
+                "max_queued": self.max_queued,
+                "avg_queue_wait_ms": round(self.total_wait / done * 1000, 3) if done else 0.0,
+            }
 
 
 class CloudinaryService:
     """Service for handling Cloudinary operations"""
 
-    def __init__(self):
+    def __init__(self, max_workers: Optional[int] = None):
         # Configure Cloudinary
         cloudinary.config(
             cloud_name=settings.CLOUDINARY_CLOUD_NAME,
@@ -18,6 +184,63 @@ class CloudinaryService:
             secure=True,
         )
 
+        # The SDK is blocking, so every call runs in a dedicated bounded pool
+        # instead of freezing the event loop
+        self.max_workers = max_workers or settings.CLOUDINARY_MAX_WORKERS
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="cloudinary"
+        )
+        self.executor_stats = ExecutorStats()
+
+    async def _run(self, func: Callable, *args, **kwargs) -> Any:
+        """Run a blocking SDK call in the thread pool"""
+        stats = self.executor_stats
+        submitted_at = time.perf_counter()
+
+        def call():
+            stats.started(time.perf_counter() - submitted_at)
+            ok = False
+            try:
+                result = func(*args, **kwargs)
+                ok = True
+                return result
+            finally:
+                stats.finished(ok)
+
+        stats.submitted()
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, call)
+
+    def stats(self) -> Dict[str, Any]:
+        """Thread pool usage for monitoring"""
+        return {
+            "backend": "sdk",
+            "max_workers": self.max_workers,
+            **self.executor_stats.snapshot(),
+        }
+
+    async def _upload_chunked(
+        self, file: BinaryIO, filename: str, size: int, **options
+    ) -> Dict[str, Any]:
+        """Upload a large file chunk by chunk through the SDK"""
+
+        async def read_chunk(source: BinaryIO, chunk_size: int) -> bytes:
+            return await self._run(source.read, chunk_size)
+
+        async def send_chunk(chunk: bytes, headers: Dict[str, str]) -> Dict[str, Any]:
+            return await self._run(
+                cloudinary.uploader.upload_large_part,
+                (filename or "upload", chunk),
+                http_headers=headers,
+                **options,
+            )
+
+        return await upload_in_chunks(file, size, read_chunk, send_chunk)
+
+    async def close(self) -> None:
+        """Stop the thread pool (called on application shutdown)"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
     async def upload_image(
         self, file: BinaryIO, filename: str, folder: str = "photos"
     ) -> Dict[str, Any]:
@@ -34,44 +257,19 @@ class CloudinaryService:
         """
         try:
             # Upload the image
-            response = cloudinary.uploader.upload(
+            response = await self._run(
+                cloudinary.uploader.upload,
                 file,
                 folder=folder,
                 resource_type="image",
-                transformation=[
-                    {"quality": "auto:good"},
-                    {"fetch_format": "auto"},
-                ],
+                transformation=DELIVERY_TRANSFORMATION,
                 # Generate thumbnail
-                eager=[
-                    {
-                        "width": 400,
-                        "height": 400,
-                        "crop": "fill",
-                        "gravity": "auto",
-                        "quality": "auto:good",
-                    }
-                ],
-                eager_async=False,
+                eager=THUMBNAIL_EAGER,
+                **eager_upload_options(),
+                phash=True,
             )
 
-            # Extract relevant data
-            result = {
-                "url": response.get("secure_url"),
-                "public_id": response.get("public_id"),
-                "thumbnail_url": (
-                    response.get("eager", [{}])[0].get("secure_url")
-                    if response.get("eager")
-                    else None
-                ),
-                "width": response.get("width"),
-                "height": response.get("height"),
-                "format": response.get("format"),
-                "bytes": response.get("bytes"),
-                "resource_type": response.get("resource_type"),
-            }
-
-            return result
+            return image_upload_result(response)
 
         except Exception as e:
             raise Exception(f"Failed to upload image to Cloudinary: {str(e)}")
@@ -91,31 +289,21 @@ class CloudinaryService:
             Dict with upload response including url, public_id, duration, etc.
         """
         try:
-            # Upload the video
-            response = cloudinary.uploader.upload(
-                file,
-                folder=folder,
-                resource_type="video",
-                transformation=[
-                    {"quality": "auto:good"},
-                    {"fetch_format": "auto"},
-                ],
-            )
-
-            # Extract relevant data
-            result = {
-                "url": response.get("secure_url"),
-                "public_id": response.get("public_id"),
-                "thumbnail_url": None,  # No thumbnail generation for videos as per requirements
-                "width": response.get("width"),
-                "height": response.get("height"),
-                "format": response.get("format"),
-                "bytes": response.get("bytes"),
-                "duration": response.get("duration"),  # Duration in seconds
-                "resource_type": response.get("resource_type"),
+            file = as_file(file)
+            size = get_file_size(file)
+            options = {
+                "folder": folder,
+                "resource_type": "video",
+                "transformation": DELIVERY_TRANSFORMATION,
             }
 
-            return result
+            # Large videos go in retryable chunks instead of one long request
+            if should_upload_in_chunks(size):
+                response = await self._upload_chunked(file, filename, size, **options)
+            else:
+                response = await self._run(cloudinary.uploader.upload, file, **options)
+
+            return video_upload_result(response)
 
         except Exception as e:
             raise Exception(f"Failed to upload video to Cloudinary: {str(e)}")
@@ -152,34 +340,60 @@ class CloudinaryService:
         results = await asyncio.gather(*[upload_single(data) for data in files_data])
         return results
 
-    async def delete_image(self, public_id: str) -> Dict[str, Any]:
+    async def delete_image(self, public_id: str, resource_type: str = "image") -> Dict[str, Any]:
         """
-        Delete an image from Cloudinary
+        Delete an image (or, with resource_type="video", a video) from Cloudinary
 
         Args:
-            public_id: Cloudinary public ID of the image
+            public_id: Cloudinary public ID of the asset
+            resource_type: "image" or "video"
 
         Returns:
             Dict with deletion response
         """
         try:
-            response = cloudinary.uploader.destroy(public_id, resource_type="image")
+            response = await self._run(
+                cloudinary.uploader.destroy, public_id, resource_type=resource_type
+            )
             return response
         except Exception as e:
-            raise Exception(f"Failed to delete image from Cloudinary: {str(e)}")
+            raise Exception(f"Failed to delete {resource_type} from Cloudinary: {str(e)}")
+
+    async def delete_resources(
+        self, public_ids: List[str], resource_type: str = "image"
+    ) -> Dict[str, str]:
+        """
+        Delete many assets of one resource type with the Admin API
+
+        Returns:
+            Dict public_id -> "deleted", "not_found" or an error message
+        """
+
+        async def delete_batch(batch: List[str]) -> Dict[str, Any]:
+            return await self._run(
+                cloudinary.api.delete_resources, batch, resource_type=resource_type
+            )
+
+        return await delete_in_batches(public_ids, delete_batch)
 
-    async def get_image_details(self, public_id: str) -> Dict[str, Any]:
+    async def get_image_details(
+        self, public_id: str, phash: bool = False, resource_type: str = "image"
+    ) -> Dict[str, Any]:
         """
-        Get details of an image from Cloudinary
+        Get details of an image (or video) from Cloudinary
 
         Args:
             public_id: Cloudinary public ID of the image
+            phash: Include the perceptual hash
+            resource_type: "image" or "video"
 
         Returns:
             Dict with image details
         """
         try:
-            response = cloudinary.api.resource(public_id, resource_type="image")
+            response = await self._run(
+                cloudinary.api.resource, public_id, resource_type=resource_type, phash=phash
+            )
             return response
         except Exception as e:
             raise Exception(f"Failed to get image details from Cloudinary: {str(e)}")
@@ -195,16 +409,47 @@ class CloudinaryService:
             Dict with deletion response
         """
         try:
-            # Delete all resources in the folder
-            response = cloudinary.api.delete_resources_by_prefix(
-                folder_path, resource_type="image"
-            )
+            # Delete all resources in the folder (up to 1000 per type)
+            deleted: Dict[str, str] = {}
+            for resource_type in ("image", "video"):
+                response = await self._run(
+                    cloudinary.api.delete_resources_by_prefix,
+                    folder_path,
+                    resource_type=resource_type,
+                )
+                deleted.update(response.get("deleted", {}))
             # Delete the folder
-            cloudinary.api.delete_folder(folder_path)
-            return response
+            await self._run(cloudinary.api.delete_folder, folder_path)
+            return {"deleted": deleted}
         except Exception as e:
             raise Exception(f"Failed to delete folder from Cloudinary: {str(e)}")
 
+    async def list_resources(
+        self,
+        prefix: str,
+        resource_type: str = "image",
+        max_results: int = 500,
+        next_cursor: Optional[str] = None,
+    ) -> Tuple[List[str], Optional[str]]:
+        """
+        List one page of the public IDs under a prefix
+
+        Returns:
+            Tuple (public_ids, next_cursor); next_cursor is None on the last page
+        """
+        options = {"type": "upload", "prefix": prefix, "max_results": max_results}
+        if next_cursor:
+            options["next_cursor"] = next_cursor
+        response = await self._run(
+            cloudinary.api.resources, resource_type=resource_type, **options
+        )
+        public_ids = [resource["public_id"] for resource in response.get("resources", [])]
+        return public_ids, response.get("next_cursor")
+
+    async def delete_empty_folder(self, folder_path: str) -> Dict[str, Any]:
+        """Delete a folder whose assets have already been deleted"""
+        return await self._run(cloudinary.api.delete_folder, folder_path)
+
     def generate_transformation_url(
         self, public_id: str, width: int = None, height: int = None, crop: str = "fill"
     ) -> str:
@@ -0,0 +1,127 @@
+import hashlib
+import hmac
+import time
+from datetime import datetime
+from typing import Any, Dict, List
+
+import cloudinary
+
+from app.infrastructure.config.settings import settings
+from app.infrastructure.external_services.cloudinary_service import (
+    DELIVERY_TRANSFORMATION,
+    THUMBNAIL_EAGER,
+    eager_upload_options,
+    thumbnail_url,
+)
+
+# Short names used by Cloudinary transformation strings
+_TRANSFORMATION_KEYS = {
+    "crop": "c",
+    "fetch_format": "f",
+    "gravity": "g",
+    "height": "h",
+    "quality": "q",
+    "width": "w",
+}
+
+# Cloudinary accepts signed requests whose timestamp is at most one hour old
+CLOUDINARY_SIGNATURE_WINDOW_SECONDS = 3600
+
+# Notifications older than this are rejected as replays
+NOTIFICATION_MAX_AGE_SECONDS = 7200
+
+
+def transformation_string(transformations: List[Dict[str, Any]]) -> str:
+    """Build a chained transformation string, e.g. "q_auto:good/f_auto" """
+    return "/".join(
+        ",".join(
+            sorted(f"{_TRANSFORMATION_KEYS[key]}_{value}" for key, value in step.items())
+        )
+        for step in transformations
+    )
+
+
+def sign_params(params: Dict[str, Any], api_secret: str, algorithm: str = "sha1") -> str:
+    """Sign upload API parameters the way Cloudinary expects"""
+    to_sign = "&".join(
+        f"{key}={','.join(map(str, value)) if isinstance(value, list) else value}"
+        for key, value in sorted(params.items())
+        if value is not None and value != ""
+    )
+    return hashlib.new(algorithm, (to_sign + api_secret).encode()).hexdigest()
+
+
+class CloudinaryUploadSigner:
+    """Issues and verifies signatures for browser-to-Cloudinary uploads"""
+
+    def __init__(self):
+        self.cloud_name = settings.CLOUDINARY_CLOUD_NAME
+        self.api_key = settings.CLOUDINARY_API_KEY
+        self.api_secret = settings.CLOUDINARY_API_SECRET
+
+    def sign_upload(self, folder: str, resource_type: str) -> Dict[str, Any]:
+        """
+        Signed parameters allowing one upload into folder
+
+        Cloudinary honours a signature for one hour after its timestamp, so
+        the timestamp is backdated to make it expire after
+        DIRECT_UPLOAD_TTL_SECONDS instead.
+        """
+        ttl = min(settings.DIRECT_UPLOAD_TTL_SECONDS, CLOUDINARY_SIGNATURE_WINDOW_SECONDS)
+        now = int(time.time())
+        timestamp = now - (CLOUDINARY_SIGNATURE_WINDOW_SECONDS - ttl)
+
+        params: Dict[str, Any] = {
+            "folder": folder,
+            "timestamp": str(timestamp),
+            "transformation": transformation_string(DELIVERY_TRANSFORMATION),
+        }
+        if resource_type == "image":
+            params["eager"] = transformation_string(THUMBNAIL_EAGER)
+            for key, value in eager_upload_options().items():
+                params[key] = str(value).lower() if isinstance(value, bool) else value
+            params["phash"] = "true"
+
+        params["signature"] = sign_params(params, self.api_secret)
+        params["api_key"] = self.api_key
+
+        return {
+            "cloud_name": self.cloud_name,
+            "upload_url": (
+                f"{settings.CLOUDINARY_API_BASE_URL.rstrip('/')}"
+                f"/v1_1/{self.cloud_name}/{resource_type}/upload"
+            ),
+            "params": params,
+            "expires_at": datetime.utcfromtimestamp(now + ttl),
+        }
+
+    def verify_upload(self, public_id: str, version: int, signature: str) -> bool:
+        """Check the signature Cloudinary returns with every upload response"""
+        expected = sign_params({"public_id": public_id, "version": version}, self.api_secret)
+        return hmac.compare_digest(expected, signature)
+
+    def delivery_url(self, public_id: str, resource_type: str, version: int, format: str) -> str:
+        """Secure URL of an uploaded asset, built from verified fields only"""
+        return cloudinary.CloudinaryResource(
+            public_id, format=format, version=version, resource_type=resource_type
+        ).build_url(secure=True)
+
+    def thumbnail_url(self, public_id: str, version: int, format: str = None) -> str:
+        """URL of the eager 400x400 thumbnail of an image"""
+        return thumbnail_url(public_id, version, format)
+
+    def verify_notification(self, body: bytes, timestamp: str, signature: str) -> bool:
+        """
+        Check the X-Cld-Signature header of a notification
+
+        Cloudinary signs the raw body followed by the X-Cld-Timestamp value.
+        """
+        try:
+            age = time.time() - int(timestamp)
+        except (TypeError, ValueError):
+            return False
+        if age > NOTIFICATION_MAX_AGE_SECONDS:
+            return False
+
+        expected = hashlib.sha1(body + timestamp.encode() + self.api_secret.encode()).hexdigest()
+        return hmac.compare_digest(expected, signature or "")
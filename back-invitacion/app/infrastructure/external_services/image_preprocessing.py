@@ -0,0 +1,280 @@
+import asyncio
+import multiprocessing
+import os
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
+
+from app.infrastructure.external_services.chunked_upload import as_file, get_file_size
+
+# Formats worth re-encoding; PNG and GIF may carry transparency or animation
+PREPROCESSED_EXTENSIONS = {".jpg", ".jpeg", ".heic", ".heif", ".webp"}
+OUTPUT_EXTENSIONS = {"jpeg": ".jpg", "webp": ".webp"}
+
+
+def pillow_available() -> bool:
+    try:
+        import PIL  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _process_image(
+    source_path: str, target_path: str, max_edge: int, output_format: str, quality: int
+) -> Optional[Dict[str, Any]]:
+    """
+    Downscale and re-encode one image (runs in a worker process)
+
+    Orientation from EXIF is applied to the pixels first, so dropping the
+    metadata afterwards does not rotate the photo; the ICC profile is kept
+    for correct colours. Returns None for animations, which are left alone.
+    """
+    from PIL import Image, ImageOps
+
+    try:
+        from pillow_heif import register_heif_opener
+
+        register_heif_opener()
+    except ImportError:
+        pass
+
+    with Image.open(source_path) as image:
+        if getattr(image, "is_animated", False):
+            return None
+
+        source_format = (image.format or "").lower()
+        icc_profile = image.info.get("icc_profile")
+        image = ImageOps.exif_transpose(image)
+
+        resized = max(image.size) > max_edge
+        if resized:
+            image.thumbnail((max_edge, max_edge), Image.LANCZOS)
+
+        keeps_alpha = output_format == "webp" and image.mode == "RGBA"
+        if image.mode not in ("RGB", "L") and not keeps_alpha:
+            image = image.convert("RGB")
+
+        options: Dict[str, Any] = {"quality": quality}
+        if icc_profile:
+            options["icc_profile"] = icc_profile
+        if output_format == "jpeg":
+            options.update(optimize=True, progressive=True)
+        else:
+            options["method"] = 4
+
+        image.save(target_path, format=output_format.upper(), **options)
+
+        return {
+            "width": image.width,
+            "height": image.height,
+            "source_format": source_format,
+            "resized": resized,
+        }
+
+
+class PreprocessingStats:
+    """Counters of the preprocessing stage"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.processed = 0
+        self.skipped = 0
+        self.failed = 0
+        self.original_bytes = 0
+        self.bytes_saved = 0
+
+    def record(self, outcome: str, original_bytes: int = 0, bytes_saved: int = 0) -> None:
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+            self.original_bytes += original_bytes
+            self.bytes_saved += bytes_saved
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "processed": self.processed,
+                "skipped": self.skipped,
+                "failed": self.failed,
+                "original_bytes": self.original_bytes,
+                "bytes_saved": self.bytes_saved,
+            }
+
+
+class ImagePreprocessor:
+    """
+    Pool of processes shrinking images before they are sent to storage
+
+    Cloudinary delivers "quality: auto:good" renditions anyway, so a 48 MP
+    original or a HEIC file mostly costs upload time. Images are capped to
+    max_edge pixels, converted to JPEG or WebP and stripped of metadata in
+    separate processes, keeping the event loop and the GIL free.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        max_edge: int = 3072,
+        output_format: str = "jpeg",
+        quality: int = 88,
+        min_bytes: int = 512 * 1024,
+    ):
+        self.max_workers = max_workers
+        self.max_edge = max_edge
+        self.output_format = output_format
+        self.quality = quality
+        self.min_bytes = min_bytes
+        # Spawned workers only import Pillow, nothing from the parent's state
+        self._executor = ProcessPoolExecutor(
+            max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")
+        )
+        self.preprocessing_stats = PreprocessingStats()
+
+    def should_preprocess(self, filename: str, size: int) -> bool:
+        extension = os.path.splitext(filename or "")[1].lower()
+        return extension in PREPROCESSED_EXTENSIONS and size >= self.min_bytes
+
+    def _output_filename(self, filename: str) -> str:
+        return os.path.splitext(filename or "upload")[0] + OUTPUT_EXTENSIONS[self.output_format]
+
+    async def preprocess(
+        self, file: BinaryIO, filename: str
+    ) -> Tuple[BinaryIO, str, Dict[str, Any]]:
+        """
+        Shrink an image if worthwhile
+
+        Returns:
+            Tuple (file to upload, its filename, report with original_bytes,
+            bytes and bytes_saved). The original is returned unchanged when
+            it is not a candidate, cannot be decoded or would not get smaller.
+        """
+        file = as_file(file)
+        position = file.tell()
+        original_bytes = get_file_size(file)
+        report = {"original_bytes": original_bytes, "bytes": original_bytes, "bytes_saved": 0}
+
+        if not self.should_preprocess(filename, original_bytes):
+            self.preprocessing_stats.record("skipped")
+            return file, filename, report
+
+        source = tempfile.NamedTemporaryFile(suffix=os.path.splitext(filename)[1], delete=False)
+        target_path = source.name + OUTPUT_EXTENSIONS[self.output_format]
+        try:
+            await asyncio.to_thread(shutil.copyfileobj, file, source, 1024 * 1024)
+            source.close()
+            file.seek(position)
+
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(
+                self._executor,
+                _process_image,
+                source.name,
+                target_path,
+                self.max_edge,
+                self.output_format,
+                self.quality,
+            )
+            if result is None:
+                self.preprocessing_stats.record("skipped")
+                return file, filename, report
+
+            processed_bytes = os.path.getsize(target_path)
+            is_heif = os.path.splitext(filename)[1].lower() in (".heic", ".heif")
+            if processed_bytes >= original_bytes and not is_heif:
+                # Already compact; keep the original
+                self.preprocessing_stats.record("skipped")
+                return file, filename, report
+
+            # Unlinked right away; the open handle keeps the data until closed
+            processed = open(target_path, "rb")
+            report.update(
+                bytes=processed_bytes,
+                bytes_saved=original_bytes - processed_bytes,
+            )
+            self.preprocessing_stats.record(
+                "processed", original_bytes, report["bytes_saved"]
+            )
+            return processed, self._output_filename(filename), report
+
+        except Exception:
+            # Any decoding problem: upload the original as before
+            self.preprocessing_stats.record("failed")
+            file.seek(position)
+            return file, filename, report
+        finally:
+            source.close()
+            for path in (source.name, target_path):
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_workers": self.max_workers,
+            "max_edge": self.max_edge,
+            "output_format": self.output_format,
+            **self.preprocessing_stats.snapshot(),
+        }
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class PreprocessingStorageService:
+    """
+    Storage service decorator running images through an ImagePreprocessor
+
+    upload_image results gain original_bytes and bytes_saved; every other
+    call goes straight to the wrapped service.
+    """
+
+    def __init__(self, storage_service, preprocessor: ImagePreprocessor):
+        self.storage_service = storage_service
+        self.preprocessor = preprocessor
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.storage_service, name)
+
+    async def upload_image(
+        self, file: BinaryIO, filename: str, folder: str = "photos"
+    ) -> Dict[str, Any]:
+        """Upload an image to Cloudinary after shrinking it locally"""
+        upload, upload_filename, report = await self.preprocessor.preprocess(file, filename)
+        try:
+            result = await self.storage_service.upload_image(upload, upload_filename, folder)
+        finally:
+            if upload is not file:
+                upload.close()
+
+        return {
+            **result,
+            "original_bytes": report["original_bytes"],
+            "bytes_saved": report["bytes_saved"],
+        }
+
+    async def bulk_upload(
+        self, files_data: List[Tuple[BinaryIO, str, str]], folder: str = "photos"
+    ) -> List[Dict[str, Any]]:
+        """Upload multiple files in parallel, preprocessing the images"""
+
+        async def upload_single(file_data: Tuple[BinaryIO, str, str]) -> Dict[str, Any]:
+            file, filename, media_type = file_data
+            try:
+                if media_type == "video":
+                    return await self.storage_service.upload_video(file, filename, folder)
+                return await self.upload_image(file, filename, folder)
+            except Exception as e:
+                return {"error": str(e), "filename": filename, "success": False}
+
+        return await asyncio.gather(*[upload_single(data) for data in files_data])
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.storage_service.stats(),
+            "preprocessing": self.preprocessor.stats(),
+        }
+
+    async def close(self) -> None:
+        self.preprocessor.close()
+        await self.storage_service.close()
@@ -0,0 +1,89 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+import cloudinary
+
+
+@dataclass(frozen=True)
+class ImageVariants:
+    """Delivery URLs of an image at each width bucket"""
+
+    urls: Tuple[Tuple[int, str], ...]  # (width, url), narrowest first
+    srcset: str  # Ready for <img srcset>: "url 320w, url 640w, ..."
+
+
+class ImageVariantUrls:
+    """
+    Builds width-bucketed delivery URLs (srcset) of images, memoized per photo
+
+    Every variant is resized with c_limit (never upscaled) and delivered
+    with f_auto/q_auto, so phones get a small WebP/AVIF instead of the
+    original. Building (and optionally signing) a Cloudinary URL is pure
+    CPU work that list endpoints would otherwise repeat for every photo of
+    every page; the URLs of a photo never change, so they are kept in an
+    LRU keyed by (public_id, format, width).
+    """
+
+    def __init__(self, widths: List[int], max_size: int = 50000, sign_urls: bool = False):
+        self.widths = sorted(set(widths))
+        self.sign_urls = sign_urls
+        self.max_size = max_size
+        self._get = lru_cache(maxsize=max_size)(self._build) if max_size else self._build
+
+    def get(
+        self, public_id: str, format: Optional[str] = None, width: Optional[int] = None
+    ) -> ImageVariants:
+        """
+        Variants of an image
+
+        Args:
+            public_id: Cloudinary public ID
+            format: Stored format (extension of the URLs)
+            width: Width of the original; wider buckets are left out
+        """
+        return self._get(public_id, format, width)
+
+    def stats(self) -> Dict[str, Any]:
+        """Memoization counters for monitoring"""
+        if not self.max_size:
+            return {"enabled": False}
+        info = self._get.cache_info()
+        return {
+            "enabled": True,
+            "size": info.currsize,
+            "max_size": info.maxsize,
+            "hits": info.hits,
+            "misses": info.misses,
+        }
+
+    def clear(self) -> None:
+        if self.max_size:
+            self._get.cache_clear()
+
+    def _build(
+        self, public_id: str, format: Optional[str], width: Optional[int]
+    ) -> ImageVariants:
+        widths = [bucket for bucket in self.widths if not width or bucket <= width]
+        if not widths:
+            # Smaller than every bucket: a single variant at its own width
+            widths = [width]
+
+        image = cloudinary.CloudinaryImage(public_id, format=format)
+        urls = tuple(
+            (
+                bucket,
+                image.build_url(
+                    secure=True,
+                    sign_url=self.sign_urls,
+                    transformation=[
+                        {"width": bucket, "crop": "limit"},
+                        {"quality": "auto", "fetch_format": "auto"},
+                    ],
+                ),
+            )
+            for bucket in widths
+        )
+        return ImageVariants(
+            urls=urls, srcset=", ".join(f"{url} {bucket}w" for bucket, url in urls)
+        )
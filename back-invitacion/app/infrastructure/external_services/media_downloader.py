@@ -0,0 +1,136 @@
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Dict, Optional
+
+import httpx
+
+from app.infrastructure.config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+
+
+class MediaDownloader:
+    """
+    Streams delivered media files (Cloudinary CDN URLs) over a pooled client
+
+    Files are read chunk by chunk, never buffered whole. A download that
+    fails midway is resumed with a Range request from the last byte
+    received, so a dropped connection does not restart a large video.
+    """
+
+    def __init__(
+        self,
+        max_connections: Optional[int] = None,
+        retries: Optional[int] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        max_connections = max_connections or settings.EXPORT_HTTP_MAX_CONNECTIONS
+        self.retries = settings.EXPORT_FETCH_RETRIES if retries is None else retries
+        self._client = httpx.AsyncClient(
+            transport=transport,
+            follow_redirects=True,
+            timeout=httpx.Timeout(settings.EXPORT_FETCH_TIMEOUT_SECONDS, connect=10.0),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+                keepalive_expiry=60.0,
+            ),
+        )
+        self.downloads = 0
+        self.in_flight = 0
+        self.bytes = 0
+        self.resumed = 0
+        self.failed = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Download counters for monitoring"""
+        return {
+            "downloads": self.downloads,
+            "in_flight": self.in_flight,
+            "bytes": self.bytes,
+            "resumed": self.resumed,
+            "failed": self.failed,
+        }
+
+    async def close(self) -> None:
+        """Close pooled connections (called on application shutdown)"""
+        await self._client.aclose()
+
+    async def size(self, url: str) -> int:
+        """Length of a file from a HEAD request"""
+        response = await self._client.head(url)
+        response.raise_for_status()
+        return int(response.headers["content-length"])
+
+    async def stream(
+        self, url: str, start: int = 0, end: Optional[int] = None, size: Optional[int] = None
+    ) -> AsyncIterator[bytes]:
+        """
+        Yield the bytes [start, end) of a file
+
+        Args:
+            url: File URL
+            start: First byte
+            end: Byte after the last one, None for the end of the file
+            size: Expected length of the whole file; a different length raises
+        """
+        self.downloads += 1
+        self.in_flight += 1
+        position = start
+        attempt = 0
+        try:
+            while end is None or position < end:
+                headers = {}
+                if position or end is not None:
+                    last = "" if end is None else str(end - 1)
+                    headers["Range"] = f"bytes={position}-{last}"
+                try:
+                    async with self._client.stream("GET", url, headers=headers) as response:
+                        response.raise_for_status()
+                        self._check_length(response, size)
+                        # A server ignoring Range sends the whole file
+                        skip = position if response.status_code == 200 else 0
+                        async for chunk in response.aiter_bytes(CHUNK_SIZE):
+                            if skip:
+                                if len(chunk) <= skip:
+                                    skip -= len(chunk)
+                                    continue
+                                chunk = chunk[skip:]
+                                skip = 0
+                            if end is not None and position + len(chunk) > end:
+                                chunk = chunk[: end - position]
+                            position += len(chunk)
+                            self.bytes += len(chunk)
+                            yield chunk
+                            if end is not None and position >= end:
+                                return
+                    if end is not None and position < end:
+                        raise Exception(f"Download of {url} ended at byte {position} of {end}")
+                    return
+                except (httpx.TransportError, httpx.HTTPStatusError) as e:
+                    retryable = not isinstance(e, httpx.HTTPStatusError) or e.response.status_code >= 500
+                    if not retryable or attempt >= self.retries:
+                        raise
+                    attempt += 1
+                    self.resumed += 1
+                    logger.warning("Resuming download of %s at byte %s: %s", url, position, e)
+                    await asyncio.sleep(0.5 * 2 ** (attempt - 1))
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.in_flight -= 1
+
+    @staticmethod
+    def _check_length(response: httpx.Response, size: Optional[int]) -> None:
+        if size is None:
+            return
+        if response.status_code == 206:
+            # "bytes 0-1023/5000"
+            total = response.headers.get("content-range", "").rpartition("/")[2]
+        else:
+            total = response.headers.get("content-length", "")
+        if total.isdigit() and int(total) != size:
+            raise Exception(f"{response.url} is {total} bytes, {size} expected")
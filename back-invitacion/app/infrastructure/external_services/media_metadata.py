@@ -0,0 +1,413 @@
+import asyncio
+import io
+import multiprocessing
+import os
+import struct
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from app.infrastructure.external_services.chunked_upload import as_file
+
+# EXIF (APP1) is limited to 64 KB and sits right after the SOI marker
+IMAGE_HEADER_BYTES = 256 * 1024
+# HEIF keeps EXIF as an item anywhere in the file; phone photos are a few MB
+HEIF_MAX_BYTES = 16 * 1024 * 1024
+MOOV_MAX_BYTES = 16 * 1024 * 1024
+HEIF_EXTENSIONS = {".heic", ".heif"}
+
+# QuickTime/MP4 timestamps count seconds from 1904-01-01 (UTC)
+MP4_EPOCH = datetime(1904, 1, 1, tzinfo=timezone.utc)
+
+# Rotation of a track matrix (a, b) to the equivalent EXIF orientation
+MATRIX_ORIENTATIONS = {(1, 0): 1, (0, 1): 6, (-1, 0): 3, (0, -1): 8}
+
+JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+EXIF_ORIENTATION = 0x0112
+EXIF_DATETIME = 0x0132
+EXIF_IFD_POINTER = 0x8769
+EXIF_DATETIME_ORIGINAL = 0x9003
+EXIF_OFFSET_TIME_ORIGINAL = 0x9011
+
+
+def parse_exif_datetime(value: Optional[str], offset: Optional[str] = None) -> Optional[datetime]:
+    """
+    Datetime of an EXIF "YYYY:MM:DD HH:MM:SS" value
+
+    Timezone-aware when the camera recorded its UTC offset; otherwise naive,
+    the camera's wall-clock time (see to_utc).
+    """
+    if not value:
+        return None
+    try:
+        captured_at = datetime.strptime(value.strip("\x00 ")[:19], "%Y:%m:%d %H:%M:%S")
+    except ValueError:
+        return None  # Unset clocks write "0000:00:00 00:00:00"
+
+    if offset and len(offset) >= 6 and offset[0] in "+-":
+        try:
+            hours, minutes = int(offset[1:3]), int(offset[4:6])
+        except ValueError:
+            return captured_at
+        delta = timedelta(hours=hours, minutes=minutes)
+        captured_at = captured_at.replace(tzinfo=timezone(delta if offset[0] == "+" else -delta))
+    return captured_at
+
+
+def to_utc(value: Optional[datetime], local_timezone: str = "UTC") -> Optional[datetime]:
+    """
+    Naive UTC datetime, the convention of every stored timestamp
+
+    Aware values (EXIF with an offset, MP4 headers) are converted as they
+    are; naive EXIF wall-clock times are read in local_timezone, the zone
+    the events take place in.
+    """
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=ZoneInfo(local_timezone))
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _read_ifd(tiff: bytes, offset: int, endian: str) -> Dict[int, Any]:
+    """Tags of one TIFF IFD with SHORT, LONG or ASCII values"""
+    tags: Dict[int, Any] = {}
+    (count,) = struct.unpack_from(endian + "H", tiff, offset)
+    for index in range(count):
+        entry = offset + 2 + index * 12
+        tag, kind, length = struct.unpack_from(endian + "HHI", tiff, entry)
+        if kind == 3:  # SHORT
+            tags[tag] = struct.unpack_from(endian + "H", tiff, entry + 8)[0]
+        elif kind == 4:  # LONG
+            tags[tag] = struct.unpack_from(endian + "I", tiff, entry + 8)[0]
+        elif kind == 2:  # ASCII, inline up to 4 bytes
+            start = entry + 8
+            if length > 4:
+                (start,) = struct.unpack_from(endian + "I", tiff, entry + 8)
+            tags[tag] = tiff[start : start + length].split(b"\x00")[0].decode("ascii", "ignore")
+    return tags
+
+
+def parse_exif(tiff: bytes) -> Dict[str, Any]:
+    """Orientation and capture time from a TIFF-structured EXIF block"""
+    endian = "<" if tiff[:2] == b"II" else ">"
+    (ifd_offset,) = struct.unpack_from(endian + "I", tiff, 4)
+    tags = _read_ifd(tiff, ifd_offset, endian)
+
+    exif_tags: Dict[int, Any] = {}
+    if EXIF_IFD_POINTER in tags:
+        exif_tags = _read_ifd(tiff, tags[EXIF_IFD_POINTER], endian)
+
+    captured_at = parse_exif_datetime(
+        exif_tags.get(EXIF_DATETIME_ORIGINAL), exif_tags.get(EXIF_OFFSET_TIME_ORIGINAL)
+    ) or parse_exif_datetime(tags.get(EXIF_DATETIME))
+    return {"orientation": tags.get(EXIF_ORIENTATION), "captured_at": captured_at}
+
+
+def parse_jpeg(data: bytes) -> Dict[str, Any]:
+    """Dimensions, orientation and capture time from the header segments of a JPEG"""
+    metadata: Dict[str, Any] = {"format": "jpg"}
+    position = 2
+    while position + 4 <= len(data):
+        if data[position] != 0xFF:
+            break
+        marker = data[position + 1]
+        if marker == 0xFF:  # Fill byte
+            position += 1
+            continue
+        (length,) = struct.unpack_from(">H", data, position + 2)
+        segment = data[position + 4 : position + 2 + length]
+
+        if marker == 0xE1 and segment.startswith(b"Exif\x00\x00"):
+            metadata.update(parse_exif(segment[6:]))
+        elif marker in JPEG_SOF_MARKERS:
+            metadata["height"], metadata["width"] = struct.unpack_from(">HH", segment, 1)
+            break
+        elif marker == 0xDA:  # Start of scan: no more headers
+            break
+        position += 2 + length
+    return metadata
+
+
+def parse_png(data: bytes) -> Dict[str, Any]:
+    """Dimensions from the IHDR chunk of a PNG"""
+    width, height = struct.unpack_from(">II", data, 16)
+    return {"format": "png", "width": width, "height": height}
+
+
+def parse_with_pillow(data: bytes) -> Dict[str, Any]:
+    """Header metadata of any other image format Pillow (and pillow-heif) can open"""
+    try:
+        from PIL import Image
+    except ImportError:
+        return {}
+    try:
+        from pillow_heif import register_heif_opener
+
+        register_heif_opener()
+    except ImportError:
+        pass
+
+    # Image.open only parses headers; pixels are never decoded here
+    with Image.open(io.BytesIO(data)) as image:
+        exif = image.getexif()
+        exif_tags = exif.get_ifd(EXIF_IFD_POINTER)
+        captured_at = parse_exif_datetime(
+            exif_tags.get(EXIF_DATETIME_ORIGINAL), exif_tags.get(EXIF_OFFSET_TIME_ORIGINAL)
+        ) or parse_exif_datetime(exif.get(EXIF_DATETIME))
+        return {
+            "format": (image.format or "").lower() or None,
+            "width": image.width,
+            "height": image.height,
+            "orientation": exif.get(EXIF_ORIENTATION),
+            "captured_at": captured_at,
+        }
+
+
+def _boxes(data: bytes, start: int = 0, end: Optional[int] = None) -> Iterator[Tuple[bytes, int, int]]:
+    """(type, payload start, payload end) of the ISO-BMFF boxes in data[start:end]"""
+    end = len(data) if end is None else end
+    position = start
+    while position + 8 <= end:
+        size, box_type = struct.unpack_from(">I4s", data, position)
+        header = 8
+        if size == 1:
+            (size,) = struct.unpack_from(">Q", data, position + 8)
+            header = 16
+        elif size == 0:
+            size = end - position
+        if size < header:
+            return
+        yield box_type, position + header, min(position + size, end)
+        position += size
+
+
+def parse_moov(moov: bytes) -> Dict[str, Any]:
+    """Duration, capture time, dimensions and rotation from an MP4/QuickTime moov box"""
+    metadata: Dict[str, Any] = {}
+    for box_type, start, end in _boxes(moov):
+        if box_type == b"mvhd":
+            if moov[start] == 1:
+                created, _, timescale, duration = struct.unpack_from(">QQIQ", moov, start + 4)
+            else:
+                created, _, timescale, duration = struct.unpack_from(">IIII", moov, start + 4)
+            if timescale:
+                metadata["duration"] = duration / timescale
+            if created:
+                metadata["captured_at"] = MP4_EPOCH + timedelta(seconds=created)
+
+        elif box_type == b"trak" and "width" not in metadata:
+            for child_type, child_start, _ in _boxes(moov, start, end):
+                if child_type != b"tkhd":
+                    continue
+                # Matrix and 16.16 width/height follow the version-dependent times
+                offset = child_start + (88 if moov[child_start] == 1 else 76)
+                a, b = struct.unpack_from(">ii", moov, offset - 36)
+                width, height = struct.unpack_from(">II", moov, offset)
+                width, height = width >> 16, height >> 16
+                if width and height:  # Audio tracks have no size
+                    orientation = MATRIX_ORIENTATIONS.get((a >> 16, b >> 16), 1)
+                    if orientation in (6, 8):
+                        width, height = height, width
+                    metadata.update(width=width, height=height, orientation=orientation)
+    return metadata
+
+
+def _extract(sample: bytes, media_type: str, local_timezone: str = "UTC") -> Dict[str, Any]:
+    """Parse the header sample of one file (runs in a worker process)"""
+    metadata = _parse(sample, media_type)
+    if metadata.get("captured_at") is not None:
+        metadata["captured_at"] = to_utc(metadata["captured_at"], local_timezone)
+    return metadata
+
+
+def _parse(sample: bytes, media_type: str) -> Dict[str, Any]:
+    if media_type == "video":
+        return parse_moov(sample)
+
+    if sample.startswith(b"\xff\xd8"):
+        metadata = parse_jpeg(sample)
+    elif sample.startswith(b"\x89PNG\r\n\x1a\n"):
+        metadata = parse_png(sample)
+    else:
+        metadata = parse_with_pillow(sample)
+
+    # Report dimensions as displayed, like videos with a rotation matrix
+    if metadata.get("orientation") in (5, 6, 7, 8) and "width" in metadata:
+        metadata["width"], metadata["height"] = metadata["height"], metadata["width"]
+    return metadata
+
+
+def _read_moov(file: BinaryIO) -> Optional[bytes]:
+    """Contents of the moov box, skipping over mdat wherever it is in the file"""
+    while True:
+        header = file.read(8)
+        if len(header) < 8:
+            return None
+        size, box_type = struct.unpack(">I4s", header)
+        header_size = 8
+        if size == 1:
+            (size,) = struct.unpack(">Q", file.read(8))
+            header_size = 16
+
+        if box_type == b"moov":
+            length = size - header_size if size else MOOV_MAX_BYTES
+            return file.read(length) if length <= MOOV_MAX_BYTES else None
+        if size < header_size:
+            return None
+        file.seek(size - header_size, os.SEEK_CUR)
+
+
+def read_header_sample(file: BinaryIO, filename: str, media_type: str) -> Optional[bytes]:
+    """The part of a file the metadata lives in; the file position is restored"""
+    position = file.tell()
+    try:
+        if media_type == "video":
+            return _read_moov(file)
+        extension = os.path.splitext(filename or "")[1].lower()
+        return file.read(HEIF_MAX_BYTES if extension in HEIF_EXTENSIONS else IMAGE_HEADER_BYTES)
+    finally:
+        file.seek(position)
+
+
+class MetadataStats:
+    """Counters of the metadata extraction stage"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.extracted = 0
+        self.empty = 0
+        self.failed = 0
+
+    def record(self, outcome: str) -> None:
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"extracted": self.extracted, "empty": self.empty, "failed": self.failed}
+
+
+class MediaMetadataExtractor:
+    """
+    Pool of processes reading metadata from file headers
+
+    Only the header is read (EXIF segments of an image, the moov box of a
+    video), so the cost does not grow with the file size. Parsing happens
+    in separate processes to keep the event loop and the GIL free.
+    Capture times are returned in naive UTC; EXIF times without an offset
+    are taken as local time in local_timezone.
+    """
+
+    def __init__(self, max_workers: int = 2, local_timezone: str = "UTC"):
+        self.max_workers = max_workers
+        ZoneInfo(local_timezone)  # Fail at startup on an unknown zone, not per file
+        self.local_timezone = local_timezone
+        # Spawned workers import only this module, nothing from the parent's state
+        self._executor = ProcessPoolExecutor(
+            max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")
+        )
+        self.metadata_stats = MetadataStats()
+
+    async def read_sample(self, file: BinaryIO, filename: str, media_type: str) -> Optional[bytes]:
+        try:
+            return await asyncio.to_thread(read_header_sample, file, filename, media_type)
+        except (OSError, struct.error):
+            return None
+
+    async def extract(self, sample: Optional[bytes], media_type: str) -> Dict[str, Any]:
+        """Metadata found in a header sample; empty when there is none or it is unreadable"""
+        if not sample:
+            self.metadata_stats.record("empty")
+            return {}
+
+        loop = asyncio.get_running_loop()
+        try:
+            metadata = await loop.run_in_executor(
+                self._executor, _extract, sample, media_type, self.local_timezone
+            )
+        except Exception:
+            self.metadata_stats.record("failed")
+            return {}
+
+        metadata = {key: value for key, value in metadata.items() if value is not None}
+        self.metadata_stats.record("extracted" if metadata else "empty")
+        return metadata
+
+    def stats(self) -> Dict[str, Any]:
+        return {"max_workers": self.max_workers, **self.metadata_stats.snapshot()}
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class MetadataStorageService:
+    """
+    Storage service decorator adding locally extracted metadata to upload results
+
+    The header is read before the upload starts and parsed while the file is
+    being sent, so extraction adds no latency. Results gain orientation and
+    captured_at; width, height, duration and format keep Cloudinary's values
+    and are only filled in where Cloudinary returned none.
+    """
+
+    def __init__(self, storage_service, extractor: MediaMetadataExtractor):
+        self.storage_service = storage_service
+        self.extractor = extractor
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.storage_service, name)
+
+    async def _upload(self, upload, file: BinaryIO, filename: str, folder: str, media_type: str):
+        file = as_file(file)
+        sample = await self.extractor.read_sample(file, filename, media_type)
+        metadata, result = await asyncio.gather(
+            self.extractor.extract(sample, media_type),
+            upload(file, filename, folder),
+        )
+
+        merged = {**result}
+        for key in ("width", "height", "duration", "format"):
+            if merged.get(key) is None and key in metadata:
+                merged[key] = metadata[key]
+        merged["orientation"] = metadata.get("orientation")
+        merged["captured_at"] = metadata.get("captured_at")
+        return merged
+
+    async def upload_image(
+        self, file: BinaryIO, filename: str, folder: str = "photos"
+    ) -> Dict[str, Any]:
+        """Upload an image to Cloudinary, adding its EXIF metadata"""
+        return await self._upload(self.storage_service.upload_image, file, filename, folder, "image")
+
+    async def upload_video(
+        self, file: BinaryIO, filename: str, folder: str = "videos"
+    ) -> Dict[str, Any]:
+        """Upload a video to Cloudinary, adding its container metadata"""
+        return await self._upload(self.storage_service.upload_video, file, filename, folder, "video")
+
+    async def bulk_upload(
+        self, files_data: List[Tuple[BinaryIO, str, str]], folder: str = "photos"
+    ) -> List[Dict[str, Any]]:
+        """Upload multiple files in parallel, extracting their metadata"""
+
+        async def upload_single(file_data: Tuple[BinaryIO, str, str]) -> Dict[str, Any]:
+            file, filename, media_type = file_data
+            try:
+                if media_type == "video":
+                    return await self.upload_video(file, filename, folder)
+                return await self.upload_image(file, filename, folder)
+            except Exception as e:
+                return {"error": str(e), "filename": filename, "success": False}
+
+        return await asyncio.gather(*[upload_single(data) for data in files_data])
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.storage_service.stats(), "metadata": self.extractor.stats()}
+
+    async def close(self) -> None:
+        self.extractor.close()
+        await self.storage_service.close()
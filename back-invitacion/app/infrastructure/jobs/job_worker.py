@@ -0,0 +1,179 @@
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class JobTakenOver(Exception):
+    """The job was claimed by another worker; this one must stop working on it"""
+
+
+class JobWorker(ABC):
+    """
+    Pool of background tasks processing jobs claimed from a database table
+
+    Every application worker runs its own pool. Subclasses claim jobs with
+    SELECT ... FOR UPDATE SKIP LOCKED, so a job is processed by exactly one
+    task across all processes, and a job left half done by a dead worker is
+    taken over once it has made no progress for stale_seconds. Long calls
+    between two progress saves run under _heartbeat, so a live worker's job
+    is never mistaken for a dead one. Progress is only saved while the claim
+    is current; a worker whose job was taken over gets JobTakenOver and
+    abandons it, leaving the new owner's progress untouched.
+    """
+
+    job_name = "job"
+
+    def __init__(
+        self,
+        session_factory: Callable,
+        concurrency: int = 2,
+        poll_interval: float = 2.0,
+        stale_seconds: int = 600,
+        max_attempts: int = 3,
+    ):
+        self.session_factory = session_factory
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.stale_seconds = stale_seconds
+        self.max_attempts = max_attempts
+        # Several heartbeats fit in the stale window, so one slow commit is not fatal
+        self.heartbeat_interval = stale_seconds / 3
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self.active = 0
+        self.jobs_completed = 0
+        self.errors = 0
+
+    def start(self) -> None:
+        """Start the task pool (called on application startup)"""
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._run()) for _ in range(self.concurrency)]
+
+    async def stop(self) -> None:
+        """
+        Stop the task pool (called on application shutdown)
+
+        A job interrupted here stays claimed and is resumed by any worker
+        after stale_seconds.
+        """
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def notify(self) -> None:
+        """Wake an idle task right away instead of at the next poll"""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def stats(self) -> Dict[str, Any]:
+        """Task pool counters for monitoring"""
+        return {
+            "running": bool(self._tasks),
+            "concurrency": self.concurrency,
+            "active": self.active,
+            "jobs_completed": self.jobs_completed,
+            "errors": self.errors,
+        }
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                job = await self._claim()
+            except Exception:
+                logger.exception("Could not claim a %s", self.job_name)
+                self.errors += 1
+                job = None
+
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                self._wakeup.clear()
+                continue
+
+            self.active += 1
+            try:
+                await self._process(job)
+            except JobTakenOver:
+                logger.warning("%s %s was taken over, abandoning it", self.job_name.capitalize(), job.id)
+            except Exception:
+                logger.exception("%s %s failed", self.job_name.capitalize(), job.id)
+                self.errors += 1
+            finally:
+                self.active -= 1
+
+    async def _claim(self):
+        stale_before = datetime.utcnow() - timedelta(seconds=self.stale_seconds)
+        async with self.session_factory() as session:
+            job = await self._repository(session).claim_next(stale_before)
+            await session.commit()
+            return job
+
+    @asynccontextmanager
+    async def _heartbeat(self, job) -> AsyncIterator[None]:
+        """
+        Keep refreshing the job's locked_at while the block runs
+
+        If another worker takes the job over meanwhile, the block is
+        cancelled and JobTakenOver raised in its place.
+        """
+        block = asyncio.current_task()
+        task = asyncio.create_task(self._beat(job, block))
+        try:
+            yield
+        except asyncio.CancelledError:
+            if task.done() and not task.cancelled() and task.result() is False:
+                block.uncancel()
+                raise JobTakenOver(job.id)
+            raise
+        finally:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def _beat(self, job, block: asyncio.Task) -> bool:
+        """Refresh the claim until cancelled; on losing it, cancel the block and return False"""
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                async with self.session_factory() as session:
+                    held = await self._repository(session).heartbeat(job.id, job.attempts)
+                    await session.commit()
+            except Exception:
+                logger.exception("Could not refresh %s %s", self.job_name, job.id)
+                self.errors += 1
+                continue
+            if not held:
+                block.cancel()
+                return False
+
+    async def _save_progress(self, session, job):
+        """
+        Save the job's progress under its current claim
+
+        Returns None when the job no longer exists (its album was deleted);
+        raises JobTakenOver when another worker holds it now.
+        """
+        job.locked_at = datetime.utcnow()
+        repository = self._repository(session)
+        if await repository.save_progress(job):
+            return job
+        if await repository.get_by_id(job.id) is None:
+            return None
+        raise JobTakenOver(job.id)
+
+    @abstractmethod
+    def _repository(self, session):
+        """Repository of the job table for a session"""
+        pass
+
+    @abstractmethod
+    async def _process(self, job) -> None:
+        """Carry a claimed job through to completion (or failure)"""
+        pass
@@ -0,0 +1,110 @@
+import logging
+from datetime import datetime
+from typing import Any, Callable, Dict
+
+from app.domain.entities.album_purge_job import AlbumPurgeJob, PURGE_RESOURCE_TYPES
+from app.infrastructure.jobs.job_worker import JobWorker
+from app.infrastructure.repositories.album_purge_job_repository_impl import (
+    AlbumPurgeJobRepositoryImpl,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class AlbumPurgeWorker(JobWorker):
+    """
+    Pool of background tasks deleting the storage assets of deleted albums
+
+    The album folder is listed one page at a time per resource type (images,
+    then videos) and each page is deleted with batched delete_resources
+    calls. The listing position and the counters are saved after every
+    page, so a job interrupted by a restart resumes where it stopped.
+    """
+
+    job_name = "album purge job"
+
+    def __init__(
+        self,
+        storage_service,
+        session_factory: Callable,
+        page_size: int = 500,
+        concurrency: int = 1,
+        poll_interval: float = 5.0,
+        stale_seconds: int = 300,
+        max_attempts: int = 5,
+    ):
+        super().__init__(session_factory, concurrency, poll_interval, stale_seconds, max_attempts)
+        self.storage_service = storage_service
+        self.page_size = page_size
+        self.assets_deleted = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Task pool counters for monitoring"""
+        return {**super().stats(), "assets_deleted": self.assets_deleted}
+
+    def _repository(self, session) -> AlbumPurgeJobRepositoryImpl:
+        return AlbumPurgeJobRepositoryImpl(session)
+
+    async def _commit_progress(self, job: AlbumPurgeJob) -> None:
+        async with self.session_factory() as session:
+            await self._save_progress(session, job)
+            await session.commit()
+
+    async def _process(self, job: AlbumPurgeJob) -> None:
+        if job.attempts > self.max_attempts:
+            # The storage API keeps failing, leave the rest for an operator
+            job.status = "failed"
+            job.error_message = f"Gave up after {self.max_attempts} attempts"
+            job.finished_at = datetime.utcnow()
+            await self._commit_progress(job)
+            return
+
+        while job.resource_type:
+            async with self._heartbeat(job):
+                public_ids, next_cursor = await self.storage_service.list_resources(
+                    f"{job.folder}/", job.resource_type, self.page_size, job.next_cursor
+                )
+                statuses = {}
+                if public_ids:
+                    statuses = await self.storage_service.delete_resources(
+                        public_ids, job.resource_type
+                    )
+            failed = 0
+            if public_ids:
+                deleted = sum(
+                    1
+                    for public_id in public_ids
+                    if statuses.get(public_id) in ("deleted", "not_found")
+                )
+                failed = len(public_ids) - deleted
+                job.deleted += deleted
+                job.failed += failed
+                self.assets_deleted += deleted
+
+            if not public_ids or (failed and not next_cursor):
+                # This resource type is done, move on to the next one
+                position = PURGE_RESOURCE_TYPES.index(job.resource_type) + 1
+                job.resource_type = (
+                    PURGE_RESOURCE_TYPES[position] if position < len(PURGE_RESOURCE_TYPES) else None
+                )
+                job.next_cursor = None
+            elif failed:
+                # Step over assets that could not be deleted
+                job.next_cursor = next_cursor
+            # A fully deleted page is gone from the listing: list the same position again
+            await self._commit_progress(job)
+
+        if job.failed:
+            job.status = "failed"
+            job.error_message = f"{job.failed} assets could not be deleted"
+        else:
+            try:
+                await self.storage_service.delete_empty_folder(job.folder)
+            except Exception:
+                # Only an empty folder is left behind
+                logger.warning("Could not delete folder %s", job.folder)
+            job.status = "completed"
+
+        job.finished_at = datetime.utcnow()
+        await self._commit_progress(job)
+        self.jobs_completed += 1
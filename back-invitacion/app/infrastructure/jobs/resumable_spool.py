@@ -0,0 +1,317 @@
+import asyncio
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+import time
+import uuid
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import AsyncIterator, BinaryIO, List, Optional
+
+# Bytes received are written to disk in blocks of this size
+WRITE_BUFFER_BYTES = 1024 * 1024
+
+# Minimum seconds between two sweeps of expired uploads
+SWEEP_INTERVAL_SECONDS = 600
+
+
+class UploadLockedError(Exception):
+    """Another request is already writing to the upload"""
+
+
+class UploadOffsetError(Exception):
+    """The offset sent by the client is not the number of bytes stored"""
+
+    def __init__(self, offset: int):
+        self.offset = offset
+        super().__init__(f"Upload-Offset must be {offset}")
+
+
+class UploadLengthExceededError(Exception):
+    """The client sent more bytes than the declared Upload-Length"""
+
+
+@dataclass
+class ResumableUpload:
+    """A file being received in chunks"""
+
+    id: str
+    album_id: str
+    filename: str
+    media_type: str  # "image" or "video"
+    length: int  # Declared size of the whole file
+    uploader_name: Optional[str]
+    created_at: datetime
+    expires_at: datetime
+    offset: int = 0  # Bytes stored so far, read from the data file
+    photo_id: Optional[str] = None  # Set once the file is stored and saved
+    duplicate: bool = False  # The album already had the file
+
+    @property
+    def completed(self) -> bool:
+        return self.photo_id is not None
+
+    @property
+    def expired(self) -> bool:
+        return datetime.utcnow() >= self.expires_at
+
+
+class ResumableUploadSpool:
+    """
+    Local directory holding the partial files of resumable uploads
+
+    Each upload is stored as {directory}/{upload_id}/info.json plus the
+    bytes received so far in {upload_id}/data. The size of the data file is
+    the offset the client resumes from, so a chunk cut by a dropped
+    connection keeps everything that reached the server. Uploads expire
+    after expiry_seconds without receiving data and are removed by sweep().
+
+    The directory must be shared by every worker on the host: a flock on
+    {upload_id}/lock makes sure a single request writes to an upload.
+    """
+
+    def __init__(self, directory: str, expiry_seconds: int):
+        self.directory = directory
+        self.expiry_seconds = expiry_seconds
+        self._last_sweep = 0.0
+
+    def _path(self, upload_id: str, name: str = "") -> str:
+        return os.path.join(self.directory, upload_id, name)
+
+    def _write_info(self, upload: ResumableUpload) -> None:
+        info = {
+            "album_id": upload.album_id,
+            "filename": upload.filename,
+            "media_type": upload.media_type,
+            "length": upload.length,
+            "uploader_name": upload.uploader_name,
+            "created_at": upload.created_at.isoformat(),
+            "expires_at": upload.expires_at.isoformat(),
+            "photo_id": upload.photo_id,
+            "duplicate": upload.duplicate,
+        }
+        path = self._path(upload.id, "info.json")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as file:
+            json.dump(info, file)
+        os.replace(tmp_path, path)
+
+    def _load(self, upload_id: str) -> Optional[ResumableUpload]:
+        try:
+            # IDs come from URLs: anything but a UUID could escape the directory
+            upload_id = str(uuid.UUID(upload_id))
+            with open(self._path(upload_id, "info.json")) as file:
+                info = json.load(file)
+        except (ValueError, FileNotFoundError):
+            return None
+
+        upload = ResumableUpload(
+            id=upload_id,
+            album_id=info["album_id"],
+            filename=info["filename"],
+            media_type=info["media_type"],
+            length=info["length"],
+            uploader_name=info["uploader_name"],
+            created_at=datetime.fromisoformat(info["created_at"]),
+            expires_at=datetime.fromisoformat(info["expires_at"]),
+            photo_id=info["photo_id"],
+            duplicate=info["duplicate"],
+        )
+        if upload.completed:
+            # The data file is deleted once the photo is saved
+            upload.offset = upload.length
+        else:
+            try:
+                upload.offset = os.path.getsize(self._path(upload_id, "data"))
+            except FileNotFoundError:
+                upload.offset = 0
+        return upload
+
+    def _create(self, upload: ResumableUpload) -> None:
+        os.makedirs(self._path(upload.id))
+        open(self._path(upload.id, "data"), "wb").close()
+        self._write_info(upload)
+
+    async def create(
+        self,
+        album_id: str,
+        filename: str,
+        media_type: str,
+        length: int,
+        uploader_name: Optional[str] = None,
+    ) -> ResumableUpload:
+        """Start a new upload with no data"""
+        now = datetime.utcnow()
+        upload = ResumableUpload(
+            id=str(uuid.uuid4()),
+            album_id=album_id,
+            filename=filename,
+            media_type=media_type,
+            length=length,
+            uploader_name=uploader_name,
+            created_at=now,
+            expires_at=now + timedelta(seconds=self.expiry_seconds),
+        )
+        await asyncio.to_thread(self._create, upload)
+
+        # Creating uploads is what fills the directory, so it also empties it
+        if time.monotonic() - self._last_sweep >= SWEEP_INTERVAL_SECONDS:
+            self._last_sweep = time.monotonic()
+            await asyncio.to_thread(self.sweep)
+        return upload
+
+    async def get(self, upload_id: str) -> Optional[ResumableUpload]:
+        """Current state of an upload, None if it does not exist"""
+        return await asyncio.to_thread(self._load, upload_id)
+
+    @asynccontextmanager
+    async def lock(self, upload: ResumableUpload) -> AsyncIterator[ResumableUpload]:
+        """
+        Hold the write lock of an upload
+
+        Yields the upload reloaded under the lock, since another request may
+        have written to it in the meantime.
+
+        Raises:
+            UploadLockedError: Another request holds the lock
+        """
+        try:
+            fd = os.open(self._path(upload.id, "lock"), os.O_CREAT | os.O_RDWR)
+        except FileNotFoundError:
+            # Removed since it was loaded
+            raise UploadLockedError(f"Upload {upload.id} is gone")
+        try:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                raise UploadLockedError(f"Upload {upload.id} is being written by another request")
+            current = await self.get(upload.id)
+            if current is None:
+                raise UploadLockedError(f"Upload {upload.id} is gone")
+            yield current
+        finally:
+            os.close(fd)
+
+    async def append(
+        self, upload: ResumableUpload, offset: int, chunks: AsyncIterator[bytes]
+    ) -> int:
+        """
+        Write a chunk of the file at offset; call while holding lock()
+
+        Bytes are written as they arrive, so if the connection drops
+        mid-chunk everything received is kept and the client resumes from
+        there. The expiry is pushed back on every call.
+
+        Returns:
+            The new offset (also set on the upload)
+
+        Raises:
+            UploadOffsetError: offset is not the number of bytes stored
+            UploadLengthExceededError: The chunk goes past the declared length
+        """
+        if offset != upload.offset:
+            raise UploadOffsetError(upload.offset)
+
+        file = await asyncio.to_thread(open, self._path(upload.id, "data"), "ab")
+        buffer = bytearray()
+        try:
+            async for chunk in chunks:
+                if upload.offset + len(buffer) + len(chunk) > upload.length:
+                    raise UploadLengthExceededError(
+                        f"Upload is {upload.length} bytes, received more"
+                    )
+                buffer += chunk
+                if len(buffer) >= WRITE_BUFFER_BYTES:
+                    await asyncio.to_thread(file.write, buffer)
+                    upload.offset += len(buffer)
+                    buffer = bytearray()
+        finally:
+            # Also on a dropped connection: keep what was received
+            if buffer:
+                await asyncio.to_thread(file.write, buffer)
+                upload.offset += len(buffer)
+            await asyncio.to_thread(file.close)
+            upload.expires_at = datetime.utcnow() + timedelta(seconds=self.expiry_seconds)
+            await asyncio.to_thread(self._write_info, upload)
+        return upload.offset
+
+    def open(self, upload: ResumableUpload) -> BinaryIO:
+        return open(self._path(upload.id, "data"), "rb")
+
+    def _sha256(self, upload: ResumableUpload) -> str:
+        digest = hashlib.sha256()
+        with self.open(upload) as file:
+            for chunk in iter(lambda: file.read(1024 * 1024), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    async def checksum(self, upload: ResumableUpload) -> str:
+        """SHA-256 hex digest of the received file, used to detect duplicates"""
+        return await asyncio.to_thread(self._sha256, upload)
+
+    def _complete(self, upload: ResumableUpload) -> None:
+        self._write_info(upload)
+        try:
+            os.remove(self._path(upload.id, "data"))
+        except FileNotFoundError:
+            pass
+
+    async def complete(
+        self, upload: ResumableUpload, photo_id: str, duplicate: bool = False
+    ) -> None:
+        """
+        Record the photo created from an upload and drop its data
+
+        The upload stays until it expires, so a client that lost the
+        response of its last chunk can still see it finished.
+        """
+        upload.photo_id = photo_id
+        upload.duplicate = duplicate
+        await asyncio.to_thread(self._complete, upload)
+
+    def remove(self, upload_id: str) -> None:
+        shutil.rmtree(self._path(upload_id), ignore_errors=True)
+
+    def _upload_ids(self) -> List[str]:
+        try:
+            return os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+
+    def sweep(self) -> int:
+        """
+        Delete expired uploads that nobody is writing to
+
+        Returns:
+            Number of uploads deleted
+        """
+        removed = 0
+        for upload_id in self._upload_ids():
+            upload = self._load(upload_id)
+            if upload is not None and not upload.expired:
+                continue
+            if upload is None:
+                # Leftover without info.json, unless it is being created right now
+                try:
+                    age = time.time() - os.path.getmtime(self._path(upload_id))
+                except OSError:
+                    continue
+                if age < self.expiry_seconds:
+                    continue
+
+            try:
+                fd = os.open(self._path(upload_id, "lock"), os.O_CREAT | os.O_RDWR)
+            except OSError:
+                continue
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                os.close(fd)
+                continue
+            self.remove(upload_id)
+            os.close(fd)
+            removed += 1
+        return removed
@@ -0,0 +1,49 @@
+import asyncio
+import hashlib
+import os
+import shutil
+from typing import BinaryIO
+
+
+class UploadSpool:
+    """
+    Local directory holding the files of queued upload jobs
+
+    Files are stored as {directory}/{job_id}/{index} until the job has been
+    processed, so a job survives a worker restart together with its files.
+    The directory must be shared by every worker on the host.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def path(self, job_id: str, index: int) -> str:
+        return os.path.join(self.directory, job_id, str(index))
+
+    def _save(self, job_id: str, index: int, file: BinaryIO) -> str:
+        path = self.path(job_id, index)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        digest = hashlib.sha256()
+        with open(tmp_path, "wb") as target:
+            for chunk in iter(lambda: file.read(1024 * 1024), b""):
+                digest.update(chunk)
+                target.write(chunk)
+        os.replace(tmp_path, path)
+        return digest.hexdigest()
+
+    async def save(self, job_id: str, index: int, file: BinaryIO) -> str:
+        """
+        Copy an uploaded file into the spool without blocking the event loop
+
+        Returns:
+            SHA-256 hex digest of the file, computed during the copy
+        """
+        return await asyncio.to_thread(self._save, job_id, index, file)
+
+    def open(self, job_id: str, index: int) -> BinaryIO:
+        return open(self.path(job_id, index), "rb")
+
+    def remove(self, job_id: str) -> None:
+        """Delete the files of a job once it has been processed"""
+        shutil.rmtree(os.path.join(self.directory, job_id), ignore_errors=True)
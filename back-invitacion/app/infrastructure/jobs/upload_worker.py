@@ -0,0 +1,144 @@
+from datetime import datetime
+from typing import Any, Callable, Dict
+
+from app.domain.entities.upload_job import UploadJob, UploadJobItem
+from app.application.use_cases.photo_use_cases import photo_from_upload
+from app.infrastructure.jobs.job_worker import JobTakenOver, JobWorker
+from app.infrastructure.jobs.upload_spool import UploadSpool
+from app.infrastructure.repositories.upload_job_repository_impl import UploadJobRepositoryImpl
+
+
+class UploadJobWorker(JobWorker):
+    """
+    Pool of background tasks processing queued upload jobs
+
+    Jobs are claimed from the upload_jobs table. Each file is saved together
+    with the job's progress in one transaction, so a restarted job skips
+    the files that are already in the album.
+    """
+
+    job_name = "upload job"
+
+    def __init__(
+        self,
+        spool: UploadSpool,
+        storage_service,
+        session_factory: Callable,
+        photo_repository_factory: Callable,
+        album_repository_factory: Callable,
+        concurrency: int = 2,
+        poll_interval: float = 2.0,
+        stale_seconds: int = 600,
+        max_attempts: int = 3,
+    ):
+        super().__init__(session_factory, concurrency, poll_interval, stale_seconds, max_attempts)
+        self.spool = spool
+        self.storage_service = storage_service
+        self.photo_repository_factory = photo_repository_factory
+        self.album_repository_factory = album_repository_factory
+        self.files_processed = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Task pool counters for monitoring"""
+        return {**super().stats(), "files_processed": self.files_processed}
+
+    def _repository(self, session) -> UploadJobRepositoryImpl:
+        return UploadJobRepositoryImpl(session)
+
+    async def _complete_duplicate(self, job: UploadJob, item: UploadJobItem) -> bool:
+        """Record a file the album already has (uploaded before, or earlier in the job)"""
+        if not item.content_hash:
+            return False
+
+        async with self.session_factory() as session:
+            existing = await self.photo_repository_factory(session).get_by_content_hashes(
+                job.album_id, [item.content_hash]
+            )
+            if not existing:
+                return False
+
+            item.status = "completed"
+            item.duplicate = True
+            item.photo_id = existing[0].id
+            await self._save_progress(session, job)
+            await session.commit()
+        return True
+
+    async def _process(self, job: UploadJob) -> None:
+        if job.attempts > self.max_attempts:
+            # The job keeps killing its worker, give up on what is left
+            for item in job.items:
+                if item.status == "pending":
+                    item.status = "failed"
+                    item.error_message = f"Gave up after {self.max_attempts} attempts"
+
+        for index, item in enumerate(job.items):
+            if item.status != "pending":
+                continue
+
+            try:
+                if await self._complete_duplicate(job, item):
+                    self.files_processed += 1
+                    continue
+
+                # The upload can outlast stale_seconds: keep the job claimed meanwhile
+                async with self._heartbeat(job):
+                    with self.spool.open(job.id, index) as file:
+                        if item.media_type == "video":
+                            cloudinary_response = await self.storage_service.upload_video(
+                                file=file,
+                                filename=item.original_filename,
+                                folder=f"albums/{job.album_id}",
+                            )
+                        else:
+                            cloudinary_response = await self.storage_service.upload_image(
+                                file=file,
+                                filename=item.original_filename,
+                                folder=f"albums/{job.album_id}",
+                            )
+
+                photo = photo_from_upload(
+                    cloudinary_response,
+                    job.album_id,
+                    item.media_type,
+                    item.original_filename,
+                    job.uploader_name,
+                    item.content_hash,
+                )
+
+                # Photo, album counter and job progress commit together
+                async with self.session_factory() as session:
+                    saved_photo = await self.photo_repository_factory(session).create(photo)
+                    await self.album_repository_factory(session).adjust_photo_count(
+                        job.album_id, 1
+                    )
+                    item.status = "completed"
+                    item.photo_id = saved_photo.id
+                    item.bytes_saved = cloudinary_response.get("bytes_saved")
+                    if await self._save_progress(session, job) is None:
+                        # The album (and with it the job) was deleted meanwhile
+                        await session.rollback()
+                        self.spool.remove(job.id)
+                        return
+                    await session.commit()
+
+            except JobTakenOver:
+                # The new owner uploads the rest; its spool files must stay
+                raise
+            except Exception as e:
+                item.status = "failed"
+                item.error_message = str(e)
+                async with self.session_factory() as session:
+                    await self._save_progress(session, job)
+                    await session.commit()
+
+            self.files_processed += 1
+
+        job.status = "failed" if job.items and job.successful == 0 else "completed"
+        job.finished_at = datetime.utcnow()
+        async with self.session_factory() as session:
+            await self._save_progress(session, job)
+            await session.commit()
+
+        self.spool.remove(job.id)
+        self.jobs_completed += 1
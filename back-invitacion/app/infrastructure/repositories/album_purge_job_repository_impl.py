@@ -0,0 +1,189 @@
+from typing import Optional, List
+from sqlalchemy import select, update, and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
+
+from app.domain.entities.album_purge_job import AlbumPurgeJob
+from app.domain.repositories.album_purge_job_repository import AlbumPurgeJobRepository
+from app.infrastructure.database.models import AlbumPurgeJobModel
+
+
+class AlbumPurgeJobRepositoryImpl(AlbumPurgeJobRepository):
+    """SQLAlchemy implementation of AlbumPurgeJobRepository"""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    def _to_entity(self, model: AlbumPurgeJobModel) -> AlbumPurgeJob:
+        """Convert SQLAlchemy model to domain entity"""
+        return AlbumPurgeJob(
+            id=model.id,
+            album_id=model.album_id,
+            folder=model.folder,
+            status=model.status,
+            resource_type=model.resource_type,
+            next_cursor=model.next_cursor,
+            deleted=model.deleted,
+            failed=model.failed,
+            attempts=model.attempts,
+            locked_at=model.locked_at,
+            finished_at=model.finished_at,
+            error_message=model.error_message,
+            created_at=model.created_at,
+            updated_at=model.updated_at,
+        )
+
+    def _to_model(self, entity: AlbumPurgeJob) -> AlbumPurgeJobModel:
+        """Convert domain entity to SQLAlchemy model"""
+        return AlbumPurgeJobModel(
+            id=entity.id,
+            album_id=entity.album_id,
+            folder=entity.folder,
+            status=entity.status,
+            resource_type=entity.resource_type,
+            next_cursor=entity.next_cursor,
+            deleted=entity.deleted,
+            failed=entity.failed,
+            attempts=entity.attempts,
+            locked_at=entity.locked_at,
+            finished_at=entity.finished_at,
+            error_message=entity.error_message,
+            created_at=entity.created_at,
+            updated_at=entity.updated_at,
+        )
+
+    async def create(self, entity: AlbumPurgeJob) -> AlbumPurgeJob:
+        """Create a new album purge job"""
+        model = self._to_model(entity)
+        self.session.add(model)
+        await self.session.flush()
+        await self.session.refresh(model)
+        return self._to_entity(model)
+
+    async def get_by_id(self, entity_id: str) -> Optional[AlbumPurgeJob]:
+        """Get album purge job by ID"""
+        result = await self.session.execute(
+            select(AlbumPurgeJobModel).where(AlbumPurgeJobModel.id == entity_id)
+        )
+        model = result.scalar_one_or_none()
+        return self._to_entity(model) if model else None
+
+    async def get_all(self, skip: int = 0, limit: int = 100) -> List[AlbumPurgeJob]:
+        """Get all album purge jobs with pagination"""
+        result = await self.session.execute(
+            select(AlbumPurgeJobModel)
+            .offset(skip)
+            .limit(limit)
+            .order_by(AlbumPurgeJobModel.created_at.desc())
+        )
+        models = result.scalars().all()
+        return [self._to_entity(model) for model in models]
+
+    async def update(self, entity_id: str, entity: AlbumPurgeJob) -> Optional[AlbumPurgeJob]:
+        """Update the status and progress of an album purge job"""
+        result = await self.session.execute(
+            select(AlbumPurgeJobModel).where(AlbumPurgeJobModel.id == entity_id)
+        )
+        model = result.scalar_one_or_none()
+        if not model:
+            return None
+
+        model.status = entity.status
+        model.resource_type = entity.resource_type
+        model.next_cursor = entity.next_cursor
+        model.deleted = entity.deleted
+        model.failed = entity.failed
+        model.locked_at = entity.locked_at
+        model.finished_at = entity.finished_at
+        model.error_message = entity.error_message
+        model.updated_at = datetime.utcnow()
+
+        await self.session.flush()
+        await self.session.refresh(model)
+        return self._to_entity(model)
+
+    async def delete(self, entity_id: str) -> bool:
+        """Delete an album purge job"""
+        result = await self.session.execute(
+            select(AlbumPurgeJobModel).where(AlbumPurgeJobModel.id == entity_id)
+        )
+        model = result.scalar_one_or_none()
+        if not model:
+            return False
+
+        await self.session.delete(model)
+        await self.session.flush()
+        return True
+
+    async def claim_next(self, stale_before: datetime) -> Optional[AlbumPurgeJob]:
+        """
+        Claim the oldest runnable job with SELECT ... FOR UPDATE SKIP LOCKED
+
+        The row lock is held until the caller commits, so workers in other
+        processes skip the job instead of waiting for it.
+        """
+        result = await self.session.execute(
+            select(AlbumPurgeJobModel)
+            .where(
+                or_(
+                    AlbumPurgeJobModel.status == "queued",
+                    and_(
+                        AlbumPurgeJobModel.status == "processing",
+                        AlbumPurgeJobModel.locked_at < stale_before,
+                    ),
+                )
+            )
+            .order_by(AlbumPurgeJobModel.created_at)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        )
+        model = result.scalar_one_or_none()
+        if not model:
+            return None
+
+        now = datetime.utcnow()
+        model.status = "processing"
+        model.attempts = (model.attempts or 0) + 1
+        model.locked_at = now
+        model.updated_at = now
+
+        await self.session.flush()
+        return self._to_entity(model)
+
+    async def heartbeat(self, job_id: str, attempt: int) -> bool:
+        """Refresh locked_at in a single UPDATE, only for the current claim"""
+        result = await self.session.execute(
+            update(AlbumPurgeJobModel)
+            .where(
+                AlbumPurgeJobModel.id == job_id,
+                AlbumPurgeJobModel.status == "processing",
+                AlbumPurgeJobModel.attempts == attempt,
+            )
+            .values(locked_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount > 0
+
+    async def save_progress(self, entity: AlbumPurgeJob) -> bool:
+        """Write status, listing position and counters in one UPDATE guarded by the claim"""
+        result = await self.session.execute(
+            update(AlbumPurgeJobModel)
+            .where(
+                AlbumPurgeJobModel.id == entity.id,
+                AlbumPurgeJobModel.status == "processing",
+                AlbumPurgeJobModel.attempts == entity.attempts,
+            )
+            .values(
+                status=entity.status,
+                resource_type=entity.resource_type,
+                next_cursor=entity.next_cursor,
+                deleted=entity.deleted,
+                failed=entity.failed,
+                locked_at=entity.locked_at,
+                finished_at=entity.finished_at,
+                error_message=entity.error_message,
+                updated_at=datetime.utcnow(),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount > 0
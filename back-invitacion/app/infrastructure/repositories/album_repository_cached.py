@@ -0,0 +1,211 @@
+import time
+from collections import OrderedDict
+from typing import Optional, List, Dict, Any, Tuple
+
+from sqlalchemy import event
+
+from app.domain.entities.album import Album
+from app.domain.repositories.album_repository import AlbumRepository
+
+# Stored for unknown event codes so repeated lookups skip the database
+_MISSING = object()
+
+# Session.info key of the album IDs to invalidate again once the session commits
+_PENDING_KEY = "album_cache_pending"
+
+
+class AlbumCache:
+    """Bounded in-process LRU cache of albums with TTL and negative entries"""
+
+    def __init__(self, max_size: int = 256, ttl: float = 30.0, negative_ttl: float = 10.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.negative_hits = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def id_key(album_id: str) -> str:
+        return f"id:{album_id}"
+
+    @staticmethod
+    def code_key(event_code: str) -> str:
+        return f"code:{event_code.upper()}"
+
+    def get(self, key: str) -> Tuple[bool, Optional[Album]]:
+        """Return (found, album); album is None for a cached miss"""
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return False, None
+
+        self._entries.move_to_end(key)
+        value = entry[1]
+        if value is _MISSING:
+            self.negative_hits += 1
+            return True, None
+
+        self.hits += 1
+        # Callers mutate entities (e.g. UpdateAlbumUseCase), never hand out the cached one
+        return True, value.model_copy()
+
+    def set(self, key: str, album: Optional[Album]) -> None:
+        """Store an album, or a negative entry when album is None"""
+        if album is None:
+            value, ttl = _MISSING, self.negative_ttl
+        else:
+            value, ttl = album.model_copy(), self.ttl
+
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def store(self, album: Album) -> None:
+        """Cache an album under both its ID and its event code"""
+        self.set(self.id_key(album.id), album)
+        self.set(self.code_key(album.event_code), album)
+
+    def invalidate(self, album_id: str) -> None:
+        """Drop every entry pointing to an album"""
+        stale = [
+            key
+            for key, (_, value) in self._entries.items()
+            if key == self.id_key(album_id) or (value is not _MISSING and value.id == album_id)
+        ]
+        for key in stale:
+            del self._entries[key]
+        self.invalidations += 1
+
+    def invalidate_code(self, event_code: str) -> None:
+        """Drop the entry (positive or negative) for an event code"""
+        self._entries.pop(self.code_key(event_code), None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for monitoring"""
+        lookups = self.hits + self.negative_hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+            "hit_ratio": round((self.hits + self.negative_hits) / lookups, 4) if lookups else 0.0,
+        }
+
+
+class CachedAlbumRepository(AlbumRepository):
+    """
+    Read-through cache around another AlbumRepository
+
+    Writes drop the album from the cache right away, so the writing request
+    never reads its own stale entry, and again after the session commits:
+    until then other requests still read the old row and may have cached it.
+    """
+
+    def __init__(self, repository: AlbumRepository, cache: AlbumCache):
+        self.repository = repository
+        self.cache = cache
+
+    @property
+    def session(self):
+        """Session of the wrapped repository (use cases commit through it)"""
+        return self.repository.session
+
+    async def create(self, entity: Album) -> Album:
+        """Create a new album"""
+        album = await self.repository.create(entity)
+        # The code may have been cached as unknown
+        self.cache.invalidate_code(album.event_code)
+        return album
+
+    async def get_by_id(self, entity_id: str) -> Optional[Album]:
+        """Get album by ID"""
+        found, album = self.cache.get(self.cache.id_key(entity_id))
+        if found:
+            return album
+
+        album = await self.repository.get_by_id(entity_id)
+        if album:
+            self.cache.store(album)
+        return album
+
+    async def get_all(self, skip: int = 0, limit: int = 100) -> List[Album]:
+        """Get all albums with pagination"""
+        return await self.repository.get_all(skip=skip, limit=limit)
+
+    def _invalidate(self, album_id: str) -> None:
+        """Drop an album from the cache now and once the current transaction commits"""
+        self.cache.invalidate(album_id)
+        sync_session = getattr(getattr(self.repository, "session", None), "sync_session", None)
+        if sync_session is None:
+            # Not a SQLAlchemy session (in-memory repositories): writes are visible at once
+            return
+
+        pending = sync_session.info.get(_PENDING_KEY)
+        if pending is None:
+            pending = sync_session.info[_PENDING_KEY] = set()
+            cache = self.cache
+
+            @event.listens_for(sync_session, "after_commit")
+            def invalidate_committed(session) -> None:
+                for committed_id in pending:
+                    cache.invalidate(committed_id)
+                pending.clear()
+
+            @event.listens_for(sync_session, "after_soft_rollback")
+            def forget_rolled_back(session, previous_transaction) -> None:
+                pending.clear()
+
+        pending.add(album_id)
+
+    async def update(self, entity_id: str, entity: Album) -> Optional[Album]:
+        """Update an existing album"""
+        self._invalidate(entity_id)
+        return await self.repository.update(entity_id, entity)
+
+    async def delete(self, entity_id: str) -> bool:
+        """Delete an album"""
+        self._invalidate(entity_id)
+        return await self.repository.delete(entity_id)
+
+    async def get_by_event_code(self, event_code: str) -> Optional[Album]:
+        """Get album by event code"""
+        found, album = self.cache.get(self.cache.code_key(event_code))
+        if found:
+            return album
+
+        album = await self.repository.get_by_event_code(event_code)
+        if album:
+            self.cache.store(album)
+        else:
+            self.cache.set(self.cache.code_key(event_code), None)
+        return album
+
+    async def adjust_photo_count(self, album_id: str, delta: int) -> bool:
+        """Atomically add delta to the photo count"""
+        self._invalidate(album_id)
+        return await self.repository.adjust_photo_count(album_id, delta)
+
+    async def touch(self, album_id: str) -> bool:
+        """Bump the gallery version"""
+        self._invalidate(album_id)
+        return await self.repository.touch(album_id)
+
+    async def increment_photo_count(self, album_id: str) -> bool:
+        """Increment the photo count for an album"""
+        return await self.adjust_photo_count(album_id, 1)
+
+    async def decrement_photo_count(self, album_id: str) -> bool:
+        """Decrement the photo count for an album"""
+        return await self.adjust_photo_count(album_id, -1)
@@ -1,5 +1,5 @@
 from typing import Optional, List
-from sqlalchemy import select
+from sqlalchemy import select, update, case, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
 
@@ -25,6 +25,7 @@ class AlbumRepositoryImpl(AlbumRepository):
             is_active=model.is_active,
             max_photos_per_user=model.max_photos_per_user,
             photo_count=model.photo_count,
+            gallery_version=model.gallery_version,
             created_at=model.created_at,
             updated_at=model.updated_at,
         )
@@ -40,6 +41,7 @@ class AlbumRepositoryImpl(AlbumRepository):
             is_active=entity.is_active,
             max_photos_per_user=entity.max_photos_per_user,
             photo_count=entity.photo_count,
+            gallery_version=entity.gallery_version,
             created_at=entity.created_at,
             updated_at=entity.updated_at,
         )
@@ -84,6 +86,7 @@ class AlbumRepositoryImpl(AlbumRepository):
         model.is_active = entity.is_active
         model.max_photos_per_user = entity.max_photos_per_user
         model.photo_count = entity.photo_count
+        model.gallery_version = AlbumModel.gallery_version + 1
         model.updated_at = datetime.utcnow()
 
         await self.session.flush()
@@ -111,31 +114,46 @@ class AlbumRepositoryImpl(AlbumRepository):
         model = result.scalar_one_or_none()
         return self._to_entity(model) if model else None
 
-    async def increment_photo_count(self, album_id: str) -> bool:
-        """Increment the photo count for an album"""
+    async def adjust_photo_count(self, album_id: str, delta: int) -> bool:
+        """
+        Atomically add delta to the photo count in a single UPDATE
+
+        The arithmetic runs in SQL so concurrent uploads from several workers
+        never overwrite each other's increments; the gallery version is
+        bumped in the same statement.
+        """
+        new_count = func.coalesce(AlbumModel.photo_count, 0) + delta
         result = await self.session.execute(
-            select(AlbumModel).where(AlbumModel.id == album_id)
+            update(AlbumModel)
+            .where(AlbumModel.id == album_id)
+            .values(
+                photo_count=case((new_count < 0, 0), else_=new_count),
+                gallery_version=AlbumModel.gallery_version + 1,
+                updated_at=datetime.utcnow(),
+            )
+            .execution_options(synchronize_session=False)
         )
-        model = result.scalar_one_or_none()
-        if not model:
-            return False
+        return result.rowcount > 0
 
-        model.photo_count += 1
-        model.updated_at = datetime.utcnow()
-        await self.session.flush()
-        return True
+    async def touch(self, album_id: str) -> bool:
+        """
+        Bump the gallery version so every album and gallery validator changes
 
-    async def decrement_photo_count(self, album_id: str) -> bool:
-        """Decrement the photo count for an album"""
+        Used when only the album's photos changed (e.g. a thumbnail became
+        ready); unlike update() nothing is read first.
+        """
         result = await self.session.execute(
-            select(AlbumModel).where(AlbumModel.id == album_id)
+            update(AlbumModel)
+            .where(AlbumModel.id == album_id)
+            .values(gallery_version=AlbumModel.gallery_version + 1, updated_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
         )
-        model = result.scalar_one_or_none()
-        if not model:
-            return False
+        return result.rowcount > 0
 
-        if model.photo_count > 0:
-            model.photo_count -= 1
-            model.updated_at = datetime.utcnow()
-            await self.session.flush()
-        return True
+    async def increment_photo_count(self, album_id: str) -> bool:
+        """Increment the photo count for an album"""
+        return await self.adjust_photo_count(album_id, 1)
+
+    async def decrement_photo_count(self, album_id: str) -> bool:
+        """Decrement the photo count for an album"""
+        return await self.adjust_photo_count(album_id, -1)
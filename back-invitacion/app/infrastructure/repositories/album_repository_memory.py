@@ -37,6 +37,7 @@ class AlbumRepositoryMemory(AlbumRepository):
             return None
 
         entity.id = entity_id
+        entity.gallery_version = self._storage[entity_id].gallery_version + 1
         entity.updated_at = datetime.utcnow()
         self._storage[entity_id] = entity
         return entity
@@ -56,23 +57,31 @@ class AlbumRepositoryMemory(AlbumRepository):
                 return album
         return None
 
-    async def increment_photo_count(self, album_id: str) -> bool:
-        """Increment the photo count for an album"""
+    async def adjust_photo_count(self, album_id: str, delta: int) -> bool:
+        """Add delta to the photo count, never below zero"""
         album = self._storage.get(album_id)
         if not album:
             return False
 
-        album.photo_count += 1
+        album.photo_count = max(0, album.photo_count + delta)
+        album.gallery_version += 1
         album.updated_at = datetime.utcnow()
         return True
 
-    async def decrement_photo_count(self, album_id: str) -> bool:
-        """Decrement the photo count for an album"""
+    async def touch(self, album_id: str) -> bool:
+        """Bump the gallery version"""
         album = self._storage.get(album_id)
         if not album:
             return False
 
-        if album.photo_count > 0:
-            album.photo_count -= 1
-            album.updated_at = datetime.utcnow()
+        album.gallery_version += 1
+        album.updated_at = datetime.utcnow()
         return True
+
+    async def increment_photo_count(self, album_id: str) -> bool:
+        """Increment the photo count for an album"""
+        return await self.adjust_photo_count(album_id, 1)
+
+    async def decrement_photo_count(self, album_id: str) -> bool:
+        """Decrement the photo count for an album"""
+        return await self.adjust_photo_count(album_id, -1)
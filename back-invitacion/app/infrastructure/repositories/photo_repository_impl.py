@@ -1,11 +1,11 @@
-from typing import Optional, List
-from sqlalchemy import select
+from typing import Optional, List, Tuple
+from sqlalchemy import select, delete, and_, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
 
 from app.domain.entities.photo import Photo
 from app.domain.repositories.photo_repository import PhotoRepository
-from app.infrastructure.database.models import PhotoModel
+from app.infrastructure.database.models import PhotoModel, AlbumModel
 
 
 class PhotoRepositoryImpl(PhotoRepository):
@@ -30,6 +30,10 @@ class PhotoRepositoryImpl(PhotoRepository):
             height=model.height,
             format=model.format,
             duration=model.duration,
+            orientation=model.orientation,
+            captured_at=model.captured_at,
+            content_hash=model.content_hash,
+            perceptual_hash=model.perceptual_hash,
             created_at=model.created_at,
             updated_at=model.updated_at,
         )
@@ -50,6 +54,11 @@ class PhotoRepositoryImpl(PhotoRepository):
             height=entity.height,
             format=entity.format,
             duration=entity.duration,
+            orientation=entity.orientation,
+            # Photos without a capture time sort by their upload time
+            captured_at=entity.captured_at or entity.created_at,
+            content_hash=entity.content_hash,
+            perceptual_hash=entity.perceptual_hash,
             created_at=entity.created_at,
             updated_at=entity.updated_at,
         )
@@ -108,6 +117,10 @@ class PhotoRepositoryImpl(PhotoRepository):
         model.height = entity.height
         model.format = entity.format
         model.duration = entity.duration
+        model.orientation = entity.orientation
+        model.captured_at = entity.captured_at or model.captured_at
+        model.content_hash = entity.content_hash
+        model.perceptual_hash = entity.perceptual_hash
         model.updated_at = datetime.utcnow()
 
         await self.session.flush()
@@ -128,19 +141,101 @@ class PhotoRepositoryImpl(PhotoRepository):
         return True
 
     async def get_by_album_id(
-        self, album_id: str, skip: int = 0, limit: int = 100
+        self, album_id: str, skip: int = 0, limit: int = 100, order: str = "uploaded"
     ) -> List[Photo]:
         """Get all photos in an album"""
         result = await self.session.execute(
-            select(PhotoModel)
-            .where(PhotoModel.album_id == album_id)
-            .offset(skip)
-            .limit(limit)
-            .order_by(PhotoModel.created_at.desc())
+            self._keyset_query(album_id, None, order).offset(skip).limit(limit)
         )
         models = result.scalars().all()
         return [self._to_entity(model) for model in models]
 
+    def _keyset_query(
+        self, album_id: str, after: Optional[Tuple[datetime, str]], order: str = "uploaded"
+    ):
+        """
+        Build the keyset query for photos after the (timestamp, id) key
+
+        "uploaded" reads the (album_id, created_at, id) index backwards
+        (newest first), "captured" reads (album_id, captured_at, id) forwards
+        (chronological), so neither order needs a sort step.
+        """
+        query = select(PhotoModel).where(PhotoModel.album_id == album_id)
+        if order == "captured":
+            if after:
+                captured_at, photo_id = after
+                query = query.where(
+                    or_(
+                        PhotoModel.captured_at > captured_at,
+                        and_(PhotoModel.captured_at == captured_at, PhotoModel.id > photo_id),
+                    )
+                )
+            return query.order_by(PhotoModel.captured_at.asc(), PhotoModel.id.asc())
+
+        if after:
+            created_at, photo_id = after
+            query = query.where(
+                or_(
+                    PhotoModel.created_at < created_at,
+                    and_(PhotoModel.created_at == created_at, PhotoModel.id < photo_id),
+                )
+            )
+        return query.order_by(PhotoModel.created_at.desc(), PhotoModel.id.desc())
+
+    async def get_by_album_id_after(
+        self,
+        album_id: str,
+        after: Optional[Tuple[datetime, str]] = None,
+        limit: int = 100,
+        order: str = "uploaded",
+    ) -> List[Photo]:
+        """
+        Get photos in an album using keyset pagination
+
+        Seeks directly into the album's index for the order, so deep pages
+        cost the same as the first one.
+        """
+        result = await self.session.execute(
+            self._keyset_query(album_id, after, order).limit(limit)
+        )
+        models = result.scalars().all()
+        return [self._to_entity(model) for model in models]
+
+    async def get_page_with_total(
+        self,
+        album_id: str,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[Tuple[datetime, str]] = None,
+        order: str = "uploaded",
+    ) -> Tuple[List[Photo], int]:
+        """
+        Get a page of photos and albums.photo_count in a single round trip
+
+        The counter is read through a scalar subquery on every row, so no
+        COUNT(*) over the album is needed. Only an empty page falls back to
+        a second (primary key) lookup of the counter.
+        """
+        total_column = (
+            select(AlbumModel.photo_count)
+            .where(AlbumModel.id == album_id)
+            .scalar_subquery()
+            .label("total")
+        )
+        query = self._keyset_query(album_id, after, order).limit(limit)
+        if not after:
+            query = query.offset(skip)
+
+        result = await self.session.execute(query.add_columns(total_column))
+        rows = result.all()
+        if rows:
+            return [self._to_entity(row[0]) for row in rows], rows[0].total or 0
+
+        result = await self.session.execute(
+            select(AlbumModel.photo_count).where(AlbumModel.id == album_id)
+        )
+        return [], result.scalar() or 0
+
     async def get_by_public_id(self, public_id: str) -> Optional[Photo]:
         """Get photo by Cloudinary public ID"""
         result = await self.session.execute(
@@ -149,6 +244,41 @@ class PhotoRepositoryImpl(PhotoRepository):
         model = result.scalar_one_or_none()
         return self._to_entity(model) if model else None
 
+    async def get_by_content_hashes(self, album_id: str, content_hashes: List[str]) -> List[Photo]:
+        """Get the photos of an album whose file has one of the given SHA-256 digests"""
+        if not content_hashes:
+            return []
+
+        result = await self.session.execute(
+            select(PhotoModel).where(
+                PhotoModel.album_id == album_id,
+                PhotoModel.content_hash.in_(content_hashes),
+            )
+        )
+        models = result.scalars().all()
+        return [self._to_entity(model) for model in models]
+
+    async def get_by_ids(self, photo_ids: List[str]) -> List[Photo]:
+        """Get several photos by ID (unknown IDs are skipped)"""
+        if not photo_ids:
+            return []
+
+        result = await self.session.execute(
+            select(PhotoModel).where(PhotoModel.id.in_(photo_ids))
+        )
+        models = result.scalars().all()
+        return [self._to_entity(model) for model in models]
+
+    async def get_perceptual_hashes(self, album_id: str) -> List[Tuple[str, str]]:
+        """Get (photo_id, perceptual_hash) of every photo of an album that has one"""
+        result = await self.session.execute(
+            select(PhotoModel.id, PhotoModel.perceptual_hash).where(
+                PhotoModel.album_id == album_id,
+                PhotoModel.perceptual_hash.is_not(None),
+            )
+        )
+        return [(photo_id, perceptual_hash) for photo_id, perceptual_hash in result.all()]
+
     async def count_by_album_id(self, album_id: str) -> int:
         """Count photos in an album"""
         from sqlalchemy import func
@@ -170,3 +300,20 @@ class PhotoRepositoryImpl(PhotoRepository):
         await self.session.delete(model)
         await self.session.flush()
         return True
+
+    async def delete_by_ids(self, album_id: str, photo_ids: List[str]) -> int:
+        """
+        Delete several photos of an album in a single DELETE ... WHERE id IN (...)
+
+        Photos of other albums are left alone. The row count is returned so
+        the album counter is adjusted by what was actually deleted.
+        """
+        if not photo_ids:
+            return 0
+
+        result = await self.session.execute(
+            delete(PhotoModel)
+            .where(PhotoModel.album_id == album_id, PhotoModel.id.in_(photo_ids))
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
@@ -1,4 +1,4 @@
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Tuple
 from datetime import datetime
 import uuid
 
@@ -18,10 +18,15 @@ class PhotoRepositoryMemory(PhotoRepository):
             entity.id = str(uuid.uuid4())
         entity.created_at = datetime.utcnow()
         entity.updated_at = datetime.utcnow()
+        entity.captured_at = entity.captured_at or entity.created_at
 
         self._storage[entity.id] = entity
         return entity
 
+    async def bulk_create(self, entities: List[Photo]) -> List[Photo]:
+        """Create multiple photos in a single operation"""
+        return [await self.create(entity) for entity in entities]
+
     async def get_by_id(self, entity_id: str) -> Optional[Photo]:
         """Get photo by ID"""
         return self._storage.get(entity_id)
@@ -50,15 +55,55 @@ class PhotoRepositoryMemory(PhotoRepository):
         return True
 
     async def get_by_album_id(
-        self, album_id: str, skip: int = 0, limit: int = 100
+        self, album_id: str, skip: int = 0, limit: int = 100, order: str = "uploaded"
     ) -> List[Photo]:
         """Get all photos in an album"""
+        photos = await self.get_by_album_id_after(album_id, None, len(self._storage), order)
+        return photos[skip : skip + limit]
+
+    async def get_by_album_id_after(
+        self,
+        album_id: str,
+        after: Optional[Tuple[datetime, str]] = None,
+        limit: int = 100,
+        order: str = "uploaded",
+    ) -> List[Photo]:
+        """Get photos in an album using keyset pagination"""
+        if order == "captured":
+            # Chronological (oldest first)
+            photos = [
+                photo
+                for photo in self._storage.values()
+                if photo.album_id == album_id
+                and (after is None or (photo.captured_at, photo.id) > after)
+            ]
+            photos.sort(key=lambda x: (x.captured_at, x.id))
+            return photos[:limit]
+
         photos = [
-            photo for photo in self._storage.values() if photo.album_id == album_id
+            photo
+            for photo in self._storage.values()
+            if photo.album_id == album_id
+            and (after is None or (photo.created_at, photo.id) < after)
         ]
-        # Sort by created_at descending (newest first)
-        photos.sort(key=lambda x: x.created_at, reverse=True)
-        return photos[skip : skip + limit]
+        # Newest first
+        photos.sort(key=lambda x: (x.created_at, x.id), reverse=True)
+        return photos[:limit]
+
+    async def get_page_with_total(
+        self,
+        album_id: str,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[Tuple[datetime, str]] = None,
+        order: str = "uploaded",
+    ) -> Tuple[List[Photo], int]:
+        """Get a page of photos together with the album's photo count"""
+        if after:
+            photos = await self.get_by_album_id_after(album_id, after, limit, order)
+        else:
+            photos = await self.get_by_album_id(album_id, skip, limit, order)
+        return photos, await self.count_by_album_id(album_id)
 
     async def get_by_public_id(self, public_id: str) -> Optional[Photo]:
         """Get photo by Cloudinary public ID"""
@@ -67,6 +112,26 @@ class PhotoRepositoryMemory(PhotoRepository):
                 return photo
         return None
 
+    async def get_by_content_hashes(self, album_id: str, content_hashes: List[str]) -> List[Photo]:
+        """Get the photos of an album whose file has one of the given SHA-256 digests"""
+        return [
+            photo
+            for photo in self._storage.values()
+            if photo.album_id == album_id and photo.content_hash in content_hashes
+        ]
+
+    async def get_by_ids(self, photo_ids: List[str]) -> List[Photo]:
+        """Get several photos by ID (unknown IDs are skipped)"""
+        return [self._storage[photo_id] for photo_id in photo_ids if photo_id in self._storage]
+
+    async def get_perceptual_hashes(self, album_id: str) -> List[Tuple[str, str]]:
+        """Get (photo_id, perceptual_hash) of every photo of an album that has one"""
+        return [
+            (photo.id, photo.perceptual_hash)
+            for photo in self._storage.values()
+            if photo.album_id == album_id and photo.perceptual_hash
+        ]
+
     async def count_by_album_id(self, album_id: str) -> int:
         """Count photos in an album"""
         return len(
@@ -81,3 +146,13 @@ class PhotoRepositoryMemory(PhotoRepository):
 
         del self._storage[photo.id]
         return True
+
+    async def delete_by_ids(self, album_id: str, photo_ids: List[str]) -> int:
+        """Delete several photos of an album at once"""
+        deleted = 0
+        for photo_id in photo_ids:
+            photo = self._storage.get(photo_id)
+            if photo and photo.album_id == album_id:
+                del self._storage[photo_id]
+                deleted += 1
+        return deleted
@@ -0,0 +1,175 @@
+from typing import Optional, List, Set, Tuple
+from datetime import datetime
+
+from sqlalchemy import event
+
+from app.domain.entities.photo import Photo
+from app.domain.repositories.photo_repository import PhotoRepository
+from app.infrastructure.cache.gallery_snapshots import GallerySnapshotStore
+from app.infrastructure.database.models import PhotoModel
+
+# Session.info key of the album IDs whose snapshots are dropped once the session commits
+_PENDING_KEY = "gallery_snapshot_pending"
+
+
+class SnapshotPhotoRepository(PhotoRepository):
+    """
+    PhotoRepository wrapper that drops gallery snapshots when an album changes
+
+    Snapshots are dropped (and frozen galleries removed) only after the
+    session commits, like CachedAlbumRepository does for albums; pages are
+    then rebuilt lazily by the next request that asks for them.
+    """
+
+    def __init__(self, repository: PhotoRepository, store: GallerySnapshotStore):
+        self.repository = repository
+        self.store = store
+
+    @property
+    def session(self):
+        """Session of the wrapped repository (use cases commit through it)"""
+        return self.repository.session
+
+    def _pending(self) -> Optional[Set[str]]:
+        """Album IDs to invalidate on commit, or None without a SQLAlchemy session"""
+        sync_session = getattr(getattr(self.repository, "session", None), "sync_session", None)
+        if sync_session is None:
+            return None
+
+        pending = sync_session.info.get(_PENDING_KEY)
+        if pending is None:
+            pending = sync_session.info[_PENDING_KEY] = set()
+            store = self.store
+
+            @event.listens_for(sync_session, "after_flush")
+            def collect_deleted(session, flush_context) -> None:
+                # Single deletes load the row first, so its album comes with it
+                pending.update(
+                    model.album_id for model in session.deleted if isinstance(model, PhotoModel)
+                )
+
+            @event.listens_for(sync_session, "after_commit")
+            def invalidate_committed(session) -> None:
+                for album_id in pending:
+                    store.invalidate(album_id)
+                pending.clear()
+
+            @event.listens_for(sync_session, "after_soft_rollback")
+            def forget_rolled_back(session, previous_transaction) -> None:
+                pending.clear()
+
+        return pending
+
+    def _invalidate(self, album_id: str) -> None:
+        """Drop an album's snapshots once the current transaction commits"""
+        pending = self._pending()
+        if pending is None:
+            # Not a SQLAlchemy session (in-memory repositories): writes are visible at once
+            self.store.invalidate(album_id)
+        else:
+            pending.add(album_id)
+
+    async def create(self, entity: Photo) -> Photo:
+        """Create a new photo"""
+        photo = await self.repository.create(entity)
+        self._invalidate(photo.album_id)
+        return photo
+
+    async def bulk_create(self, entities: List[Photo]) -> List[Photo]:
+        """Create multiple photos in a single operation"""
+        photos = await self.repository.bulk_create(entities)
+        for album_id in {photo.album_id for photo in photos}:
+            self._invalidate(album_id)
+        return photos
+
+    async def get_by_id(self, entity_id: str) -> Optional[Photo]:
+        """Get photo by ID"""
+        return await self.repository.get_by_id(entity_id)
+
+    async def get_all(self, skip: int = 0, limit: int = 100) -> List[Photo]:
+        """Get all photos with pagination"""
+        return await self.repository.get_all(skip=skip, limit=limit)
+
+    async def update(self, entity_id: str, entity: Photo) -> Optional[Photo]:
+        """Update an existing photo"""
+        photo = await self.repository.update(entity_id, entity)
+        if photo:
+            self._invalidate(photo.album_id)
+        return photo
+
+    async def delete(self, entity_id: str) -> bool:
+        """Delete a photo"""
+        if self._pending() is not None:
+            # The deleted row's album is collected when the delete is flushed
+            return await self.repository.delete(entity_id)
+
+        photo = await self.repository.get_by_id(entity_id)
+        result = await self.repository.delete(entity_id)
+        if result and photo:
+            self.store.invalidate(photo.album_id)
+        return result
+
+    async def get_by_album_id(
+        self, album_id: str, skip: int = 0, limit: int = 100, order: str = "uploaded"
+    ) -> List[Photo]:
+        """Get all photos in an album"""
+        return await self.repository.get_by_album_id(album_id, skip, limit, order)
+
+    async def get_by_album_id_after(
+        self,
+        album_id: str,
+        after: Optional[Tuple[datetime, str]] = None,
+        limit: int = 100,
+        order: str = "uploaded",
+    ) -> List[Photo]:
+        """Get photos in an album using keyset pagination"""
+        return await self.repository.get_by_album_id_after(album_id, after, limit, order)
+
+    async def get_page_with_total(
+        self,
+        album_id: str,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[Tuple[datetime, str]] = None,
+        order: str = "uploaded",
+    ) -> Tuple[List[Photo], int]:
+        """Get a page of photos together with the album's photo count"""
+        return await self.repository.get_page_with_total(album_id, skip, limit, after, order)
+
+    async def get_by_public_id(self, public_id: str) -> Optional[Photo]:
+        """Get photo by Cloudinary public ID"""
+        return await self.repository.get_by_public_id(public_id)
+
+    async def get_by_content_hashes(self, album_id: str, content_hashes: List[str]) -> List[Photo]:
+        """Get the photos of an album whose file has one of the given SHA-256 digests"""
+        return await self.repository.get_by_content_hashes(album_id, content_hashes)
+
+    async def get_by_ids(self, photo_ids: List[str]) -> List[Photo]:
+        """Get several photos by ID (unknown IDs are skipped)"""
+        return await self.repository.get_by_ids(photo_ids)
+
+    async def get_perceptual_hashes(self, album_id: str) -> List[Tuple[str, str]]:
+        """Get (photo_id, perceptual_hash) of every photo of an album that has one"""
+        return await self.repository.get_perceptual_hashes(album_id)
+
+    async def count_by_album_id(self, album_id: str) -> int:
+        """Count photos in an album"""
+        return await self.repository.count_by_album_id(album_id)
+
+    async def delete_by_public_id(self, public_id: str) -> bool:
+        """Delete photo by Cloudinary public ID"""
+        if self._pending() is not None:
+            return await self.repository.delete_by_public_id(public_id)
+
+        photo = await self.repository.get_by_public_id(public_id)
+        result = await self.repository.delete_by_public_id(public_id)
+        if result and photo:
+            self.store.invalidate(photo.album_id)
+        return result
+
+    async def delete_by_ids(self, album_id: str, photo_ids: List[str]) -> int:
+        """Delete several photos of an album at once"""
+        deleted = await self.repository.delete_by_ids(album_id, photo_ids)
+        if deleted:
+            self._invalidate(album_id)
+        return deleted
@@ -3,10 +3,172 @@ Singleton instances and factory functions for repositories
 This file handles dependency injection for the application
 """
 
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.infrastructure.config.settings import settings
 from app.infrastructure.external_services.cloudinary_service import CloudinaryService
+from app.infrastructure.external_services.cloudinary_http_service import CloudinaryHttpService
+from app.infrastructure.external_services.cloudinary_signing import CloudinaryUploadSigner
+from app.infrastructure.external_services.image_preprocessing import (
+    ImagePreprocessor,
+    PreprocessingStorageService,
+    pillow_available,
+)
+from app.infrastructure.external_services.media_metadata import (
+    MediaMetadataExtractor,
+    MetadataStorageService,
+)
+from app.infrastructure.external_services.media_downloader import MediaDownloader
+from app.infrastructure.external_services.image_variants import ImageVariantUrls
+from app.application.services.album_export import ChecksumCache, SizeCache
+from app.application.services.upload_admission import UploadAdmission
+from app.infrastructure.repositories.album_repository_impl import AlbumRepositoryImpl
+from app.infrastructure.repositories.photo_repository_impl import PhotoRepositoryImpl
+from app.infrastructure.repositories.photo_repository_snapshot import SnapshotPhotoRepository
+from app.infrastructure.cache.gallery_snapshots import GallerySnapshotStore
+from app.infrastructure.cache.near_duplicates import NearDuplicateIndexCache
+from app.infrastructure.database.connection import AsyncSessionLocal
+from app.infrastructure.jobs.purge_worker import AlbumPurgeWorker
+from app.infrastructure.jobs.resumable_spool import ResumableUploadSpool
+from app.infrastructure.jobs.upload_spool import UploadSpool
+from app.infrastructure.jobs.upload_worker import UploadJobWorker
+from app.infrastructure.repositories.upload_job_repository_impl import UploadJobRepositoryImpl
+from app.infrastructure.repositories.album_purge_job_repository_impl import (
+    AlbumPurgeJobRepositoryImpl,
+)
+from app.infrastructure.repositories.album_repository_cached import (
+    AlbumCache,
+    CachedAlbumRepository,
+)
+from app.domain.repositories.album_repository import AlbumRepository
+from app.domain.repositories.photo_repository import PhotoRepository
+from app.domain.repositories.upload_job_repository import UploadJobRepository
+from app.domain.repositories.album_purge_job_repository import AlbumPurgeJobRepository
 
 # Cloudinary service singleton (stateless, can be shared)
-cloudinary_service = CloudinaryService()
+if settings.CLOUDINARY_BACKEND == "http":
+    cloudinary_service = CloudinaryHttpService()
+else:
+    cloudinary_service = CloudinaryService()
+
+# Shrink images locally before upload when enabled and Pillow is installed
+if settings.IMAGE_PREPROCESSING_ENABLED and pillow_available():
+    cloudinary_service = PreprocessingStorageService(
+        cloudinary_service,
+        ImagePreprocessor(
+            max_workers=settings.IMAGE_PREPROCESSING_WORKERS,
+            max_edge=settings.IMAGE_MAX_EDGE_PX,
+            output_format=settings.IMAGE_OUTPUT_FORMAT,
+            quality=settings.IMAGE_OUTPUT_QUALITY,
+            min_bytes=settings.IMAGE_PREPROCESSING_MIN_KB * 1024,
+        ),
+    )
+
+# Read EXIF / container metadata locally; wraps preprocessing so the original is read
+if settings.MEDIA_METADATA_ENABLED:
+    cloudinary_service = MetadataStorageService(
+        cloudinary_service,
+        MediaMetadataExtractor(
+            max_workers=settings.MEDIA_METADATA_WORKERS,
+            local_timezone=settings.MEDIA_LOCAL_TIMEZONE,
+        ),
+    )
+
+# Signer for browser-to-Cloudinary uploads (stateless, can be shared)
+direct_upload_signer = CloudinaryUploadSigner()
+
+# Album cache singleton (shared by every request in this worker)
+album_cache = AlbumCache(
+    max_size=settings.ALBUM_CACHE_MAX_SIZE,
+    ttl=settings.ALBUM_CACHE_TTL_SECONDS,
+    negative_ttl=settings.ALBUM_CACHE_NEGATIVE_TTL_SECONDS,
+)
+
+# Gallery snapshot store singleton (pages shared on disk by every worker)
+gallery_snapshot_store = GallerySnapshotStore(
+    directory=settings.GALLERY_SNAPSHOT_DIR,
+    static_directory=settings.GALLERY_STATIC_DIR,
+    max_pages=settings.GALLERY_SNAPSHOT_MAX_PAGES,
+)
+
+# Near-duplicate indexes (per worker, kept in sync incrementally)
+near_duplicate_indexes = NearDuplicateIndexCache(max_size=settings.NEAR_DUPLICATE_INDEX_MAX_ALBUMS)
+
+# Memoized srcset URLs of images (per worker, URLs never change)
+image_variants = ImageVariantUrls(
+    widths=settings.IMAGE_VARIANT_WIDTHS,
+    max_size=settings.IMAGE_VARIANT_CACHE_SIZE,
+    sign_urls=settings.IMAGE_VARIANT_SIGN_URLS,
+)
+
+# Budget of uploads this worker receives at once (enforced by the admission middleware)
+upload_admission = UploadAdmission(
+    max_uploads=settings.UPLOAD_MAX_CONCURRENT,
+    max_bytes=settings.UPLOAD_MAX_IN_FLIGHT_MB * 1024 * 1024,
+)
+
+# Album ZIP exports: pooled CDN client, CRC-32s and checked sizes of already exported files
+media_downloader = MediaDownloader()
+export_checksums = ChecksumCache(max_size=settings.EXPORT_CHECKSUM_CACHE_SIZE)
+export_sizes = SizeCache(max_size=settings.EXPORT_CHECKSUM_CACHE_SIZE)
+
+
+def create_album_repository(session: AsyncSession) -> AlbumRepository:
+    """Create the album repository for a session, behind the cache if enabled"""
+    repository = AlbumRepositoryImpl(session)
+    if settings.ALBUM_CACHE_ENABLED:
+        return CachedAlbumRepository(repository, album_cache)
+    return repository
+
+
+def create_photo_repository(session: AsyncSession) -> PhotoRepository:
+    """Create the photo repository for a session, invalidating snapshots on writes"""
+    repository = PhotoRepositoryImpl(session)
+    if settings.GALLERY_SNAPSHOT_ENABLED:
+        return SnapshotPhotoRepository(repository, gallery_snapshot_store)
+    return repository
+
+
+def create_upload_job_repository(session: AsyncSession) -> UploadJobRepository:
+    """Create the upload job repository for a session"""
+    return UploadJobRepositoryImpl(session)
+
+
+def create_album_purge_job_repository(session: AsyncSession) -> AlbumPurgeJobRepository:
+    """Create the album purge job repository for a session"""
+    return AlbumPurgeJobRepositoryImpl(session)
+
+
+# Files of queued upload jobs and the task pool processing them
+upload_spool = UploadSpool(settings.UPLOAD_JOB_DIR)
+upload_job_worker = UploadJobWorker(
+    spool=upload_spool,
+    storage_service=cloudinary_service,
+    session_factory=AsyncSessionLocal,
+    photo_repository_factory=create_photo_repository,
+    album_repository_factory=create_album_repository,
+    concurrency=settings.UPLOAD_JOB_CONCURRENCY,
+    poll_interval=settings.UPLOAD_JOB_POLL_SECONDS,
+    stale_seconds=settings.UPLOAD_JOB_STALE_SECONDS,
+    max_attempts=settings.UPLOAD_JOB_MAX_ATTEMPTS,
+)
+
+# Partial files of resumable (tus) uploads
+resumable_upload_spool = ResumableUploadSpool(
+    settings.RESUMABLE_UPLOAD_DIR,
+    expiry_seconds=settings.RESUMABLE_UPLOAD_EXPIRY_HOURS * 3600,
+)
+
+# Task pool deleting the storage assets of deleted albums
+album_purge_worker = AlbumPurgeWorker(
+    storage_service=cloudinary_service,
+    session_factory=AsyncSessionLocal,
+    page_size=settings.ALBUM_PURGE_PAGE_SIZE,
+    concurrency=settings.ALBUM_PURGE_CONCURRENCY,
+    poll_interval=settings.ALBUM_PURGE_POLL_SECONDS,
+    stale_seconds=settings.ALBUM_PURGE_STALE_SECONDS,
+    max_attempts=settings.ALBUM_PURGE_MAX_ATTEMPTS,
+)
+
 
-# Note: Database repositories are created per-request via dependency injection
-# See app/api/v1/dependencies/database.py for repository creation
+# Note: Database repositories are created per-request with the factories above
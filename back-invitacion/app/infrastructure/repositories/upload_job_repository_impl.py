@@ -0,0 +1,173 @@
+from typing import Optional, List
+from sqlalchemy import select, update, and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
+
+from app.domain.entities.upload_job import UploadJob, UploadJobItem
+from app.domain.repositories.upload_job_repository import UploadJobRepository
+from app.infrastructure.database.models import UploadJobModel
+
+
+class UploadJobRepositoryImpl(UploadJobRepository):
+    """SQLAlchemy implementation of UploadJobRepository"""
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    def _to_entity(self, model: UploadJobModel) -> UploadJob:
+        """Convert SQLAlchemy model to domain entity"""
+        return UploadJob(
+            id=model.id,
+            album_id=model.album_id,
+            uploader_name=model.uploader_name,
+            status=model.status,
+            items=[UploadJobItem(**item) for item in model.items],
+            attempts=model.attempts,
+            locked_at=model.locked_at,
+            finished_at=model.finished_at,
+            created_at=model.created_at,
+            updated_at=model.updated_at,
+        )
+
+    def _to_model(self, entity: UploadJob) -> UploadJobModel:
+        """Convert domain entity to SQLAlchemy model"""
+        return UploadJobModel(
+            id=entity.id,
+            album_id=entity.album_id,
+            uploader_name=entity.uploader_name,
+            status=entity.status,
+            items=[item.model_dump() for item in entity.items],
+            attempts=entity.attempts,
+            locked_at=entity.locked_at,
+            finished_at=entity.finished_at,
+            created_at=entity.created_at,
+            updated_at=entity.updated_at,
+        )
+
+    async def create(self, entity: UploadJob) -> UploadJob:
+        """Create a new upload job"""
+        model = self._to_model(entity)
+        self.session.add(model)
+        await self.session.flush()
+        await self.session.refresh(model)
+        return self._to_entity(model)
+
+    async def get_by_id(self, entity_id: str) -> Optional[UploadJob]:
+        """Get upload job by ID"""
+        result = await self.session.execute(
+            select(UploadJobModel).where(UploadJobModel.id == entity_id)
+        )
+        model = result.scalar_one_or_none()
+        return self._to_entity(model) if model else None
+
+    async def get_all(self, skip: int = 0, limit: int = 100) -> List[UploadJob]:
+        """Get all upload jobs with pagination"""
+        result = await self.session.execute(
+            select(UploadJobModel)
+            .offset(skip)
+            .limit(limit)
+            .order_by(UploadJobModel.created_at.desc())
+        )
+        models = result.scalars().all()
+        return [self._to_entity(model) for model in models]
+
+    async def update(self, entity_id: str, entity: UploadJob) -> Optional[UploadJob]:
+        """Update the status and per-file progress of an upload job"""
+        result = await self.session.execute(
+            select(UploadJobModel).where(UploadJobModel.id == entity_id)
+        )
+        model = result.scalar_one_or_none()
+        if not model:
+            return None
+
+        model.status = entity.status
+        model.items = [item.model_dump() for item in entity.items]
+        model.locked_at = entity.locked_at
+        model.finished_at = entity.finished_at
+        model.updated_at = datetime.utcnow()
+
+        await self.session.flush()
+        await self.session.refresh(model)
+        return self._to_entity(model)
+
+    async def delete(self, entity_id: str) -> bool:
+        """Delete an upload job"""
+        result = await self.session.execute(
+            select(UploadJobModel).where(UploadJobModel.id == entity_id)
+        )
+        model = result.scalar_one_or_none()
+        if not model:
+            return False
+
+        await self.session.delete(model)
+        await self.session.flush()
+        return True
+
+    async def claim_next(self, stale_before: datetime) -> Optional[UploadJob]:
+        """
+        Claim the oldest runnable job with SELECT ... FOR UPDATE SKIP LOCKED
+
+        The row lock is held until the caller commits, so workers in other
+        processes skip the job instead of waiting for it.
+        """
+        result = await self.session.execute(
+            select(UploadJobModel)
+            .where(
+                or_(
+                    UploadJobModel.status == "queued",
+                    and_(
+                        UploadJobModel.status == "processing",
+                        UploadJobModel.locked_at < stale_before,
+                    ),
+                )
+            )
+            .order_by(UploadJobModel.created_at)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        )
+        model = result.scalar_one_or_none()
+        if not model:
+            return None
+
+        now = datetime.utcnow()
+        model.status = "processing"
+        model.attempts = (model.attempts or 0) + 1
+        model.locked_at = now
+        model.updated_at = now
+
+        await self.session.flush()
+        return self._to_entity(model)
+
+    async def heartbeat(self, job_id: str, attempt: int) -> bool:
+        """Refresh locked_at in a single UPDATE, only for the current claim"""
+        result = await self.session.execute(
+            update(UploadJobModel)
+            .where(
+                UploadJobModel.id == job_id,
+                UploadJobModel.status == "processing",
+                UploadJobModel.attempts == attempt,
+            )
+            .values(locked_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount > 0
+
+    async def save_progress(self, entity: UploadJob) -> bool:
+        """Write status and per-file progress in one UPDATE guarded by the claim"""
+        result = await self.session.execute(
+            update(UploadJobModel)
+            .where(
+                UploadJobModel.id == entity.id,
+                UploadJobModel.status == "processing",
+                UploadJobModel.attempts == entity.attempts,
+            )
+            .values(
+                status=entity.status,
+                items=[item.model_dump() for item in entity.items],
+                locked_at=entity.locked_at,
+                finished_at=entity.finished_at,
+                updated_at=datetime.utcnow(),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount > 0
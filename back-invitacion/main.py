@@ -3,7 +3,14 @@ from contextlib import asynccontextmanager
 
 from app.infrastructure.config.settings import settings
 from app.infrastructure.database.connection import init_db, close_db
+from app.infrastructure.repositories.singletons import (
+    album_purge_worker,
+    cloudinary_service,
+    media_downloader,
+    upload_job_worker,
+)
 from app.api.v1.router import api_router
+from app.api.middlewares.admission import setup_upload_admission
 from app.api.middlewares.cors import setup_cors
 from app.api.middlewares.error_handler import setup_exception_handlers
 
@@ -13,8 +20,16 @@ async def lifespan(app: FastAPI):
     """Lifespan events for FastAPI application"""
     # Startup
     await init_db()
+    if settings.UPLOAD_JOBS_ENABLED:
+        upload_job_worker.start()
+    if settings.ALBUM_PURGE_ENABLED:
+        album_purge_worker.start()
     yield
     # Shutdown
+    await upload_job_worker.stop()
+    await album_purge_worker.stop()
+    await cloudinary_service.close()
+    await media_downloader.close()
     await close_db()
 
 
@@ -27,7 +42,8 @@ def create_application() -> FastAPI:
         lifespan=lifespan,
     )
 
-    # Setup middlewares
+    # Setup middlewares (CORS last, so it is outermost and also covers 503s)
+    setup_upload_admission(application)
     setup_cors(application)
     setup_exception_handlers(application)
 
@@ -0,0 +1,86 @@
+"""
+Rellenar el hash perceptual de las fotos subidas antes de tenerlo
+Ejecutar: python scripts/backfill_perceptual_hashes.py [album_id]
+
+Pide a Cloudinary (Admin API) el pHash de cada imagen sin perceptual_hash,
+por lotes y con unas pocas peticiones en paralelo. Se puede interrumpir y
+volver a ejecutar: solo procesa las fotos que aún no lo tienen.
+"""
+
+import asyncio
+import sys
+from typing import Optional
+
+from sqlalchemy import select, update
+
+from app.infrastructure.database.connection import AsyncSessionLocal, engine
+from app.infrastructure.database.models import PhotoModel
+from app.infrastructure.repositories.singletons import cloudinary_service
+
+BATCH_SIZE = 100
+CONCURRENCY = 4  # Respeta el límite por hora de la Admin API
+
+
+async def fetch_phash(public_id: str, semaphore: asyncio.Semaphore) -> Optional[str]:
+    async with semaphore:
+        try:
+            details = await cloudinary_service.get_image_details(public_id, phash=True)
+            return details.get("phash")
+        except Exception as e:
+            print(f"  ⚠️  {public_id}: {e}")
+            return None
+
+
+async def backfill(album_id: Optional[str] = None):
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+    updated = skipped = 0
+    after_id = ""
+
+    try:
+        while True:
+            async with AsyncSessionLocal() as session:
+                query = (
+                    select(PhotoModel.id, PhotoModel.public_id)
+                    .where(
+                        PhotoModel.media_type == "image",
+                        PhotoModel.perceptual_hash.is_(None),
+                        PhotoModel.id > after_id,
+                    )
+                    .order_by(PhotoModel.id)
+                    .limit(BATCH_SIZE)
+                )
+                if album_id:
+                    query = query.where(PhotoModel.album_id == album_id)
+                batch = (await session.execute(query)).all()
+
+            if not batch:
+                break
+            after_id = batch[-1].id
+
+            hashes = await asyncio.gather(
+                *[fetch_phash(public_id, semaphore) for _, public_id in batch]
+            )
+
+            async with AsyncSessionLocal() as session:
+                for (photo_id, _), phash in zip(batch, hashes):
+                    if not phash:
+                        skipped += 1
+                        continue
+                    await session.execute(
+                        update(PhotoModel)
+                        .where(PhotoModel.id == photo_id)
+                        .values(perceptual_hash=phash)
+                    )
+                    updated += 1
+                await session.commit()
+
+            print(f"  {updated} actualizadas, {skipped} sin hash")
+
+        print(f"✅ Listo: {updated} fotos con hash perceptual nuevo, {skipped} sin hash")
+    finally:
+        await cloudinary_service.close()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(backfill(sys.argv[1] if len(sys.argv) > 1 else None))
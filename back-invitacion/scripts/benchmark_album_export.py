@@ -0,0 +1,157 @@
+"""
+Benchmark de la exportación ZIP de un álbum completo
+Ejecutar: python scripts/benchmark_album_export.py [fotos] [tamano_kb] [latencia_ms]
+
+Levanta el servidor local de scripts/cloudinary_standin.py como CDN, crea
+un álbum en memoria con N fotos (y un video grande cada 100) y lo exporta
+a un archivo temporal midiendo el throughput y la memoria máxima. Después
+comprueba el ZIP con zipfile y simula una descarga cortada al 60 % que se
+reanuda con Range, con y sin los CRC en caché.
+"""
+
+import asyncio
+import hashlib
+import os
+import resource
+import sys
+import tempfile
+import time
+import zipfile
+from datetime import datetime, timedelta
+
+from app.application.services.album_export import ChecksumCache
+from app.application.use_cases.album_export_use_cases import ExportAlbumUseCase
+from app.domain.entities.album import Album
+from app.domain.entities.photo import Photo
+from app.infrastructure.external_services.media_downloader import MediaDownloader
+from app.infrastructure.repositories.album_repository_memory import AlbumRepositoryMemory
+from app.infrastructure.repositories.photo_repository_memory import PhotoRepositoryMemory
+from cloudinary_standin import start_standin
+
+PORT = 8912
+CONCURRENCY = 8
+VIDEO_EVERY = 100
+VIDEO_SIZE = 8 * 1024 * 1024
+
+
+def max_rss_mb() -> float:
+    """Memoria residente máxima del proceso (ru_maxrss está en KB en Linux)"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+async def seed_album(total: int, size_kb: int, base_url: str):
+    """Crear un álbum en memoria con fotos servidas por el CDN local"""
+    albums = AlbumRepositoryMemory()
+    photos = PhotoRepositoryMemory()
+    album = await albums.create(Album(name="Benchmark", event_code="EXPORT"))
+    start = datetime(2024, 6, 15, 18, 0)
+
+    for i in range(total):
+        video = i % VIDEO_EVERY == VIDEO_EVERY - 1
+        size = VIDEO_SIZE if video else size_kb * 1024 + i % 997
+        extension = "mp4" if video else "jpg"
+        await photos.create(
+            Photo(
+                url=f"{base_url}/media/{size}/{i}.{extension}",
+                public_id=f"albums/{album.id}/{i}",
+                album_id=album.id,
+                media_type="video" if video else "image",
+                # Varios móviles numeran igual: nombres repetidos
+                original_filename=f"IMG_{i % 1000:04d}.{extension}",
+                file_size=size,
+                format=extension,
+                captured_at=start + timedelta(seconds=i * 7),
+            )
+        )
+    return albums, photos, album.id
+
+
+async def export_to(path: str, use_case: ExportAlbumUseCase, album_id: str, start: int = 0) -> dict:
+    """Escribir el ZIP (o su resto desde `start`) en path"""
+    began = time.perf_counter()
+    _album, export = await use_case.execute(album_id)
+    first_byte = None
+    written = 0
+    with open(path, "ab" if start else "wb") as file:
+        async for chunk in export.iter_bytes(start):
+            if first_byte is None:
+                first_byte = time.perf_counter() - began
+            file.write(chunk)
+            written += len(chunk)
+    elapsed = time.perf_counter() - began
+    return {
+        "size": export.size,
+        "written": written,
+        "seconds": elapsed,
+        "first_byte_ms": (first_byte or elapsed) * 1000,
+        "mb_per_s": written / elapsed / 1024 / 1024,
+    }
+
+
+def sha256_of(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+async def main(total: int, size_kb: int, latency_ms: float):
+    server = await start_standin(PORT, latency_ms / 1000)
+    base_url = f"http://127.0.0.1:{PORT}"
+    albums, photos, album_id = await seed_album(total, size_kb, base_url)
+    downloader = MediaDownloader(max_connections=CONCURRENCY * 2, retries=3)
+    directory = tempfile.mkdtemp()
+    full_path = os.path.join(directory, "full.zip")
+    resumed_path = os.path.join(directory, "resumed.zip")
+
+    def use_case(checksums: ChecksumCache) -> ExportAlbumUseCase:
+        return ExportAlbumUseCase(albums, photos, downloader, checksums, CONCURRENCY)
+
+    try:
+        print(f"{total} archivos (~{size_kb} KB, un video de {VIDEO_SIZE // 1024 // 1024} MB "
+              f"cada {VIDEO_EVERY}), concurrencia {CONCURRENCY}, latencia {latency_ms} ms\n")
+        rss_before = max_rss_mb()
+        checksums = ChecksumCache()
+        full = await export_to(full_path, use_case(checksums), album_id)
+        rss_after = max_rss_mb()
+
+        with zipfile.ZipFile(full_path) as archive:
+            names = archive.namelist()
+            corrupt = archive.testzip()
+        valid = len(names) == total and corrupt is None and os.path.getsize(full_path) == full["size"]
+
+        # Descarga cortada al 60 %: el resto se pide desde ese byte
+        cut = int(full["size"] * 0.6)
+        results = {}
+        for label, cache in (("reanudar (CRC en caché)", checksums), ("reanudar (sin caché)", ChecksumCache())):
+            with open(full_path, "rb") as source, open(resumed_path, "wb") as target:
+                target.write(source.read(cut))
+            results[label] = await export_to(resumed_path, use_case(cache), album_id, start=cut)
+            results[label]["same"] = sha256_of(resumed_path) == sha256_of(full_path)
+
+        print(f"ZIP de {full['size'] / 1024 / 1024:.1f} MB, {len(names)} entradas, "
+              f"{'válido' if valid else 'INVÁLIDO'}")
+        print(f"Memoria máxima: {rss_before:.0f} MB antes, {rss_after:.0f} MB después de exportar\n")
+        print(f"{'descarga':<26}{'MB':>10}{'s':>8}{'MB/s':>8}{'1er byte ms':>13}{'igual':>7}")
+        print(f"{'completa':<26}{full['written'] / 1024 / 1024:>10.1f}{full['seconds']:>8.1f}"
+              f"{full['mb_per_s']:>8.1f}{full['first_byte_ms']:>13.0f}{'':>7}")
+        for label, result in results.items():
+            print(f"{label:<26}{result['written'] / 1024 / 1024:>10.1f}{result['seconds']:>8.1f}"
+                  f"{result['mb_per_s']:>8.1f}{result['first_byte_ms']:>13.0f}"
+                  f"{'sí' if result['same'] else 'NO':>7}")
+        print(f"\nDescargas del CDN: {downloader.stats()}")
+    finally:
+        await downloader.close()
+        server.should_exit = True
+        for path in (full_path, resumed_path):
+            if os.path.exists(path):
+                os.remove(path)
+        os.rmdir(directory)
+
+
+if __name__ == "__main__":
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+    size_kb = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    latency_ms = float(sys.argv[3]) if len(sys.argv) > 3 else 20.0
+    asyncio.run(main(total, size_kb, latency_ms))
@@ -0,0 +1,114 @@
+"""
+Benchmark de /photos/bulk-upload: subida secuencial vs pipeline en paralelo
+Ejecutar: python scripts/benchmark_bulk_upload.py [archivos] [tamano_kb] [latencia_ms] [latencia_db_ms]
+
+Levanta el servidor local de scripts/cloudinary_standin.py y ejecuta
+BulkUploadMediaUseCase con concurrencia 1 (como la ruta antes) y con
+BULK_UPLOAD_CONCURRENCY, guardando en repositorios en memoria cuyas
+transacciones tardan latencia_db_ms (MySQL remoto). Muestra el tiempo total,
+el de una sola subida y cuántas transacciones hizo el escritor.
+"""
+
+import asyncio
+import io
+import os
+import sys
+import time
+import uuid
+
+from app.application.dtos.photo_dto import PhotoUploadDTO
+from app.application.use_cases.photo_use_cases import BulkUploadMediaUseCase
+from app.domain.entities.album import Album
+from app.infrastructure.config.settings import settings
+from app.infrastructure.external_services.cloudinary_http_service import CloudinaryHttpService
+from app.infrastructure.repositories.album_repository_memory import AlbumRepositoryMemory
+from app.infrastructure.repositories.photo_repository_memory import PhotoRepositoryMemory
+from cloudinary_standin import start_standin
+
+PORT = 8913
+RUNS = 3
+
+
+class MemorySession:
+    """Sesión de mentira para los repositorios en memoria, con latencia de commit"""
+
+    commits = 0
+
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def commit(self):
+        await asyncio.sleep(self.latency)
+        MemorySession.commits += 1
+
+    async def rollback(self):
+        pass
+
+
+async def run(service, concurrency: int, files: int, payload: bytes, db_latency: float) -> dict:
+    """Subir `files` archivos distintos en una petición, RUNS veces"""
+    albums = AlbumRepositoryMemory()
+    photos = PhotoRepositoryMemory()
+    album = await albums.create(Album(name="Benchmark", event_code=f"B{uuid.uuid4().hex[:8]}"))
+    use_case = BulkUploadMediaUseCase(
+        lambda: MemorySession(db_latency),
+        lambda session: photos,
+        lambda session: albums,
+        service,
+        concurrency=concurrency,
+    )
+
+    timings = []
+    MemorySession.commits = 0
+    for _ in range(RUNS):
+        # Contenido distinto en cada archivo y ronda: ninguno es duplicado
+        files_data = [
+            (io.BytesIO(payload + uuid.uuid4().bytes), f"foto-{i}.jpg", "image") for i in range(files)
+        ]
+        hashes = [uuid.uuid4().hex for _ in range(files)]
+        start = time.perf_counter()
+        results = await use_case.execute(
+            files_data, hashes, PhotoUploadDTO(album_id=album.id, uploader_name="Bench")
+        )
+        timings.append((time.perf_counter() - start) * 1000)
+        assert all(result.success for result in results)
+
+    timings.sort()
+    return {"ms": timings[len(timings) // 2], "commits": MemorySession.commits / RUNS}
+
+
+async def main(files: int, size_kb: int, latency_ms: float, db_latency_ms: float):
+    server = await start_standin(PORT, latency_ms / 1000)
+    service = CloudinaryHttpService(base_url=f"http://127.0.0.1:{PORT}")
+    payload = os.urandom(size_kb * 1024)
+    db_latency = db_latency_ms / 1000
+
+    try:
+        print(f"{files} archivos de {size_kb} KB, latencia de Cloudinary {latency_ms} ms, "
+              f"commit {db_latency_ms} ms\n")
+        single = await run(service, 1, 1, payload, db_latency)
+        sequential = await run(service, 1, files, payload, db_latency)
+        pipelined = await run(service, settings.BULK_UPLOAD_CONCURRENCY, files, payload, db_latency)
+
+        print(f"{'modo':<36}{'ms':>10}{'commits':>10}")
+        print(f"{'un solo archivo':<36}{single['ms']:>10.0f}{single['commits']:>10.0f}")
+        print(f"{'secuencial (concurrencia 1)':<36}{sequential['ms']:>10.0f}{sequential['commits']:>10.0f}")
+        label = f"pipeline (concurrencia {settings.BULK_UPLOAD_CONCURRENCY})"
+        print(f"{label:<36}{pipelined['ms']:>10.0f}{pipelined['commits']:>10.0f}")
+    finally:
+        await service.close()
+        server.should_exit = True
+
+
+if __name__ == "__main__":
+    files = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    size_kb = int(sys.argv[2]) if len(sys.argv) > 2 else 512
+    latency_ms = float(sys.argv[3]) if len(sys.argv) > 3 else 300.0
+    db_latency_ms = float(sys.argv[4]) if len(sys.argv) > 4 else 15.0
+    asyncio.run(main(files, size_kb, latency_ms, db_latency_ms))
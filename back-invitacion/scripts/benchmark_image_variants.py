@@ -0,0 +1,93 @@
+"""
+Benchmark de serialización de listas de fotos con variantes (srcset)
+Ejecutar: python scripts/benchmark_image_variants.py [fotos_por_pagina] [paginas]
+
+Serializa páginas de fotos sintéticas como GET /photos/album/{id} sin
+variantes, con variantes construidas en cada petición y con las URLs
+memoizadas (LRU caliente), con y sin firma de URLs.
+"""
+
+import sys
+import time
+import uuid
+from datetime import datetime
+
+import cloudinary
+
+from app.application.dtos.photo_dto import PhotoListResponseDTO
+from app.application.use_cases.photo_use_cases import photo_response
+from app.domain.entities.photo import Photo
+from app.infrastructure.external_services.image_variants import ImageVariantUrls
+
+WIDTHS = [320, 640, 1080, 1600]
+RUNS = 5
+
+
+def generate_photos(total: int) -> list:
+    """Fotos sintéticas con los campos que devuelve la API"""
+    album_id = str(uuid.uuid4())
+    return [
+        Photo(
+            id=str(uuid.uuid4()),
+            url=f"https://res.cloudinary.com/bench/image/upload/v1/albums/{album_id}/{i}.jpg",
+            public_id=f"albums/{album_id}/{uuid.uuid4().hex}",
+            album_id=album_id,
+            original_filename=f"IMG_{i:04d}.jpg",
+            uploader_name="Invitado",
+            file_size=2_400_000,
+            width=4032,
+            height=3024,
+            format="jpg",
+            captured_at=datetime.utcnow(),
+            created_at=datetime.utcnow(),
+        )
+        for i in range(total)
+    ]
+
+
+def serialize_pages(pages: list, variants) -> None:
+    for photos in pages:
+        PhotoListResponseDTO(
+            total=len(photos),
+            photos=[photo_response(photo, variants) for photo in photos],
+            album_id=photos[0].album_id,
+        ).model_dump_json()
+
+
+def measure(func, runs: int = RUNS) -> float:
+    """Mediana en milisegundos"""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return timings[len(timings) // 2]
+
+
+def main():
+    per_page = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    page_count = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    cloudinary.config(cloud_name="bench", api_key="key", api_secret="secret", secure=True)
+
+    photos = generate_photos(per_page * page_count)
+    pages = [photos[i : i + per_page] for i in range(0, len(photos), per_page)]
+
+    cases = [("sin variantes", None, False)]
+    for signed in (False, True):
+        label = "firmadas" if signed else "sin firmar"
+        cases.append((f"variantes {label}, sin caché", ImageVariantUrls(WIDTHS, 0, signed), False))
+        cases.append((f"variantes {label}, caché LRU", ImageVariantUrls(WIDTHS, 50_000, signed), True))
+
+    print(f"{page_count} páginas de {per_page} fotos, anchos {WIDTHS}\n")
+    print(f"{'caso':<36}{'ms/página':>12}{'fotos/s':>12}")
+    for label, variants, warm in cases:
+        if warm:
+            # Las páginas ya se sirvieron una vez: el worker tiene las URLs
+            serialize_pages(pages, variants)
+        total_ms = measure(lambda: serialize_pages(pages, variants))
+        print(f"{label:<36}{total_ms / page_count:>12.2f}{len(photos) / total_ms * 1000:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
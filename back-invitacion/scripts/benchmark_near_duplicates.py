@@ -0,0 +1,119 @@
+"""
+Benchmark de detección de casi-duplicados: índice BK-tree vs comparación de todos los pares
+Ejecutar: python scripts/benchmark_near_duplicates.py [numero_de_fotos] [distancia_maxima]
+
+Genera hashes perceptuales de 64 bits con la forma de un álbum real (ráfagas
+de fotos casi iguales entre fotos distintas) y mide, sin base de datos:
+
+- construcción completa del índice (primera consulta de un álbum en un worker),
+  con el join por bloques que usa la aplicación y, como referencia, con una
+  búsqueda en el BK-tree por foto
+- consulta de clusters con el índice ya construido tras una subida nueva
+  (el caso habitual: el índice se actualiza de forma incremental)
+- comparación de todos los pares (lo que costaría cada consulta sin índice)
+"""
+
+import random
+import sys
+import time
+from typing import Dict, List, Tuple
+
+from app.application.services.near_duplicates import NearDuplicateIndex, hamming, parse_hash
+
+RUNS = 5
+
+
+def generate_album(total: int, seed: int = 42) -> List[Tuple[str, str]]:
+    """Fotos (id, phash): ~40% en ráfagas de 2-6 variantes con pocos bits distintos"""
+    rng = random.Random(seed)
+    entries = []
+    while len(entries) < total:
+        base = rng.getrandbits(64)
+        burst = rng.randint(2, 6) if rng.random() < 0.15 else 1
+        for _ in range(min(burst, total - len(entries))):
+            value = base
+            for bit in rng.sample(range(64), rng.randint(0, 4) if burst > 1 else 0):
+                value ^= 1 << bit
+            entries.append((f"photo-{len(entries)}", f"{value:016x}"))
+    rng.shuffle(entries)
+    return entries
+
+
+def all_pairs_clusters(entries: List[Tuple[str, str]], max_distance: int) -> List[List[str]]:
+    """Clusters comparando cada par de fotos (O(n²))"""
+    values = [(photo_id, parse_hash(phash)) for photo_id, phash in entries]
+    parent: Dict[str, str] = {photo_id: photo_id for photo_id, _ in values}
+
+    def find(key: str) -> str:
+        while parent[key] != key:
+            parent[key] = parent[parent[key]]
+            key = parent[key]
+        return key
+
+    for i, (id_a, a) in enumerate(values):
+        for id_b, b in values[i + 1 :]:
+            if hamming(a, b) <= max_distance:
+                parent[find(id_b)] = find(id_a)
+
+    groups: Dict[str, List[str]] = {}
+    for photo_id, _ in values:
+        groups.setdefault(find(photo_id), []).append(photo_id)
+    return [group for group in groups.values() if len(group) > 1]
+
+
+def build_index_by_search(entries: List[Tuple[str, str]], max_distance: int) -> NearDuplicateIndex:
+    """Construir el índice buscando cada foto en el BK-tree (referencia)"""
+    index = NearDuplicateIndex(max_distance)
+    for photo_id, phash in entries:
+        index.add(photo_id, phash)
+    return index
+
+
+def measure(func, runs: int = RUNS) -> float:
+    """Mediana en milisegundos"""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return timings[len(timings) // 2]
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    max_distance = int(sys.argv[2]) if len(sys.argv) > 2 else 6
+
+    entries = generate_album(total)
+    print(f"Álbum sintético: {total} fotos, distancia máxima {max_distance}\n")
+
+    build_ms = measure(lambda: NearDuplicateIndex.build(max_distance, entries), runs=3)
+    search_build_ms = measure(lambda: build_index_by_search(entries, max_distance), runs=1)
+    index = NearDuplicateIndex.build(max_distance, entries)
+    clusters = index.clusters()
+
+    # Una subida nueva: sync() añade solo la foto nueva y se leen los clusters
+    new_entries = entries + [("photo-new", entries[0][1])]
+
+    def incremental_query():
+        index.sync(new_entries)
+        index.clusters()
+
+    query_ms = measure(incremental_query)
+
+    pairs_runs = 1 if total > 5_000 else 3
+    pairs_ms = measure(lambda: all_pairs_clusters(entries, max_distance), runs=pairs_runs)
+    pairs_clusters = all_pairs_clusters(entries, max_distance)
+
+    same = sorted(map(sorted, clusters)) == sorted(map(sorted, pairs_clusters))
+    print(f"Clusters encontrados: {len(clusters)} (todos los pares: {len(pairs_clusters)}, "
+          f"{'iguales' if same else 'DISTINTOS'})\n")
+    print(f"{'operación':<48}{'ms':>10}")
+    print(f"{'Construir índice (1ª consulta del álbum)':<48}{build_ms:>10.1f}")
+    print(f"{'  - referencia: una búsqueda BK-tree por foto':<48}{search_build_ms:>10.1f}")
+    print(f"{'Consulta tras una subida (BK-tree incremental)':<48}{query_ms:>10.1f}")
+    print(f"{'Todos los pares (cada consulta sin índice)':<48}{pairs_ms:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
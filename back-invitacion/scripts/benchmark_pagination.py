@@ -0,0 +1,113 @@
+"""
+Benchmark de paginación de galerías: OFFSET vs cursor (keyset)
+Ejecutar: python scripts/benchmark_pagination.py [numero_de_fotos]
+
+Crea un álbum temporal con N fotos, mide la latencia de páginas cada vez
+más profundas con ambos modos y elimina el álbum al terminar.
+"""
+
+import asyncio
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from app.infrastructure.database.connection import AsyncSessionLocal, engine
+from app.infrastructure.database.models import AlbumModel, PhotoModel
+from app.infrastructure.repositories.photo_repository_impl import PhotoRepositoryImpl
+
+PAGE_SIZE = 100
+RUNS = 5
+
+
+async def seed_album(total: int) -> str:
+    """Crear un álbum temporal con fotos de prueba"""
+    album_id = str(uuid.uuid4())
+    now = datetime.utcnow()
+
+    async with AsyncSessionLocal() as session:
+        session.add(
+            AlbumModel(
+                id=album_id,
+                name="Benchmark",
+                event_code=f"BENCH{album_id[:8].upper()}",
+                photo_count=total,
+            )
+        )
+        await session.flush()
+
+        for start in range(0, total, 1000):
+            session.add_all(
+                [
+                    PhotoModel(
+                        url=f"https://example.com/{album_id}/{i}.jpg",
+                        public_id=f"bench/{album_id}/{i}",
+                        album_id=album_id,
+                        created_at=now - timedelta(seconds=i // 3),
+                    )
+                    for i in range(start, min(start + 1000, total))
+                ]
+            )
+            await session.flush()
+        await session.commit()
+
+    return album_id
+
+
+async def drop_album(album_id: str):
+    """Eliminar el álbum temporal y sus fotos"""
+    async with AsyncSessionLocal() as session:
+        album = await session.get(AlbumModel, album_id)
+        if album:
+            await session.delete(album)
+            await session.commit()
+
+
+async def time_call(coro_factory) -> float:
+    """Mediana en milisegundos de varias ejecuciones"""
+    samples = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        await coro_factory()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return samples[len(samples) // 2]
+
+
+async def run(total: int):
+    print(f"Creando álbum temporal con {total} fotos...")
+    album_id = await seed_album(total)
+
+    try:
+        async with AsyncSessionLocal() as session:
+            repository = PhotoRepositoryImpl(session)
+
+            # Recorrer todas las páginas en modo cursor guardando sus posiciones
+            cursors = [None]
+            after = None
+            while True:
+                page = await repository.get_by_album_id_after(album_id, after, PAGE_SIZE)
+                if len(page) < PAGE_SIZE:
+                    break
+                after = (page[-1].created_at, page[-1].id)
+                cursors.append(after)
+
+            print(f"\n{'página':>8} {'offset (ms)':>12} {'cursor (ms)':>12}")
+            step = max(1, len(cursors) // 10)
+            for page_number in range(0, len(cursors), step):
+                skip = page_number * PAGE_SIZE
+                after = cursors[page_number]
+                offset_ms = await time_call(
+                    lambda: repository.get_by_album_id(album_id, skip, PAGE_SIZE)
+                )
+                cursor_ms = await time_call(
+                    lambda: repository.get_by_album_id_after(album_id, after, PAGE_SIZE)
+                )
+                print(f"{page_number:>8} {offset_ms:>12.2f} {cursor_ms:>12.2f}")
+    finally:
+        await drop_album(album_id)
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(run(int(sys.argv[1]) if len(sys.argv) > 1 else 10000))
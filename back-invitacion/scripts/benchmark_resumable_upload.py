@@ -0,0 +1,147 @@
+"""
+Benchmark de subidas con cortes de conexión: multipart vs reanudable (tus)
+Ejecutar: python scripts/benchmark_resumable_upload.py [videos] [tamano_mb] [cortes_por_video] [velocidad_mbps]
+
+Simula invitados subiendo videos por un Wi-Fi que se corta `cortes_por_video`
+veces en puntos al azar. Con multipart cada corte obliga a repetir el
+archivo desde el principio; con la subida reanudable los bytes recibidos se
+quedan en ResumableUploadSpool y el cliente sigue desde el offset de HEAD
+(solo se pierde el bloque que estaba en vuelo). Al completarse, cada video
+pasa por CompleteResumableUploadUseCase contra el servidor local de
+scripts/cloudinary_standin.py y repositorios en memoria.
+
+Muestra los bytes enviados por los clientes, los escritos por el servidor,
+las peticiones y el tiempo de transferencia estimado a `velocidad_mbps`.
+"""
+
+import asyncio
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+from app.application.dtos.photo_dto import PhotoUploadDTO
+from app.application.use_cases.resumable_upload_use_cases import (
+    CompleteResumableUploadUseCase,
+    CreateResumableUploadUseCase,
+)
+from app.domain.entities.album import Album
+from app.infrastructure.external_services.cloudinary_http_service import CloudinaryHttpService
+from app.infrastructure.jobs.resumable_spool import ResumableUploadSpool
+from app.infrastructure.repositories.album_repository_memory import AlbumRepositoryMemory
+from app.infrastructure.repositories.photo_repository_memory import PhotoRepositoryMemory
+from cloudinary_standin import start_standin
+
+PORT = 8914
+BLOCK = 64 * 1024  # Lo que lleva la red en vuelo: se pierde en cada corte
+
+
+class Dropped(Exception):
+    """La conexión del invitado se cortó"""
+
+
+async def body(data: bytes, start: int, cut: int):
+    """Cuerpo de una petición desde `start`, cortado al llegar a `cut` bytes del archivo"""
+    for position in range(start, len(data), BLOCK):
+        if position + BLOCK > cut:
+            raise Dropped()
+        yield data[position : position + BLOCK]
+
+
+def cut_points(size: int, drops: int, rng: random.Random) -> list:
+    return sorted(rng.randrange(BLOCK, size) for _ in range(drops)) + [size + BLOCK]
+
+
+async def multipart(data: bytes, cuts: list, directory: str) -> dict:
+    """Cada intento es un POST nuevo que Starlette vuelca a disco desde el byte 0"""
+    sent = written = requests = 0
+    for cut in cuts:
+        requests += 1
+        with open(os.path.join(directory, "multipart"), "wb") as file:
+            try:
+                async for chunk in body(data, 0, cut):
+                    file.write(chunk)
+                    written += len(chunk)
+                sent += len(data)
+                break
+            except Dropped:
+                sent += cut
+    return {"sent": sent, "written": written, "requests": requests}
+
+
+async def resumable(
+    data: bytes, cuts: list, album_id: str, spool: ResumableUploadSpool, create, complete
+) -> dict:
+    """POST de creación y luego PATCH desde el offset de HEAD tras cada corte"""
+    upload = await create.execute("video.mp4", "video", len(data), PhotoUploadDTO(album_id=album_id))
+    sent, requests = 0, 1
+    for attempt, cut in enumerate(cuts):
+        requests += 2 if attempt else 1  # Tras un corte, HEAD para saber desde dónde seguir
+        upload = await spool.get(upload.id)
+        async with spool.lock(upload) as upload:
+            start = upload.offset
+            try:
+                await spool.append(upload, start, body(data, start, cut))
+            except Dropped:
+                sent += cut - start
+                continue
+            sent += len(data) - start
+            photo, duplicate = await complete.execute(upload)
+            await spool.complete(upload, photo.id, duplicate)
+            break
+    # Cada byte recibido se escribe una sola vez
+    return {"sent": sent, "written": len(data), "requests": requests}
+
+
+async def main(videos: int, size_mb: int, drops: int, mbps: float):
+    server = await start_standin(PORT)
+    service = CloudinaryHttpService(base_url=f"http://127.0.0.1:{PORT}")
+    directory = tempfile.mkdtemp()
+    spool = ResumableUploadSpool(os.path.join(directory, "resumable"), 3600)
+    albums = AlbumRepositoryMemory()
+    photos = PhotoRepositoryMemory()
+    album = await albums.create(Album(name="Benchmark", event_code="RESUME"))
+    create = CreateResumableUploadUseCase(albums, spool)
+    complete = CompleteResumableUploadUseCase(photos, albums, service, spool)
+    rng = random.Random(42)
+
+    totals = {"multipart": {}, "reanudable": {}}
+    try:
+        print(f"{videos} videos de {size_mb} MB, {drops} cortes por video, "
+              f"enlace de {mbps} Mbit/s\n")
+        began = time.perf_counter()
+        for _ in range(videos):
+            data = os.urandom(size_mb * 1024 * 1024)
+            cuts = cut_points(len(data), drops, rng)
+            for label, result in (
+                ("multipart", await multipart(data, cuts, directory)),
+                ("reanudable", await resumable(data, cuts, album.id, spool, create, complete)),
+            ):
+                for key, value in result.items():
+                    totals[label][key] = totals[label].get(key, 0) + value
+        elapsed = time.perf_counter() - began
+
+        useful = videos * size_mb * 1024 * 1024
+        print(f"{'modo':<12}{'MB enviados':>13}{'reenviado':>11}{'MB a disco':>12}"
+              f"{'peticiones':>12}{'min de red':>12}")
+        for label, total in totals.items():
+            print(f"{label:<12}{total['sent'] / 1024 / 1024:>13.1f}"
+                  f"{(total['sent'] - useful) / useful:>10.0%} "
+                  f"{total['written'] / 1024 / 1024:>12.1f}{total['requests']:>12}"
+                  f"{total['sent'] * 8 / (mbps * 1_000_000) / 60:>12.1f}")
+        print(f"\nFotos guardadas: {len(await photos.get_by_album_id(album.id))} "
+              f"({elapsed:.1f} s en local)")
+    finally:
+        await service.close()
+        server.should_exit = True
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    videos = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    size_mb = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    drops = int(sys.argv[3]) if len(sys.argv) > 3 else 2
+    mbps = float(sys.argv[4]) if len(sys.argv) > 4 else 10.0
+    asyncio.run(main(videos, size_mb, drops, mbps))
@@ -0,0 +1,81 @@
+"""
+Benchmark de backends de almacenamiento: SDK de Cloudinary vs cliente HTTP async
+Ejecutar: python scripts/benchmark_storage_backends.py [subidas] [tamano_kb] [latencia_ms]
+
+Levanta el servidor local de scripts/cloudinary_standin.py y sube los mismos
+archivos con ambos backends, midiendo la latencia por subida y el throughput.
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+import cloudinary
+
+from app.infrastructure.external_services.cloudinary_service import CloudinaryService
+from app.infrastructure.external_services.cloudinary_http_service import CloudinaryHttpService
+from cloudinary_standin import start_standin
+
+PORT = 8911
+CONCURRENCY = 8
+
+
+async def run_backend(service, uploads: int, payload: bytes) -> dict:
+    """Subir `uploads` archivos con concurrencia limitada"""
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+    latencies = []
+
+    async def upload_one(index: int):
+        async with semaphore:
+            start = time.perf_counter()
+            await service.upload_image(payload, f"bench-{index}.jpg", folder="bench")
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[upload_one(i) for i in range(uploads)])
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1],
+        "uploads_per_s": uploads / elapsed,
+    }
+
+
+async def main(uploads: int, size_kb: int, latency_ms: float):
+    server = await start_standin(PORT, latency_ms / 1000)
+    base_url = f"http://127.0.0.1:{PORT}"
+    payload = os.urandom(size_kb * 1024)
+
+    # El SDK construye sus URLs a partir de upload_prefix
+    sdk_service = CloudinaryService(max_workers=CONCURRENCY)
+    cloudinary.config(upload_prefix=base_url)
+    http_service = CloudinaryHttpService(base_url=base_url)
+
+    try:
+        print(f"{uploads} subidas de {size_kb} KB, concurrencia {CONCURRENCY}, latencia {latency_ms} ms\n")
+        print(f"{'backend':>8} {'p50 (ms)':>10} {'p95 (ms)':>10} {'subidas/s':>10}")
+        for name, service in (("sdk", sdk_service), ("http", http_service)):
+            result = await run_backend(service, uploads, payload)
+            print(
+                f"{name:>8} {result['p50_ms']:>10.2f} {result['p95_ms']:>10.2f} "
+                f"{result['uploads_per_s']:>10.1f}"
+            )
+    finally:
+        await sdk_service.close()
+        await http_service.close()
+        server.should_exit = True
+        await asyncio.sleep(0.1)
+
+
+if __name__ == "__main__":
+    asyncio.run(
+        main(
+            int(sys.argv[1]) if len(sys.argv) > 1 else 200,
+            int(sys.argv[2]) if len(sys.argv) > 2 else 512,
+            float(sys.argv[3]) if len(sys.argv) > 3 else 20.0,
+        )
+    )
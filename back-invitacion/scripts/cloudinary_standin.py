@@ -0,0 +1,280 @@
+"""
+Servidor local que imita la API de subida de Cloudinary
+Ejecutar: python scripts/cloudinary_standin.py [puerto] [latencia_ms] [fallar_cada_n_chunks]
+
+Responde a los endpoints que usan los backends de almacenamiento
+(upload, destroy, resources, folders) con respuestas con la misma forma que
+las de Cloudinary. Solo recuerda los public_id subidos (no el contenido),
+para que los borrados respondan "deleted" o "not found". Útil para pruebas
+y benchmarks.
+
+Con api_key/api_secret comprueba, como Cloudinary, la firma y la antigüedad
+del timestamp de las subidas y borrados, y las credenciales (Basic) de la
+Admin API; si no, acepta cualquier petición.
+
+Soporta subidas por chunks (X-Unique-Upload-Id + Content-Range) y puede
+descartar uno de cada N chunks con un 503 para probar los reintentos.
+
+También sirve archivos como el CDN: GET /media/{bytes}/{nombre} devuelve
+`bytes` bytes deterministas (según el nombre), con soporte de Range.
+"""
+
+import asyncio
+import base64
+import hashlib
+import sys
+import time
+import uuid
+from typing import Optional
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+
+# Parámetros que Cloudinary no incluye en la firma
+UNSIGNED_PARAMS = {"file", "cloud_name", "resource_type", "api_key", "signature"}
+
+# Antigüedad máxima del timestamp de una petición firmada
+SIGNATURE_WINDOW_SECONDS = 3600
+
+
+def expected_signature(params: dict, api_secret: str) -> str:
+    """Firma SHA-1 de los parámetros, calculada como la calcula Cloudinary"""
+    to_sign = "&".join(
+        f"{key}={value}"
+        for key, value in sorted(params.items())
+        if key not in UNSIGNED_PARAMS and value != ""
+    )
+    return hashlib.sha1((to_sign + api_secret).encode()).hexdigest()
+
+
+def error(message: str, status_code: int) -> JSONResponse:
+    return JSONResponse({"error": {"message": message}}, status_code=status_code)
+
+
+def create_app(
+    latency: float = 0.0,
+    fail_every: int = 0,
+    api_key: Optional[str] = None,
+    api_secret: Optional[str] = None,
+) -> Starlette:
+    """Crear la aplicación con una latencia artificial por petición"""
+    state = {
+        "uploads": 0,
+        "bytes": 0,
+        "chunks": 0,
+        "dropped_chunks": 0,
+        "destroyed": 0,
+        "rejected": 0,
+        "media_requests": 0,
+        "media_bytes": 0,
+    }
+    # public_id -> resource_type de lo subido
+    assets = {}
+
+    def check_signature(params: dict) -> Optional[JSONResponse]:
+        if api_secret is None:
+            return None
+        if params.get("api_key") != api_key:
+            state["rejected"] += 1
+            return error("Unknown API key", 401)
+        if params.get("signature") != expected_signature(params, api_secret):
+            state["rejected"] += 1
+            return error("Invalid Signature", 401)
+        if abs(time.time() - int(params.get("timestamp") or 0)) > SIGNATURE_WINDOW_SECONDS:
+            state["rejected"] += 1
+            return error("Stale request", 400)
+        return None
+
+    def check_credentials(request: Request) -> Optional[JSONResponse]:
+        if api_secret is None:
+            return None
+        expected = base64.b64encode(f"{api_key}:{api_secret}".encode()).decode()
+        if request.headers.get("authorization") != f"Basic {expected}":
+            state["rejected"] += 1
+            return error("Invalid credentials", 401)
+        return None
+
+    async def upload(request: Request):
+        form = await request.form()
+        file = form.get("file")
+        params = {key: value for key, value in form.items() if key != "file"}
+        if isinstance(file, str):
+            # Subida desde una URL remota
+            received = 0
+        else:
+            received = file.size
+            await file.close()
+        await asyncio.sleep(latency)
+
+        rejection = check_signature(params)
+        if rejection:
+            return rejection
+
+        upload_id = request.headers.get("x-unique-upload-id")
+        if upload_id:
+            state["chunks"] += 1
+            if fail_every and state["chunks"] % fail_every == 0:
+                state["dropped_chunks"] += 1
+                return error("Chunk dropped", 503)
+
+            # "bytes 0-5242879/20000000"
+            start_end, total = request.headers["content-range"].split(" ")[1].split("/")
+            end = int(start_end.split("-")[1])
+            if end + 1 < int(total):
+                return JSONResponse({"done": False, "upload_id": upload_id})
+            received = int(total)
+
+        state["uploads"] += 1
+        state["bytes"] += received
+        cloud = request.path_params["cloud"]
+        resource_type = request.path_params["resource_type"]
+        public_id = f"{params.get('folder') or 'standin'}/{uuid.uuid4().hex}"
+        assets[public_id] = resource_type
+        url = f"https://res.cloudinary.com/{cloud}/{resource_type}/upload/{public_id}"
+        return JSONResponse(
+            {
+                "public_id": public_id,
+                "secure_url": url,
+                "resource_type": resource_type,
+                "format": "mp4" if resource_type == "video" else "jpg",
+                "width": 1920,
+                "height": 1080,
+                "bytes": received,
+                "duration": 12.4 if resource_type == "video" else None,
+                "eager": [{"secure_url": f"{url}?thumb"}] if resource_type == "image" else [],
+                "phash": f"{uuid.uuid4().int >> 64:016x}" if resource_type == "image" else None,
+            }
+        )
+
+    async def destroy(request: Request):
+        params = dict(await request.form())
+        await asyncio.sleep(latency)
+        rejection = check_signature(params)
+        if rejection:
+            return rejection
+        public_id = params.get("public_id")
+        if assets.get(public_id) != request.path_params["resource_type"]:
+            return JSONResponse({"result": "not found"})
+        del assets[public_id]
+        state["destroyed"] += 1
+        return JSONResponse({"result": "ok"})
+
+    async def resources(request: Request):
+        await asyncio.sleep(latency)
+        rejection = check_credentials(request)
+        if rejection:
+            return rejection
+        # "image/upload" o "image/upload/<public_id>"
+        resource_type, _, public_id = request.path_params["path"].partition("/upload")
+        public_id = public_id.lstrip("/")
+        if request.method == "GET":
+            if public_id:
+                if assets.get(public_id) != resource_type:
+                    return error(f"Resource not found - {public_id}", 404)
+                return JSONResponse({"public_id": public_id, "resource_type": resource_type})
+            prefix = request.query_params.get("prefix", "")
+            return JSONResponse(
+                {
+                    "resources": [
+                        {"public_id": key}
+                        for key, kind in assets.items()
+                        if kind == resource_type and key.startswith(prefix)
+                    ]
+                }
+            )
+
+        public_ids = request.query_params.getlist("public_ids[]")
+        if not public_ids:
+            prefix = request.query_params.get("prefix", "")
+            public_ids = [
+                key for key, kind in assets.items() if kind == resource_type and key.startswith(prefix)
+            ]
+        deleted = {}
+        for key in public_ids:
+            found = assets.get(key) == resource_type
+            if found:
+                del assets[key]
+                state["destroyed"] += 1
+            deleted[key] = "deleted" if found else "not_found"
+        return JSONResponse({"deleted": deleted})
+
+    async def folders(request: Request):
+        await asyncio.sleep(latency)
+        rejection = check_credentials(request)
+        if rejection:
+            return rejection
+        return JSONResponse({"deleted": [request.path_params["path"]]})
+
+    async def media(request: Request):
+        size = int(request.path_params["size"])
+        # 64 KB de contenido que depende del nombre, repetido hasta `size`
+        block = hashlib.sha256(request.path_params["name"].encode()).digest() * 2048
+        start, end = 0, size
+        status_code = 200
+        headers = {"Accept-Ranges": "bytes"}
+
+        range_header = request.headers.get("range")
+        if range_header:
+            first, _, last = range_header.split("=", 1)[1].partition("-")
+            start = int(first)
+            end = min(int(last) + 1, size) if last else size
+            status_code = 206
+            headers["Content-Range"] = f"bytes {start}-{end - 1}/{size}"
+        headers["Content-Length"] = str(end - start)
+        if request.method == "HEAD":
+            return Response(status_code=status_code, headers=headers)
+
+        await asyncio.sleep(latency)
+        state["media_requests"] += 1
+        state["media_bytes"] += end - start
+
+        async def body():
+            position = start
+            while position < end:
+                offset = position % len(block)
+                chunk = block[offset : offset + end - position]
+                position += len(chunk)
+                yield chunk
+
+        return StreamingResponse(body(), status_code=status_code, headers=headers)
+
+    async def stats(request: Request):
+        return JSONResponse(state)
+
+    return Starlette(
+        routes=[
+            Route("/v1_1/{cloud}/{resource_type}/upload", upload, methods=["POST"]),
+            Route("/v1_1/{cloud}/{resource_type}/destroy", destroy, methods=["POST"]),
+            Route("/v1_1/{cloud}/resources/{path:path}", resources, methods=["GET", "DELETE"]),
+            Route("/v1_1/{cloud}/folders/{path:path}", folders, methods=["DELETE"]),
+            Route("/media/{size:int}/{name:path}", media, methods=["GET", "HEAD"]),
+            Route("/stats", stats, methods=["GET"]),
+        ]
+    )
+
+
+async def start_standin(port: int, latency: float = 0.0, fail_every: int = 0) -> "uvicorn.Server":
+    """Arrancar el servidor en segundo plano dentro del event loop actual"""
+    import uvicorn
+
+    server = uvicorn.Server(
+        uvicorn.Config(
+            create_app(latency, fail_every), host="127.0.0.1", port=port, log_level="warning"
+        )
+    )
+    asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+    return server
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8900
+    latency_ms = float(sys.argv[2]) if len(sys.argv) > 2 else 0.0
+    fail_every = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+    uvicorn.run(create_app(latency_ms / 1000, fail_every), host="127.0.0.1", port=port)
@@ -0,0 +1,23 @@
+"""
+Shared test configuration
+
+Settings are read when app modules are first imported, so the environment
+is prepared here, before any test module imports the app: a throwaway
+SQLite database (set DATABASE_URL to run the integration tests against
+MySQL) and temporary spool directories.
+"""
+
+import os
+import tempfile
+
+_tmp = tempfile.mkdtemp(prefix="back-invitacion-tests-")
+
+os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{os.path.join(_tmp, 'test.db')}?timeout=60")
+os.environ.setdefault("DB_POOL_MODE", "null")
+os.environ.setdefault("GALLERY_SNAPSHOT_DIR", os.path.join(_tmp, "gallery_snapshots"))
+os.environ.setdefault("GALLERY_STATIC_DIR", os.path.join(_tmp, "static_galleries"))
+os.environ.setdefault("UPLOAD_JOB_DIR", os.path.join(_tmp, "upload_jobs"))
+os.environ.setdefault("RESUMABLE_UPLOAD_DIR", os.path.join(_tmp, "resumable_uploads"))
+os.environ.setdefault("CLOUDINARY_CLOUD_NAME", "test")
+os.environ.setdefault("CLOUDINARY_API_KEY", "key")
+os.environ.setdefault("CLOUDINARY_API_SECRET", "secret")
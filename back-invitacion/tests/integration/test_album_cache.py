@@ -0,0 +1,109 @@
+"""
+Album cache invalidation around real transactions
+
+A request reading an album while another one is writing it still sees the
+committed row, and may cache it; the writer's commit must drop that entry.
+"""
+
+import uuid
+
+import pytest
+
+from app.domain.entities.album import Album
+from app.infrastructure.database import models  # noqa: F401  (registers the tables)
+from app.infrastructure.database.connection import AsyncSessionLocal, init_db
+from app.infrastructure.repositories.album_repository_cached import (
+    AlbumCache,
+    CachedAlbumRepository,
+)
+from app.infrastructure.repositories.album_repository_impl import AlbumRepositoryImpl
+
+pytestmark = pytest.mark.integration
+
+
+@pytest.fixture
+async def album_id():
+    await init_db()
+    async with AsyncSessionLocal() as session:
+        album = await AlbumRepositoryImpl(session).create(
+            Album(name="Boda", event_code=f"K{uuid.uuid4().hex[:8].upper()}")
+        )
+        await session.commit()
+        return album.id
+
+
+async def cached_count(cache: AlbumCache, album_id: str) -> int:
+    """Another request reading the album through the cache"""
+    async with AsyncSessionLocal() as session:
+        album = await CachedAlbumRepository(AlbumRepositoryImpl(session), cache).get_by_id(album_id)
+        return album.photo_count
+
+
+async def test_entry_cached_during_the_write_is_dropped_on_commit(album_id):
+    cache = AlbumCache()
+
+    async with AsyncSessionLocal() as session:
+        writer = CachedAlbumRepository(AlbumRepositoryImpl(session), cache)
+        assert await writer.adjust_photo_count(album_id, 3)
+
+        # Not committed yet: a concurrent reader caches the old count
+        assert await cached_count(cache, album_id) == 0
+        assert await cached_count(cache, album_id) == 0
+        assert cache.hits == 1
+
+        await session.commit()
+
+    assert await cached_count(cache, album_id) == 3
+
+
+async def test_rollback_leaves_nothing_pending(album_id):
+    cache = AlbumCache()
+
+    async with AsyncSessionLocal() as session:
+        writer = CachedAlbumRepository(AlbumRepositoryImpl(session), cache)
+        assert await writer.adjust_photo_count(album_id, 3)
+        await session.rollback()
+
+        assert await cached_count(cache, album_id) == 0
+        invalidations = cache.invalidations
+        await session.commit()
+
+    assert cache.invalidations == invalidations
+    assert await cached_count(cache, album_id) == 0
+    assert cache.hits == 1
+
+
+async def test_every_album_written_in_the_transaction_is_dropped(album_id):
+    cache = AlbumCache()
+    async with AsyncSessionLocal() as session:
+        other = await AlbumRepositoryImpl(session).create(
+            Album(name="Otra", event_code=f"K{uuid.uuid4().hex[:8].upper()}")
+        )
+        await session.commit()
+
+    async with AsyncSessionLocal() as session:
+        writer = CachedAlbumRepository(AlbumRepositoryImpl(session), cache)
+        await writer.adjust_photo_count(album_id, 1)
+        await writer.adjust_photo_count(other.id, 2)
+        assert await cached_count(cache, album_id) == 0
+        assert await cached_count(cache, other.id) == 0
+        await session.commit()
+
+    assert await cached_count(cache, album_id) == 1
+    assert await cached_count(cache, other.id) == 2
+
+
+async def test_touch_bumps_updated_at_only(album_id):
+    cache = AlbumCache()
+    async with AsyncSessionLocal() as session:
+        before = await CachedAlbumRepository(AlbumRepositoryImpl(session), cache).get_by_id(album_id)
+
+    async with AsyncSessionLocal() as session:
+        assert await CachedAlbumRepository(AlbumRepositoryImpl(session), cache).touch(album_id)
+        await session.commit()
+
+    async with AsyncSessionLocal() as session:
+        after = await CachedAlbumRepository(AlbumRepositoryImpl(session), cache).get_by_id(album_id)
+    assert after.updated_at > before.updated_at
+    assert after.photo_count == before.photo_count
+    assert after.name == before.name
@@ -0,0 +1,71 @@
+import uuid
+
+import httpx
+import pytest
+
+from app.domain.entities.album import Album
+from app.infrastructure.database import models  # noqa: F401  (registers the tables)
+from app.infrastructure.database.connection import AsyncSessionLocal, init_db
+from app.infrastructure.repositories.album_repository_impl import AlbumRepositoryImpl
+from app.infrastructure.repositories.singletons import album_cache
+from main import app
+
+pytestmark = pytest.mark.integration
+
+
+async def test_album_validator_ignores_a_stale_cache_entry():
+    await init_db()
+    async with AsyncSessionLocal() as session:
+        album = await AlbumRepositoryImpl(session).create(
+            Album(name="Boda", event_code=f"E{uuid.uuid4().hex[:8].upper()}")
+        )
+        await session.commit()
+    album_cache.store(album)
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        first = await client.get(f"/api/v1/albums/{album.id}")
+        assert first.status_code == 200
+        etag = first.headers["etag"]
+
+        # Written by another worker: this worker's cache entry is now stale
+        async with AsyncSessionLocal() as session:
+            await AlbumRepositoryImpl(session).adjust_photo_count(album.id, 4)
+            await session.commit()
+        assert album_cache.get(album_cache.id_key(album.id))[0]
+
+        second = await client.get(f"/api/v1/albums/{album.id}", headers={"If-None-Match": etag})
+
+    assert second.status_code == 200
+    assert second.headers["etag"] != etag
+    assert second.json()["photo_count"] == 4
+
+
+async def test_changes_within_one_second_change_the_etags():
+    await init_db()
+    async with AsyncSessionLocal() as session:
+        album = await AlbumRepositoryImpl(session).create(
+            Album(name="Boda", event_code=f"E{uuid.uuid4().hex[:8].upper()}")
+        )
+        await session.commit()
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        urls = [f"/api/v1/albums/{album.id}", f"/api/v1/photos/album/{album.id}"]
+        before = [(await client.get(url)).headers["etag"] for url in urls]
+
+        # An upload and a delete: same photo_count, and on MySQL the same updated_at
+        async with AsyncSessionLocal() as session:
+            await AlbumRepositoryImpl(session).adjust_photo_count(album.id, 1)
+            await AlbumRepositoryImpl(session).adjust_photo_count(album.id, -1)
+            await session.commit()
+
+        after = [
+            await client.get(url, headers={"If-None-Match": etag})
+            for url, etag in zip(urls, before)
+        ]
+
+    assert [response.status_code for response in after] == [200, 200]
+    assert all(response.headers["etag"] != etag for response, etag in zip(after, before))
@@ -0,0 +1,87 @@
+"""
+Concurrent photo_count updates against a real database
+
+Runs against DATABASE_URL (a throwaway SQLite file by default; point it at
+MySQL to exercise row locking across connections).
+"""
+
+import asyncio
+import uuid
+
+import pytest
+
+from app.domain.entities.album import Album
+from app.infrastructure.database import models  # noqa: F401  (registers the tables)
+from app.infrastructure.database.connection import AsyncSessionLocal, init_db
+from app.infrastructure.repositories.album_repository_impl import AlbumRepositoryImpl
+
+pytestmark = pytest.mark.integration
+
+WRITERS = 50
+
+
+async def create_album() -> str:
+    await init_db()
+    async with AsyncSessionLocal() as session:
+        album = await AlbumRepositoryImpl(session).create(
+            Album(name="Boda", event_code=f"C{uuid.uuid4().hex[:8].upper()}")
+        )
+        await session.commit()
+        return album.id
+
+
+async def photo_count(album_id: str) -> int:
+    async with AsyncSessionLocal() as session:
+        return (await AlbumRepositoryImpl(session).get_by_id(album_id)).photo_count
+
+
+async def adjust(album_id: str, delta: int) -> None:
+    """One upload request: its own session and transaction"""
+    async with AsyncSessionLocal() as session:
+        assert await AlbumRepositoryImpl(session).adjust_photo_count(album_id, delta)
+        await session.commit()
+
+
+async def test_concurrent_adjustments_are_not_lost():
+    album_id = await create_album()
+    # Enough photos up front that no delete is clamped at zero, whatever the order
+    seed = WRITERS // 2
+    await adjust(album_id, seed)
+
+    # Single uploads, bulk batches and deletes hitting the same album at once
+    deltas = [1] * WRITERS + [5] * WRITERS + [-1] * (WRITERS // 2)
+    await asyncio.gather(*[adjust(album_id, delta) for delta in deltas])
+
+    assert await photo_count(album_id) == seed + sum(deltas)
+
+
+async def test_count_never_goes_below_zero():
+    album_id = await create_album()
+
+    await asyncio.gather(*[adjust(album_id, -1) for _ in range(10)])
+
+    assert await photo_count(album_id) == 0
+
+
+async def test_unknown_album_is_reported():
+    await init_db()
+    async with AsyncSessionLocal() as session:
+        assert not await AlbumRepositoryImpl(session).adjust_photo_count(str(uuid.uuid4()), 1)
+
+
+async def test_every_change_bumps_the_gallery_version():
+    album_id = await create_album()
+
+    # An upload and a delete in the same second leave updated_at and the
+    # count as they were: only the counter tells the two states apart
+    await adjust(album_id, 1)
+    await adjust(album_id, -1)
+    await asyncio.gather(*[adjust(album_id, 1) for _ in range(10)])
+    async with AsyncSessionLocal() as session:
+        assert await AlbumRepositoryImpl(session).touch(album_id)
+        await session.commit()
+
+    async with AsyncSessionLocal() as session:
+        album = await AlbumRepositoryImpl(session).get_by_id(album_id)
+    assert album.gallery_version == 13
+    assert album.photo_count == 10
@@ -0,0 +1,185 @@
+"""
+Gallery snapshots and frozen galleries around real transactions
+
+Snapshots are only dropped once the write that changed the album commits;
+before that, other requests still read the old rows.
+"""
+
+import json
+import os
+import tempfile
+import uuid
+
+import pytest
+from sqlalchemy import event
+
+from app.application.use_cases.photo_use_cases import FreezeGalleryUseCase, GetGalleryPageUseCase
+from app.domain.entities.album import Album
+from app.domain.entities.photo import Photo
+from app.infrastructure.cache.gallery_snapshots import GallerySnapshotStore
+from app.infrastructure.database.connection import AsyncSessionLocal, engine, init_db
+from app.infrastructure.repositories.album_repository_impl import AlbumRepositoryImpl
+from app.infrastructure.repositories.photo_repository_impl import PhotoRepositoryImpl
+from app.infrastructure.repositories.photo_repository_snapshot import SnapshotPhotoRepository
+
+pytestmark = pytest.mark.integration
+
+PAGE_SIZE = 2
+
+
+@pytest.fixture
+def store():
+    return GallerySnapshotStore(
+        directory=tempfile.mkdtemp(prefix="snapshots-"),
+        static_directory=tempfile.mkdtemp(prefix="static-"),
+    )
+
+
+async def create_album(photos: int) -> Album:
+    await init_db()
+    async with AsyncSessionLocal() as session:
+        albums = AlbumRepositoryImpl(session)
+        album = await albums.create(Album(name="Boda", event_code=f"G{uuid.uuid4().hex[:8].upper()}"))
+        for index in range(photos):
+            await PhotoRepositoryImpl(session).create(new_photo(album.id, index))
+        await albums.adjust_photo_count(album.id, photos)
+        await session.commit()
+        return await albums.get_by_id(album.id)
+
+
+def new_photo(album_id: str, index: int) -> Photo:
+    return Photo(
+        url=f"https://cdn.test/{index}.jpg",
+        public_id=f"albums/{album_id}/{uuid.uuid4().hex}",
+        album_id=album_id,
+    )
+
+
+async def read_page(store: GallerySnapshotStore, album_id: str, page: int = 0) -> dict:
+    """Another request reading the gallery"""
+    async with AsyncSessionLocal() as session:
+        album = await AlbumRepositoryImpl(session).get_by_id(album_id)
+        use_case = GetGalleryPageUseCase(SnapshotPhotoRepository(PhotoRepositoryImpl(session), store), store)
+        return json.loads(await use_case.execute(album, page, PAGE_SIZE))
+
+
+async def test_snapshot_is_dropped_on_commit(store):
+    album = await create_album(1)
+    assert (await read_page(store, album.id))["total"] == 1
+
+    async with AsyncSessionLocal() as session:
+        writer = SnapshotPhotoRepository(PhotoRepositoryImpl(session), store)
+        await writer.create(new_photo(album.id, 1))
+        await AlbumRepositoryImpl(session).adjust_photo_count(album.id, 1)
+
+        # Not committed yet: other requests are still served the old page
+        assert (await read_page(store, album.id))["total"] == 1
+        assert store.stats()["hits"] == 1
+
+        await session.commit()
+
+    assert store.stats()["pages_in_memory"] == 0
+    page = await read_page(store, album.id)
+    assert page["total"] == 2
+    assert len(page["photos"]) == 2
+
+
+async def test_rollback_keeps_the_snapshot(store):
+    album = await create_album(1)
+    await read_page(store, album.id)
+
+    async with AsyncSessionLocal() as session:
+        writer = SnapshotPhotoRepository(PhotoRepositoryImpl(session), store)
+        await writer.create(new_photo(album.id, 1))
+        await session.rollback()
+        await session.commit()
+
+    assert store.stats()["pages_in_memory"] == 1
+    assert (await read_page(store, album.id))["total"] == 1
+
+
+async def test_delete_takes_the_album_from_the_deleted_row(store):
+    album = await create_album(2)
+    await read_page(store, album.id)
+    async with AsyncSessionLocal() as session:
+        photo_id = (await PhotoRepositoryImpl(session).get_by_album_id(album.id))[0].id
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement.split()[0])
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        async with AsyncSessionLocal() as session:
+            assert await SnapshotPhotoRepository(PhotoRepositoryImpl(session), store).delete(photo_id)
+            # Same statements as the repository's own delete: no extra lookup
+            assert statements == ["SELECT", "DELETE"]
+            assert store.stats()["pages_in_memory"] == 1
+            await session.commit()
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+    assert store.stats()["pages_in_memory"] == 0
+
+
+async def test_freeze_writes_every_page(store):
+    album = await create_album(5)
+    async with AsyncSessionLocal() as session:
+        album_dir = await FreezeGalleryUseCase(PhotoRepositoryImpl(session), store).execute(
+            album, PAGE_SIZE
+        )
+
+    pages = []
+    for page in range(3):
+        with open(os.path.join(album_dir, f"page-{page}.json")) as frozen:
+            pages.append(json.load(frozen))
+    assert not os.path.exists(os.path.join(album_dir, "page-3.json"))
+    assert [len(page["photos"]) for page in pages] == [2, 2, 1]
+    assert {page["total"] for page in pages} == {5}
+    ids = [photo["id"] for page in pages for photo in page["photos"]]
+    assert len(set(ids)) == 5
+    # Same pages as the live gallery
+    for page in range(3):
+        assert await read_page(store, album.id, page) == pages[page]
+
+
+async def test_change_to_a_frozen_gallery_unfreezes_it_on_commit(store):
+    album = await create_album(3)
+    async with AsyncSessionLocal() as session:
+        album_dir = await FreezeGalleryUseCase(PhotoRepositoryImpl(session), store).execute(
+            album, PAGE_SIZE
+        )
+        photo_id = (await PhotoRepositoryImpl(session).get_by_album_id(album.id))[0].id
+
+    async with AsyncSessionLocal() as session:
+        # e.g. a moderator removing a photo from a closed album
+        assert await SnapshotPhotoRepository(PhotoRepositoryImpl(session), store).delete(photo_id)
+        await AlbumRepositoryImpl(session).adjust_photo_count(album.id, -1)
+        assert os.path.exists(album_dir)
+        await session.commit()
+
+    assert not os.path.exists(album_dir)
+
+
+async def test_refreezing_a_smaller_gallery_drops_extra_pages(store):
+    album = await create_album(5)
+    async with AsyncSessionLocal() as session:
+        freeze = FreezeGalleryUseCase(PhotoRepositoryImpl(session), store)
+        album_dir = await freeze.execute(album, PAGE_SIZE)
+        await freeze.execute(album, 5)
+
+    assert sorted(os.listdir(album_dir)) == ["page-0.json"]
+
+
+def test_pages_are_shared_on_disk_and_keyed_by_version(store):
+    other_worker = GallerySnapshotStore(directory=store.directory)
+    store.put_page("a1", "3", 0, b"v3")
+
+    assert other_worker.get_page("a1", "3", 0) == b"v3"
+    assert other_worker.stats()["disk_hits"] == 1
+    assert other_worker.get_page("a1", "4", 0) is None
+
+    store.put_page("a1", "4", 0, b"v4")
+    # Older versions are removed from disk
+    assert os.listdir(os.path.join(store.directory, "a1")) == ["4"]
@@ -0,0 +1,180 @@
+"""
+Resumable (tus) uploads through the real app
+
+A chunk cut by a dropped connection keeps the bytes that arrived, the
+client resumes from the offset HEAD reports, and the last chunk stores the
+file like /photos/upload.
+"""
+
+import base64
+import hashlib
+import os
+import uuid
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+
+from app.api.v1.routes import photos as photo_routes
+from app.domain.entities.album import Album
+from app.infrastructure.database.connection import AsyncSessionLocal, init_db
+from app.infrastructure.repositories.album_repository_impl import AlbumRepositoryImpl
+from app.infrastructure.repositories.photo_repository_impl import PhotoRepositoryImpl
+from app.infrastructure.repositories.singletons import resumable_upload_spool
+from main import app
+
+pytestmark = pytest.mark.integration
+
+DATA = os.urandom(300_000)
+TUS = {"Tus-Resumable": "1.0.0"}
+
+
+class RecordingStorage:
+    """Storage stand-in keeping what each upload sent"""
+
+    def __init__(self):
+        self.received = {}
+
+    async def upload_image(self, file, filename, folder):
+        self.received[filename] = file.read()
+        return {
+            "url": f"https://cdn.test/{folder}/{filename}",
+            "public_id": f"{folder}/{uuid.uuid4().hex}",
+            "bytes": len(self.received[filename]),
+            "format": "jpg",
+        }
+
+
+@pytest.fixture
+def storage(monkeypatch):
+    storage = RecordingStorage()
+    monkeypatch.setattr(photo_routes, "cloudinary_service", storage)
+    return storage
+
+
+@pytest.fixture
+async def album_id():
+    await init_db()
+    async with AsyncSessionLocal() as session:
+        album = await AlbumRepositoryImpl(session).create(
+            Album(name="Boda", event_code=f"R{uuid.uuid4().hex[:8].upper()}")
+        )
+        await session.commit()
+        return album.id
+
+
+@pytest.fixture
+async def client():
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        yield client
+
+
+def metadata(**values) -> str:
+    return ",".join(f"{key} {base64.b64encode(value.encode()).decode()}" for key, value in values.items())
+
+
+async def create(client, album_id: str) -> str:
+    response = await client.post(
+        "/api/v1/photos/resumable",
+        headers={
+            **TUS,
+            "Upload-Length": str(len(DATA)),
+            "Upload-Metadata": metadata(
+                filename=f"{uuid.uuid4().hex}.jpg", filetype="image/jpeg", album_id=album_id
+            ),
+        },
+    )
+    assert response.status_code == 201, response.text
+    return response.headers["location"]
+
+
+async def patch(client, location: str, offset: int, body):
+    return await client.patch(
+        location,
+        content=body,
+        headers={**TUS, "Upload-Offset": str(offset), "Content-Type": "application/offset+octet-stream"},
+    )
+
+
+async def offset_of(client, location: str) -> int:
+    response = await client.head(location, headers=TUS)
+    assert response.status_code == 200
+    return int(response.headers["upload-offset"])
+
+
+async def test_interrupted_chunk_is_resumed_and_completes_the_upload(client, album_id, storage):
+    location = await create(client, album_id)
+
+    async def dropped_body():
+        yield DATA[:100_000]
+        yield DATA[100_000:150_000]
+        raise ConnectionResetError("connection dropped")
+
+    # The server sees the body end early; a real client never gets the response
+    await patch(client, location, 0, dropped_body())
+
+    offset = await offset_of(client, location)
+    assert offset == 150_000
+    response = await patch(client, location, offset, DATA[offset:])
+    assert response.status_code == 204, response.text
+    assert response.headers["upload-offset"] == str(len(DATA))
+
+    status = (await client.get(location)).json()
+    assert status["status"] == "completed"
+    async with AsyncSessionLocal() as session:
+        photo = await PhotoRepositoryImpl(session).get_by_id(status["photo"]["id"])
+    assert photo.album_id == album_id
+    assert photo.content_hash == hashlib.sha256(DATA).hexdigest()
+    assert list(storage.received.values()) == [DATA]
+
+    # The response of the last chunk was lost: resending it changes nothing
+    assert (await patch(client, location, len(DATA), b"")).status_code == 204
+    assert len(storage.received) == 1
+
+
+async def test_offset_conflict(client, album_id, storage):
+    location = await create(client, album_id)
+    assert (await patch(client, location, 0, DATA[:1000])).status_code == 204
+
+    response = await patch(client, location, 500, DATA[500:2000])
+
+    assert response.status_code == 409
+    assert response.headers["upload-offset"] == "1000"
+    assert await offset_of(client, location) == 1000
+
+
+async def test_upload_being_written_is_locked(client, album_id, storage):
+    location = await create(client, album_id)
+    upload = await resumable_upload_spool.get(location.rsplit("/", 1)[1])
+
+    async with resumable_upload_spool.lock(upload):
+        assert (await patch(client, location, 0, DATA[:1000])).status_code == 423
+        assert (await client.delete(location, headers=TUS)).status_code == 423
+
+    assert await offset_of(client, location) == 0
+
+
+async def test_expired_upload_is_gone_and_swept(client, album_id, storage):
+    location = await create(client, album_id)
+    upload = await resumable_upload_spool.get(location.rsplit("/", 1)[1])
+    upload.expires_at = datetime.utcnow() - timedelta(seconds=1)
+    resumable_upload_spool._write_info(upload)
+
+    assert (await client.head(location, headers=TUS)).status_code == 410
+    assert (await patch(client, location, 0, DATA[:1000])).status_code == 410
+
+    resumable_upload_spool.sweep()
+    assert (await client.head(location, headers=TUS)).status_code == 404
+
+
+async def test_delete_cancels_the_upload(client, album_id, storage):
+    location = await create(client, album_id)
+    await patch(client, location, 0, DATA[:1000])
+
+    response = await client.delete(location, headers=TUS)
+
+    assert response.status_code == 204
+    assert (await client.head(location, headers=TUS)).status_code == 404
+    assert storage.received == {}
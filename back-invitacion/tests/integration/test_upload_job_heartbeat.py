@@ -0,0 +1,178 @@
+"""
+Upload jobs stay claimed while a slow storage call is in flight
+
+The worker's stale window is shorter than one upload here; without the
+heartbeat another worker would take the job over mid-upload. A worker that
+does lose its job stops, and can no longer write over the new owner's
+progress.
+"""
+
+import asyncio
+import io
+import tempfile
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import update
+
+from app.domain.entities.album import Album
+from app.domain.entities.upload_job import UploadJob, UploadJobItem
+from app.infrastructure.database.models import UploadJobModel
+from app.infrastructure.database.connection import AsyncSessionLocal, init_db
+from app.infrastructure.jobs.job_worker import JobTakenOver
+from app.infrastructure.jobs.upload_spool import UploadSpool
+from app.infrastructure.jobs.upload_worker import UploadJobWorker
+from app.infrastructure.repositories.album_repository_impl import AlbumRepositoryImpl
+from app.infrastructure.repositories.photo_repository_impl import PhotoRepositoryImpl
+from app.infrastructure.repositories.upload_job_repository_impl import UploadJobRepositoryImpl
+
+pytestmark = pytest.mark.integration
+
+STALE_SECONDS = 0.6
+UPLOAD_SECONDS = 2.0
+
+
+class SlowStorage:
+    """Storage whose uploads take several stale windows"""
+
+    async def upload_image(self, file, filename, folder):
+        await asyncio.sleep(UPLOAD_SECONDS)
+        return {
+            "url": f"https://cdn.test/{folder}/{filename}",
+            "public_id": f"{folder}/{uuid.uuid4().hex}",
+            "bytes": len(file.read()),
+            "format": "jpg",
+        }
+
+
+@pytest.fixture
+def worker():
+    return UploadJobWorker(
+        spool=UploadSpool(tempfile.mkdtemp(prefix="heartbeat-")),
+        storage_service=SlowStorage(),
+        session_factory=AsyncSessionLocal,
+        photo_repository_factory=PhotoRepositoryImpl,
+        album_repository_factory=AlbumRepositoryImpl,
+        stale_seconds=STALE_SECONDS,
+    )
+
+
+async def queue_job(worker: UploadJobWorker) -> str:
+    await init_db()
+    async with AsyncSessionLocal() as session:
+        # Only this test's job is runnable, whatever earlier tests left claimed
+        await session.execute(
+            update(UploadJobModel)
+            .where(UploadJobModel.status.in_(["queued", "processing"]))
+            .values(status="failed")
+        )
+        album = await AlbumRepositoryImpl(session).create(
+            Album(name="Boda", event_code=f"H{uuid.uuid4().hex[:8].upper()}")
+        )
+        job = await UploadJobRepositoryImpl(session).create(
+            UploadJob(album_id=album.id, items=[UploadJobItem(original_filename="a.jpg")])
+        )
+        await session.commit()
+    await worker.spool.save(job.id, 0, io.BytesIO(b"jpeg"))
+    return job.id
+
+
+async def take_over() -> UploadJob:
+    """What another worker's poll would claim right now"""
+    async with AsyncSessionLocal() as session:
+        stale_before = datetime.utcnow() - timedelta(seconds=STALE_SECONDS)
+        job = await UploadJobRepositoryImpl(session).claim_next(stale_before)
+        await session.commit()
+        return job
+
+
+async def test_job_is_not_taken_over_during_a_long_upload(worker):
+    job_id = await queue_job(worker)
+    job = await worker._claim()
+    assert job.id == job_id
+
+    processing = asyncio.create_task(worker._process(job))
+    for _ in range(3):
+        await asyncio.sleep(UPLOAD_SECONDS / 4)
+        stolen = await take_over()
+        assert stolen is None or stolen.id != job_id
+    await processing
+
+    async with AsyncSessionLocal() as session:
+        job = await UploadJobRepositoryImpl(session).get_by_id(job_id)
+    assert job.status == "completed"
+    assert job.attempts == 1
+    assert job.successful == 1
+
+
+async def claim_from_another_worker() -> UploadJob:
+    """Take the job over as if its worker had looked dead"""
+    async with AsyncSessionLocal() as session:
+        job = await UploadJobRepositoryImpl(session).claim_next(
+            datetime.utcnow() + timedelta(seconds=1)
+        )
+        await session.commit()
+        return job
+
+
+async def test_heartbeat_claim_check(worker):
+    await queue_job(worker)
+    job = await worker._claim()
+
+    async with AsyncSessionLocal() as session:
+        repository = UploadJobRepositoryImpl(session)
+        assert await repository.heartbeat(job.id, job.attempts)
+        # Another claim bumped the attempt count: this claim no longer holds it
+        assert not await repository.heartbeat(job.id, job.attempts - 1)
+
+
+async def test_taken_over_worker_abandons_the_upload(worker):
+    job_id = await queue_job(worker)
+    job = await worker._claim()
+    new_owner = await claim_from_another_worker()
+    assert new_owner.id == job_id and new_owner.attempts == job.attempts + 1
+
+    started = asyncio.get_running_loop().time()
+    with pytest.raises(JobTakenOver):
+        await worker._process(job)
+
+    # Cancelled at the first heartbeat, not after the upload finished
+    assert asyncio.get_running_loop().time() - started < UPLOAD_SECONDS
+    async with AsyncSessionLocal() as session:
+        stored = await UploadJobRepositoryImpl(session).get_by_id(job_id)
+        photos = await PhotoRepositoryImpl(session).get_by_album_id(stored.album_id)
+    assert stored.attempts == new_owner.attempts
+    assert stored.items[0].status == "pending"
+    assert photos == []
+    # The new owner still needs the spooled file
+    with worker.spool.open(job_id, 0) as file:
+        assert file.read() == b"jpeg"
+
+
+async def test_taken_over_worker_cannot_overwrite_the_new_owners_progress(worker):
+    job_id = await queue_job(worker)
+    old = await worker._claim()
+    new = await claim_from_another_worker()
+    assert new.id == job_id
+
+    new.items[0].status = "completed"
+    new.items[0].photo_id = "photo-of-the-new-owner"
+    async with AsyncSessionLocal() as session:
+        assert await worker._save_progress(session, new) is new
+        await session.commit()
+
+    old.items[0].status = "failed"
+    old.items[0].error_message = "stale worker"
+    async with AsyncSessionLocal() as session:
+        with pytest.raises(JobTakenOver):
+            await worker._save_progress(session, old)
+
+    async with AsyncSessionLocal() as session:
+        repository = UploadJobRepositoryImpl(session)
+        stored = await repository.get_by_id(job_id)
+        # The new owner's claim is intact, so its heartbeat keeps working
+        assert await repository.heartbeat(job_id, new.attempts)
+    assert stored.attempts == new.attempts
+    assert stored.items[0].status == "completed"
+    assert stored.items[0].photo_id == "photo-of-the-new-owner"
@@ -0,0 +1,173 @@
+"""
+Memory and size limits of the multipart upload routes
+
+A bulk request at the maximum size goes through the real app (SQLite,
+fake storage) while tracemalloc records the peak Python heap, which must
+stay a small fraction of the body: files are spooled to disk and streamed
+to storage in chunks, never held in memory.
+"""
+
+import io
+import os
+import tracemalloc
+import uuid
+
+import httpx
+import pytest
+
+from app.api.v1.dependencies.uploads import max_upload_bytes
+from app.api.v1.routes import photos as photo_routes
+from app.domain.entities.album import Album
+from app.infrastructure.config.settings import settings
+from app.infrastructure.database import models  # noqa: F401  (registers the tables)
+from app.infrastructure.database.connection import AsyncSessionLocal, init_db
+from app.infrastructure.repositories.album_repository_impl import AlbumRepositoryImpl
+from main import app
+
+pytestmark = [pytest.mark.integration, pytest.mark.slow]
+
+MB = 1024 * 1024
+READ_SIZE = 1024 * 1024
+
+
+class SyntheticFile:
+    """File-like object of `size` bytes generated on read, never held in memory"""
+
+    def __init__(self, size: int, marker: bytes):
+        self.size = size
+        self.marker = marker
+        self.position = 0
+
+    def read(self, n: int = -1) -> bytes:
+        n = self.size - self.position if n is None or n < 0 else min(n, self.size - self.position)
+        start = self.position
+        self.position += n
+        if start == 0 and n:
+            # Distinct content per file, so none is skipped as a duplicate
+            return (self.marker + bytes(n))[:n]
+        return bytes(n)
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        self.position = {io.SEEK_SET: 0, io.SEEK_CUR: self.position, io.SEEK_END: self.size}[whence] + offset
+        return self.position
+
+    def tell(self) -> int:
+        return self.position
+
+
+class StreamingStorage:
+    """Storage stand-in that consumes each file in chunks, like the real backends"""
+
+    def __init__(self):
+        self.received = {}
+
+    async def upload_image(self, file, filename, folder):
+        size = 0
+        for chunk in iter(lambda: file.read(READ_SIZE), b""):
+            size += len(chunk)
+        self.received[filename] = size
+        return {
+            "url": f"https://cdn.test/{folder}/{filename}",
+            "public_id": f"{folder}/{uuid.uuid4().hex}",
+            "bytes": size,
+            "format": "jpg",
+        }
+
+    upload_video = upload_image
+
+
+@pytest.fixture
+async def album_id():
+    await init_db()
+    async with AsyncSessionLocal() as session:
+        album = await AlbumRepositoryImpl(session).create(
+            Album(name="Boda", event_code=f"M{uuid.uuid4().hex[:8].upper()}")
+        )
+        await session.commit()
+        return album.id
+
+
+@pytest.fixture
+def storage(monkeypatch):
+    storage = StreamingStorage()
+    monkeypatch.setattr(photo_routes, "cloudinary_service", storage)
+    return storage
+
+
+def client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test", timeout=None
+    )
+
+
+async def test_bulk_upload_at_maximum_size_keeps_memory_bounded(album_id, storage):
+    files = settings.MAX_FILES_PER_REQUEST
+    total = min(files * settings.MAX_FILE_SIZE_MB, settings.MAX_TOTAL_REQUEST_SIZE_MB) * MB
+    file_size = total // files - 4096  # Leave room for the multipart framing
+    upload = [
+        ("files", (f"{i}.jpg", SyntheticFile(file_size, os.urandom(16)), "image/jpeg"))
+        for i in range(files)
+    ]
+
+    tracemalloc.start()
+    try:
+        async with client() as http:
+            response = await http.post(
+                "/api/v1/photos/bulk-upload", files=upload, data={"album_id": album_id}
+            )
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    assert response.status_code == 207, response.text
+    assert response.json()["successful"] == files
+    assert storage.received == {f"{i}.jpg": file_size for i in range(files)}
+    # A ~300 MB request may not cost more than a few MB of heap
+    assert peak < 32 * MB, f"peak heap {peak / MB:.1f} MB for a {total / MB:.0f} MB request"
+
+
+async def test_declared_oversized_upload_is_rejected_before_reading(album_id, storage):
+    body = SyntheticFile(settings.MAX_FILE_SIZE_MB * MB + MB, b"big")
+
+    async with client() as http:
+        response = await http.post(
+            "/api/v1/photos/upload",
+            files={"file": ("big.jpg", body, "image/jpeg")},
+            data={"album_id": album_id},
+        )
+
+    assert response.status_code == 413
+    assert body.position == 0
+    assert storage.received == {}
+
+
+async def test_streamed_oversized_upload_is_cut_off_at_the_limit(album_id, storage):
+    limit = max_upload_bytes(1)
+    boundary = "limit-test"
+    sent = 0
+
+    async def body():
+        # No Content-Length: the limit can only be enforced while reading
+        nonlocal sent
+        head = (
+            f"--{boundary}\r\nContent-Disposition: form-data; name=\"album_id\"\r\n\r\n{album_id}\r\n"
+            f"--{boundary}\r\nContent-Disposition: form-data; name=\"file\"; filename=\"big.jpg\"\r\n"
+            "Content-Type: image/jpeg\r\n\r\n"
+        ).encode()
+        yield head
+        sent += len(head)
+        for _ in range(limit // (64 * 1024) + 200):
+            yield bytes(64 * 1024)
+            sent += 64 * 1024
+        yield f"\r\n--{boundary}--\r\n".encode()
+
+    async with client() as http:
+        response = await http.post(
+            "/api/v1/photos/upload",
+            content=body(),
+            headers={"Content-Type": f"multipart/form-data; boundary={boundary}"},
+        )
+
+    assert response.status_code == 413
+    assert sent <= limit + 64 * 1024
+    assert storage.received == {}
@@ -0,0 +1,202 @@
+import asyncio
+import hashlib
+import io
+import random
+import uuid
+import zipfile
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.application.services.album_export import (
+    AlbumExport,
+    ChecksumCache,
+    ExportItem,
+    SizeCache,
+)
+from app.application.services.zip_stream import ZipEntry
+from app.application.use_cases import album_export_use_cases
+from app.application.use_cases.album_export_use_cases import ExportAlbumUseCase
+from app.domain.entities.album import Album
+from app.domain.entities.photo import Photo
+from app.infrastructure.repositories.album_repository_memory import AlbumRepositoryMemory
+from app.infrastructure.repositories.photo_repository_memory import PhotoRepositoryMemory
+
+pytestmark = pytest.mark.unit
+
+SIZES = [0, 1, 1000, 65536, 65537, 200_000, 3, 150_001]
+
+
+def content(url: str, size: int) -> bytes:
+    """Deterministic bytes of a file, so any range can be produced on its own"""
+    blocks = []
+    counter = 0
+    while len(blocks) * 32 < size:
+        blocks.append(hashlib.sha256(f"{url}:{counter}".encode()).digest())
+        counter += 1
+    return b"".join(blocks)[:size]
+
+
+class FakeDownloader:
+    """Serves byte ranges of generated files in uneven chunks, with some latency"""
+
+    def __init__(self, seed: int = 0, sizes=None, head_fails: bool = False):
+        self.random = random.Random(seed)
+        self.requests = []
+        self.sizes = sizes or {}
+        self.head_fails = head_fails
+        self.heads = []
+
+    async def size(self, url):
+        self.heads.append(url)
+        if self.head_fails:
+            raise Exception("HEAD failed")
+        return self.sizes[url]
+
+    async def stream(self, url, start, end, size):
+        self.requests.append((url, start, end))
+        data = content(url, size)[start:end]
+        position = 0
+        while position < len(data):
+            await asyncio.sleep(self.random.random() / 1000)
+            step = self.random.randint(1, 70_000)
+            yield data[position:position + step]
+            position += step
+
+
+def make_items():
+    return [
+        ExportItem(
+            entry=ZipEntry(
+                name=f"Boda/{index:02d} foto ñ.jpg",
+                size=size,
+                modified=datetime(2024, 5, 17, 18, 30, 12),
+            ),
+            url=f"https://cdn.test/{index}.jpg",
+            key=f"albums/{index}",
+        )
+        for index, size in enumerate(SIZES)
+    ]
+
+
+async def read(export: AlbumExport, start: int = 0, end: int = None) -> bytes:
+    return b"".join([chunk async for chunk in export.iter_bytes(start, end)])
+
+
+@pytest.fixture
+async def archive():
+    export = AlbumExport(make_items(), FakeDownloader(), ChecksumCache(), concurrency=3)
+    return await read(export)
+
+
+async def test_archive_is_valid(archive):
+    export = AlbumExport(make_items(), FakeDownloader(), ChecksumCache())
+    assert len(archive) == export.size
+
+    with zipfile.ZipFile(io.BytesIO(archive)) as zf:
+        assert zf.testzip() is None
+        assert zf.namelist() == [item.entry.name for item in make_items()]
+        for item in make_items():
+            info = zf.getinfo(item.entry.name)
+            assert info.compress_type == zipfile.ZIP_STORED
+            assert info.date_time == (2024, 5, 17, 18, 30, 12)
+            assert zf.read(info) == content(item.url, item.entry.size)
+
+
+async def test_random_ranges_match_the_full_archive(archive):
+    rng = random.Random(1234)
+    checksums = ChecksumCache()
+    for _ in range(40):
+        start = rng.randrange(len(archive))
+        end = rng.randrange(start, len(archive) + 1)
+        # Half the ranges with a cold checksum cache, half with a warm one
+        cache = ChecksumCache() if rng.random() < 0.5 else checksums
+        export = AlbumExport(make_items(), FakeDownloader(rng.randrange(1000)), cache)
+        assert await read(export, start, end) == archive[start:end], (start, end)
+
+
+async def test_ranges_at_the_edges(archive):
+    size = len(archive)
+    for start, end in [(0, 1), (size - 1, size), (0, size), (size - 22, size), (30, 31)]:
+        export = AlbumExport(make_items(), FakeDownloader(), ChecksumCache())
+        assert await read(export, start, end) == archive[start:end], (start, end)
+
+
+async def test_cached_checksums_skip_files_before_the_range(archive):
+    checksums = ChecksumCache()
+    await read(AlbumExport(make_items(), FakeDownloader(), checksums))
+
+    downloader = FakeDownloader()
+    export = AlbumExport(make_items(), downloader, checksums)
+    last = export.items[-1].entry
+    start = export.layout.data_offset(last) + 10
+    assert await read(export, start) == archive[start:]
+    # Only the tail of the last file was fetched
+    assert downloader.requests == [(export.items[-1].url, 10, last.size)]
+
+
+async def album_with_photos(stored_sizes):
+    albums, photos = AlbumRepositoryMemory(), PhotoRepositoryMemory()
+    album = await albums.create(Album(name="Boda", event_code=f"X{uuid.uuid4().hex[:6]}"))
+    taken = datetime(2024, 5, 17, 18, 0)
+    for index, size in enumerate(stored_sizes):
+        await photos.create(
+            Photo(
+                url=f"https://cdn.test/{index}.jpg",
+                public_id=f"albums/{album.id}/{index}",
+                album_id=album.id,
+                original_filename="IMG_0001.jpg",
+                format="jpg",
+                file_size=size,
+                captured_at=taken + timedelta(minutes=index),
+            )
+        )
+    return albums, photos, album
+
+
+async def test_export_pages_through_the_album(monkeypatch):
+    monkeypatch.setattr(album_export_use_cases, "EXPORT_PAGE_SIZE", 2)
+    albums, photos, album = await album_with_photos([10, 20, 30, 40, 50])
+    downloader = FakeDownloader(sizes={f"https://cdn.test/{i}.jpg": (i + 1) * 10 for i in range(5)})
+
+    _, export = await ExportAlbumUseCase(albums, photos, downloader, ChecksumCache()).execute(album.id)
+
+    names = [item.entry.name for item in export.items]
+    assert names[:3] == [
+        f"{album.event_code}/IMG_0001.jpg",
+        f"{album.event_code}/IMG_0001 (2).jpg",
+        f"{album.event_code}/IMG_0001 (3).jpg",
+    ]
+    assert len(set(names)) == 5
+    assert [item.entry.size for item in export.items] == [10, 20, 30, 40, 50]
+
+
+async def test_wrong_stored_size_is_replaced_by_the_cdn_length():
+    # The second photo was stored with a size its delivered file does not have
+    albums, photos, album = await album_with_photos([1000, 999, 3])
+    cdn_sizes = {"https://cdn.test/0.jpg": 1000, "https://cdn.test/1.jpg": 4321, "https://cdn.test/2.jpg": 3}
+    sizes = SizeCache()
+    downloader = FakeDownloader(sizes=cdn_sizes)
+    use_case = ExportAlbumUseCase(albums, photos, downloader, ChecksumCache(), sizes=sizes)
+
+    _, export = await use_case.execute(album.id)
+    archive = await read(export)
+
+    with zipfile.ZipFile(io.BytesIO(archive)) as zf:
+        assert zf.testzip() is None
+        assert [info.file_size for info in zf.infolist()] == [1000, 4321, 3]
+
+    # Checked lengths are remembered: a resumed download sends no HEAD
+    downloader.heads.clear()
+    await use_case.execute(album.id)
+    assert downloader.heads == []
+
+
+async def test_stored_size_is_used_when_head_fails():
+    albums, photos, album = await album_with_photos([100, 200])
+
+    _, export = await ExportAlbumUseCase(
+        albums, photos, FakeDownloader(head_fails=True), ChecksumCache()
+    ).execute(album.id)
+
+    assert [item.entry.size for item in export.items] == [100, 200]
@@ -0,0 +1,126 @@
+import asyncio
+import io
+import uuid
+
+import pytest
+
+from app.application.dtos.photo_dto import PhotoUploadDTO
+from app.application.use_cases.photo_use_cases import BulkUploadMediaUseCase
+from app.domain.entities.album import Album
+from app.infrastructure.repositories.album_repository_memory import AlbumRepositoryMemory
+from app.infrastructure.repositories.photo_repository_memory import PhotoRepositoryMemory
+
+pytestmark = pytest.mark.unit
+
+
+class MemorySession:
+    """Session stand-in for the in-memory repositories"""
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def commit(self):
+        pass
+
+    async def rollback(self):
+        pass
+
+
+class FakeStorage:
+    """Storage returning a response per filename; "broken" ones lack the URL"""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.uploaded = []
+
+    async def upload_image(self, file, filename, folder):
+        await asyncio.sleep(self.delay)
+        self.uploaded.append(filename)
+        if filename.startswith("error"):
+            raise RuntimeError("Cloudinary timed out")
+        response = {
+            "url": f"https://cdn.test/{folder}/{filename}",
+            "public_id": f"{folder}/{uuid.uuid4().hex}",
+            "bytes": 10,
+            "format": "jpg",
+        }
+        if filename.startswith("broken"):
+            del response["url"]
+        return response
+
+    upload_video = upload_image
+
+
+@pytest.fixture
+async def setup():
+    albums = AlbumRepositoryMemory()
+    photos = PhotoRepositoryMemory()
+    album = await albums.create(Album(name="Boda", event_code=f"T{uuid.uuid4().hex[:8]}"))
+    return albums, photos, album
+
+
+def make_use_case(albums, photos, storage, concurrency=4):
+    return BulkUploadMediaUseCase(
+        MemorySession,
+        lambda session: photos,
+        lambda session: albums,
+        storage,
+        concurrency=concurrency,
+    )
+
+
+def files(*names):
+    return [(io.BytesIO(name.encode()), name, "image") for name in names]
+
+
+async def test_bad_storage_response_fails_only_its_file(setup):
+    albums, photos, album = setup
+    storage = FakeStorage(delay=0.01)
+    names = ["a.jpg", "broken.jpg", "b.jpg", "error.jpg", "c.jpg"]
+
+    results = await make_use_case(albums, photos, storage).execute(
+        files(*names), [uuid.uuid4().hex for _ in names], PhotoUploadDTO(album_id=album.id)
+    )
+
+    assert [result.original_filename for result in results] == names
+    assert [result.success for result in results] == [True, False, True, False, True]
+    assert "url" in results[1].error_message
+    assert results[3].error_message == "Cloudinary timed out"
+    assert (await albums.get_by_id(album.id)).photo_count == 3
+    # Nothing keeps running after the request returns
+    assert asyncio.all_tasks() == {asyncio.current_task()}
+
+
+async def test_duplicate_is_uploaded_when_first_copy_fails(setup):
+    albums, photos, album = setup
+    storage = FakeStorage()
+    same_hash = uuid.uuid4().hex
+
+    results = await make_use_case(albums, photos, storage).execute(
+        files("broken.jpg", "copy.jpg"), [same_hash, same_hash], PhotoUploadDTO(album_id=album.id)
+    )
+
+    assert [result.success for result in results] == [False, True]
+    assert not results[1].duplicate
+    assert storage.uploaded == ["broken.jpg", "copy.jpg"]
+
+
+async def test_cancelled_request_cancels_pending_uploads(setup):
+    albums, photos, album = setup
+    storage = FakeStorage(delay=10)
+    names = [f"{i}.jpg" for i in range(5)]
+    task = asyncio.create_task(
+        make_use_case(albums, photos, storage).execute(
+            files(*names), [uuid.uuid4().hex for _ in names], PhotoUploadDTO(album_id=album.id)
+        )
+    )
+    await asyncio.sleep(0.05)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert asyncio.all_tasks() == {asyncio.current_task()}
+    assert (await albums.get_by_id(album.id)).photo_count == 0
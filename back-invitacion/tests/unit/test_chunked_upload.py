@@ -0,0 +1,118 @@
+import asyncio
+import io
+import os
+
+import pytest
+
+from app.infrastructure.config.settings import settings
+from app.infrastructure.external_services.chunked_upload import MIN_CHUNK_SIZE, upload_in_chunks
+
+pytestmark = pytest.mark.unit
+
+
+class DroppingStandIn:
+    """
+    Chunked upload endpoint that drops the chunks listed in `drop`
+
+    Keeps every accepted chunk by its Content-Range and answers the last one
+    with the reassembled asset, like Cloudinary does.
+    """
+
+    def __init__(self, drop=(), drop_times: int = 1):
+        self.drop = {index: drop_times for index in drop}
+        self.calls = []
+        self.parts = {}
+
+    async def send_chunk(self, chunk: bytes, headers):
+        # "bytes 0-5242879/17825792"
+        start_end, total = headers["Content-Range"].split(" ")[1].split("/")
+        start, end = (int(value) for value in start_end.split("-"))
+        index = start // MIN_CHUNK_SIZE
+        self.calls.append((index, headers["X-Unique-Upload-Id"]))
+        assert len(chunk) == end - start + 1
+
+        if self.drop.get(index):
+            self.drop[index] -= 1
+            raise Exception("HTTP 503: Chunk dropped")
+
+        self.parts[start] = chunk
+        if end + 1 < int(total):
+            return {"done": False}
+        data = b"".join(self.parts[offset] for offset in sorted(self.parts))
+        return {"public_id": "standin/video", "bytes": len(data), "data": data}
+
+
+async def read_chunk(file, chunk_size: int) -> bytes:
+    return file.read(chunk_size)
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(settings, "CLOUDINARY_CHUNK_RETRY_BACKOFF_SECONDS", 0)
+
+
+@pytest.fixture
+def payload():
+    # Three full chunks and a short last one
+    return os.urandom(3 * MIN_CHUNK_SIZE + 1234)
+
+
+async def test_only_the_dropped_chunk_is_resent(payload):
+    standin = DroppingStandIn(drop=[1])
+
+    result = await upload_in_chunks(
+        io.BytesIO(payload), len(payload), read_chunk, standin.send_chunk,
+        chunk_size=MIN_CHUNK_SIZE, retries=3,
+    )
+
+    assert [index for index, _ in standin.calls] == [0, 1, 1, 2, 3]
+    # Every attempt belongs to the same upload
+    assert len({upload_id for _, upload_id in standin.calls}) == 1
+    assert result["bytes"] == len(payload)
+    assert result["data"] == payload
+
+
+async def test_every_chunk_dropped_once_is_still_reassembled(payload):
+    standin = DroppingStandIn(drop=[0, 1, 2, 3])
+
+    result = await upload_in_chunks(
+        io.BytesIO(payload), len(payload), read_chunk, standin.send_chunk,
+        chunk_size=MIN_CHUNK_SIZE, retries=1,
+    )
+
+    assert [index for index, _ in standin.calls] == [0, 0, 1, 1, 2, 2, 3, 3]
+    assert result["data"] == payload
+
+
+async def test_chunk_failing_past_the_retries_aborts_the_upload(payload):
+    standin = DroppingStandIn(drop=[2], drop_times=3)
+
+    with pytest.raises(Exception, match="Chunk dropped"):
+        await upload_in_chunks(
+            io.BytesIO(payload), len(payload), read_chunk, standin.send_chunk,
+            chunk_size=MIN_CHUNK_SIZE, retries=2,
+        )
+
+    # Chunks after the failing one are never sent
+    assert [index for index, _ in standin.calls] == [0, 1, 2, 2, 2]
+    assert 3 * MIN_CHUNK_SIZE not in standin.parts
+
+
+async def test_retries_back_off_between_attempts(payload, monkeypatch):
+    monkeypatch.setattr(settings, "CLOUDINARY_CHUNK_RETRY_BACKOFF_SECONDS", 0.01)
+    sleeps = []
+    real_sleep = asyncio.sleep
+
+    async def record_sleep(seconds):
+        sleeps.append(seconds)
+        await real_sleep(0)
+
+    monkeypatch.setattr(asyncio, "sleep", record_sleep)
+    standin = DroppingStandIn(drop=[0], drop_times=2)
+
+    await upload_in_chunks(
+        io.BytesIO(payload), len(payload), read_chunk, standin.send_chunk,
+        chunk_size=MIN_CHUNK_SIZE, retries=2,
+    )
+
+    assert sleeps == [0.01, 0.02]
@@ -0,0 +1,62 @@
+import asyncio
+import io
+import time
+
+import cloudinary.uploader
+import httpx
+import pytest
+
+from app.infrastructure.external_services.cloudinary_service import CloudinaryService
+from main import app
+
+pytestmark = pytest.mark.unit
+
+UPLOAD_SECONDS = 0.5
+
+
+def slow_upload(file, **options):
+    """Blocking SDK call: holds its thread like a real 50 MB upload would"""
+    time.sleep(UPLOAD_SECONDS)
+    return {
+        "secure_url": "https://res.cloudinary.com/test/image/upload/v1/a.jpg",
+        "public_id": "albums/a",
+        "version": 1,
+        "format": "jpg",
+        "bytes": 10,
+    }
+
+
+async def test_health_answers_while_uploads_saturate_the_executor(monkeypatch):
+    monkeypatch.setattr(cloudinary.uploader, "upload", slow_upload)
+    service = CloudinaryService(max_workers=2)
+    # Three rounds of uploads: both threads busy and the rest queued
+    uploads = [
+        asyncio.create_task(service.upload_image(io.BytesIO(b"x"), f"{i}.jpg", "albums/a"))
+        for i in range(6)
+    ]
+
+    try:
+        await asyncio.sleep(0.05)
+        assert service.stats()["running"] == 2
+        assert service.stats()["queued"] == 4
+
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            timings = []
+            for _ in range(5):
+                start = time.perf_counter()
+                response = await client.get("/api/v1/health")
+                timings.append(time.perf_counter() - start)
+                assert response.status_code == 200
+                await asyncio.sleep(0.05)
+
+        # Every health check answered well within a single upload's duration
+        assert max(timings) < UPLOAD_SECONDS / 5
+        assert not all(upload.done() for upload in uploads)
+
+        results = await asyncio.gather(*uploads)
+        assert all(result["public_id"] == "albums/a" for result in results)
+        assert service.stats()["completed"] == 6
+    finally:
+        await service.close()
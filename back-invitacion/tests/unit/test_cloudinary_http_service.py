@@ -0,0 +1,136 @@
+import io
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from app.infrastructure.config.settings import settings
+from app.infrastructure.external_services.chunked_upload import MIN_CHUNK_SIZE
+from app.infrastructure.external_services import cloudinary_http_service
+from app.infrastructure.external_services.cloudinary_http_service import CloudinaryHttpService
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", "scripts"))
+from cloudinary_standin import create_app  # noqa: E402
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+def standin():
+    return create_app(
+        api_key=settings.CLOUDINARY_API_KEY, api_secret=settings.CLOUDINARY_API_SECRET
+    )
+
+
+@pytest.fixture
+async def service(standin):
+    service = CloudinaryHttpService(
+        base_url="http://standin", transport=httpx.ASGITransport(app=standin)
+    )
+    yield service
+    await service.close()
+
+
+async def stats(service) -> dict:
+    return (await service._client.get("http://standin/stats")).json()
+
+
+async def test_upload_image(service):
+    result = await service.upload_image(io.BytesIO(b"jpeg" * 1000), "boda.jpg", "albums/a1")
+
+    assert result["public_id"].startswith("albums/a1/")
+    assert result["url"] == f"https://res.cloudinary.com/test/image/upload/{result['public_id']}"
+    assert result["thumbnail_url"].endswith("?thumb")
+    assert result["bytes"] == 4000
+    assert result["format"] == "jpg"
+    assert (await stats(service))["uploads"] == 1
+
+
+async def test_upload_video_in_chunks_survives_dropped_chunks(monkeypatch):
+    monkeypatch.setattr(settings, "CLOUDINARY_CHUNKED_THRESHOLD_MB", 0)
+    monkeypatch.setattr(settings, "CLOUDINARY_CHUNK_SIZE_MB", MIN_CHUNK_SIZE // (1024 * 1024))
+    monkeypatch.setattr(settings, "CLOUDINARY_CHUNK_RETRY_BACKOFF_SECONDS", 0)
+    standin = create_app(
+        fail_every=2,
+        api_key=settings.CLOUDINARY_API_KEY,
+        api_secret=settings.CLOUDINARY_API_SECRET,
+    )
+    service = CloudinaryHttpService(
+        base_url="http://standin", transport=httpx.ASGITransport(app=standin)
+    )
+    size = 2 * MIN_CHUNK_SIZE + 100
+    try:
+        result = await service.upload_video(io.BytesIO(os.urandom(size)), "vals.mp4", "albums/a1")
+        counters = await stats(service)
+    finally:
+        await service.close()
+
+    assert result["bytes"] == size
+    assert result["duration"] == 12.4
+    # Chunks 2 and 4 dropped, each resent once: 3 chunks in 5 requests
+    assert counters["chunks"] == 5
+    assert counters["dropped_chunks"] == 2
+    assert counters["uploads"] == 1
+
+
+async def test_requests_are_signed(service):
+    await service.upload_image(io.BytesIO(b"x"), "a.jpg", "albums/a1")
+
+    service.api_secret = "wrong"
+    with pytest.raises(Exception, match="Invalid Signature"):
+        await service.upload_image(io.BytesIO(b"x"), "b.jpg", "albums/a1")
+    with pytest.raises(Exception, match="Invalid Signature"):
+        await service.delete_image("albums/a1/anything")
+    with pytest.raises(Exception, match="Invalid credentials"):
+        await service.get_image_details("albums/a1/anything")
+
+    counters = await stats(service)
+    assert counters["uploads"] == 1
+    assert counters["rejected"] == 3
+
+
+async def test_stale_signature_is_rejected(service, monkeypatch):
+    # Only the service's clock is two hours behind, not the stand-in's
+    monkeypatch.setattr(
+        cloudinary_http_service,
+        "time",
+        SimpleNamespace(time=lambda: time.time() - 2 * 3600),
+    )
+
+    with pytest.raises(Exception, match="Stale request"):
+        await service.upload_image(io.BytesIO(b"x"), "a.jpg", "albums/a1")
+
+
+async def test_delete_image(service):
+    uploaded = await service.upload_image(io.BytesIO(b"x"), "a.jpg", "albums/a1")
+
+    assert (await service.delete_image(uploaded["public_id"]))["result"] == "ok"
+    assert (await service.delete_image(uploaded["public_id"]))["result"] == "not found"
+    with pytest.raises(Exception, match="Resource not found"):
+        await service.get_image_details(uploaded["public_id"])
+
+
+async def test_delete_video_needs_its_resource_type(service):
+    uploaded = await service.upload_video(io.BytesIO(b"x"), "a.mp4", "albums/a1")
+
+    assert (await service.delete_image(uploaded["public_id"]))["result"] == "not found"
+    assert (await service.delete_image(uploaded["public_id"], "video"))["result"] == "ok"
+
+
+async def test_delete_resources_and_folder(service):
+    kept = await service.upload_image(io.BytesIO(b"x"), "kept.jpg", "albums/a2")
+    photos = [
+        (await service.upload_image(io.BytesIO(b"x"), f"{i}.jpg", "albums/a1"))["public_id"]
+        for i in range(3)
+    ]
+    video = await service.upload_video(io.BytesIO(b"x"), "v.mp4", "albums/a1")
+
+    statuses = await service.delete_resources([photos[0], "albums/a1/missing"])
+    assert statuses == {photos[0]: "deleted", "albums/a1/missing": "not_found"}
+
+    result = await service.delete_folder("albums/a1")
+    assert set(result["deleted"]) == {photos[1], photos[2], video["public_id"]}
+    assert await service.list_resources("albums/") == ([kept["public_id"]], None)
@@ -0,0 +1,52 @@
+import uuid
+
+import pytest
+
+from app.application.use_cases.photo_use_cases import CompleteThumbnailUseCase
+from app.domain.entities.album import Album
+from app.domain.entities.photo import Photo
+from app.infrastructure.repositories.album_repository_memory import AlbumRepositoryMemory
+from app.infrastructure.repositories.photo_repository_memory import PhotoRepositoryMemory
+
+pytestmark = pytest.mark.unit
+
+
+@pytest.fixture
+async def setup():
+    albums = AlbumRepositoryMemory()
+    photos = PhotoRepositoryMemory()
+    album = await albums.create(Album(name="Boda", event_code=f"T{uuid.uuid4().hex[:8]}"))
+    await albums.adjust_photo_count(album.id, 1)
+    photo = await photos.create(
+        Photo(url="https://cdn.test/a.jpg", public_id="albums/a", album_id=album.id)
+    )
+    return albums, photos, album, photo
+
+
+async def test_ready_thumbnail_touches_the_album(setup):
+    albums, photos, album, photo = setup
+    before = (await albums.get_by_id(album.id)).updated_at
+
+    updated = await CompleteThumbnailUseCase(photos, albums).execute(
+        photo.public_id, "https://cdn.test/a-thumb.jpg"
+    )
+
+    assert updated.thumbnail_url == "https://cdn.test/a-thumb.jpg"
+    album = await albums.get_by_id(album.id)
+    assert album.updated_at > before
+    assert album.photo_count == 1
+
+
+async def test_repeated_notification_leaves_the_album_alone(setup):
+    albums, photos, album, photo = setup
+    use_case = CompleteThumbnailUseCase(photos, albums)
+    await use_case.execute(photo.public_id, "https://cdn.test/a-thumb.jpg")
+    touched = (await albums.get_by_id(album.id)).updated_at
+
+    await use_case.execute(photo.public_id, "https://cdn.test/a-thumb.jpg")
+
+    assert (await albums.get_by_id(album.id)).updated_at == touched
+
+
+async def test_touch_reports_unknown_albums():
+    assert not await AlbumRepositoryMemory().touch(str(uuid.uuid4()))
@@ -0,0 +1,84 @@
+import uuid
+
+import pytest
+
+from app.application.dtos.photo_dto import DirectUploadConfirmDTO
+from app.application.use_cases.photo_use_cases import ConfirmDirectUploadUseCase
+from app.domain.entities.album import Album
+from app.domain.exceptions.base import ValidationException
+from app.infrastructure.external_services.cloudinary_signing import (
+    CloudinaryUploadSigner,
+    sign_params,
+)
+from app.infrastructure.repositories.album_repository_memory import AlbumRepositoryMemory
+from app.infrastructure.repositories.photo_repository_memory import PhotoRepositoryMemory
+
+pytestmark = pytest.mark.unit
+
+
+class FakeStorage:
+    """Answers the Admin API resource() call with what Cloudinary stored"""
+
+    def __init__(self, resources):
+        self.resources = resources
+
+    async def get_image_details(self, public_id, phash=False, resource_type="image"):
+        return self.resources[public_id]
+
+
+@pytest.fixture
+async def setup():
+    albums = AlbumRepositoryMemory()
+    photos = PhotoRepositoryMemory()
+    album = await albums.create(Album(name="Boda", event_code=f"D{uuid.uuid4().hex[:8]}"))
+    public_id = f"albums/{album.id}/abc"
+    storage = FakeStorage(
+        {
+            public_id: {
+                "public_id": public_id,
+                "bytes": 123456,
+                "width": 4000,
+                "height": 3000,
+                "format": "jpg",
+                "phash": "ba19c8ab5fa05a59",
+            }
+        }
+    )
+    signer = CloudinaryUploadSigner()
+    use_case = ConfirmDirectUploadUseCase(photos, albums, signer, storage)
+    return use_case, album, public_id, signer
+
+
+def confirmation(album, public_id, signer, **fields) -> DirectUploadConfirmDTO:
+    version = 1717000000
+    return DirectUploadConfirmDTO(
+        album_id=album.id,
+        public_id=public_id,
+        version=version,
+        signature=sign_params({"public_id": public_id, "version": version}, signer.api_secret),
+        **fields,
+    )
+
+
+async def test_details_come_from_cloudinary(setup):
+    use_case, album, public_id, signer = setup
+
+    photo = await use_case.execute(confirmation(album, public_id, signer, bytes=123456))
+
+    assert photo.file_size == 123456
+    assert (photo.width, photo.height, photo.format) == (4000, 3000, "jpg")
+    assert photo.perceptual_hash == "ba19c8ab5fa05a59"
+    assert photo.url.endswith(f"{public_id}.jpg")
+
+
+@pytest.mark.parametrize(
+    "tampered",
+    [{"bytes": 1}, {"format": "png"}, {"phash": "0000000000000000"}, {"width": 10}],
+)
+async def test_tampered_details_are_rejected(setup, tampered):
+    use_case, album, public_id, signer = setup
+
+    field = next(iter(tampered))
+    with pytest.raises(ValidationException, match=f"{field} does not match"):
+        await use_case.execute(confirmation(album, public_id, signer, **tampered))
+    assert (await use_case.album_repository.get_by_id(album.id)).photo_count == 0
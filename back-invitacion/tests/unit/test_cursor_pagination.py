@@ -0,0 +1,87 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.application.services.pagination import decode_cursor, encode_cursor
+from app.application.use_cases.photo_use_cases import GetPhotosByCursorUseCase
+from app.domain.entities.photo import Photo
+from app.domain.exceptions.base import ValidationException
+from app.infrastructure.repositories.photo_repository_memory import PhotoRepositoryMemory
+
+pytestmark = pytest.mark.unit
+
+START = datetime(2024, 6, 1, 18, 30)
+
+
+async def album_with_photos(count: int, same_second: bool = False) -> PhotoRepositoryMemory:
+    """Photos in album "a1"; with same_second they all share created_at (a bulk upload)"""
+    repository = PhotoRepositoryMemory()
+    for index in range(count):
+        photo = await repository.create(
+            Photo(url=f"https://cdn.test/{index}.jpg", public_id=f"p{index}", album_id="a1")
+        )
+        photo.created_at = START if same_second else START + timedelta(seconds=index)
+        photo.captured_at = START - timedelta(minutes=index)
+    await repository.create(Photo(url="https://cdn.test/other.jpg", public_id="other", album_id="a2"))
+    return repository
+
+
+async def walk(use_case: GetPhotosByCursorUseCase, limit: int, order: str = "uploaded"):
+    """Follow next_cursor until the last page"""
+    pages, cursor = [], None
+    while True:
+        photos, total, cursor = await use_case.execute("a1", cursor, limit, order=order)
+        pages.append([photo.public_id for photo in photos])
+        if cursor is None:
+            return pages, total
+
+
+def test_cursor_round_trip():
+    position = datetime(2024, 6, 1, 18, 30, 5, 123456)
+
+    cursor = encode_cursor(position, "3f2a")
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (position, "3f2a")
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "e30", encode_cursor(START, "x")[:-4]])
+def test_invalid_cursor_is_rejected(cursor):
+    with pytest.raises(ValidationException, match="Invalid pagination cursor"):
+        decode_cursor(cursor)
+
+
+async def test_pages_follow_each_other_newest_first():
+    use_case = GetPhotosByCursorUseCase(await album_with_photos(7))
+
+    pages, total = await walk(use_case, limit=3)
+
+    assert pages == [["p6", "p5", "p4"], ["p3", "p2", "p1"], ["p0"]]
+    assert total == 7
+
+
+async def test_photos_uploaded_in_the_same_second_are_not_skipped():
+    use_case = GetPhotosByCursorUseCase(await album_with_photos(7, same_second=True))
+
+    pages, _ = await walk(use_case, limit=2)
+
+    ids = [public_id for page in pages for public_id in page]
+    assert sorted(ids) == [f"p{index}" for index in range(7)]
+    assert len(pages) == 4
+
+
+async def test_captured_order_pages_oldest_first():
+    use_case = GetPhotosByCursorUseCase(await album_with_photos(5))
+
+    pages, _ = await walk(use_case, limit=2, order="captured")
+
+    assert pages == [["p4", "p3"], ["p2", "p1"], ["p0"]]
+
+
+async def test_full_last_page_has_no_cursor():
+    use_case = GetPhotosByCursorUseCase(await album_with_photos(4))
+
+    photos, _, cursor = await use_case.execute("a1", None, limit=4)
+
+    assert len(photos) == 4
+    assert cursor is None
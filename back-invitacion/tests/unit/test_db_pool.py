@@ -0,0 +1,100 @@
+import tempfile
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.infrastructure.config.settings import settings
+from app.infrastructure.database.pool import (
+    InstrumentedQueuePool,
+    PoolStats,
+    get_pool_limits,
+    get_pool_status,
+    pool_stats,
+)
+
+pytestmark = pytest.mark.unit
+
+
+def make_engine(**options):
+    path = tempfile.mktemp(suffix=".db")
+    return create_async_engine(f"sqlite+aiosqlite:///{path}", **options)
+
+
+@pytest.mark.parametrize(
+    "max_connections, workers, expected",
+    [
+        (0, 4, (5, 10)),  # No server budget: the configured limits
+        (40, 2, (5, 10)),  # Budget larger than the pool
+        (12, 2, (5, 1)),  # 6 per worker: overflow takes what is left
+        (8, 4, (2, 0)),  # 2 per worker: smaller pool, no overflow
+        (3, 8, (1, 0)),  # Fewer connections than workers: one each
+    ],
+)
+def test_pool_limits_split_the_server_budget(monkeypatch, max_connections, workers, expected):
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 5)
+    monkeypatch.setattr(settings, "DB_MAX_OVERFLOW", 10)
+    monkeypatch.setattr(settings, "DB_MAX_CONNECTIONS", max_connections)
+    monkeypatch.setattr(settings, "DB_WORKERS", workers)
+
+    assert get_pool_limits() == expected
+
+
+def test_stats_average_over_checkouts_and_timeouts():
+    stats = PoolStats()
+    assert stats.snapshot()["avg_wait_ms"] == 0.0
+
+    stats.record_wait(0.001)
+    stats.record_wait(0.003)
+    stats.record_wait(0.005, timed_out=True)
+
+    assert stats.snapshot() == {
+        "checkouts": 2,
+        "timeouts": 1,
+        "avg_wait_ms": 3.0,
+        "max_wait_ms": 5.0,
+    }
+
+
+async def test_checkouts_are_counted_and_reported():
+    engine = make_engine(poolclass=InstrumentedQueuePool, pool_size=2, max_overflow=1, pool_timeout=5)
+    before = pool_stats.snapshot()["checkouts"]
+    try:
+        async with engine.connect() as first, engine.connect() as second:
+            await first.execute(text("SELECT 1"))
+            await second.execute(text("SELECT 1"))
+            status = get_pool_status(engine.pool)
+            assert status["checked_out"] == 2
+            assert (status["mode"], status["pooled"]) == ("queue", True)
+            assert (status["size"], status["max_overflow"], status["timeout"]) == (2, 1, 5)
+
+        status = get_pool_status(engine.pool)
+        assert status["checked_out"] == 0
+        assert status["checked_in"] == 2
+        assert status["checkouts"] == before + 2
+    finally:
+        await engine.dispose()
+
+
+async def test_timeout_is_counted():
+    engine = make_engine(poolclass=InstrumentedQueuePool, pool_size=1, max_overflow=0, pool_timeout=0.05)
+    before = pool_stats.snapshot()["timeouts"]
+    try:
+        async with engine.connect():
+            with pytest.raises(PoolTimeoutError):
+                async with engine.connect():
+                    pass
+        assert pool_stats.snapshot()["timeouts"] == before + 1
+        assert pool_stats.snapshot()["max_wait_ms"] >= 50
+    finally:
+        await engine.dispose()
+
+
+async def test_null_pool_is_reported_as_unpooled():
+    engine = make_engine(poolclass=NullPool)
+    try:
+        assert get_pool_status(engine.pool) == {"mode": "null", "pooled": False}
+    finally:
+        await engine.dispose()
@@ -0,0 +1,96 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.infrastructure.external_services.cloudinary_http_service import CloudinaryHttpService
+from app.infrastructure.external_services.cloudinary_service import (
+    DELETE_BATCH_SIZE,
+    DELETE_CONCURRENCY,
+    delete_in_batches,
+)
+
+pytestmark = pytest.mark.unit
+
+
+class FakeAdminApi:
+    """delete_resources stand-in recording batches and how many ran at once"""
+
+    def __init__(self, failing_batch: int = None, delay: float = 0.0):
+        self.failing_batch = failing_batch
+        self.delay = delay
+        self.batches = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def delete_batch(self, batch):
+        number = len(self.batches)
+        self.batches.append(batch)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            if number == self.failing_batch:
+                raise RuntimeError("rate limited")
+            return {"deleted": {public_id: "deleted" for public_id in batch}}
+        finally:
+            self.in_flight -= 1
+
+
+def ids(count: int) -> list:
+    return [f"albums/a1/{index}" for index in range(count)]
+
+
+async def test_ids_are_split_into_admin_api_batches():
+    api = FakeAdminApi()
+
+    statuses = await delete_in_batches(ids(250), api.delete_batch)
+
+    assert [len(batch) for batch in api.batches] == [DELETE_BATCH_SIZE, DELETE_BATCH_SIZE, 50]
+    assert [public_id for batch in api.batches for public_id in batch] == ids(250)
+    assert statuses == {public_id: "deleted" for public_id in ids(250)}
+
+
+async def test_batches_run_concurrently_up_to_the_limit():
+    api = FakeAdminApi(delay=0.01)
+
+    await delete_in_batches(ids(DELETE_BATCH_SIZE * 10), api.delete_batch)
+
+    assert len(api.batches) == 10
+    assert api.max_in_flight == DELETE_CONCURRENCY
+
+
+async def test_failed_batch_only_marks_its_own_ids():
+    api = FakeAdminApi(failing_batch=1)
+
+    statuses = await delete_in_batches(ids(250), api.delete_batch)
+
+    failed = set(api.batches[1])
+    assert {statuses[public_id] for public_id in failed} == {"error: rate limited"}
+    assert all(status == "deleted" for public_id, status in statuses.items() if public_id not in failed)
+    assert len(statuses) == 250
+
+
+async def test_nothing_to_delete_makes_no_call():
+    api = FakeAdminApi()
+
+    assert await delete_in_batches([], api.delete_batch) == {}
+    assert api.batches == []
+
+
+async def test_http_service_sends_one_request_per_batch():
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        public_ids = request.url.params.get_list("public_ids[]")
+        requests.append(len(public_ids))
+        return httpx.Response(200, json={"deleted": {public_id: "not_found" for public_id in public_ids}})
+
+    service = CloudinaryHttpService(base_url="http://standin", transport=httpx.MockTransport(handler))
+    try:
+        statuses = await service.delete_resources(ids(230), "video")
+    finally:
+        await service.close()
+
+    assert sorted(requests) == [30, DELETE_BATCH_SIZE, DELETE_BATCH_SIZE]
+    assert statuses == {public_id: "not_found" for public_id in ids(230)}
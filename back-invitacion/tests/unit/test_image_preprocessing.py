@@ -0,0 +1,133 @@
+import io
+import os
+
+import pytest
+
+from app.infrastructure.external_services.image_preprocessing import (
+    ImagePreprocessor,
+    PreprocessingStorageService,
+    pillow_available,
+)
+
+pytestmark = [
+    pytest.mark.unit,
+    pytest.mark.skipif(not pillow_available(), reason="Pillow is not installed"),
+]
+
+
+@pytest.fixture
+def preprocessor():
+    preprocessor = ImagePreprocessor(max_workers=1, max_edge=400, min_bytes=1024)
+    yield preprocessor
+    preprocessor.close()
+
+
+def noisy_image(size, image_format="JPEG", **options) -> io.BytesIO:
+    """A photo-like image that compresses badly"""
+    from PIL import Image
+
+    image = Image.frombytes("RGB", size, os.urandom(size[0] * size[1] * 3))
+    file = io.BytesIO()
+    image.save(file, format=image_format, **options)
+    file.seek(0)
+    return file
+
+
+def image_size(file) -> tuple:
+    from PIL import Image
+
+    with Image.open(file) as image:
+        return image.size
+
+
+async def test_large_image_is_downscaled_and_reencoded(preprocessor):
+    original = noisy_image((1200, 800), quality=100)
+    original_bytes = len(original.getvalue())
+
+    processed, filename, report = await preprocessor.preprocess(original, "IMG_0001.jpeg")
+
+    assert filename == "IMG_0001.jpg"
+    assert image_size(processed) == (400, 267)
+    assert report["original_bytes"] == original_bytes
+    assert report["bytes"] == os.fstat(processed.fileno()).st_size
+    assert report["bytes_saved"] == original_bytes - report["bytes"] > 0
+    assert preprocessor.stats()["processed"] == 1
+    processed.close()
+
+
+async def test_exif_orientation_is_applied_to_the_pixels(preprocessor):
+    from PIL import Image
+
+    exif = Image.Exif()
+    exif[0x0112] = 6  # Rotate 90° clockwise to display
+    original = noisy_image((300, 200), quality=100, exif=exif.tobytes())
+
+    processed, _, _ = await preprocessor.preprocess(original, "portrait.jpg")
+
+    assert image_size(processed) == (200, 300)
+    with Image.open(processed) as image:
+        assert 0x0112 not in image.getexif()
+    processed.close()
+
+
+@pytest.mark.parametrize(
+    "filename, size",
+    [("small.jpg", (10, 10)), ("logo.png", (600, 600)), ("clip.mp4", (600, 600))],
+)
+async def test_non_candidates_are_returned_untouched(preprocessor, filename, size):
+    original = noisy_image(size, image_format="PNG")
+    original.seek(5)
+
+    file, returned_name, report = await preprocessor.preprocess(original, filename)
+
+    assert (file, returned_name) == (original, filename)
+    assert file.tell() == 5
+    assert report["bytes_saved"] == 0
+    assert preprocessor.stats()["skipped"] == 1
+
+
+async def test_undecodable_file_falls_back_to_the_original(preprocessor):
+    original = io.BytesIO(b"\xff\xd8 not really a jpeg" * 200)
+
+    file, filename, report = await preprocessor.preprocess(original, "broken.jpg")
+
+    assert (file, filename) == (original, "broken.jpg")
+    assert file.tell() == 0
+    assert report["bytes"] == report["original_bytes"]
+    assert preprocessor.stats()["failed"] == 1
+
+
+async def test_animation_is_left_alone(preprocessor):
+    from PIL import Image
+
+    frames = [Image.frombytes("RGB", (300, 300), os.urandom(300 * 300 * 3)) for _ in range(2)]
+    original = io.BytesIO()
+    frames[0].save(original, format="WEBP", save_all=True, append_images=frames[1:])
+    original.seek(0)
+
+    file, filename, _ = await preprocessor.preprocess(original, "sticker.webp")
+
+    assert (file, filename) == (original, "sticker.webp")
+    assert preprocessor.stats()["skipped"] == 1
+
+
+async def test_storage_decorator_uploads_the_processed_file(preprocessor):
+    received = {}
+
+    class Storage:
+        async def upload_image(self, file, filename, folder):
+            received.update(filename=filename, size=image_size(file), file=file)
+            return {"url": f"https://cdn.test/{folder}/{filename}", "bytes": 1}
+
+        async def upload_video(self, file, filename, folder):
+            return {"url": f"https://cdn.test/{folder}/{filename}"}
+
+    storage = PreprocessingStorageService(Storage(), preprocessor)
+
+    result = await storage.upload_image(noisy_image((1200, 800), quality=100), "a.jpg", "albums/x")
+
+    assert received["filename"] == "a.jpg"
+    assert received["size"] == (400, 267)
+    assert received["file"].closed
+    assert result["bytes_saved"] > 0
+    assert result["original_bytes"] > result["bytes_saved"]
@@ -0,0 +1,71 @@
+import pytest
+
+from app.infrastructure.external_services.image_variants import ImageVariantUrls
+
+pytestmark = pytest.mark.unit
+
+WIDTHS = [1280, 320, 640, 320]
+
+
+def widths_of(variants) -> list:
+    return [width for width, _ in variants.urls]
+
+
+def test_buckets_wider_than_the_original_are_left_out():
+    variants = ImageVariantUrls(WIDTHS).get("albums/a1/boda", "jpg", 1000)
+
+    assert widths_of(variants) == [320, 640]
+    for width, url in variants.urls:
+        assert f"c_limit,w_{width}/f_auto,q_auto/" in url
+        assert url.startswith("https://") and url.endswith("albums/a1/boda.jpg")
+
+
+def test_unknown_width_gets_every_bucket():
+    variants = ImageVariantUrls(WIDTHS).get("albums/a1/boda", "jpg")
+
+    assert widths_of(variants) == [320, 640, 1280]
+
+
+def test_image_narrower_than_every_bucket_gets_its_own_width():
+    variants = ImageVariantUrls(WIDTHS).get("albums/a1/icon", "png", 200)
+
+    assert widths_of(variants) == [200]
+    assert "c_limit,w_200/" in variants.urls[0][1]
+    assert variants.srcset == f"{variants.urls[0][1]} 200w"
+
+
+def test_srcset_lists_every_variant():
+    variants = ImageVariantUrls(WIDTHS).get("albums/a1/boda", "jpg", 1280)
+
+    assert variants.srcset == ", ".join(f"{url} {width}w" for width, url in variants.urls)
+    assert variants.srcset.endswith("1280w")
+
+
+def test_signed_urls_carry_a_signature():
+    signed = ImageVariantUrls(WIDTHS, sign_urls=True).get("albums/a1/boda", "jpg", 640)
+    unsigned = ImageVariantUrls(WIDTHS).get("albums/a1/boda", "jpg", 640)
+
+    assert all("/s--" in url for _, url in signed.urls)
+    assert not any("/s--" in url for _, url in unsigned.urls)
+
+
+def test_urls_are_memoized_per_photo():
+    variant_urls = ImageVariantUrls(WIDTHS, max_size=2)
+
+    first = variant_urls.get("a", "jpg", 1000)
+    assert variant_urls.get("a", "jpg", 1000) is first
+    variant_urls.get("b", "jpg", 1000)
+    variant_urls.get("c", "jpg", 1000)
+
+    stats = variant_urls.stats()
+    assert (stats["hits"], stats["misses"], stats["size"]) == (1, 3, 2)
+    assert variant_urls.get("a", "jpg", 1000) is not first
+    variant_urls.clear()
+    assert variant_urls.stats()["size"] == 0
+
+
+def test_memoization_can_be_disabled():
+    variant_urls = ImageVariantUrls(WIDTHS, max_size=0)
+
+    assert variant_urls.get("a", "jpg", 1000) == variant_urls.get("a", "jpg", 1000)
+    assert variant_urls.stats() == {"enabled": False}
@@ -0,0 +1,26 @@
+import pytest
+
+from app.infrastructure.jobs.job_worker import JobWorker
+from app.infrastructure.jobs.purge_worker import AlbumPurgeWorker
+from app.infrastructure.jobs.upload_worker import UploadJobWorker
+
+pytestmark = pytest.mark.unit
+
+
+def test_job_worker_is_abstract():
+    with pytest.raises(TypeError, match="_process"):
+        JobWorker(session_factory=None)
+
+
+def test_worker_missing_a_hook_cannot_be_created():
+    class NoRepository(JobWorker):
+        async def _process(self, job) -> None:
+            pass
+
+    with pytest.raises(TypeError, match="_repository"):
+        NoRepository(session_factory=None)
+
+
+@pytest.mark.parametrize("worker_class", [UploadJobWorker, AlbumPurgeWorker])
+def test_workers_implement_every_hook(worker_class):
+    assert not worker_class.__abstractmethods__
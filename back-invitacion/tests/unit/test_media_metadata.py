@@ -0,0 +1,83 @@
+import struct
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfoNotFoundError
+
+import pytest
+
+from app.infrastructure.external_services.media_metadata import (
+    EXIF_DATETIME_ORIGINAL,
+    EXIF_IFD_POINTER,
+    EXIF_OFFSET_TIME_ORIGINAL,
+    MP4_EPOCH,
+    MediaMetadataExtractor,
+    _extract,
+    to_utc,
+)
+
+pytestmark = pytest.mark.unit
+
+
+def jpeg_with_exif(taken: str, offset: str = None) -> bytes:
+    """Smallest JPEG header carrying DateTimeOriginal (and OffsetTimeOriginal)"""
+    exif_tags = [(EXIF_DATETIME_ORIGINAL, taken.encode() + b"\x00")]
+    if offset:
+        exif_tags.append((EXIF_OFFSET_TIME_ORIGINAL, offset.encode() + b"\x00"))
+
+    # Header, IFD0 with the Exif pointer, then the Exif IFD and its strings
+    exif_ifd = 8 + 2 + 12 + 4
+    data_start = exif_ifd + 2 + 12 * len(exif_tags) + 4
+    tiff = b"II*\x00" + struct.pack("<I", 8)
+    tiff += struct.pack("<HHHII", 1, EXIF_IFD_POINTER, 4, 1, exif_ifd) + struct.pack("<I", 0)
+    entries, strings = b"", b""
+    for tag, value in exif_tags:
+        entries += struct.pack("<HHII", tag, 2, len(value), data_start + len(strings))
+        strings += value
+    tiff += struct.pack("<H", len(exif_tags)) + entries + struct.pack("<I", 0) + strings
+
+    app1 = b"Exif\x00\x00" + tiff
+    return b"\xff\xd8\xff\xe1" + struct.pack(">H", len(app1) + 2) + app1 + b"\xff\xda"
+
+
+def moov_created(created: datetime) -> bytes:
+    seconds = int((created - MP4_EPOCH.replace(tzinfo=None)).total_seconds())
+    mvhd = struct.pack(">B3xIIII", 0, seconds, seconds, 600, 600 * 12) + bytes(80)
+    return struct.pack(">I4s", 8 + len(mvhd), b"mvhd") + mvhd
+
+
+def test_exif_with_offset_is_converted_to_utc():
+    metadata = _extract(jpeg_with_exif("2024:06:01 20:15:00", "-06:00"), "image", "Europe/Madrid")
+
+    assert metadata["captured_at"] == datetime(2024, 6, 2, 2, 15)
+
+
+def test_exif_without_offset_is_read_in_the_local_timezone():
+    sample = jpeg_with_exif("2024:06:01 20:15:00")
+
+    assert _extract(sample, "image", "America/Mexico_City")["captured_at"] == datetime(2024, 6, 2, 2, 15)
+    assert _extract(sample, "image")["captured_at"] == datetime(2024, 6, 1, 20, 15)
+
+
+def test_video_header_is_already_utc():
+    metadata = _extract(moov_created(datetime(2024, 6, 2, 2, 16)), "video", "America/Mexico_City")
+
+    assert metadata["captured_at"] == datetime(2024, 6, 2, 2, 16)
+    assert metadata["duration"] == 12
+
+
+def test_photo_and_video_of_the_same_moment_sort_together():
+    # A phone without OffsetTimeOriginal: photo at 20:15 local, video a minute later
+    photo = _extract(jpeg_with_exif("2024:06:01 20:15:00"), "image", "America/Mexico_City")
+    video = _extract(moov_created(datetime(2024, 6, 2, 2, 16)), "video", "America/Mexico_City")
+
+    assert video["captured_at"] - photo["captured_at"] == timedelta(minutes=1)
+
+
+def test_to_utc_keeps_naive_utc():
+    assert to_utc(None) is None
+    assert to_utc(datetime(2024, 1, 1, 12)) == datetime(2024, 1, 1, 12)
+    assert to_utc(datetime(2024, 1, 1, 12), "Europe/Madrid") == datetime(2024, 1, 1, 11)
+
+
+def test_unknown_timezone_fails_at_startup():
+    with pytest.raises(ZoneInfoNotFoundError):
+        MediaMetadataExtractor(max_workers=1, local_timezone="Mars/Olympus")
@@ -0,0 +1,137 @@
+import random
+
+import pytest
+
+from app.application.services.near_duplicates import BKTree, NearDuplicateIndex, hamming, near_pairs
+from app.infrastructure.cache.near_duplicates import NearDuplicateIndexCache
+
+pytestmark = pytest.mark.unit
+
+
+def random_hashes(count: int, seed: int) -> list:
+    """Random 64-bit hashes, a third of them a few bits away from an earlier one"""
+    rng = random.Random(seed)
+    values = []
+    for _ in range(count):
+        if values and rng.random() < 0.33:
+            value = rng.choice(values)
+            for bit in rng.sample(range(64), rng.randint(0, 12)):
+                value ^= 1 << bit
+        else:
+            value = rng.getrandbits(64)
+        values.append(value)
+    return values
+
+
+def entries_of(values: list) -> list:
+    return [(f"p{i}", f"{value:016x}") for i, value in enumerate(values)]
+
+
+def brute_force_pairs(values: list, max_distance: int) -> set:
+    return {
+        (i, j)
+        for i in range(len(values))
+        for j in range(i + 1, len(values))
+        if hamming(values[i], values[j]) <= max_distance
+    }
+
+
+def brute_force_clusters(values: list, max_distance: int) -> set:
+    """Connected components of the near pairs, as frozensets of photo ids"""
+    groups = {i: {i} for i in range(len(values))}
+    for i, j in brute_force_pairs(values, max_distance):
+        if groups[i] is not groups[j]:
+            merged = groups[i] | groups[j]
+            for member in merged:
+                groups[member] = merged
+    return {
+        frozenset(f"p{i}" for i in group)
+        for group in {id(group): group for group in groups.values()}.values()
+        if len(group) > 1
+    }
+
+
+def as_sets(clusters: list) -> set:
+    return {frozenset(cluster) for cluster in clusters}
+
+
+@pytest.mark.parametrize("max_distance", [0, 3, 6, 10])
+def test_near_pairs_match_brute_force(max_distance):
+    values = random_hashes(300, seed=max_distance)
+
+    pairs = near_pairs(values, max_distance)
+
+    assert len(pairs) == len(set(pairs))
+    assert set(pairs) == brute_force_pairs(values, max_distance)
+
+
+def test_bk_tree_search_matches_brute_force():
+    values = random_hashes(300, seed=1)
+    tree = BKTree()
+    for i, value in enumerate(values):
+        tree.add(value, f"p{i}")
+
+    for query in values[:30]:
+        expected = {
+            (hamming(query, value), f"p{i}") for i, value in enumerate(values) if hamming(query, value) <= 8
+        }
+        assert set(tree.search(query, 8)) == expected
+    assert tree.size == 300
+
+
+@pytest.mark.parametrize("max_distance", [4, 10])
+def test_build_clusters_match_brute_force(max_distance):
+    values = random_hashes(200, seed=7)
+
+    index = NearDuplicateIndex.build(max_distance, entries_of(values))
+
+    assert as_sets(index.clusters()) == brute_force_clusters(values, max_distance)
+    sizes = [len(cluster) for cluster in index.clusters()]
+    assert sizes == sorted(sizes, reverse=True)
+
+
+def test_photos_added_later_join_the_same_clusters():
+    values = random_hashes(200, seed=3)
+    entries = entries_of(values)
+
+    index = NearDuplicateIndex.build(10, entries[:80])
+    assert index.sync(entries)
+
+    assert as_sets(index.clusters()) == as_sets(NearDuplicateIndex.build(10, entries).clusters())
+
+
+def test_sync_refuses_removed_photos():
+    entries = [("a", "ffffffffffffffff"), ("b", "fffffffffffffffe"), ("c", "0000000000000000")]
+    index = NearDuplicateIndex.build(10, entries)
+    assert index.clusters() == [["a", "b"]]
+
+    assert not index.sync(entries[1:])
+
+
+def test_cache_updates_and_rebuilds_after_a_delete():
+    cache = NearDuplicateIndexCache()
+    entries = [("a", "ffffffffffffffff"), ("b", "fffffffffffffffe")]
+
+    index = cache.get_index("album", 10, entries)
+    entries.append(("c", "fffffffffffffffc"))
+    assert cache.get_index("album", 10, entries) is index
+    assert as_sets(index.clusters()) == {frozenset("abc")}
+
+    # "b" deleted: a and c are still close, but the index must not keep b
+    rebuilt = cache.get_index("album", 10, [entries[0], entries[2]])
+    assert rebuilt is not index
+    assert as_sets(rebuilt.clusters()) == {frozenset("ac")}
+    assert (cache.builds, cache.updates) == (2, 1)
+
+
+def test_cache_keeps_the_most_recently_used_indexes():
+    cache = NearDuplicateIndexCache(max_size=2)
+    first = cache.get_index("a1", 10, [])
+    cache.get_index("a2", 10, [])
+    cache.get_index("a1", 10, [])
+    cache.get_index("a3", 10, [])
+
+    assert cache.stats()["indexes"] == 2
+    assert cache.get_index("a1", 10, []) is first
+    cache.invalidate("a1")
+    assert cache.get_index("a1", 10, []) is not first
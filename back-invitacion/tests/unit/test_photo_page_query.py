@@ -0,0 +1,104 @@
+import tempfile
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.infrastructure.database.connection import Base
+from app.infrastructure.database.models import AlbumModel, PhotoModel
+from app.infrastructure.repositories.photo_repository_impl import PhotoRepositoryImpl
+
+pytestmark = pytest.mark.unit
+
+START = datetime(2024, 6, 1, 18, 30)
+# Seconds after START each photo was uploaded: p1..p3 in the same second
+UPLOADED = [0, 3, 3, 3, 10]
+
+
+@pytest.fixture
+async def session():
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tempfile.mktemp(suffix='.db')}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+        session.add(AlbumModel(id="a1", name="Boda", event_code="PAGE1", photo_count=5))
+        session.add(AlbumModel(id="a2", name="Vacía", event_code="PAGE2", photo_count=0))
+        for index, seconds in enumerate(UPLOADED):
+            session.add(
+                PhotoModel(
+                    id=f"p{index}",
+                    url=f"https://cdn.test/{index}.jpg",
+                    public_id=f"albums/a1/{index}",
+                    album_id="a1",
+                    created_at=START + timedelta(seconds=seconds),
+                    captured_at=START - timedelta(minutes=index),
+                )
+            )
+        await session.commit()
+        yield session
+    await engine.dispose()
+
+
+@pytest.fixture
+def statements(session):
+    recorded = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        recorded.append(statement)
+
+    sync_engine = session.bind.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", record)
+    yield recorded
+    event.remove(sync_engine, "before_cursor_execute", record)
+
+
+async def test_page_and_total_come_back_in_one_query(session, statements):
+    photos, total = await PhotoRepositoryImpl(session).get_page_with_total("a1", skip=1, limit=2)
+
+    assert [photo.id for photo in photos] == ["p3", "p2"]
+    assert total == 5
+    assert len(statements) == 1
+    assert "count(" not in statements[0].lower()
+
+
+async def test_total_is_the_album_counter(session):
+    # Not a COUNT(*): the counter kept by adjust_photo_count is the source
+    album = await session.get(AlbumModel, "a1")
+    album.photo_count = 42
+    await session.commit()
+
+    _, total = await PhotoRepositoryImpl(session).get_page_with_total("a1", limit=1)
+
+    assert total == 42
+
+
+async def test_empty_page_still_reports_the_total(session, statements):
+    repository = PhotoRepositoryImpl(session)
+
+    assert await repository.get_page_with_total("a1", skip=10) == ([], 5)
+    assert await repository.get_page_with_total("a2") == ([], 0)
+    assert await repository.get_page_with_total("missing") == ([], 0)
+    assert len(statements) == 6
+
+
+async def test_keyset_pages_match_offset_pages(session):
+    repository = PhotoRepositoryImpl(session)
+    for order in ("uploaded", "captured"):
+        everything, _ = await repository.get_page_with_total("a1", limit=10, order=order)
+
+        paged, after = [], None
+        while True:
+            photos, total = await repository.get_page_with_total("a1", limit=2, after=after, order=order)
+            if not photos:
+                break
+            paged.extend(photos)
+            last = photos[-1]
+            after = (last.captured_at if order == "captured" else last.created_at, last.id)
+
+        assert [photo.id for photo in paged] == [photo.id for photo in everything]
+        assert total == 5
+
+    # Captured order is chronological: the photo taken first comes first
+    assert [photo.id for photo in everything] == ["p4", "p3", "p2", "p1", "p0"]
@@ -0,0 +1,148 @@
+import hashlib
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.infrastructure.jobs.resumable_spool import (
+    ResumableUploadSpool,
+    UploadLengthExceededError,
+    UploadLockedError,
+    UploadOffsetError,
+)
+
+pytestmark = pytest.mark.unit
+
+DATA = bytes(range(256)) * 40  # 10240 bytes
+
+
+@pytest.fixture
+def spool():
+    return ResumableUploadSpool(tempfile.mkdtemp(prefix="resumable-"), expiry_seconds=3600)
+
+
+async def new_upload(spool):
+    return await spool.create("album-1", "vals.mp4", "video", len(DATA), "Ana")
+
+
+async def chunks(data: bytes, size: int = 1000, fail_after: int = None):
+    """Request body in pieces; fail_after bytes in, the connection drops"""
+    for start in range(0, len(data), size):
+        if fail_after is not None and start >= fail_after:
+            raise ConnectionResetError("client went away")
+        yield data[start:start + size]
+
+
+async def append(spool, upload, offset, body):
+    async with spool.lock(upload) as current:
+        return await spool.append(current, offset, body)
+
+
+async def test_created_upload_starts_empty(spool):
+    upload = await new_upload(spool)
+
+    stored = await spool.get(upload.id)
+    assert stored.offset == 0
+    assert (stored.album_id, stored.filename, stored.media_type) == ("album-1", "vals.mp4", "video")
+    assert stored.length == len(DATA)
+    assert not stored.completed
+    assert await spool.get("../../etc") is None
+
+
+async def test_chunks_are_appended_in_order(spool):
+    upload = await new_upload(spool)
+
+    assert await append(spool, upload, 0, chunks(DATA[:4000])) == 4000
+    assert await append(spool, upload, 4000, chunks(DATA[4000:])) == len(DATA)
+
+    with spool.open(await spool.get(upload.id)) as file:
+        assert file.read() == DATA
+    assert await spool.checksum(upload) == hashlib.sha256(DATA).hexdigest()
+
+
+async def test_wrong_offset_is_a_conflict(spool):
+    upload = await new_upload(spool)
+    await append(spool, upload, 0, chunks(DATA[:4000]))
+
+    with pytest.raises(UploadOffsetError) as error:
+        await append(spool, upload, 3000, chunks(DATA[3000:]))
+    assert error.value.offset == 4000
+    assert (await spool.get(upload.id)).offset == 4000
+
+
+async def test_dropped_chunk_keeps_what_arrived(spool):
+    upload = await new_upload(spool)
+
+    with pytest.raises(ConnectionResetError):
+        await append(spool, upload, 0, chunks(DATA, fail_after=6000))
+
+    # The client asks for the offset (tus HEAD) and sends the rest
+    offset = (await spool.get(upload.id)).offset
+    assert offset == 6000
+    assert await append(spool, upload, offset, chunks(DATA[offset:])) == len(DATA)
+    with spool.open(upload) as file:
+        assert file.read() == DATA
+
+
+async def test_bytes_past_the_declared_length_are_refused(spool):
+    upload = await new_upload(spool)
+
+    with pytest.raises(UploadLengthExceededError):
+        await append(spool, upload, 0, chunks(DATA + b"extra"))
+    assert (await spool.get(upload.id)).offset <= len(DATA)
+
+
+async def test_a_single_writer_holds_the_lock(spool):
+    upload = await new_upload(spool)
+
+    async with spool.lock(upload):
+        with pytest.raises(UploadLockedError):
+            async with spool.lock(upload):
+                pass
+    async with spool.lock(upload) as current:
+        assert current.id == upload.id
+
+
+async def test_completed_upload_drops_its_data(spool):
+    upload = await new_upload(spool)
+    await append(spool, upload, 0, chunks(DATA))
+
+    await spool.complete(upload, "photo-1", duplicate=True)
+
+    stored = await spool.get(upload.id)
+    assert stored.completed and stored.duplicate
+    assert stored.photo_id == "photo-1"
+    assert stored.offset == len(DATA)
+    assert not os.path.exists(os.path.join(spool.directory, upload.id, "data"))
+
+
+async def test_sweep_removes_expired_uploads_only(spool):
+    expired = await new_upload(spool)
+    expired.expires_at = datetime.utcnow() - timedelta(seconds=1)
+    spool._write_info(expired)
+    busy = await new_upload(spool)
+    busy.expires_at = expired.expires_at
+    spool._write_info(busy)
+    active = await new_upload(spool)
+
+    assert (await spool.get(expired.id)).expired
+    async with spool.lock(busy):
+        # Still being written to: left for the next sweep
+        assert spool.sweep() == 1
+
+    assert await spool.get(expired.id) is None
+    assert await spool.get(busy.id) is not None
+    assert await spool.get(active.id) is not None
+    assert spool.sweep() == 1
+    assert await spool.get(busy.id) is None
+
+
+async def test_appending_pushes_the_expiry_back(spool):
+    upload = await new_upload(spool)
+    upload.expires_at = datetime.utcnow() + timedelta(seconds=5)
+    spool._write_info(upload)
+
+    await append(spool, upload, 0, chunks(DATA[:100]))
+
+    assert (await spool.get(upload.id)).expires_at > datetime.utcnow() + timedelta(seconds=3000)
@@ -0,0 +1,191 @@
+import json
+
+import pytest
+from fastapi import FastAPI, Request
+from starlette.requests import ClientDisconnect
+
+from app.api.middlewares.admission import UploadAdmissionMiddleware
+from app.application.services.upload_admission import UploadAdmission
+
+pytestmark = pytest.mark.unit
+
+MAX_REQUEST_BYTES = 1000
+RETRY_AFTER = 7
+
+
+def make_app(admission: UploadAdmission) -> UploadAdmissionMiddleware:
+    """An upload route behind the middleware, reporting what it read and reserved"""
+    app = FastAPI()
+
+    @app.post("/upload")
+    async def upload(request: Request):
+        body = await request.body()
+        return {"read": len(body), "reserved": admission.bytes}
+
+    @app.post("/fail")
+    async def fail(request: Request):
+        await request.body()
+        raise RuntimeError("storage is down")
+
+    return UploadAdmissionMiddleware(
+        app, admission, max_request_bytes=MAX_REQUEST_BYTES, retry_after=RETRY_AFTER
+    )
+
+
+class Client:
+    """Drives one ASGI request, counting how many body messages the app pulled"""
+
+    def __init__(self, chunks, disconnect: bool = False):
+        self.chunks = list(chunks)
+        self.disconnect = disconnect
+        self.pulled = 0
+        self.sent = []
+
+    async def receive(self):
+        if self.pulled < len(self.chunks):
+            self.pulled += 1
+            more = self.pulled < len(self.chunks) or self.disconnect
+            return {"type": "http.request", "body": self.chunks[self.pulled - 1], "more_body": more}
+        return {"type": "http.disconnect"}
+
+    async def send(self, message):
+        self.sent.append(message)
+
+    async def post(self, app, path="/upload", content_type="multipart/form-data; boundary=x", length=None):
+        headers = [(b"content-type", content_type.encode())]
+        if length is not None:
+            headers.append((b"content-length", str(length).encode()))
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "POST",
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": b"",
+            "root_path": "",
+            "headers": headers,
+            "server": ("test", 80),
+            "client": ("127.0.0.1", 1234),
+        }
+        await app(scope, self.receive, self.send)
+        return self
+
+    @property
+    def status(self) -> int:
+        return self.sent[0]["status"]
+
+    @property
+    def headers(self) -> dict:
+        return {key.decode(): value.decode() for key, value in self.sent[0]["headers"]}
+
+    def json(self):
+        return json.loads(b"".join(message.get("body", b"") for message in self.sent[1:]))
+
+
+async def test_admitted_upload_is_released():
+    admission = UploadAdmission(max_uploads=2)
+
+    client = await Client([b"a" * 300]).post(make_app(admission), length=300)
+
+    assert client.status == 200
+    assert client.json() == {"read": 300, "reserved": 300}
+    assert admission.stats()["uploads"] == 0
+    assert admission.stats()["bytes"] == 0
+    assert admission.admitted == 1
+
+
+async def test_over_budget_gets_503_before_the_body_is_read():
+    admission = UploadAdmission(max_uploads=1)
+    assert admission.acquire(100)
+
+    client = await Client([b"a" * 300]).post(make_app(admission), length=300)
+
+    assert client.status == 503
+    assert client.headers["retry-after"] == str(RETRY_AFTER)
+    assert client.pulled == 0
+    assert admission.rejected_uploads == 1
+    assert admission.uploads == 1
+
+
+async def test_byte_budget_turns_away_a_large_upload():
+    admission = UploadAdmission(max_bytes=500)
+    assert admission.acquire(400)
+
+    client = await Client([b"a" * 200]).post(make_app(admission), length=200)
+
+    assert client.status == 503
+    assert admission.rejected_bytes == 1
+
+
+async def test_declared_oversize_gets_413_before_the_body_is_read():
+    admission = UploadAdmission(max_uploads=2)
+
+    client = await Client([b"a" * 2000]).post(make_app(admission), length=MAX_REQUEST_BYTES + 1)
+
+    assert client.status == 413
+    assert client.pulled == 0
+    assert admission.too_large == 1
+    assert admission.admitted == 0
+
+
+async def test_streamed_oversize_is_cut_off_at_the_limit():
+    admission = UploadAdmission(max_uploads=2)
+
+    client = await Client([b"a" * 400] * 10).post(make_app(admission))
+
+    assert client.status == 413
+    # Third chunk crosses the 1000 bytes: nothing after it is pulled
+    assert client.pulled == 3
+    assert admission.too_large == 1
+    assert (admission.uploads, admission.bytes) == (0, 0)
+
+
+async def test_body_without_length_reserves_the_maximum():
+    admission = UploadAdmission(max_uploads=2)
+
+    client = await Client([b"a" * 100, b"a" * 100]).post(make_app(admission))
+
+    assert client.status == 200
+    assert client.json() == {"read": 200, "reserved": MAX_REQUEST_BYTES}
+    assert admission.bytes == 0
+
+
+async def test_client_disconnect_releases_the_reservation():
+    admission = UploadAdmission(max_uploads=1)
+
+    with pytest.raises(ClientDisconnect):
+        await Client([b"a" * 100], disconnect=True).post(make_app(admission), length=500)
+
+    assert (admission.uploads, admission.bytes) == (0, 0)
+    assert (await Client([b"a"]).post(make_app(admission), length=1)).status == 200
+
+
+async def test_exception_releases_the_reservation():
+    admission = UploadAdmission(max_uploads=1)
+
+    with pytest.raises(RuntimeError):
+        await Client([b"a" * 100]).post(make_app(admission), path="/fail", length=100)
+
+    assert (admission.uploads, admission.bytes) == (0, 0)
+
+
+async def test_other_requests_are_not_counted():
+    admission = UploadAdmission(max_uploads=1)
+    assert admission.acquire(1)
+
+    client = await Client([b'"x"']).post(make_app(admission), content_type="application/json", length=3)
+
+    assert client.status == 200
+    assert admission.admitted == 1
+
+
+def test_upload_larger_than_the_budget_is_admitted_when_idle():
+    admission = UploadAdmission(max_bytes=100)
+
+    assert admission.acquire(500)
+    assert not admission.acquire(1)
+    admission.release(500)
+    assert admission.acquire(1)
+    assert admission.stats()["peak_bytes"] == 500
@@ -0,0 +1,123 @@
+import hashlib
+import io
+import os
+import uuid
+
+import pytest
+from starlette.datastructures import UploadFile
+
+from app.api.v1.dependencies.uploads import hash_upload
+from app.application.dtos.photo_dto import PhotoUploadDTO
+from app.application.use_cases.photo_use_cases import BulkUploadMediaUseCase, UploadPhotoUseCase
+from app.domain.entities.album import Album
+from app.infrastructure.repositories.album_repository_memory import AlbumRepositoryMemory
+from app.infrastructure.repositories.photo_repository_memory import PhotoRepositoryMemory
+
+pytestmark = pytest.mark.unit
+
+
+class MemorySession:
+    """Session stand-in for the in-memory repositories"""
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def commit(self):
+        pass
+
+    async def rollback(self):
+        pass
+
+
+class FakeStorage:
+    """Records the filenames that reached Cloudinary"""
+
+    def __init__(self):
+        self.uploaded = []
+
+    async def upload_image(self, file, filename, folder):
+        self.uploaded.append(filename)
+        return {
+            "url": f"https://cdn.test/{folder}/{filename}",
+            "public_id": f"{folder}/{uuid.uuid4().hex}",
+            "bytes": 10,
+            "format": "jpg",
+        }
+
+
+@pytest.fixture
+async def setup():
+    albums = AlbumRepositoryMemory()
+    photos = PhotoRepositoryMemory()
+    album = await albums.create(Album(name="Boda", event_code=f"H{uuid.uuid4().hex[:8]}"))
+    other = await albums.create(Album(name="Bautizo", event_code=f"H{uuid.uuid4().hex[:8]}"))
+    return albums, photos, album, other, FakeStorage()
+
+
+def digest(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+async def test_hash_covers_the_whole_file_and_rewinds():
+    content = os.urandom(3 * 1024 * 1024 + 17)
+    file = UploadFile(io.BytesIO(content), filename="big.jpg")
+    file.file.read(10)
+
+    assert await hash_upload(file) == digest(content)
+    assert file.file.tell() == 0
+
+
+async def test_same_file_in_the_album_is_not_uploaded_again(setup):
+    albums, photos, album, _, storage = setup
+    use_case = UploadPhotoUseCase(photos, albums, storage)
+    upload_data = PhotoUploadDTO(album_id=album.id)
+
+    first, duplicate = await use_case.execute(io.BytesIO(b"x"), "a.jpg", upload_data, digest(b"x"))
+    assert not duplicate
+    again, duplicate = await use_case.execute(io.BytesIO(b"x"), "a (1).jpg", upload_data, digest(b"x"))
+
+    assert duplicate
+    assert again.id == first.id
+    assert storage.uploaded == ["a.jpg"]
+    assert (await albums.get_by_id(album.id)).photo_count == 1
+
+
+async def test_same_file_in_another_album_is_uploaded(setup):
+    albums, photos, album, other, storage = setup
+    use_case = UploadPhotoUseCase(photos, albums, storage)
+
+    await use_case.execute(io.BytesIO(b"x"), "a.jpg", PhotoUploadDTO(album_id=album.id), digest(b"x"))
+    photo, duplicate = await use_case.execute(
+        io.BytesIO(b"x"), "a.jpg", PhotoUploadDTO(album_id=other.id), digest(b"x")
+    )
+
+    assert not duplicate
+    assert photo.album_id == other.id
+    assert photo.content_hash == digest(b"x")
+    assert len(storage.uploaded) == 2
+
+
+async def test_bulk_upload_stores_each_file_once(setup):
+    albums, photos, album, _, storage = setup
+    await UploadPhotoUseCase(photos, albums, storage).execute(
+        io.BytesIO(b"old"), "old.jpg", PhotoUploadDTO(album_id=album.id), digest(b"old")
+    )
+    use_case = BulkUploadMediaUseCase(
+        MemorySession, lambda session: photos, lambda session: albums, storage
+    )
+    contents = [b"old", b"new", b"new", b"other"]
+
+    results = await use_case.execute(
+        [(io.BytesIO(content), f"{index}.jpg", "image") for index, content in enumerate(contents)],
+        [digest(content) for content in contents],
+        PhotoUploadDTO(album_id=album.id),
+    )
+
+    assert [result.success for result in results] == [True] * 4
+    assert [result.duplicate for result in results] == [True, False, True, False]
+    assert results[2].data.id == results[1].data.id
+    assert storage.uploaded == ["old.jpg", "1.jpg", "3.jpg"]
+    assert (await albums.get_by_id(album.id)).photo_count == 3